@@ -0,0 +1,96 @@
+"""
+Benchmark ASR-segment / diarization-turn alignment on synthetic meetings.
+
+Usage (from repo root):
+    python scripts/bench_alignment.py --segments 100000 --turns 100000
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from meeting_summarizer.diarization.align import align_transcript_with_diarization  # noqa: E402
+
+
+def _intervals(count: int, total_s: float, mean_s: float, rng: random.Random):
+    """Back-to-back intervals with jittered lengths and small gaps, like ASR segments or turns."""
+    rows = []
+    position = 0.0
+    step = total_s / max(1, count)
+    for _ in range(count):
+        length = max(0.05, rng.uniform(0.5, 1.5) * mean_s)
+        rows.append((position, position + length))
+        position += step
+    return rows
+
+
+def _align_by_scan(transcript, diarization):
+    """The previous O(N x M) implementation, kept here as the baseline."""
+    turns = diarization["turns"]
+    out = []
+    for seg in transcript["segments"]:
+        best, best_overlap = None, 0.0
+        for turn in turns:
+            ov = max(0.0, min(seg["end"], turn["end"]) - max(seg["start"], turn["start"]))
+            if ov > best_overlap:
+                best, best_overlap = turn, ov
+        out.append(best)
+    return out
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Time sweep-line alignment against the full scan.")
+    parser.add_argument("--segments", type=int, default=100000)
+    parser.add_argument("--turns", type=int, default=100000)
+    parser.add_argument("--scan-sample", type=int, default=2000,
+                        help="Segments/turns used to time the quadratic scan (extrapolated to full size).")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    total_s = max(args.segments, args.turns) * 3.0
+    transcript = {
+        "segments": [
+            {"id": i, "start": s, "end": e, "text": "x"}
+            for i, (s, e) in enumerate(_intervals(args.segments, total_s, 3.0, rng))
+        ]
+    }
+    diarization = {
+        "turns": [
+            {"id": j, "speaker": f"SPEAKER_{j % 6}", "start": s, "end": e}
+            for j, (s, e) in enumerate(_intervals(args.turns, total_s, 3.0, rng))
+        ]
+    }
+
+    began = time.perf_counter()
+    aligned = align_transcript_with_diarization(transcript, diarization)
+    sweep_s = time.perf_counter() - began
+
+    n = min(args.scan_sample, args.segments)
+    m = min(args.scan_sample, args.turns)
+    sample_transcript = {"segments": transcript["segments"][:n]}
+    sample_diarization = {"turns": diarization["turns"][:m]}
+    began = time.perf_counter()
+    expected = _align_by_scan(sample_transcript, sample_diarization)
+    scan_sample_s = time.perf_counter() - began
+    scan_estimate_s = scan_sample_s * (args.segments / n) * (args.turns / m)
+
+    sample_aligned = align_transcript_with_diarization(sample_transcript, sample_diarization)["segments"]
+    matches = all(
+        row.get("turn_id") == (turn["id"] if turn is not None else None)
+        for row, turn in zip(sample_aligned, expected)
+    )
+
+    print(f"{args.segments} segments x {args.turns} turns")
+    print(f"sweep:     {sweep_s:.2f}s ({len(aligned['segments'])} rows)")
+    print(f"full scan: ~{scan_estimate_s:.0f}s (extrapolated from {n} x {m}: {scan_sample_s:.2f}s)")
+    print(f"speedup: ~{scan_estimate_s / sweep_s:.0f}x  sample identical: {matches}")
+
+
+if __name__ == "__main__":
+    main()
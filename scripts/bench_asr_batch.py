@@ -0,0 +1,55 @@
+"""
+Compare one-file-at-a-time ASR with batched multi-file ASR on real recordings.
+
+Usage (from repo root; needs the faster-whisper model, downloaded on first use):
+    python scripts/bench_asr_batch.py data/raw/*.wav --model small --batch-size 8
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from meeting_summarizer.asr.batch_transcribe import transcribe_batch  # noqa: E402
+from meeting_summarizer.asr.model_registry import default_registry  # noqa: E402
+from meeting_summarizer.asr.transcribe import transcribe_audio  # noqa: E402
+from meeting_summarizer.audio.load_audio import load_audio  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure ASR throughput: per-file vs batched.")
+    parser.add_argument("audio", nargs="+", help="Audio files to transcribe.")
+    parser.add_argument("--model", type=str, default="small")
+    parser.add_argument("--batch-size", type=int, default=8)
+    args = parser.parse_args()
+
+    paths = [Path(path) for path in args.audio]
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_dir = Path(tmp) / "cache"
+        # Decode and load the model up front so neither mode is charged for them.
+        audios = [load_audio(path, cache_dir=cache_dir) for path in paths]
+        audio_s = sum(audio.duration_s for audio in audios)
+        _model, load_s = default_registry().get(args.model)
+
+        began = time.perf_counter()
+        for path, audio in zip(paths, audios):
+            transcribe_audio(path, model_size=args.model, audio=audio)
+        single_s = time.perf_counter() - began
+
+        report = transcribe_batch(
+            paths, Path(tmp) / "runs", model_size=args.model, batch_size=args.batch_size, audio_cache_dir=cache_dir
+        )
+
+    print(f"files: {len(paths)}  audio: {audio_s:.1f}s  model load: {load_s:.2f}s")
+    print(f"one file at a time: {single_s:.2f}s  ({audio_s / single_s:.1f}x real time)")
+    print(f"batched (size {args.batch_size}): {report['wall_s']:.2f}s  ({report['throughput_x']:.1f}x real time)")
+    print(f"speedup: {single_s / report['wall_s']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+Compare single-pass ASR with silence-split parallel ASR on one long recording.
+
+Usage (from repo root; needs the faster-whisper model, downloaded on first use):
+    python scripts/bench_asr_parallel.py data/raw/long_meeting.wav --workers 4
+"""
+from __future__ import annotations
+
+import argparse
+import difflib
+import os
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from meeting_summarizer.asr.parallel_transcribe import transcribe_parallel  # noqa: E402
+from meeting_summarizer.asr.transcribe import transcribe_audio  # noqa: E402
+from meeting_summarizer.audio.load_audio import load_audio  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure silence-split parallel ASR against a single pass.")
+    parser.add_argument("audio", help="Long recording to transcribe.")
+    parser.add_argument("--model", type=str, default="small")
+    parser.add_argument("--workers", type=int, default=max(2, (os.cpu_count() or 2) // 2))
+    args = parser.parse_args()
+
+    audio = load_audio(Path(args.audio))
+
+    began = time.perf_counter()
+    single = transcribe_audio(Path(args.audio), model_size=args.model, audio=audio)
+    single_s = time.perf_counter() - began
+
+    began = time.perf_counter()
+    parallel = transcribe_parallel(Path(args.audio), model_size=args.model, workers=args.workers, audio=audio)
+    parallel_s = time.perf_counter() - began
+
+    single_words = " ".join(segment["text"] for segment in single["segments"]).split()
+    parallel_words = " ".join(segment["text"] for segment in parallel["segments"]).split()
+    similarity = difflib.SequenceMatcher(a=single_words, b=parallel_words, autojunk=False).ratio()
+
+    print(f"audio: {audio.duration_s:.1f}s  workers: {args.workers}  chunks: {parallel['timing']['chunks']}")
+    print(f"single pass: {single_s:.2f}s (model load {single['timing']['model_load_s']:.2f}s)")
+    print(f"parallel:    {parallel_s:.2f}s (model load {parallel['timing']['model_load_s']:.2f}s per worker)")
+    print(f"speedup: {single_s / parallel_s:.2f}x  word-sequence similarity: {similarity:.3f}")
+
+
+if __name__ == "__main__":
+    main()
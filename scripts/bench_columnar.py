@@ -0,0 +1,97 @@
+"""
+Compare indented JSON with the columnar artifact format (io.export_results): on-disk size,
+full document loads, and lazy reads of one column or a page of rows.
+
+Usage (from repo root):
+    python scripts/bench_columnar.py --rows 100000
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from meeting_summarizer.io.export_results import export_artifact, load_artifact, open_artifact  # noqa: E402
+from meeting_summarizer.prosody.model_sequence import build_prosody_sequence_model  # noqa: E402
+
+
+def _prosody(rows: int, seed: int = 0) -> dict:
+    rng = random.Random(seed)
+    features, position = [], 0.0
+    for index in range(rows):
+        duration = rng.uniform(0.5, 6.0)
+        pause = rng.uniform(0.0, 1.5)
+        features.append(
+            {
+                "segment_id": index,
+                "start": position + pause,
+                "end": position + pause + duration,
+                "speaker": f"SPEAKER_{rng.randrange(6)}",
+                "duration_s": duration,
+                "pause_before_s": pause,
+                "pause_after_s": rng.uniform(0.0, 1.5),
+                "rms_mean": None if rng.random() < 0.02 else rng.uniform(0.01, 0.3),
+                "rms_std": rng.uniform(0.001, 0.05),
+            }
+        )
+        position += pause + duration
+    return {
+        "audio_path": "synthetic.wav",
+        "method": "rms_pause_v2",
+        "sample_rate_hz": 16000,
+        "audio_read_error": None,
+        "features": features,
+    }
+
+
+def _timed(function) -> float:
+    began = time.perf_counter()
+    function()
+    return time.perf_counter() - began
+
+
+def _report(json_path: Path, page: int) -> None:
+    directory = export_artifact(json_path)
+    json_bytes = json_path.stat().st_size
+    columnar_bytes = sum(path.stat().st_size for path in directory.iterdir())
+    parse_s = _timed(lambda: json.loads(json_path.read_text(encoding="utf-8")))
+    rebuild_s = _timed(lambda: load_artifact(json_path))
+    table = open_artifact(json_path)
+    numeric = next(column["name"] for column in table.header["columns"] if column["kind"] == "float")
+    column_s = _timed(lambda: open_artifact(json_path).column(numeric))
+    middle = table.num_rows // 2
+    page_s = _timed(lambda: open_artifact(json_path).rows(middle, middle + page))
+
+    print(f"{json_path.name}: {table.num_rows} rows")
+    print(f"  size: JSON {json_bytes / 1e6:.1f} MB, columnar {columnar_bytes / 1e6:.1f} MB "
+          f"({json_bytes / columnar_bytes:.1f}x smaller)")
+    print(f"  full document: json.loads {parse_s * 1000:.0f} ms, columnar rebuild {rebuild_s * 1000:.0f} ms")
+    print(f"  one column ({numeric}): {column_s * 1000:.2f} ms "
+          f"({parse_s / column_s:.0f}x faster than parsing the JSON)")
+    print(f"  {page} rows from the middle: {page_s * 1000:.2f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Size and load time: indented JSON vs columnar artifacts.")
+    parser.add_argument("--rows", type=int, default=100000, help="Prosody segments in the synthetic run.")
+    parser.add_argument("--page", type=int, default=500, help="Rows per lazy page read.")
+    args = parser.parse_args()
+
+    prosody = _prosody(args.rows)
+    with tempfile.TemporaryDirectory() as tmp:
+        run_dir = Path(tmp)
+        (run_dir / "prosody.json").write_text(json.dumps(prosody, indent=2), encoding="utf-8")
+        build_prosody_sequence_model(prosody, run_dir / "prosody_model.json")
+        for name in ("prosody.json", "prosody_model.json"):
+            _report(run_dir / name, args.page)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Benchmark Baum-Welch training and Viterbi decoding of the prosody HMM on synthetic meetings.
+
+Usage (from repo root):
+    python scripts/bench_hmm.py --meetings 100 --segments 2000
+    python scripts/bench_hmm.py --meetings 1 --segments 100000
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+import numpy as np  # noqa: E402
+
+from meeting_summarizer.prosody.hmm import GaussianHMM  # noqa: E402
+
+# Hidden regimes (log rms, log1p pause before, log1p pause after, log duration) and their
+# transition matrix: fluent speech, hesitant speech, emphatic speech, long pauses.
+REGIME_MEANS = np.array(
+    [
+        [-2.5, 0.10, 0.10, 1.2],
+        [-3.5, 0.40, 0.30, 0.6],
+        [-1.5, 0.05, 0.20, 1.5],
+        [-3.0, 1.20, 1.00, 0.3],
+    ]
+)
+REGIME_TRANSITIONS = np.array(
+    [
+        [0.85, 0.07, 0.05, 0.03],
+        [0.15, 0.70, 0.05, 0.10],
+        [0.20, 0.05, 0.70, 0.05],
+        [0.30, 0.20, 0.10, 0.40],
+    ]
+)
+
+
+def _meeting(segments: int, rng: np.random.Generator):
+    cumulative = np.cumsum(REGIME_TRANSITIONS, axis=1)
+    states = np.empty(segments, dtype=np.int64)
+    states[0] = 0
+    draws = rng.random(segments)
+    for t in range(1, segments):
+        states[t] = int(np.searchsorted(cumulative[states[t - 1]], draws[t]))
+    return REGIME_MEANS[states] + 0.25 * rng.standard_normal((segments, REGIME_MEANS.shape[1])), states
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Time prosody HMM training and decoding.")
+    parser.add_argument("--meetings", type=int, default=100)
+    parser.add_argument("--segments", type=int, default=2000, help="Observations per meeting.")
+    parser.add_argument("--states", type=int, default=4)
+    parser.add_argument("--iterations", type=int, default=20)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    data = [_meeting(args.segments, rng) for _ in range(args.meetings)]
+    sequences = [observations for observations, _states in data]
+    total = args.meetings * args.segments
+
+    model = GaussianHMM(n_states=args.states, n_iter=args.iterations, tol=0.0)
+    began = time.perf_counter()
+    model.fit(sequences)
+    fit_s = time.perf_counter() - began
+
+    began = time.perf_counter()
+    paths = model.decode(sequences)
+    decode_s = time.perf_counter() - began
+
+    truth = np.concatenate([states for _observations, states in data])
+    decoded = np.concatenate(paths)
+    # States are anonymous: map each decoded state to the regime it overlaps most.
+    mapping = {
+        state: int(np.bincount(truth[decoded == state], minlength=len(REGIME_MEANS)).argmax())
+        for state in np.unique(decoded)
+    }
+    accuracy = float(np.mean(np.array([mapping[state] for state in decoded]) == truth))
+
+    print(f"{args.meetings} meetings x {args.segments} observations = {total}, {model.n_states} states")
+    print(f"  Baum-Welch: {model.iterations} iterations in {fit_s:.2f}s "
+          f"({1e6 * fit_s / (model.iterations * total):.2f} us per observation-iteration)")
+    print(f"  Viterbi:    {decode_s:.2f}s")
+    print(f"  decoded regime accuracy: {accuracy:.3f}")
+
+
+if __name__ == "__main__":
+    main()
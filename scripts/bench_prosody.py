@@ -0,0 +1,84 @@
+"""
+Benchmark prosody extraction engines on a synthetic recording.
+
+Usage (from repo root):
+    python scripts/bench_prosody.py --minutes 10
+"""
+from __future__ import annotations
+
+import argparse
+import math
+import sys
+import tempfile
+import time
+import wave
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+import numpy as np  # noqa: E402
+
+from meeting_summarizer.prosody.extract_prosody import extract_prosody_features  # noqa: E402
+
+
+def _write_synthetic_wav(path: Path, seconds: float, sample_rate: int, channels: int) -> None:
+    t = np.arange(int(seconds * sample_rate), dtype=np.float64) / sample_rate
+    envelope = 0.05 + 0.15 * (0.5 + 0.5 * np.sin(2.0 * math.pi * 0.1 * t))
+    mono = envelope * np.sin(2.0 * math.pi * 180.0 * t)
+    pcm = (np.repeat(mono[:, None], channels, axis=1) * 32767.0).astype("<i2")
+    with wave.open(str(path), "wb") as wav_file:
+        wav_file.setnchannels(channels)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes(pcm.tobytes())
+
+
+def _aligned_segments(seconds: float, segment_s: float = 4.0, gap_s: float = 0.3) -> dict:
+    segments = []
+    start = 0.0
+    while start < seconds:
+        end = min(seconds, start + segment_s)
+        segments.append({"id": len(segments), "start": start, "end": end, "speaker": "SPEAKER_0", "text": ""})
+        start = end + gap_s
+    return {"segments": segments}
+
+
+def _time_engine(audio_path: Path, aligned: dict, output_path: Path, engine: str, repeat: int) -> float:
+    best = math.inf
+    for _ in range(repeat):
+        began = time.perf_counter()
+        extract_prosody_features(audio_path, aligned, output_path, engine=engine, use_envelope_cache=False)
+        best = min(best, time.perf_counter() - began)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare numpy vs pure-Python prosody engines.")
+    parser.add_argument("--minutes", type=float, default=5.0, help="Synthetic recording length.")
+    parser.add_argument("--sample-rate", type=int, default=16000)
+    parser.add_argument("--channels", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per engine (best time is reported).")
+    args = parser.parse_args()
+
+    seconds = args.minutes * 60.0
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_dir = Path(tmp)
+        audio_path = tmp_dir / "synthetic.wav"
+        _write_synthetic_wav(audio_path, seconds, args.sample_rate, args.channels)
+        aligned = _aligned_segments(seconds)
+
+        timings = {
+            engine: _time_engine(audio_path, aligned, tmp_dir / f"prosody_{engine}.json", engine, args.repeat)
+            for engine in ("python", "numpy")
+        }
+
+    print(f"audio: {args.minutes:.1f} min @ {args.sample_rate} Hz x {args.channels} ch, "
+          f"{len(aligned['segments'])} segments")
+    for engine, elapsed in timings.items():
+        print(f"  {engine:>6}: {elapsed:8.3f} s  ({seconds / elapsed:8.1f}x real-time)")
+    print(f"  speedup: {timings['python'] / timings['numpy']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Benchmark the cross-meeting search index: ingest many synthetic meetings, then time queries.
+
+Usage (from repo root):
+    python scripts/bench_search.py --meetings 10000 --segments 100
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from meeting_summarizer.search.index import MeetingIndex  # noqa: E402
+
+COMMON = "team project update review plan schedule issue meeting customer release".split()
+
+
+def _meeting(rng: random.Random, segments: int, vocabulary: list) -> dict:
+    rows, position = [], 0.0
+    for index in range(segments):
+        duration = rng.uniform(2.0, 8.0)
+        words = [rng.choice(COMMON) if rng.random() < 0.3 else rng.choice(vocabulary) for _ in range(rng.randint(6, 18))]
+        rows.append(
+            {
+                "id": index,
+                "start": position,
+                "end": position + duration,
+                "speaker": f"SPEAKER_{rng.randrange(4)}",
+                "text": " ".join(words),
+            }
+        )
+        position += duration + rng.uniform(0.0, 1.0)
+    return {"segments": rows}
+
+
+def _time_queries(index: MeetingIndex, label: str, queries: list, **filters) -> None:
+    """Median / max wall time of `index.search(query, **filters)` over `queries`."""
+    timings = []
+    for query in queries:
+        began = time.perf_counter()
+        index.search(query, **filters)
+        timings.append((time.perf_counter() - began) * 1000.0)
+    print(f"  {label}: median {statistics.median(timings):.2f} ms, max {max(timings):.2f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Time search index ingestion and queries over many meetings.")
+    parser.add_argument("--meetings", type=int, default=10000)
+    parser.add_argument("--segments", type=int, default=100, help="Segments per meeting.")
+    parser.add_argument("--queries", type=int, default=50)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    # Zipf-ish vocabulary: a few thousand words, most of them rare across the corpus.
+    vocabulary = [f"word{k}" for k in range(5000)]
+    with tempfile.TemporaryDirectory() as tmp:
+        with MeetingIndex(Path(tmp) / "search.db") as index:
+            began = time.perf_counter()
+            for meeting in range(args.meetings):
+                local = rng.sample(vocabulary, 60)
+                index.add_meeting(f"run{meeting:06d}", _meeting(rng, args.segments, local), summary=" ".join(local))
+            ingest_s = time.perf_counter() - began
+            stats = index.stats()
+            print(f"{stats['meetings']} meetings, {stats['segments']} segments")
+            print(f"  ingest: {ingest_s:.1f}s ({stats['segments'] / ingest_s:.0f} segments/s)")
+
+            rare = [rng.choice(vocabulary) for _ in range(args.queries)]
+            pairs = [f"{rng.choice(vocabulary)} {rng.choice(COMMON)}" for _ in range(args.queries)]
+            _time_queries(index, "rare word", rare)
+            _time_queries(index, "rare word + common word", pairs)
+            _time_queries(index, "rare word + speaker", rare, speaker="SPEAKER_2")
+            _time_queries(index, "common word, by relevance", COMMON[:5])
+            _time_queries(index, "common word, by time", COMMON[:5], order="time")
+            _time_queries(index, "speaker, no query", [None] * 5, speaker="SPEAKER_2")
+            _time_queries(
+                index, "one run + speaker + time window", [None] * 5,
+                run_dir="run004242", speaker="SPEAKER_2", start=120.0, end=300.0,
+            )
+            began = time.perf_counter()
+            index.search_summaries(rare[0])
+            print(f"  summary search: {(time.perf_counter() - began) * 1000.0:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
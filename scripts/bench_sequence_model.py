@@ -0,0 +1,80 @@
+"""
+Benchmark the prosody sequence model engines on synthetic prosody features.
+
+Usage (from repo root):
+    python scripts/bench_sequence_model.py --rows 1000000
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from meeting_summarizer.prosody.model_sequence import (  # noqa: E402
+    sequence_columns,
+    sequence_model,
+    sequence_states,
+)
+
+
+def _features(rows: int, speakers: int, seed: int = 0):
+    """prosody.json-style rows: back-to-back segments, ~5% without an RMS value."""
+    rng = random.Random(seed)
+    features = []
+    position = 0.0
+    for index in range(rows):
+        duration = rng.uniform(0.5, 6.0)
+        pause = rng.expovariate(3.0)
+        features.append(
+            {
+                "segment_id": index,
+                "start": position + pause,
+                "end": position + pause + duration,
+                "speaker": f"SPEAKER_{rng.randrange(speakers)}",
+                "duration_s": duration,
+                "pause_before_s": pause,
+                "pause_after_s": rng.expovariate(3.0),
+                "rms_mean": None if rng.random() < 0.05 else rng.uniform(0.005, 0.3),
+            }
+        )
+        position += pause + duration
+    return features
+
+
+def _timed(fn, *args, **kwargs):
+    began = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - began
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare row and columnar prosody sequence engines.")
+    parser.add_argument("--rows", type=int, default=1000000, help="Number of prosody observations.")
+    parser.add_argument("--speakers", type=int, default=6)
+    parser.add_argument("--skip-python", action="store_true", help="Only time the numpy engine.")
+    args = parser.parse_args()
+
+    prosody = {"audio_path": "synthetic.wav", "method": "rms_pause_v2", "features": _features(args.rows, args.speakers)}
+
+    columns, columns_s = _timed(sequence_columns, prosody["features"])
+    _core, core_s = _timed(sequence_states, columns)
+    numpy_model, numpy_s = _timed(sequence_model, prosody, engine="numpy")
+
+    print(f"{args.rows} observations, {args.speakers} speakers")
+    print(f"numpy engine:  {numpy_s:.2f}s total")
+    print(f"  dict rows -> columns:            {columns_s:.2f}s")
+    print(f"  sort/buckets/stats/transitions:  {core_s:.3f}s")
+    print(f"  observation rows for the JSON:   {max(0.0, numpy_s - columns_s - core_s):.2f}s")
+    if not args.skip_python:
+        python_model, python_s = _timed(sequence_model, prosody, engine="python")
+        print(f"python engine: {python_s:.2f}s total ({python_s / numpy_s:.1f}x slower)")
+        print(f"identical output: {python_model == numpy_model}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Benchmark topic segmentation on a synthetic transcript made of distinct-vocabulary topics.
+
+Usage (from repo root):
+    python scripts/bench_topics.py --hours 8
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from meeting_summarizer.topics.segment_topics import segment_topics  # noqa: E402
+
+FILLER = "so we should probably look at this and then maybe talk about it later today".split()
+
+
+def _transcript(hours: float, topic_minutes: float, seed: int = 0):
+    """
+    ~4 s segments; every `topic_minutes` the meeting switches to a fresh 40-word vocabulary
+    (drawn Zipf-like, so a few key terms recur) mixed with shared filler words.
+    """
+    rng = random.Random(seed)
+    weights = [1.0 / (rank + 1) for rank in range(40)]
+    segments, truth = [], []
+    position, index, topic = 0.0, 0, -1
+    vocabulary = []
+    while position < hours * 3600.0:
+        if position >= (topic + 1) * topic_minutes * 60.0:
+            topic += 1
+            truth.append(index)
+            vocabulary = [f"term{topic}x{k}" for k in range(40)]
+        duration = rng.uniform(2.0, 6.0)
+        words = [
+            rng.choices(vocabulary, weights)[0] if rng.random() < 0.3 else rng.choice(FILLER) for _ in range(12)
+        ]
+        segments.append(
+            {"id": index, "start": position, "end": position + duration,
+             "speaker": f"SPEAKER_{rng.randrange(4)}", "text": " ".join(words)}
+        )
+        position += duration + rng.uniform(0.1, 0.6)
+        index += 1
+    return {"segments": segments}, truth[1:]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Time TextTiling topic segmentation on a long synthetic meeting.")
+    parser.add_argument("--hours", type=float, default=8.0)
+    parser.add_argument("--topic-minutes", type=float, default=12.0, help="Length of each synthetic topic.")
+    args = parser.parse_args()
+
+    aligned, truth = _transcript(args.hours, args.topic_minutes)
+    with tempfile.TemporaryDirectory() as tmp:
+        began = time.perf_counter()
+        topics = segment_topics(aligned, Path(tmp) / "topics.json")["topics"]
+        elapsed = time.perf_counter() - began
+
+    found = [topic["segment_ids"][0] for topic in topics[1:]]
+    hits = sum(any(abs(start - boundary) <= 2 for start in found) for boundary in truth)
+    print(f"{len(aligned['segments'])} segments ({args.hours:.1f} h), {len(truth) + 1} true topics")
+    print(f"  elapsed: {elapsed:.2f}s, topics found: {len(topics)}")
+    print(f"  true boundaries recovered within 2 segments: {hits}/{len(truth)}")
+
+
+if __name__ == "__main__":
+    main()
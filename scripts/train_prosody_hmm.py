@@ -0,0 +1,43 @@
+"""
+Fit one prosody HMM across many meetings' prosody.json files and save it for decoding.
+
+Usage (from repo root):
+    python scripts/train_prosody_hmm.py outputs/*/prosody.json --output models/prosody_hmm.json
+    PYTHONPATH=src python src/cli.py --input new.wav --prosody-hmm-model models/prosody_hmm.json
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from meeting_summarizer.prosody.hmm import DEFAULT_ITERATIONS, DEFAULT_STATES, fit_prosody_hmm  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Train a Gaussian prosody HMM on several meetings.")
+    parser.add_argument("prosody", nargs="+", help="prosody.json files, one per meeting.")
+    parser.add_argument("--output", type=str, default="models/prosody_hmm.json")
+    parser.add_argument("--states", type=int, default=DEFAULT_STATES)
+    parser.add_argument("--iterations", type=int, default=DEFAULT_ITERATIONS)
+    args = parser.parse_args()
+
+    prosodies = [json.loads(Path(path).read_text(encoding="utf-8")) for path in args.prosody]
+    began = time.perf_counter()
+    model = fit_prosody_hmm(prosodies, n_states=args.states, n_iter=args.iterations)
+    elapsed = time.perf_counter() - began
+
+    model.save(Path(args.output))
+    observations = sum(len(prosody.get("features", [])) for prosody in prosodies)
+    print(f"{len(prosodies)} meetings, {observations} observations, {model.n_states} states")
+    print(f"  {model.iterations} Baum-Welch iterations in {elapsed:.2f}s (converged: {model.converged})")
+    print(f"  log-likelihood: {model.log_likelihood:.1f}  ->  {args.output}")
+
+
+if __name__ == "__main__":
+    main()
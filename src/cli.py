@@ -1,13 +1,82 @@
 from __future__ import annotations
 
 import argparse
+import sys
 from pathlib import Path
+from typing import List, Optional
 
-from meeting_summarizer.pipeline import run_pipeline
+from meeting_summarizer.asr.model_registry import warm_up
+from meeting_summarizer.pipeline import DIARIZERS, run_pipeline
+from meeting_summarizer.search.index import DEFAULT_LIMIT, SEARCH_ORDERS, MeetingIndex
 
+DEFAULT_SEARCH_DB = "outputs/search.db"
 
-def main() -> None:
-    parser = argparse.ArgumentParser(description="Speech-aware meeting summarizer (CS 582).")
+
+def index_main(argv: List[str]) -> None:
+    """`cli.py index [RUNS_ROOT ...]`: add new or changed run directories to the search database."""
+    parser = argparse.ArgumentParser(prog="cli.py index", description="Build or update the meeting search index.")
+    parser.add_argument("roots", nargs="*", default=["outputs"],
+                        help="Directories to scan for runs (any folder holding segments.json). Default: outputs.")
+    parser.add_argument("--db", type=str, default=DEFAULT_SEARCH_DB, help=f"Search database (default: {DEFAULT_SEARCH_DB}).")
+    parser.add_argument("--prune", action="store_true", help="Also drop runs whose directory is gone.")
+    args = parser.parse_args(argv)
+
+    with MeetingIndex(Path(args.db)) as index:
+        for root in args.roots:
+            counts = index.ingest_tree(Path(root))
+            print(f"{root}: {counts['indexed']} indexed, {counts['unchanged']} unchanged")
+        if args.prune:
+            print(f"Pruned {index.remove_missing()} missing runs")
+        stats = index.stats()
+    print(f"{args.db}: {stats['meetings']} meetings, {stats['segments']} segments")
+
+
+def search_main(argv: List[str]) -> None:
+    """`cli.py search [QUERY] [--speaker S] [--start T] [--end T]`: query the search database."""
+    parser = argparse.ArgumentParser(prog="cli.py search", description="Search indexed meetings.")
+    parser.add_argument("query", nargs="*", help="Words that must all appear (stemmed; `word*` for a prefix).")
+    parser.add_argument("--db", type=str, default=DEFAULT_SEARCH_DB, help=f"Search database (default: {DEFAULT_SEARCH_DB}).")
+    parser.add_argument("--speaker", type=str, default=None, help="Only segments by this speaker label.")
+    parser.add_argument("--start", type=float, default=None, help="Only segments ending at or after this time (s).")
+    parser.add_argument("--end", type=float, default=None, help="Only segments starting at or before this time (s).")
+    parser.add_argument("--run", type=str, default=None, help="Only this run directory.")
+    parser.add_argument("--order", choices=SEARCH_ORDERS, default="relevance",
+                        help="relevance (BM25, default) or time (meeting then time; fastest for common words).")
+    parser.add_argument("--summaries", action="store_true", help="Search summary.md files instead of segments.")
+    parser.add_argument("--limit", type=int, default=DEFAULT_LIMIT, help=f"Maximum results (default: {DEFAULT_LIMIT}).")
+    args = parser.parse_args(argv)
+
+    query = " ".join(args.query)
+    if not Path(args.db).exists():
+        parser.error(f"{args.db} does not exist; build it with `cli.py index` first")
+    with MeetingIndex(Path(args.db)) as index:
+        if args.summaries:
+            if not query:
+                parser.error("--summaries needs a query")
+            for row in index.search_summaries(query, limit=args.limit):
+                print(f"{row['run_dir']}: {row['snippet']}")
+            return
+        rows = index.search(query or None, speaker=args.speaker, start=args.start, end=args.end,
+                            run_dir=str(Path(args.run).resolve()) if args.run else None,
+                            limit=args.limit, order=args.order)
+    for row in rows:
+        print(f"{row['run_dir']} [{row['start']:.1f}s - {row['end']:.1f}s] {row['speaker']}: "
+              f"{row['snippet'] or row['text']}")
+    if not rows:
+        print("No matches.")
+
+
+SUBCOMMANDS = {"index": index_main, "search": search_main}
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] in SUBCOMMANDS:
+        SUBCOMMANDS[argv[0]](argv[1:])
+        return
+
+    parser = argparse.ArgumentParser(description="Speech-aware meeting summarizer (CS 582).",
+                                     epilog="Subcommands: `index` and `search` (cross-meeting search; see --help of each).")
     parser.add_argument("--input", type=str, default="data/raw/example.wav",
                         help="Path to input audio file (can be placeholder for now).")
     parser.add_argument("--output", type=str, default="outputs/run1",
@@ -15,7 +84,53 @@ def main() -> None:
     parser.add_argument("--enable-engagement", action="store_true",
                         help="Enable engagement/emotion stage (optional).")
     parser.add_argument("--no-asr", action="store_true", help="Skip ASR (useful for fast smoke tests).")
-    args = parser.parse_args()
+    parser.add_argument("--pitch", action="store_true",
+                        help="Add F0 (pitch) features to prosody.json (method rms_pause_f0_v3).")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Worker processes for per-segment prosody features (default: 1, serial).")
+    parser.add_argument("--vad", action="store_true",
+                        help="Run energy-based voice activity detection (vad.json) and use it for pauses.")
+    parser.add_argument("--vad-trim-asr", action="store_true",
+                        help="Also skip silence during ASR using the VAD speech regions (implies --vad).")
+    parser.add_argument("--audio-cache-dir", type=str, default=None,
+                        help="Where decoded audio is cached (default: <output parent>/.audio_cache).")
+    parser.add_argument("--asr-model", type=str, default="small",
+                        help="faster-whisper model size or local model directory (default: small).")
+    parser.add_argument("--asr-workers", type=int, default=1,
+                        help="Split long audio at silences and transcribe on this many processes (default: 1).")
+    parser.add_argument("--stream-asr", action="store_true",
+                        help="Write transcript.jsonl as segments decode and compute prosody while ASR runs.")
+    parser.add_argument("--asr-cache-dir", type=str, default=None,
+                        help="Where transcripts are cached (default: <output parent>/.asr_cache).")
+    parser.add_argument("--no-asr-cache", action="store_true", help="Always re-run ASR instead of using the cache.")
+    parser.add_argument("--diarizer", choices=DIARIZERS, default="baseline",
+                        help="Speaker diarization backend: baseline (single speaker), spectral "
+                             "(log-mel embedding clustering) or online (incremental, fixed latency). "
+                             "Default: baseline.")
+    parser.add_argument("--prosody-hmm", action="store_true",
+                        help="Also decode prosody states with a Gaussian HMM (prosody_hmm.json).")
+    parser.add_argument("--prosody-hmm-model", type=str, default=None,
+                        help="Pre-trained HMM JSON (scripts/train_prosody_hmm.py) to decode with "
+                             "instead of fitting on this meeting (implies --prosody-hmm).")
+    parser.add_argument("--corpus-stats", type=str, default=None,
+                        help="Add this meeting's prosody to a running corpus statistics JSON "
+                             "(team-wide speaker baselines).")
+    parser.add_argument("--search-index", type=str, default=None,
+                        help="Add the finished run to this cross-meeting search database "
+                             "(see `cli.py search`).")
+    parser.add_argument("--columnar", action="store_true",
+                        help="Also write columnar copies of per-row outputs (prosody.cols/, ...) for lazy loading.")
+    parser.add_argument("--force", action="store_true",
+                        help="Recompute every stage, even those whose inputs are unchanged since the last "
+                             "run into --output (see metadata.json).")
+    parser.add_argument("--warm-up", action="store_true",
+                        help="Load and warm up the ASR model before the run and report its load time.")
+    args = parser.parse_args(argv)
+
+    if args.warm_up and not args.no_asr:
+        timing = warm_up(args.asr_model)
+        print(f"ASR model '{args.asr_model}' loaded in {timing['model_load_s']:.2f}s "
+              f"(warm-up {timing['warm_up_s']:.2f}s)")
 
     input_path = Path(args.input)
     output_dir = Path(args.output)
@@ -25,9 +140,32 @@ def main() -> None:
         output_dir=output_dir,
         enable_engagement=args.enable_engagement,
         run_asr=not args.no_asr,
+        extract_pitch=args.pitch,
+        workers=args.workers,
+        run_vad=args.vad,
+        vad_trim_asr=args.vad_trim_asr,
+        audio_cache_dir=Path(args.audio_cache_dir) if args.audio_cache_dir else None,
+        asr_model=args.asr_model,
+        asr_workers=args.asr_workers,
+        stream_asr=args.stream_asr,
+        asr_cache_dir=Path(args.asr_cache_dir) if args.asr_cache_dir else None,
+        use_asr_cache=not args.no_asr_cache,
+        diarizer=args.diarizer,
+        prosody_hmm=args.prosody_hmm,
+        prosody_hmm_model=Path(args.prosody_hmm_model) if args.prosody_hmm_model else None,
+        corpus_stats_path=Path(args.corpus_stats) if args.corpus_stats else None,
+        search_index_path=Path(args.search_index) if args.search_index else None,
+        export_columns=args.columnar,
+        reuse_outputs=not args.force,
     )
 
-    print("Pipeline ran (scaffold). Outputs written to:", result.output_dir)
+    print("Pipeline finished. Outputs written to:", result.output_dir)
+    if result.asr_cache:
+        print("ASR transcript cache:", result.asr_cache)
+    if result.corpus_stats == "skipped":
+        print("Corpus stats: meeting already counted, not added again:", args.corpus_stats)
+    if result.reused_stages:
+        print("Reused unchanged stages:", ", ".join(result.reused_stages))
     print()
     print(result.summary_text)
 
@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+import time
+from bisect import bisect_right
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from meeting_summarizer.asr.model_registry import (
+    DEFAULT_COMPUTE_TYPE,
+    DEFAULT_CPU_THREADS,
+    DEFAULT_DEVICE,
+    ModelRegistry,
+    default_registry,
+)
+from meeting_summarizer.audio.load_audio import AudioBuffer, load_audio
+from meeting_summarizer.io.atomic import write_json_atomic
+from meeting_summarizer.vad.detect_speech import find_speech_regions, speech_chunks
+
+DEFAULT_BATCH_SIZE = 8
+# Recordings are concatenated into groups of at most this much audio per batched call,
+# which bounds the memory of the concatenated buffer (30 min of float32 is ~115 MB).
+DEFAULT_MAX_GROUP_S = 1800.0
+BATCH_REPORT_FILENAME = "batch_report.json"
+
+
+def _batched_pipeline(model):
+    from faster_whisper import BatchedInferencePipeline
+
+    return BatchedInferencePipeline(model)
+
+
+def _run_dir_names(audio_paths: Sequence[Path]) -> List[str]:
+    """One run directory name per recording: its stem, suffixed when stems collide."""
+    names: List[str] = []
+    seen: Dict[str, int] = {}
+    for path in audio_paths:
+        stem = Path(path).stem
+        count = seen.get(stem, 0)
+        seen[stem] = count + 1
+        names.append(stem if count == 0 else f"{stem}_{count}")
+    return names
+
+
+def _detect_language(model, audio: AudioBuffer, chunks: List[Tuple[float, float]]) -> str:
+    # Detect on the first speech rather than on whatever the recording opens with.
+    start = int(chunks[0][0] * audio.sample_rate) if chunks else 0
+    language, _probability, _all = model.detect_language(audio=np.asarray(audio.samples[start:]))
+    return language
+
+
+def _group_jobs(jobs: List[Dict], max_group_s: float) -> List[List[Dict]]:
+    """Pack jobs of the same language into groups of at most `max_group_s` seconds of audio."""
+    groups: List[List[Dict]] = []
+    open_groups: Dict[str, List[Dict]] = {}
+    for job in jobs:
+        group = open_groups.get(job["language"])
+        duration = job["audio"].duration_s
+        if group is None or sum(item["audio"].duration_s for item in group) + duration > max_group_s:
+            group = []
+            groups.append(group)
+            open_groups[job["language"]] = group
+        group.append(job)
+    return groups
+
+
+def _transcribe_group(pipeline, group: List[Dict], batch_size: int) -> Dict[int, List[Dict]]:
+    """
+    Transcribe a group of recordings in one batched call and split the segments back per file.
+
+    The recordings are laid end to end and every speech chunk becomes one clip, so clips from
+    different recordings share encoder/decoder batches; no clip crosses a recording boundary.
+    """
+    offsets: List[float] = []
+    clips: List[Dict[str, float]] = []
+    position = 0.0
+    for job in group:
+        offsets.append(position)
+        clips.extend({"start": position + start, "end": position + end} for start, end in job["chunks"])
+        position += job["audio"].duration_s
+
+    per_job: Dict[int, List[Dict]] = {index: [] for index in range(len(group))}
+    if not clips:
+        return per_job
+
+    samples = np.concatenate([np.asarray(job["audio"].samples, dtype=np.float32) for job in group])
+    segments, _info = pipeline.transcribe(
+        samples, language=group[0]["language"], clip_timestamps=clips, batch_size=batch_size
+    )
+    for segment in segments:
+        index = max(0, bisect_right(offsets, float(segment.start)) - 1)
+        duration = group[index]["audio"].duration_s
+        rows = per_job[index]
+        rows.append(
+            {
+                "id": len(rows),
+                "start": max(0.0, float(segment.start) - offsets[index]),
+                "end": min(duration, float(segment.end) - offsets[index]),
+                "text": segment.text.strip(),
+            }
+        )
+    return per_job
+
+
+def transcribe_batch(
+    audio_paths: Sequence[Path],
+    output_root: Path,
+    model_size: str = "small",
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    language: Optional[str] = None,
+    max_group_s: float = DEFAULT_MAX_GROUP_S,
+    audio_cache_dir: Optional[Path] = None,
+    device: str = DEFAULT_DEVICE,
+    compute_type: str = DEFAULT_COMPUTE_TYPE,
+    cpu_threads: int = DEFAULT_CPU_THREADS,
+    registry: Optional[ModelRegistry] = None,
+) -> Dict:
+    """
+    Transcribe many recordings with faster-whisper's batched inference.
+
+    Each recording is decoded once (through the audio cache) and split at VAD silences into
+    chunks of up to 30 s. Recordings of the same language are concatenated into groups, and
+    each group is decoded by a single `BatchedInferencePipeline` call, so one batch of
+    `batch_size` chunks can mix several recordings. Every recording gets
+    `<output_root>/<stem>/transcript.json` in the same format as `transcribe_audio`. A
+    recording that cannot be decoded is reported and skipped.
+
+    Writes and returns a report (`batch_report.json`) with per-file results, total audio
+    seconds, wall time (model load excluded) and throughput in audio-seconds per
+    wall-second.
+    """
+    output_root = Path(output_root)
+    registry = registry or default_registry()
+    model, model_load_s = registry.get(model_size, device, compute_type, cpu_threads)
+    pipeline = _batched_pipeline(model)
+    report_load_s = model_load_s
+
+    started = time.perf_counter()
+    files: List[Dict] = []
+    jobs: List[Dict] = []
+    for audio_path, run_name in zip(audio_paths, _run_dir_names(audio_paths)):
+        audio_path = Path(audio_path)
+        entry = {
+            "audio_path": str(audio_path),
+            "output_dir": str(output_root / run_name),
+            "duration_s": 0.0,
+            "segments": 0,
+            "error": None,
+        }
+        files.append(entry)
+        try:
+            audio = load_audio(audio_path, cache_dir=audio_cache_dir or output_root / ".audio_cache")
+        except (OSError, ValueError) as exc:
+            entry["error"] = str(exc)
+            continue
+
+        chunks = speech_chunks(find_speech_regions(audio), audio.duration_s)
+        entry["duration_s"] = audio.duration_s
+        jobs.append(
+            {
+                "entry": entry,
+                "audio": audio,
+                "chunks": chunks,
+                "language": language or _detect_language(model, audio, chunks),
+            }
+        )
+
+    for group in _group_jobs(jobs, max_group_s):
+        group_started = time.perf_counter()
+        per_job = _transcribe_group(pipeline, group, batch_size)
+        group_s = time.perf_counter() - group_started
+        group_audio_s = sum(job["audio"].duration_s for job in group) or 1.0
+
+        for index, job in enumerate(group):
+            entry = job["entry"]
+            transcript = {
+                "audio_path": entry["audio_path"],
+                "model": model_size,
+                "language": job["language"],
+                "segments": per_job[index],
+                "timing": {
+                    "model_load_s": model_load_s,
+                    # The group is decoded as a whole; each file gets its share by duration.
+                    "transcription_s": group_s * job["audio"].duration_s / group_audio_s,
+                },
+            }
+            model_load_s = 0.0
+            run_dir = Path(entry["output_dir"])
+            write_json_atomic(run_dir / "transcript.json", transcript)
+            entry["segments"] = len(per_job[index])
+
+    wall_s = time.perf_counter() - started
+    audio_s = sum(entry["duration_s"] for entry in files)
+    report = {
+        "model": model_size,
+        "batch_size": batch_size,
+        "files": files,
+        "audio_s": audio_s,
+        "model_load_s": report_load_s,
+        "wall_s": wall_s,
+        "throughput_x": audio_s / wall_s if wall_s > 0 else 0.0,
+    }
+    write_json_atomic(output_root / BATCH_REPORT_FILENAME, report)
+    return report
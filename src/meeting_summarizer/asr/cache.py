@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, Optional
+
+# Transcripts are small (about 1 MB for two hours of speech), so this holds hundreds of runs.
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+def transcript_cache_key(content_hash: str, model_size: str, language: Optional[str] = None, **options) -> str:
+    """
+    Cache key for one transcription: SHA-256 over the audio content hash, model, language
+    and every decoding option that can change the output (clip timestamps, worker split...).
+    """
+    payload = {
+        "content_sha256": content_hash,
+        "model": model_size,
+        "language": language,
+        "options": options,
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+class TranscriptCache:
+    """
+    Content-addressed transcripts on disk: `<cache_dir>/<key>.json`.
+
+    Writes are atomic (temp file + rename). Reads refresh the file's mtime, and after each
+    write the least recently used entries are deleted until the directory is back under
+    `max_bytes`. `hits` / `misses` count lookups on this instance.
+    """
+
+    def __init__(self, cache_dir: Path, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = int(max_bytes)
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Dict]:
+        path = self._path(key)
+        try:
+            transcript = json.loads(path.read_text(encoding="utf-8"))
+            os.utime(path)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return transcript
+
+    def put(self, key: str, transcript: Dict) -> None:
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self._path(key)
+        tmp_path = path.with_name(f"{key}.{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(transcript), encoding="utf-8")
+        os.replace(tmp_path, path)
+        self.evict(keep=path)
+
+    def evict(self, keep: Optional[Path] = None) -> int:
+        """Delete least recently used entries until the cache fits `max_bytes`; returns how many."""
+        entries = []
+        for path in self.cache_dir.glob("*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, path))
+        entries.sort()
+
+        total = sum(size for _mtime, size, _path in entries)
+        removed = 0
+        for _mtime, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        return removed
+
+    def stats(self) -> Dict:
+        return {"hits": self.hits, "misses": self.misses}
@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# (model_size, device, compute_type, cpu_threads)
+ModelKey = Tuple[str, str, str, int]
+
+DEFAULT_DEVICE = "cpu"
+DEFAULT_COMPUTE_TYPE = "int8"
+DEFAULT_CPU_THREADS = 0  # 0 lets CTranslate2 pick
+DEFAULT_MAX_MODELS = 2
+DEFAULT_MAX_MEMORY_MB = 4096.0
+
+# Approximate parameter counts (millions) used to budget resident memory per model.
+_MODEL_PARAMS_M = {
+    "tiny": 39,
+    "base": 74,
+    "small": 244,
+    "medium": 769,
+    "large": 1550,
+    "turbo": 809,
+    "distil-small": 166,
+    "distil-medium": 394,
+    "distil-large": 756,
+}
+_BYTES_PER_PARAM = {
+    "int8": 1,
+    "int8_float16": 1,
+    "int8_bfloat16": 1,
+    "int8_float32": 1,
+    "int16": 2,
+    "float16": 2,
+    "bfloat16": 2,
+    "float32": 4,
+}
+
+# A second of silence is enough to run the encoder and decoder once.
+_WARM_UP_SAMPLES = 16000
+
+
+def estimate_model_memory_mb(model_size: str, compute_type: str = DEFAULT_COMPUTE_TYPE) -> float:
+    """
+    Rough resident size of a loaded model: weights on disk for a local model directory,
+    otherwise parameter count x bytes per parameter for `compute_type`.
+    """
+    local = Path(model_size)
+    if local.is_dir():
+        return sum(path.stat().st_size for path in local.rglob("*") if path.is_file()) / (1024 * 1024)
+
+    name = model_size.lower().removesuffix(".en")
+    params_m = _MODEL_PARAMS_M.get(name)
+    if params_m is None:
+        prefix = next((key for key in sorted(_MODEL_PARAMS_M, key=len, reverse=True) if name.startswith(key)), None)
+        params_m = _MODEL_PARAMS_M[prefix] if prefix else _MODEL_PARAMS_M["large"]
+    return params_m * 1e6 * _BYTES_PER_PARAM.get(compute_type, 2) / (1024 * 1024)
+
+
+def _load_whisper_model(model_size: str, device: str, compute_type: str, cpu_threads: int):
+    from faster_whisper import WhisperModel
+
+    return WhisperModel(model_size, device=device, compute_type=compute_type, cpu_threads=cpu_threads)
+
+
+class ModelRegistry:
+    """
+    Process-wide cache of loaded Whisper models, keyed by (size, device, compute_type, cpu_threads).
+
+    Models are evicted least-recently-used first once more than `max_models` are loaded or
+    their estimated memory exceeds `max_memory_mb` (the model being requested is always
+    kept, even if it alone is over the cap). Thread-safe; a model is loaded at most once
+    even when several requests ask for it concurrently. Loads run outside the registry
+    lock, so only callers asking for the model being loaded wait for it; requests for
+    models already loaded are answered straight away. A load in progress counts against
+    both caps from the moment it starts, so room is made for it then and a finished load
+    never evicts another; concurrent loads that are together over the cap all stay until
+    the next load.
+    """
+
+    def __init__(
+        self,
+        max_models: int = DEFAULT_MAX_MODELS,
+        max_memory_mb: Optional[float] = DEFAULT_MAX_MEMORY_MB,
+        loader: Optional[Callable[[str, str, str, int], Any]] = None,
+    ) -> None:
+        self.max_models = max(1, int(max_models))
+        self.max_memory_mb = max_memory_mb
+        self._loader = loader or _load_whisper_model
+        self._models: "OrderedDict[ModelKey, Tuple[Any, float]]" = OrderedDict()
+        # Loads in progress and their estimated memory; callers wanting the same key wait on
+        # its future.
+        self._loading: Dict[ModelKey, Tuple[Future, float]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(
+        self,
+        model_size: str,
+        device: str = DEFAULT_DEVICE,
+        compute_type: str = DEFAULT_COMPUTE_TYPE,
+        cpu_threads: int = DEFAULT_CPU_THREADS,
+    ) -> Tuple[Any, float]:
+        """
+        Return (model, load_s); `load_s` is 0.0 when the model was already loaded, and the
+        time spent waiting when another caller was loading it.
+        """
+        key: ModelKey = (str(model_size), str(device), str(compute_type), int(cpu_threads))
+        started = time.perf_counter()
+        memory_mb: Optional[float] = None
+        while True:
+            with self._lock:
+                if key in self._models:
+                    self._models.move_to_end(key)
+                    self.hits += 1
+                    return self._models[key][0], 0.0
+                loading = self._loading.get(key)
+                if loading is not None:
+                    self.hits += 1
+                    break
+                if memory_mb is not None:
+                    self.misses += 1
+                    self._evict_for(memory_mb)
+                    future: Future = Future()
+                    self._loading[key] = (future, memory_mb)
+                    break
+            # Sizing a local model walks its directory, so it is done without the lock (and
+            # only on a miss); the key is looked up again before the load is claimed.
+            memory_mb = estimate_model_memory_mb(key[0], key[2])
+
+        if loading is not None:
+            return loading[0].result(), time.perf_counter() - started
+
+        try:
+            model = self._loader(*key)
+        except BaseException as exc:
+            with self._lock:
+                del self._loading[key]
+            future.set_exception(exc)
+            raise
+        with self._lock:
+            # Room was made when the load was claimed; evicting again here could drop a model
+            # another load has just inserted.
+            self._models[key] = (model, memory_mb)
+            del self._loading[key]
+        future.set_result(model)
+        return model, time.perf_counter() - started
+
+    def _evict_for(self, memory_mb: float) -> None:
+        # Loads in progress already hold their share of both caps.
+        reserved_mb = sum(reserved for _future, reserved in self._loading.values())
+        while self._models and len(self._models) + len(self._loading) >= self.max_models:
+            self._models.popitem(last=False)
+        if self.max_memory_mb is None:
+            return
+        while self._models and self.memory_mb() + reserved_mb + memory_mb > self.max_memory_mb:
+            self._models.popitem(last=False)
+
+    def memory_mb(self) -> float:
+        return sum(memory_mb for _model, memory_mb in self._models.values())
+
+    def loaded(self) -> List[ModelKey]:
+        """Keys of loaded models, least recently used first."""
+        with self._lock:
+            return list(self._models)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._models.clear()
+
+
+_REGISTRY = ModelRegistry()
+
+
+def default_registry() -> ModelRegistry:
+    return _REGISTRY
+
+
+def warm_up(
+    model_size: str = "small",
+    device: str = DEFAULT_DEVICE,
+    compute_type: str = DEFAULT_COMPUTE_TYPE,
+    cpu_threads: int = DEFAULT_CPU_THREADS,
+    registry: Optional[ModelRegistry] = None,
+) -> Dict:
+    """
+    Load a model into the registry and run it once on a second of silence, so the first real
+    request pays neither the load nor the first-inference setup. Returns the timings.
+    """
+    import numpy as np
+
+    registry = registry or _REGISTRY
+    model, load_s = registry.get(model_size, device, compute_type, cpu_threads)
+    started = time.perf_counter()
+    segments, _info = model.transcribe(np.zeros(_WARM_UP_SAMPLES, dtype=np.float32), language="en")
+    for _segment in segments:
+        pass
+    return {
+        "model": model_size,
+        "model_load_s": load_s,
+        "warm_up_s": time.perf_counter() - started,
+    }
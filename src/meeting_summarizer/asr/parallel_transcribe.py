@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from meeting_summarizer.asr.model_registry import (
+    DEFAULT_COMPUTE_TYPE,
+    DEFAULT_DEVICE,
+    ModelRegistry,
+)
+from meeting_summarizer.asr.transcribe import transcribe_audio
+from meeting_summarizer.audio.load_audio import load_audio
+from meeting_summarizer.audio.shared_audio import SharedAudio, open_shared_audio, shared_audio
+from meeting_summarizer.audio.wav_reader import DEFAULT_BLOCK_FRAMES
+from meeting_summarizer.vad.detect_speech import find_speech_regions, speech_chunks, speech_clip_timestamps
+
+if TYPE_CHECKING:
+    from meeting_summarizer.audio.load_audio import AudioBuffer
+
+# Chunks are sized so each worker gets a few of them (for load balance) but never shorter
+# than one Whisper window, which would only add boundary effects.
+CHUNKS_PER_WORKER = 4
+MIN_CHUNK_S = 30.0
+
+ChunkResult = Tuple[Optional[str], List[Tuple[float, float, str]], float]
+
+# Per-process state, set by `_init_worker`.
+_WORKER_MODEL = None
+_WORKER_LOAD_S = 0.0
+_WORKER_AUDIO = None
+_WORKER_SHM: Optional[shared_memory.SharedMemory] = None
+_WORKER_SAMPLE_RATE = 0
+
+
+def _init_worker(
+    model_key: Tuple[str, str, str, int],
+    loader: Optional[Callable[[str, str, str, int], Any]],
+    spec: SharedAudio,
+    sample_rate: int,
+) -> None:
+    global _WORKER_MODEL, _WORKER_LOAD_S, _WORKER_AUDIO, _WORKER_SHM, _WORKER_SAMPLE_RATE
+    _WORKER_MODEL, _WORKER_LOAD_S = ModelRegistry(max_models=1, loader=loader).get(*model_key)
+    _WORKER_AUDIO, _WORKER_SHM = open_shared_audio(spec)
+    _WORKER_SAMPLE_RATE = int(sample_rate)
+
+
+def _transcribe_chunk(task: Tuple[float, float, Optional[str]]) -> ChunkResult:
+    start_s, end_s, language = task
+    left = int(round(start_s * _WORKER_SAMPLE_RATE))
+    right = int(round(end_s * _WORKER_SAMPLE_RATE))
+    segments, info = _WORKER_MODEL.transcribe(np.array(_WORKER_AUDIO[left:right]), language=language)
+    rows = [
+        (start_s + float(segment.start), min(end_s, start_s + float(segment.end)), segment.text.strip())
+        for segment in segments
+    ]
+    return info.language, rows, _WORKER_LOAD_S
+
+
+def _majority_language(languages: Sequence[Tuple[Optional[str], float]]) -> Optional[str]:
+    totals: Dict[str, float] = {}
+    for language, seconds in languages:
+        if language:
+            totals[language] = totals.get(language, 0.0) + seconds
+    return max(totals, key=totals.get) if totals else None
+
+
+def transcribe_parallel(
+    audio_path: Path,
+    model_size: str = "small",
+    workers: int = 2,
+    cpu_threads_per_worker: Optional[int] = None,
+    language: Optional[str] = None,
+    regions: Optional[List[Dict]] = None,
+    audio: Optional["AudioBuffer"] = None,
+    device: str = DEFAULT_DEVICE,
+    compute_type: str = DEFAULT_COMPUTE_TYPE,
+    loader: Optional[Callable[[str, str, str, int], Any]] = None,
+) -> Dict:
+    """
+    Transcribe one long recording on a pool of worker processes.
+
+    The recording is split at VAD silences (`regions`, e.g. from vad.json, or detected here)
+    into chunks of at least 30 s, about `CHUNKS_PER_WORKER` per worker. Each worker loads
+    its own model with `cpu_threads_per_worker` threads (default: cores / workers) and maps
+    the decoded audio (the cache `.npy` file when `audio` is memory-mapped from it, else
+    shared memory). Segments are shifted back to recording time,
+    concatenated in chunk order and renumbered, so the result has the `transcribe_audio`
+    format. `loader` overrides how workers build the model and must be picklable.
+
+    With `workers <= 1` this is `transcribe_audio` with the same `language`, `loader` and,
+    when given, `regions` (as `clip_timestamps`), so only the worker count differs.
+    """
+    if workers <= 1:
+        clip_timestamps = None
+        if regions:
+            duration_s = audio.duration_s if audio is not None else 0.0
+            clip_timestamps = speech_clip_timestamps({"regions": regions, "duration_s": duration_s})
+        return transcribe_audio(
+            audio_path,
+            model_size=model_size,
+            clip_timestamps=clip_timestamps,
+            audio=audio,
+            device=device,
+            compute_type=compute_type,
+            cpu_threads=cpu_threads_per_worker or 0,
+            registry=ModelRegistry(max_models=1, loader=loader) if loader is not None else None,
+            language=language,
+        )
+    if audio is None:
+        audio = load_audio(audio_path)
+
+    started = time.perf_counter()
+    if regions is None:
+        regions = find_speech_regions(audio)
+    max_chunk_s = max(MIN_CHUNK_S, audio.duration_s / (workers * CHUNKS_PER_WORKER))
+    chunks = speech_chunks(regions, audio.duration_s, max_chunk_s=max_chunk_s)
+
+    threads = cpu_threads_per_worker or max(1, (os.cpu_count() or 1) // workers)
+    model_key = (model_size, device, compute_type, int(threads))
+    results: List[ChunkResult] = []
+    if chunks:
+        with shared_audio(audio, DEFAULT_BLOCK_FRAMES) as spec, ProcessPoolExecutor(
+            max_workers=min(workers, len(chunks)),
+            initializer=_init_worker,
+            initargs=(model_key, loader, spec, audio.sample_rate),
+        ) as pool:
+            results = list(pool.map(_transcribe_chunk, [(start, end, language) for start, end in chunks]))
+
+    segments: List[Dict] = []
+    for _language, rows, _load_s in results:
+        for start, end, text in rows:
+            segments.append({"id": len(segments), "start": start, "end": end, "text": text})
+
+    wall_s = time.perf_counter() - started
+    # Workers load their models concurrently, so the slowest load is what the run paid.
+    model_load_s = max((load_s for _language, _rows, load_s in results), default=0.0)
+    chunk_languages = [(result[0], end - start) for result, (start, end) in zip(results, chunks)]
+    return {
+        "audio_path": str(audio_path),
+        "model": model_size,
+        "language": language or _majority_language(chunk_languages),
+        "segments": segments,
+        "timing": {
+            "model_load_s": model_load_s,
+            "transcription_s": max(0.0, wall_s - model_load_s),
+            "workers": workers,
+            "chunks": len(chunks),
+        },
+    }
@@ -1,41 +1,198 @@
+from __future__ import annotations
+
+import json
+import time
 from pathlib import Path
-from typing import Dict, List
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Sequence
+
+from meeting_summarizer.asr.model_registry import (
+    DEFAULT_COMPUTE_TYPE,
+    DEFAULT_CPU_THREADS,
+    DEFAULT_DEVICE,
+    ModelRegistry,
+    default_registry,
+)
+
+if TYPE_CHECKING:
+    from meeting_summarizer.audio.load_audio import AudioBuffer
+
 
-from faster_whisper import WhisperModel
+TRANSCRIPT_JSONL_FILENAME = "transcript.jsonl"
 
 
-def transcribe_audio(audio_path: Path, model_size: str = "small") -> Dict:
+class TranscriptStream:
     """
-    Transcribe an audio file using faster-whisper.
+    Segments from faster-whisper, yielded as they are decoded.
 
-    Returns a dictionary with:
-        - audio_path
-        - model
-        - segments (list of {start, end, text})
+    Constructing the stream loads the model (through `registry`) and starts decoding;
+    faster-whisper detects the language up front and decodes segments lazily. Iterating
+    yields `{id, start, end, text}` dicts. When `jsonl_path` is given, a header line
+    (`audio_path`, `model`, `language`) is written immediately, each segment is appended
+    and flushed as it arrives, and a final `{"timing": ...}` line marks completion, so
+    `load_partial_transcript` can show progress while a long file is still running.
+
+    After iteration, `transcript()` returns the same dict as `transcribe_audio`, with
+    `timing.first_segment_s` (seconds from decode start to the first segment) added.
+    """
+
+    def __init__(
+        self,
+        audio_path: Path,
+        model_size: str = "small",
+        clip_timestamps: Optional[Sequence[float]] = None,
+        audio: Optional["AudioBuffer"] = None,
+        device: str = DEFAULT_DEVICE,
+        compute_type: str = DEFAULT_COMPUTE_TYPE,
+        cpu_threads: int = DEFAULT_CPU_THREADS,
+        registry: Optional[ModelRegistry] = None,
+        jsonl_path: Optional[Path] = None,
+        language: Optional[str] = None,
+    ) -> None:
+        if audio is None and not audio_path.exists():
+            raise FileNotFoundError(f"Audio file not found: {audio_path}")
+
+        self.audio_path = audio_path
+        self.model_size = model_size
+        self.jsonl_path = jsonl_path
+        self.segments: List[Dict] = []
+        self.first_segment_s: Optional[float] = None
+        self.transcription_s: Optional[float] = None
+
+        registry = registry or default_registry()
+        model, self.model_load_s = registry.get(model_size, device, compute_type, cpu_threads)
+
+        options = {}
+        if clip_timestamps:
+            options["clip_timestamps"] = list(clip_timestamps)
+        if language:
+            options["language"] = language
+        source = audio.samples if audio is not None else str(audio_path)
+        self._started = time.perf_counter()
+        self._segments_generator, info = model.transcribe(source, **options)
+        self.language = info.language
+
+        if jsonl_path is not None:
+            jsonl_path.parent.mkdir(parents=True, exist_ok=True)
+            header = {"audio_path": str(audio_path), "model": model_size, "language": self.language}
+            jsonl_path.write_text(json.dumps(header) + "\n", encoding="utf-8")
+
+    def __iter__(self) -> Iterator[Dict]:
+        handle = self.jsonl_path.open("a", encoding="utf-8") if self.jsonl_path is not None else None
+        try:
+            for i, segment in enumerate(self._segments_generator):
+                row = {
+                    "id": i,
+                    "start": segment.start,
+                    "end": segment.end,
+                    "text": segment.text.strip(),
+                }
+                if self.first_segment_s is None:
+                    self.first_segment_s = time.perf_counter() - self._started
+                self.segments.append(row)
+                if handle is not None:
+                    handle.write(json.dumps(row) + "\n")
+                    handle.flush()
+                yield row
+
+            # Segments are decoded lazily, so the clock stops only after the generator is drained.
+            self.transcription_s = time.perf_counter() - self._started
+            if handle is not None:
+                handle.write(json.dumps({"timing": self.timing()}) + "\n")
+        finally:
+            if handle is not None:
+                handle.close()
+
+    def timing(self) -> Dict:
+        return {
+            "model_load_s": self.model_load_s,
+            "transcription_s": self.transcription_s,
+            "first_segment_s": self.first_segment_s,
+        }
+
+    def transcript(self) -> Dict:
+        return {
+            "audio_path": str(self.audio_path),
+            "model": self.model_size,
+            "language": self.language,
+            "segments": self.segments,
+            "timing": self.timing(),
+        }
+
+
+def write_transcript_jsonl(transcript: Dict, jsonl_path: Path) -> None:
+    """Write a finished transcript in the transcript.jsonl layout that `TranscriptStream` produces."""
+    header = {key: transcript.get(key) for key in ("audio_path", "model", "language")}
+    lines = [header, *transcript.get("segments", []), {"timing": transcript.get("timing", {})}]
+    jsonl_path.parent.mkdir(parents=True, exist_ok=True)
+    jsonl_path.write_text("".join(json.dumps(line) + "\n" for line in lines), encoding="utf-8")
+
+
+def load_partial_transcript(jsonl_path: Path) -> Dict:
     """
+    Read a (possibly still growing) transcript.jsonl into the transcript.json format.
 
-    if not audio_path.exists():
-        raise FileNotFoundError(f"Audio file not found: {audio_path}")
+    `complete` is False until the final timing line has been written; a half-written last
+    line is ignored.
+    """
+    transcript: Dict = {"segments": [], "complete": False}
+    for line in jsonl_path.read_text(encoding="utf-8").splitlines():
+        try:
+            record = json.loads(line)
+        except ValueError:
+            break
+        if "timing" in record:
+            transcript["timing"] = record["timing"]
+            transcript["complete"] = True
+        elif "id" in record:
+            transcript["segments"].append(record)
+        else:
+            transcript.update(record)
+    return transcript
 
-    model = WhisperModel(model_size, device="cpu", compute_type="int8")
 
-    segments_generator, info = model.transcribe(str(audio_path))
+def transcribe_audio(
+    audio_path: Path,
+    model_size: str = "small",
+    clip_timestamps: Optional[Sequence[float]] = None,
+    audio: Optional["AudioBuffer"] = None,
+    device: str = DEFAULT_DEVICE,
+    compute_type: str = DEFAULT_COMPUTE_TYPE,
+    cpu_threads: int = DEFAULT_CPU_THREADS,
+    registry: Optional[ModelRegistry] = None,
+    language: Optional[str] = None,
+) -> Dict:
+    """
+    Transcribe an audio file using faster-whisper.
 
-    segments: List[Dict] = []
+    `clip_timestamps` ([start0, end0, start1, end1, ...] in seconds, e.g. from
+    `vad.detect_speech.speech_clip_timestamps`) restricts decoding to those spans
+    so no compute is spent on silence; segment times stay relative to the file.
+    `audio` is the pipeline's decoded 16 kHz buffer; when given, its samples are
+    passed to faster-whisper as-is instead of letting it decode the file again.
+    `language` (e.g. "en") skips language detection; by default it is detected.
 
-    for i, segment in enumerate(segments_generator):
-        segments.append(
-            {
-                "id": i,
-                "start": segment.start,
-                "end": segment.end,
-                "text": segment.text.strip(),
-            }
-        )
+    The model comes from `registry` (default: the process-wide one), so repeated calls
+    with the same settings load it only once. Use `TranscriptStream` to consume
+    segments while decoding is still running.
 
-    return {
-        "audio_path": str(audio_path),
-        "model": model_size,
-        "language": info.language,
-        "segments": segments,
-    }
\ No newline at end of file
+    Returns a dictionary with:
+        - audio_path
+        - model
+        - segments (list of {start, end, text})
+        - timing ({model_load_s, transcription_s, first_segment_s}; load is 0.0 when the
+          model was already loaded)
+    """
+    stream = TranscriptStream(
+        audio_path,
+        model_size=model_size,
+        clip_timestamps=clip_timestamps,
+        audio=audio,
+        device=device,
+        compute_type=compute_type,
+        cpu_threads=cpu_threads,
+        registry=registry,
+        language=language,
+    )
+    for _segment in stream:
+        pass
+    return stream.transcript()
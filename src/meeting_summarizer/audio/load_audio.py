@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import hashlib
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, Optional
+
+import numpy as np
+
+from meeting_summarizer.audio.wav_reader import DEFAULT_BLOCK_FRAMES
+
+# Whisper models expect 16 kHz mono float32; every stage shares that representation.
+AUDIO_SAMPLE_RATE = 16000
+_HASH_CHUNK_BYTES = 1 << 20
+
+
+@dataclass
+class AudioBuffer:
+    """
+    A decoded recording: 16 kHz mono float32 samples, usually memory-mapped from the cache.
+
+    Exposes the same `sample_rate` / `num_frames` / `read` / `iter_blocks` surface as
+    `WavReader` so VAD and prosody can consume either one, and `samples` can be handed to
+    faster-whisper directly.
+    """
+
+    samples: np.ndarray
+    sample_rate: int
+    source_path: Path
+    content_hash: str
+    cache_path: Optional[Path] = None
+    engine: str = "numpy"
+
+    @property
+    def num_frames(self) -> int:
+        return int(len(self.samples))
+
+    @property
+    def duration_s(self) -> float:
+        return self.num_frames / float(self.sample_rate)
+
+    def read(self, start_frame: int, end_frame: int) -> np.ndarray:
+        start = max(0, min(self.num_frames, int(start_frame)))
+        end = max(start, min(self.num_frames, int(end_frame)))
+        return self.samples[start:end]
+
+    def iter_blocks(
+        self, start_frame: int, end_frame: int, block_frames: int = DEFAULT_BLOCK_FRAMES
+    ) -> Iterator[np.ndarray]:
+        start = max(0, min(self.num_frames, int(start_frame)))
+        end = max(start, min(self.num_frames, int(end_frame)))
+        step = max(1, int(block_frames))
+        for block_start in range(start, end, step):
+            yield self.samples[block_start : min(end, block_start + step)]
+
+    def close(self) -> None:
+        """No-op so an `AudioBuffer` can stand in wherever a `WavReader` is closed."""
+
+
+def hash_file(path: Path) -> str:
+    """SHA-256 of the file bytes, read in 1 MB chunks."""
+    digest = hashlib.sha256()
+    with Path(path).open("rb") as handle:
+        for chunk in iter(lambda: handle.read(_HASH_CHUNK_BYTES), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _decode_to_array(audio_path: Path, sample_rate: int) -> np.ndarray:
+    # faster-whisper's decoder (PyAV/FFmpeg) handles any container and resamples for us; it
+    # is the same decoder ASR would otherwise run internally.
+    from faster_whisper import decode_audio
+
+    return np.asarray(decode_audio(str(audio_path), sampling_rate=sample_rate), dtype=np.float32)
+
+
+def load_audio(
+    audio_path: Path,
+    cache_dir: Optional[Path] = None,
+    sample_rate: int = AUDIO_SAMPLE_RATE,
+) -> AudioBuffer:
+    """
+    Decode `audio_path` once to mono float32 at `sample_rate`, caching it as `<sha256>_<rate>.npy`.
+
+    With a `cache_dir`, a later call for identical bytes (any path) memory-maps the cached
+    array instead of decoding, so the returned buffer costs no decode and no copy. Without
+    one, the recording is decoded into memory.
+    """
+    audio_path = Path(audio_path)
+    if not audio_path.exists():
+        raise FileNotFoundError(f"Audio file not found: {audio_path}")
+
+    content_hash = hash_file(audio_path)
+    if cache_dir is None:
+        samples = _decode_to_array(audio_path, sample_rate)
+        return AudioBuffer(samples, sample_rate, audio_path, content_hash)
+
+    cache_path = Path(cache_dir) / f"{content_hash}_{sample_rate}.npy"
+    if not cache_path.exists():
+        samples = _decode_to_array(audio_path, sample_rate)
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_name(f"{cache_path.stem}.{os.getpid()}.tmp.npy")
+        np.save(tmp_path, samples)
+        os.replace(tmp_path, cache_path)
+
+    samples = np.load(cache_path, mmap_mode="r")
+    return AudioBuffer(samples, sample_rate, audio_path, content_hash, cache_path=cache_path)
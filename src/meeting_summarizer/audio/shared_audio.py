@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from multiprocessing import shared_memory
+from typing import TYPE_CHECKING, Iterator, Optional, Tuple
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from meeting_summarizer.audio.load_audio import AudioBuffer
+    from meeting_summarizer.audio.wav_reader import WavReader
+
+# How worker processes reach a decoded recording: ("npy", cache path, num_samples) for an
+# `AudioBuffer` memory-mapped from the audio cache, else ("shm", block name, num_samples).
+SharedAudio = Tuple[str, str, int]
+
+
+def open_shared_audio(spec: SharedAudio) -> Tuple[np.ndarray, Optional[shared_memory.SharedMemory]]:
+    """Worker-side view of `spec`; the SharedMemory handle (if any) must outlive the array."""
+    kind, name, num_samples = spec
+    if kind == "npy":
+        return np.load(name, mmap_mode="r"), None
+    shm = shared_memory.SharedMemory(name=name)
+    return np.ndarray((num_samples,), dtype=np.float32, buffer=shm.buf), shm
+
+
+def _copy_to_shared_memory(reader: "WavReader | AudioBuffer", block_frames: int) -> shared_memory.SharedMemory:
+    shm = shared_memory.SharedMemory(create=True, size=max(1, reader.num_frames) * 4)
+    audio = np.ndarray((reader.num_frames,), dtype=np.float32, buffer=shm.buf)
+    position = 0
+    for block in reader.iter_blocks(0, reader.num_frames, block_frames):
+        audio[position : position + len(block)] = block
+        position += len(block)
+    # A truncated data chunk decodes to fewer frames than the header claims.
+    audio[position:] = 0.0
+    del audio
+    return shm
+
+
+@contextmanager
+def shared_audio(source: "WavReader | AudioBuffer", block_frames: int) -> Iterator[SharedAudio]:
+    """
+    Make `source` readable from worker processes (see `open_shared_audio`). A buffer already
+    memory-mapped from its `.npy` cache file is shared by path (workers map the same pages);
+    anything else is decoded once into a `multiprocessing.shared_memory` block, unlinked on
+    exit.
+    """
+    samples = getattr(source, "samples", None)
+    cache_path = getattr(source, "cache_path", None)
+    if cache_path is not None and isinstance(samples, np.memmap) and samples.dtype == np.float32:
+        yield ("npy", str(cache_path), source.num_frames)
+        return
+    shm = _copy_to_shared_memory(source, block_frames)
+    try:
+        yield ("shm", shm.name, source.num_frames)
+    finally:
+        shm.close()
+        shm.unlink()
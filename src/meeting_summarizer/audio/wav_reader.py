@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import struct
+import wave
+from pathlib import Path
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without numpy installed
+    np = None
+
+# Default read granularity: 2^20 frames is ~65 s of 16 kHz audio (~2 MB of int16 mono).
+DEFAULT_BLOCK_FRAMES = 1 << 20
+
+# Integer dtype and full-scale value per WAV sample width (bytes).
+_NUMPY_PCM_FORMATS = {
+    1: ("<u1", 128.0),
+    2: ("<i2", 32768.0),
+    4: ("<i4", 2147483648.0),
+}
+
+
+def _decode_pcm_bytes_numpy(raw: bytes, sample_width: int, channels: int):
+    """Decode interleaved PCM bytes into a float64 mono array normalized to [-1, 1]."""
+    dtype, max_abs = _NUMPY_PCM_FORMATS[sample_width]
+    ints = np.frombuffer(raw, dtype=dtype).astype(np.float64)
+    if sample_width == 1:
+        ints -= 128.0
+
+    if channels > 1:
+        usable = (len(ints) // channels) * channels
+        ints = ints[:usable].reshape(-1, channels).mean(axis=1)
+
+    return ints / max_abs
+
+
+def _decode_pcm_bytes_python(raw: bytes, sample_width: int, channels: int) -> List[float]:
+    """Pure-Python variant of `_decode_pcm_bytes_numpy` returning a list of floats."""
+    if sample_width == 1:
+        ints = [byte - 128 for byte in raw]
+        max_abs = 128.0
+    elif sample_width == 2:
+        count = len(raw) // 2
+        ints = list(struct.unpack(f"<{count}h", raw[: count * 2]))
+        max_abs = 32768.0
+    else:
+        count = len(raw) // 4
+        ints = list(struct.unpack(f"<{count}i", raw[: count * 4]))
+        max_abs = 2147483648.0
+
+    if channels <= 1:
+        return [value / max_abs for value in ints]
+
+    mono: List[float] = []
+    for idx in range(0, len(ints) - channels + 1, channels):
+        frame = ints[idx : idx + channels]
+        mono.append((sum(frame) / len(frame)) / max_abs)
+    return mono
+
+
+class WavReader:
+    """
+    Random-access reader over a PCM WAV file that decodes only the requested frame ranges.
+
+    Nothing is read at open time besides the header, so memory use is bounded by the size of
+    the ranges (or blocks, via `iter_blocks`) a caller asks for rather than by recording length.
+    `engine` is "numpy" (arrays) or "python" (lists).
+    """
+
+    def __init__(self, audio_path: Path, engine: str = "numpy") -> None:
+        if engine not in {"numpy", "python"}:
+            raise ValueError(f"Unknown WAV reader engine: {engine!r}")
+        self.audio_path = Path(audio_path)
+        self.engine = engine
+        self._wav: Optional[wave.Wave_read] = wave.open(str(self.audio_path), "rb")
+        try:
+            self.channels = self._wav.getnchannels()
+            self.sample_width = self._wav.getsampwidth()
+            self.sample_rate = int(self._wav.getframerate())
+            self.num_frames = int(self._wav.getnframes())
+            if self.sample_width not in _NUMPY_PCM_FORMATS:
+                raise ValueError(f"Unsupported WAV sample width: {self.sample_width} bytes")
+        except Exception:
+            self.close()
+            raise
+
+    def __enter__(self) -> "WavReader":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._wav is not None:
+            self._wav.close()
+            self._wav = None
+
+    def _clamp(self, start_frame: int, end_frame: int) -> Tuple[int, int]:
+        start = max(0, min(self.num_frames, int(start_frame)))
+        end = max(start, min(self.num_frames, int(end_frame)))
+        return start, end
+
+    def read(self, start_frame: int, end_frame: int) -> Sequence[float]:
+        """Return mono samples normalized to [-1, 1] for frames [start_frame, end_frame)."""
+        if self._wav is None:
+            raise ValueError("WavReader is closed")
+        start, end = self._clamp(start_frame, end_frame)
+        if end == start:
+            return np.empty(0, dtype=np.float64) if self.engine == "numpy" else []
+
+        self._wav.setpos(start)
+        raw = self._wav.readframes(end - start)
+        if self.engine == "numpy":
+            return _decode_pcm_bytes_numpy(raw, self.sample_width, self.channels)
+        return _decode_pcm_bytes_python(raw, self.sample_width, self.channels)
+
+    def iter_blocks(
+        self, start_frame: int, end_frame: int, block_frames: int = DEFAULT_BLOCK_FRAMES
+    ) -> Iterator[Sequence[float]]:
+        """Yield consecutive decoded blocks of at most `block_frames` frames covering the range."""
+        start, end = self._clamp(start_frame, end_frame)
+        step = max(1, int(block_frames))
+        for block_start in range(start, end, step):
+            yield self.read(block_start, min(end, block_start + step))
@@ -1,6 +1,12 @@
 from __future__ import annotations
 
-from typing import Dict, List, Optional
+import heapq
+from bisect import bisect_left
+from itertools import chain
+from typing import Dict, List, Optional, Tuple
+
+# Parsed turn: (start, end, original index, turn id, speaker)
+_Turn = Tuple[float, float, int, int, str]
 
 
 def _overlap(a_start: float, a_end: float, b_start: float, b_end: float) -> float:
@@ -8,51 +14,93 @@ def _overlap(a_start: float, a_end: float, b_start: float, b_end: float) -> floa
     return max(0.0, min(a_end, b_end) - max(a_start, b_start))
 
 
+def _parse_segment(idx: int, seg: Dict) -> Tuple[int, float, float, str]:
+    # Some ASR backends may not provide an 'id' per segment; default to index.
+    raw_id = seg.get("id", idx)
+    seg_id = int(raw_id) if raw_id is not None else int(idx)
+
+    start = float(seg.get("start", 0.0))
+    end = float(seg.get("end", start))
+    text = (seg.get("text") or "").strip()
+    return seg_id, start, end, text
+
+
+def _parse_turn(position: int, turn: Dict) -> _Turn:
+    t_start = float(turn.get("start", 0.0))
+    t_end = float(turn.get("end", t_start))
+    return t_start, t_end, position, int(turn.get("id")), str(turn.get("speaker", "UNKNOWN"))
+
+
+def _aligned_row(seg_id: int, start: float, end: float, text: str, best: Optional[_Turn]) -> Dict:
+    out = {
+        "id": seg_id,
+        "start": start,
+        "end": end,
+        "speaker": best[4] if best is not None else "UNKNOWN",
+        "text": text,
+        "asr_segment_id": seg_id,
+    }
+    if best is not None:
+        out["turn_id"] = best[3]
+    return out
+
+
+def _best_turn(start: float, end: float, candidates) -> Optional[_Turn]:
+    """Turn with the largest positive overlap; ties go to the turn listed first."""
+    best: Optional[_Turn] = None
+    best_overlap = 0.0
+    for turn in candidates:
+        ov = _overlap(start, end, turn[0], turn[1])
+        if ov > best_overlap or (ov == best_overlap and best is not None and turn[2] < best[2]):
+            best_overlap = ov
+            best = turn
+    return best if best_overlap > 0.0 else None
+
+
+def align_segment(idx: int, seg: Dict, turns: List[Dict]) -> Dict:
+    """Aligned row for one ASR segment: the speaker of the turn it overlaps most."""
+    seg_id, start, end, text = _parse_segment(idx, seg)
+    parsed = [_parse_turn(position, turn) for position, turn in enumerate(turns)]
+    return _aligned_row(seg_id, start, end, text, _best_turn(start, end, parsed))
+
+
 def align_transcript_with_diarization(transcript: Dict, diarization: Optional[Dict]) -> Dict:
     """
     Create segments.json by assigning each ASR segment a speaker based on max overlap.
     If diarization is None, speaker is UNKNOWN.
+
+    Sort-and-sweep: segments are visited by start time. Turns that started before the
+    current segment sit in an active heap (ordered by end) and leave it once they end before
+    the segment starts; turns starting inside the segment are a slice of the start-sorted
+    turn list found by bisection. Either way each candidate overlaps the segment, so the cost
+    is O((N + M) log M) plus the overlapping pairs, instead of N x M, and a single long
+    segment or turn does not widen the search for the others. Ties on overlap go to the
+    turn listed first in `diarization["turns"]`, as with a plain scan.
     """
     asr_segments = transcript.get("segments", [])
-    turns = (diarization or {}).get("turns", [])
-
-    aligned: List[Dict] = []
-
-    for idx, seg in enumerate(asr_segments):
-        # Some ASR backends may not provide an 'id' per segment; default to index.
-        raw_id = seg.get("id", idx)
-        seg_id = int(raw_id) if raw_id is not None else int(idx)
-
-        start = float(seg.get("start", 0.0))
-        end = float(seg.get("end", start))
-        text = (seg.get("text") or "").strip()
-
-        speaker = "UNKNOWN"
-        best_turn_id = None
-        best_overlap = 0.0
-
-        for turn in turns:
-            t_id = int(turn.get("id"))
-            t_start = float(turn.get("start", 0.0))
-            t_end = float(turn.get("end", t_start))
-            ov = _overlap(start, end, t_start, t_end)
-            if ov > best_overlap:
-                best_overlap = ov
-                best_turn_id = t_id
-                speaker = str(turn.get("speaker", "UNKNOWN"))
-
-        out = {
-            "id": seg_id,
-            "start": start,
-            "end": end,
-            "speaker": speaker,
-            "text": text,
-            "asr_segment_id": seg_id,
-        }
-        if best_turn_id is not None:
-            out["turn_id"] = best_turn_id
-
-        aligned.append(out)
+    raw_turns = (diarization or {}).get("turns", [])
+    if not asr_segments:
+        return {"segments": []}
+
+    parsed_segments = [_parse_segment(idx, seg) for idx, seg in enumerate(asr_segments)]
+    turns = sorted(_parse_turn(position, turn) for position, turn in enumerate(raw_turns))
+    turn_starts = [turn[0] for turn in turns]
+
+    aligned: List[Dict] = [{} for _ in parsed_segments]
+    active: List[Tuple[float, int, _Turn]] = []
+    next_turn = 0
+    for idx in sorted(range(len(parsed_segments)), key=lambda i: parsed_segments[i][1]):
+        seg_id, start, end, text = parsed_segments[idx]
+        while next_turn < len(turns) and turns[next_turn][0] < start:
+            turn = turns[next_turn]
+            heapq.heappush(active, (turn[1], turn[2], turn))
+            next_turn += 1
+        while active and active[0][0] <= start:
+            heapq.heappop(active)
+
+        inside = turns[next_turn : bisect_left(turn_starts, end, lo=next_turn)]
+        best = _best_turn(start, end, chain((entry[2] for entry in active), inside))
+        aligned[idx] = _aligned_row(seg_id, start, end, text, best)
 
     aligned.sort(key=lambda x: (x["start"], x["end"]))
-    return {"segments": aligned}
\ No newline at end of file
+    return {"segments": aligned}
@@ -1,6 +1,21 @@
 from pathlib import Path
 from typing import Dict, List
 
+from meeting_summarizer.io.atomic import write_json_atomic
+
+
+def baseline_turn(index: int, segment: Dict) -> Dict:
+    """The baseline turn for one ASR segment (usable while the transcript is still streaming)."""
+    start = float(segment.get("start", 0.0))
+    end = float(segment.get("end", start))
+    return {
+        "id": index,
+        "speaker": "SPEAKER_0",
+        "start": start,
+        "end": end,
+    }
+
+
 def baseline_diarize_from_transcript(transcript: Dict, output_path: Path) -> Dict:
     """
     Simple baseline diarization stub.
@@ -16,16 +31,7 @@ def baseline_diarize_from_transcript(transcript: Dict, output_path: Path) -> Dic
     speakers = ["SPEAKER_0"]
 
     for i, seg in enumerate(segments):
-        start = float(seg.get("start", 0.0))
-        end = float(seg.get("end", start))
-        turns.append(
-            {
-                "id": i,
-                "speaker": "SPEAKER_0",
-                "start": start,
-                "end": end,
-            }
-        )
+        turns.append(baseline_turn(i, seg))
 
     diarization = {
         "audio_path": audio_path,
@@ -34,10 +40,6 @@ def baseline_diarize_from_transcript(transcript: Dict, output_path: Path) -> Dic
         "turns": turns,
     }
 
-    # ensure output directory exists
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    output_path.write_text(
-        __import__("json").dumps(diarization, indent=2), encoding="utf-8"
-    )
+    write_json_atomic(output_path, diarization)
 
     return diarization
\ No newline at end of file
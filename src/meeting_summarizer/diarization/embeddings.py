@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import math
+from typing import Tuple
+
+import numpy as np
+
+# Log-mel front end (16 kHz speech): 25 ms Hann frames every 10 ms, 40 mel bands.
+MEL_BANDS = 40
+MEL_FMIN_HZ = 60.0
+MEL_FMAX_HZ = 7600.0
+FRAME_S = 0.025
+FRAME_HOP_S = 0.01
+# Speaker embedding windows: stats over 1.5 s of frames, every 0.75 s.
+EMBEDDING_WINDOW_S = 1.5
+EMBEDDING_HOP_S = 0.75
+# Shorter stretches of speech carry too little to embed.
+MIN_EMBEDDING_S = 0.3
+# Frames more than this far (natural-log power, ~26 dB) below the loudest frame of the
+# stretch are pauses or breath and are left out of the statistics.
+ACTIVE_FRAME_RANGE = 6.0
+MIN_ACTIVE_FRAMES = 10
+EMBEDDING_DIM = 2 * MEL_BANDS
+
+_FILTERBANKS = {}
+
+
+def _hz_to_mel(hz):
+    return 2595.0 * np.log10(1.0 + np.asarray(hz, dtype=np.float64) / 700.0)
+
+
+def _mel_to_hz(mel):
+    return 700.0 * (10.0 ** (np.asarray(mel, dtype=np.float64) / 2595.0) - 1.0)
+
+
+def mel_filterbank(sample_rate: int, n_fft: int, n_mels: int = MEL_BANDS) -> np.ndarray:
+    """Triangular (n_mels, n_fft // 2 + 1) filterbank, cached per configuration."""
+    key = (int(sample_rate), int(n_fft), int(n_mels))
+    if key in _FILTERBANKS:
+        return _FILTERBANKS[key]
+    fmax = min(MEL_FMAX_HZ, sample_rate / 2.0)
+    edges = _mel_to_hz(np.linspace(_hz_to_mel(MEL_FMIN_HZ), _hz_to_mel(fmax), n_mels + 2))
+    bins = np.fft.rfftfreq(n_fft, 1.0 / sample_rate)
+    lower, center, upper = edges[:-2, None], edges[1:-1, None], edges[2:, None]
+    rising = (bins - lower) / (center - lower)
+    falling = (upper - bins) / (upper - center)
+    bank = np.maximum(0.0, np.minimum(rising, falling)).astype(np.float32)
+    _FILTERBANKS[key] = bank
+    return bank
+
+
+def frame_params(sample_rate: int) -> Tuple[int, int, int]:
+    """(frame length, hop, FFT size) in samples."""
+    frame = int(round(sample_rate * FRAME_S))
+    hop = int(round(sample_rate * FRAME_HOP_S))
+    return frame, hop, 1 << int(math.ceil(math.log2(frame)))
+
+
+def log_mel_frames(samples, sample_rate: int) -> np.ndarray:
+    """(n_frames, MEL_BANDS) float32 log-mel energies; frame i starts at sample i * hop."""
+    frame, hop, n_fft = frame_params(sample_rate)
+    samples = np.asarray(samples, dtype=np.float32)
+    if len(samples) < frame:
+        return np.empty((0, MEL_BANDS), dtype=np.float32)
+    frames = np.lib.stride_tricks.sliding_window_view(samples, frame)[::hop] * np.hanning(frame).astype(np.float32)
+    power = np.square(np.abs(np.fft.rfft(frames, n=n_fft, axis=1))).astype(np.float32)
+    return np.log(power @ mel_filterbank(sample_rate, n_fft).T + 1e-10).astype(np.float32)
+
+
+def window_embeddings(samples, sample_rate: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Embed a stretch of speech as overlapping windows of log-mel statistics.
+
+    Windows of `EMBEDDING_WINDOW_S` start every `EMBEDDING_HOP_S`; the last one is pulled
+    back to end with the audio, and audio shorter than one window is a single window.
+    Each embedding is the per-band mean and standard deviation over the window's active
+    frames (within `ACTIVE_FRAME_RANGE` of the loudest), read from prefix sums so
+    overlapping windows cost nothing extra; windows with too few active frames are dropped.
+
+    Returns (embeddings (n, EMBEDDING_DIM) float32, window starts s, window ends s), with
+    times relative to the first sample.
+    """
+    empty = (np.empty((0, EMBEDDING_DIM), dtype=np.float32), np.empty(0), np.empty(0))
+    if len(samples) < int(MIN_EMBEDDING_S * sample_rate):
+        return empty
+    frames = log_mel_frames(samples, sample_rate).astype(np.float64)
+    if len(frames) == 0:
+        return empty
+
+    _frame, hop, _n_fft = frame_params(sample_rate)
+    per_window = max(1, int(round(EMBEDDING_WINDOW_S / FRAME_HOP_S)))
+    per_hop = max(1, int(round(EMBEDDING_HOP_S / FRAME_HOP_S)))
+    n_frames = len(frames)
+    if n_frames <= per_window:
+        starts = np.array([0])
+    else:
+        starts = np.arange(0, n_frames - per_window + 1, per_hop)
+        if starts[-1] + per_window < n_frames:
+            starts = np.append(starts, n_frames - per_window)
+    ends = np.minimum(starts + per_window, n_frames)
+
+    # Only loud-enough frames count, so pauses inside a window do not drag its spectrum.
+    frame_energy = np.log(np.sum(np.exp(frames), axis=1))
+    active = (frame_energy >= frame_energy.max() - ACTIVE_FRAME_RANGE).astype(np.float64)
+    zero = np.zeros((1, frames.shape[1]))
+    cumsum = np.concatenate((zero, np.cumsum(frames * active[:, None], axis=0)))
+    cumsum_sq = np.concatenate((zero, np.cumsum(np.square(frames) * active[:, None], axis=0)))
+    active_sum = np.concatenate(([0.0], np.cumsum(active)))
+    counts = (active_sum[ends] - active_sum[starts])[:, None]
+    keep = counts[:, 0] >= min(MIN_ACTIVE_FRAMES, per_window)
+    starts, ends, counts = starts[keep], ends[keep], counts[keep]
+    if len(starts) == 0:
+        return empty
+    mean = (cumsum[ends] - cumsum[starts]) / counts
+    var = np.maximum(0.0, (cumsum_sq[ends] - cumsum_sq[starts]) / counts - np.square(mean))
+    embeddings = np.concatenate((mean, np.sqrt(var)), axis=1).astype(np.float32)
+
+    duration = len(samples) / float(sample_rate)
+    start_s = starts * hop / float(sample_rate)
+    end_s = np.minimum(duration, (ends - 1) * hop / float(sample_rate) + FRAME_S)
+    return embeddings, start_s, end_s
+
+
+def normalize_embeddings(embeddings: np.ndarray, mean: np.ndarray, std: np.ndarray) -> np.ndarray:
+    """Standardize each dimension with the given stats, then scale rows to unit length."""
+    scaled = (np.asarray(embeddings, dtype=np.float64) - mean) / np.maximum(std, 1e-6)
+    norms = np.linalg.norm(scaled, axis=1, keepdims=True)
+    return (scaled / np.maximum(norms, 1e-12)).astype(np.float32)
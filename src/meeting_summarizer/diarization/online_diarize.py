@@ -0,0 +1,465 @@
+from __future__ import annotations
+
+import wave
+from collections import deque
+from pathlib import Path
+from typing import TYPE_CHECKING, Deque, Dict, List, Optional
+
+import numpy as np
+
+from meeting_summarizer.audio.wav_reader import DEFAULT_BLOCK_FRAMES, WavReader
+from meeting_summarizer.diarization.embeddings import (
+    EMBEDDING_HOP_S,
+    EMBEDDING_WINDOW_S,
+    MIN_EMBEDDING_S,
+    window_embeddings,
+)
+from meeting_summarizer.diarization.spectral_diarize import (
+    MAX_SPEAKERS,
+    MERGE_GAP_S,
+    SPEAKER_DISTANCE_THRESHOLD,
+    agglomerate,
+)
+from meeting_summarizer.io.atomic import write_json_atomic
+from meeting_summarizer.vad.detect_speech import (
+    VAD_FRAME_S,
+    VAD_MIN_RMS,
+    VAD_NOISE_FACTOR,
+    frame_rms_zcr,
+)
+
+if TYPE_CHECKING:
+    from meeting_summarizer.audio.load_audio import AudioBuffer
+
+ONLINE_DIARIZATION_METHOD = "logmel_online_v1"
+# A window's label is final once this many later windows have been seen (for smoothing and
+# for a new speaker to prove itself); see `OnlineDiarizer.latency_s`.
+DEFAULT_LOOKAHEAD_WINDOWS = 3
+# Clusters with fewer windows are provisional: their windows are reported as the nearest
+# established speaker until they grow (or are dropped as stale).
+MIN_SPEAKER_WINDOWS = 3
+# Centroids are running means over at most this many windows, so they follow slow drift
+# and their weights stay bounded.
+MAX_CENTROID_WINDOWS = 200
+# Every this many windows, clusters whose centroids have drifted together are merged.
+RECLUSTER_EVERY = 20
+MAX_CLUSTERS = 2 * MAX_SPEAKERS
+# A far-off window that lies (almost) on the line between two established centroids,
+# d(x, a) + d(x, b) <= MIXTURE_SLACK * d(a, b), straddles a speaker change: it is labelled
+# with the nearer speaker but neither starts a cluster nor moves a centroid.
+MIXTURE_SLACK = 1.25
+# A window counts as speech when this share of its 20ms frames is above the VAD threshold.
+# The noise floor is a low percentile of the last NOISE_HISTORY_S seconds of frame energy:
+# lower than the batch VAD's, since a short history may hold only a few pauses. Until
+# NOISE_WARMUP_S of audio has been seen only the absolute VAD_MIN_RMS applies, and the
+# threshold never exceeds LOUD_SHARE of the LOUD_PERCENTILE frame energy, so a history
+# holding nothing but speech (a meeting that opens mid-sentence) does not gate it out.
+MIN_SPEECH_SHARE = 0.3
+NOISE_HISTORY_S = 30.0
+NOISE_PERCENTILE = 2.0
+NOISE_WARMUP_S = 5.0
+LOUD_PERCENTILE = 90.0
+LOUD_SHARE = 0.5
+# What opening or reading a recording can raise; reported as `audio_read_error`.
+_AUDIO_ERRORS = (wave.Error, ValueError, OSError, EOFError)
+
+
+class _Cluster:
+    __slots__ = ("total", "count", "windows", "last_seen", "name", "mixture")
+
+    def __init__(self, embedding: np.ndarray, window: int) -> None:
+        self.total = embedding.astype(np.float64).copy()
+        self.count = 1.0
+        self.windows = 1
+        self.last_seen = window
+        self.name: Optional[str] = None
+        self.mixture = False
+
+    @property
+    def centroid(self) -> np.ndarray:
+        return self.total / self.count
+
+    @property
+    def established(self) -> bool:
+        return self.windows >= MIN_SPEAKER_WINDOWS and not self.mixture
+
+    def add(self, embedding: np.ndarray, window: int) -> None:
+        if self.count >= MAX_CENTROID_WINDOWS:
+            self.total *= (MAX_CENTROID_WINDOWS - 1) / self.count
+            self.count = MAX_CENTROID_WINDOWS - 1.0
+        self.total += embedding
+        self.count += 1.0
+        self.windows += 1
+        self.last_seen = window
+
+
+class OnlineDiarizer:
+    """
+    Incremental speaker diarization for live audio, producing `diarization.json` turns.
+
+    Feed mono float samples with `push_audio`; every `EMBEDDING_HOP_S` of audio yields one
+    1.5 s log-mel window embedding (the same features as `spectral_diarize`), which is
+    assigned to the nearest running speaker centroid, or starts a new cluster when every
+    centroid is further than `threshold`. A window's label is final `lookahead` windows
+    later (`latency_s` after its audio arrived), after a majority vote with its
+    neighbours; `push_audio` returns the turns that closed, `open_turn` is the one in
+    progress and `finish()` flushes the rest and returns the full diarization dict.
+
+    Every `RECLUSTER_EVERY` windows the centroids are re-clustered by average linkage
+    (bounded by `MAX_CLUSTERS`) so speakers split early on can merge, and stale
+    provisional clusters are dropped. Working memory (audio tail, noise history, pending
+    windows, centroids) is constant in meeting length; only the emitted turns grow.
+    """
+
+    def __init__(
+        self,
+        sample_rate: int,
+        audio_path: str = "",
+        threshold: float = SPEAKER_DISTANCE_THRESHOLD,
+        max_speakers: int = MAX_SPEAKERS,
+        lookahead: int = DEFAULT_LOOKAHEAD_WINDOWS,
+    ) -> None:
+        self.sample_rate = int(sample_rate)
+        self.audio_path = str(audio_path)
+        self.threshold = float(threshold)
+        self.max_speakers = int(max_speakers)
+        self.lookahead = max(0, int(lookahead))
+        self.window_size = int(round(EMBEDDING_WINDOW_S * self.sample_rate))
+        self.hop_size = int(round(EMBEDDING_HOP_S * self.sample_rate))
+        self._vad_frame = max(1, int(self.sample_rate * VAD_FRAME_S))
+
+        # _audio[0] is sample _audio_offset; it always starts at the next window's start.
+        self._audio = np.empty(0, dtype=np.float32)
+        self._audio_offset = 0
+        self._samples_received = 0
+        self._noise: Deque[float] = deque(maxlen=int(NOISE_HISTORY_S / VAD_FRAME_S))
+
+        self._windows = 0
+        # Pending windows: [index, own start s, own end s, embedding or None, cluster or None]
+        self._pending: Deque[List] = deque()
+        self._clusters: Dict[int, _Cluster] = {}
+        self._next_cluster = 0
+        self._final_labels: Deque[Optional[int]] = deque(maxlen=1)
+        self._candidate: Optional[List] = None  # [window index, embedding] of the last far-off window
+
+        self._open: Optional[List] = None  # [name, start, end]
+        self._turns: List[Dict] = []
+        self._speakers: List[str] = []
+        self._finished = False
+
+    @property
+    def latency_s(self) -> float:
+        """Longest delay between audio arriving and its speaker label becoming final."""
+        return 0.5 * (EMBEDDING_WINDOW_S + EMBEDDING_HOP_S) + self.lookahead * EMBEDDING_HOP_S
+
+    @property
+    def received_s(self) -> float:
+        return self._samples_received / float(self.sample_rate)
+
+    @property
+    def open_turn(self) -> Optional[Dict]:
+        """The turn still being extended, with labels final up to its current `end`."""
+        if self._open is None:
+            return None
+        name, start, end = self._open
+        return {"speaker": name, "start": start, "end": end}
+
+    # -- input -------------------------------------------------------------------------------
+
+    def push_audio(self, samples) -> List[Dict]:
+        """Add samples; returns the turns that closed as a result."""
+        if self._finished:
+            raise ValueError("OnlineDiarizer is already finished")
+        chunk = np.asarray(samples, dtype=np.float32)
+        if len(chunk) == 0:
+            return []
+        self._audio = np.concatenate((self._audio, chunk))
+        self._samples_received += len(chunk)
+
+        closed: List[Dict] = []
+        position = 0
+        while len(self._audio) - position >= self.window_size:
+            window = self._audio[position : position + self.window_size]
+            self._add_window(window, self._audio_offset + position, self.window_size)
+            position += self.hop_size
+            closed.extend(self._drain(final=False))
+        if position:
+            self._audio = self._audio[position:].copy()
+            self._audio_offset += position
+        return closed
+
+    def finish(self, output_path: Optional[Path] = None) -> Dict:
+        """Embed the remaining audio, finalize every label and return the diarization dict."""
+        if not self._finished:
+            # The tail after the last full window: one shorter window, if long enough.
+            tail_start = self._audio_offset + (self.window_size - self.hop_size if self._windows else 0)
+            if self._samples_received > tail_start and len(self._audio) >= int(MIN_EMBEDDING_S * self.sample_rate):
+                self._add_window(self._audio, self._audio_offset, len(self._audio))
+            self._drain(final=True)
+            self._close_open()
+            self._finished = True
+
+        diarization = {
+            "audio_path": self.audio_path,
+            "method": ONLINE_DIARIZATION_METHOD,
+            "audio_read_error": None,
+            "speakers": list(self._speakers),
+            "turns": list(self._turns),
+        }
+        if output_path is not None:
+            write_json_atomic(output_path, diarization)
+        return diarization
+
+    # -- windows -----------------------------------------------------------------------------
+
+    def _is_speech(self, samples: np.ndarray, new_from: int) -> bool:
+        rms, _zcr = frame_rms_zcr(samples, self._vad_frame)
+        if len(rms) == 0:
+            return False
+        self._noise.extend(rms[new_from // self._vad_frame :].tolist())
+        threshold = VAD_MIN_RMS
+        if len(self._noise) * VAD_FRAME_S >= NOISE_WARMUP_S:
+            history = np.fromiter(self._noise, dtype=np.float64)
+            noise_floor, loud = np.percentile(history, [NOISE_PERCENTILE, LOUD_PERCENTILE])
+            threshold = max(VAD_MIN_RMS, min(float(noise_floor) * VAD_NOISE_FACTOR, LOUD_SHARE * float(loud)))
+        return float(np.mean(rms >= threshold)) >= MIN_SPEECH_SHARE
+
+    def _add_window(self, samples: np.ndarray, offset: int, length: int) -> None:
+        index = self._windows
+        self._windows += 1
+        start_s = offset / float(self.sample_rate)
+        end_s = (offset + length) / float(self.sample_rate)
+        # Each window speaks for the middle hop of its span; the first and last reach the edges.
+        margin = 0.5 * (EMBEDDING_WINDOW_S - EMBEDDING_HOP_S)
+        own_start = start_s if index == 0 else start_s + margin
+        own_end = end_s if length < self.window_size else start_s + margin + EMBEDDING_HOP_S
+        if self._pending and length < self.window_size:
+            own_start = self._pending[-1][2]
+
+        new_from = 0 if index == 0 else max(0, length - self.hop_size)
+        embedding = None
+        cluster = None
+        if self._is_speech(samples[:length], new_from):
+            embeddings, _starts, _ends = window_embeddings(samples[:length], self.sample_rate)
+            if len(embeddings):
+                embedding = embeddings[0].astype(np.float64)
+                cluster = self._assign(embedding, index)
+        self._pending.append([index, own_start, own_end, embedding, cluster])
+
+        if index and index % RECLUSTER_EVERY == 0:
+            self._recluster(index)
+
+    # -- clustering --------------------------------------------------------------------------
+
+    def _distances(self, embedding: np.ndarray, ids: List[int]) -> np.ndarray:
+        centroids = np.array([self._clusters[cid].centroid for cid in ids])
+        return np.sqrt(np.mean(np.square(centroids - embedding), axis=1))
+
+    def _assign(self, embedding: np.ndarray, index: int) -> Optional[int]:
+        """Cluster for a speech window; None while a far-off window waits for the next to confirm it."""
+        ids = list(self._clusters)
+        candidate, self._candidate = self._candidate, None
+        if ids:
+            dist = self._distances(embedding, ids)
+            best = int(np.argmin(dist))
+            if dist[best] <= self.threshold or len(ids) >= MAX_CLUSTERS:
+                cluster = self._clusters[ids[best]]
+                cluster.add(embedding, index)
+                if cluster.windows == MIN_SPEAKER_WINDOWS:
+                    cluster.mixture = self._is_mixture(self._distances(cluster.centroid, ids), ids, exclude=ids[best])
+                return ids[best]
+            if self._is_mixture(dist, ids):
+                return ids[best]
+            # A far-off window only starts a cluster once the next window agrees with it: a
+            # window straddling a speaker change is far from both speakers but, unlike a new
+            # voice, is not followed by another like it.
+            confirmed = (
+                candidate is not None
+                and candidate[0] == index - 1
+                and float(np.sqrt(np.mean(np.square(candidate[1] - embedding)))) <= self.threshold
+            )
+            if not confirmed:
+                self._candidate = [index, embedding]
+                return None
+        cid = self._next_cluster
+        self._next_cluster += 1
+        self._clusters[cid] = _Cluster(embedding, index)
+        if ids:
+            self._clusters[cid].add(candidate[1], index)
+        return cid
+
+    def _is_mixture(self, dist: np.ndarray, ids: List[int], exclude: Optional[int] = None) -> bool:
+        """Whether a point at distances `dist` from clusters `ids` sits between two established ones."""
+        established = [i for i, cid in enumerate(ids) if cid != exclude and self._clusters[cid].established]
+        for a_pos, a in enumerate(established):
+            for b in established[a_pos + 1 :]:
+                between = float(self._distances(self._clusters[ids[a]].centroid, [ids[b]])[0])
+                if dist[a] + dist[b] <= MIXTURE_SLACK * between:
+                    return True
+        return False
+
+    def _established(self) -> List[int]:
+        return [cid for cid, cluster in self._clusters.items() if cluster.established]
+
+    def _recluster(self, index: int) -> None:
+        """
+        Merge clusters that ended up close, drop stale provisional ones, re-check which
+        clusters are speaker-change mixtures and re-assign the pending windows.
+        """
+        horizon = index - self.lookahead - RECLUSTER_EVERY
+        for cid in [cid for cid, c in self._clusters.items() if not c.established and c.last_seen < horizon]:
+            del self._clusters[cid]
+
+        ids = [cid for cid, cluster in self._clusters.items() if not cluster.mixture]
+        if len(ids) > 1:
+            means = np.array([self._clusters[cid].centroid for cid in ids])
+            squared = np.sum(np.square(means), axis=1)
+            gram = squared[:, None] + squared[None, :] - 2.0 * (means @ means.T)
+            dist = np.sqrt(np.maximum(gram, 0.0) / means.shape[1])
+            weights = np.array([self._clusters[cid].windows for cid in ids], dtype=np.float64)
+            labels = agglomerate(dist, weights, threshold=self.threshold, max_speakers=self.max_speakers, min_share=0.0)
+            for group in np.unique(labels):
+                members = [ids[i] for i in np.flatnonzero(labels == group)]
+                # The survivor is the cluster that was named first (or the oldest).
+                members.sort(key=lambda cid: (self._name_rank(self._clusters[cid].name), cid))
+                keep = self._clusters[members[0]]
+                for cid in members[1:]:
+                    other = self._clusters.pop(cid)
+                    keep.total += other.total
+                    keep.count += other.count
+                    keep.windows += other.windows
+                    keep.last_seen = max(keep.last_seen, other.last_seen)
+                    keep.name = keep.name or other.name
+
+        by_size = sorted(self._clusters, key=lambda cid: -self._clusters[cid].windows)
+        for cid in by_size:
+            cluster = self._clusters[cid]
+            if cluster.windows >= MIN_SPEAKER_WINDOWS:
+                cluster.mixture = False
+                cluster.mixture = self._is_mixture(self._distances(cluster.centroid, by_size), by_size, exclude=cid)
+
+        for window in self._pending:
+            if window[3] is not None:
+                window[4] = self._nearest(window[3], list(self._clusters))
+
+    def _name_rank(self, name: Optional[str]) -> int:
+        return self._speakers.index(name) if name in self._speakers else len(self._speakers)
+
+    def _nearest(self, embedding: np.ndarray, ids: List[int]) -> Optional[int]:
+        if not ids:
+            return None
+        return ids[int(np.argmin(self._distances(embedding, ids)))]
+
+    # -- turns -------------------------------------------------------------------------------
+
+    def _final_label(self, position: int) -> Optional[int]:
+        """Label of pending window `position`: majority of it and its neighbours, mapped to an established cluster."""
+        window = self._pending[position]
+        if window[4] is None or window[4] not in self._clusters:
+            if window[3] is None:
+                return None
+            window[4] = self._nearest(window[3], list(self._clusters))
+            if window[4] is None:
+                # Its would-be cluster was dropped before confirmation and no other exists yet.
+                return None
+        votes: Dict[int, int] = {}
+        neighbours = [self._final_labels[-1]] if self._final_labels else []
+        if position + 1 < len(self._pending):
+            neighbours.append(self._pending[position + 1][4])
+        for label in [window[4]] + neighbours:
+            if label is not None and label in self._clusters:
+                votes[label] = votes.get(label, 0) + 1
+        label = window[4]
+        best = max(votes, key=votes.get)
+        if votes[best] > votes.get(label, 0):
+            label = best
+        if not self._clusters[label].established:
+            established = self._established()
+            if established:
+                label = self._nearest(window[3], established)
+        return label
+
+    def _drain(self, final: bool) -> List[Dict]:
+        closed: List[Dict] = []
+        while self._pending and (final or len(self._pending) > self.lookahead):
+            label = self._final_label(0)
+            _index, own_start, own_end, _embedding, _cluster = self._pending.popleft()
+            self._final_labels.append(label)
+            if label is None:
+                if self._open is not None and own_end - self._open[2] > MERGE_GAP_S:
+                    closed.extend(self._close_open())
+                continue
+            name = self._name_for(label)
+            if self._open is not None and self._open[0] == name and own_start - self._open[2] <= MERGE_GAP_S:
+                self._open[2] = own_end
+                continue
+            closed.extend(self._close_open())
+            self._open = [name, own_start, own_end]
+        return closed
+
+    def _name_for(self, label: int) -> str:
+        cluster = self._clusters[label]
+        if cluster.name is None:
+            cluster.name = f"SPEAKER_{len(self._speakers)}"
+            self._speakers.append(cluster.name)
+        return cluster.name
+
+    def _close_open(self) -> List[Dict]:
+        if self._open is None:
+            return []
+        name, start, end = self._open
+        self._open = None
+        turn = {"id": len(self._turns), "speaker": name, "start": float(start), "end": float(end)}
+        self._turns.append(turn)
+        return [turn]
+
+
+def diarize_audio_online(
+    audio_path: Path,
+    output_path: Path,
+    audio: Optional["AudioBuffer"] = None,
+    block_frames: int = DEFAULT_BLOCK_FRAMES,
+    **options,
+) -> Dict:
+    """
+    Run `OnlineDiarizer` over a recording in `block_frames` chunks, as if it were live, and
+    write diarization.json. `options` go to `OnlineDiarizer`. When the audio is missing or
+    unreadable, `turns` is empty and `audio_read_error` explains why.
+    """
+    audio_read_error: Optional[str] = None
+    diarization: Optional[Dict] = None
+
+    if audio is not None or audio_path.exists():
+        try:
+            source = audio if audio is not None else WavReader(audio_path, engine="numpy")
+        except _AUDIO_ERRORS as exc:
+            audio_read_error = str(exc)
+        else:
+            try:
+                diarizer = OnlineDiarizer(source.sample_rate, audio_path=str(audio_path), **options)
+                blocks = source.iter_blocks(0, source.num_frames, block_frames)
+                while True:
+                    try:
+                        block = next(blocks, None)
+                    except _AUDIO_ERRORS as exc:
+                        audio_read_error = str(exc)
+                        break
+                    if block is None:
+                        diarization = diarizer.finish()
+                        break
+                    diarizer.push_audio(block)
+            finally:
+                source.close()
+    else:
+        audio_read_error = f"Audio file not found: {audio_path}"
+
+    if diarization is None:
+        diarization = {
+            "audio_path": str(audio_path),
+            "method": ONLINE_DIARIZATION_METHOD,
+            "audio_read_error": audio_read_error,
+            "speakers": [],
+            "turns": [],
+        }
+    write_json_atomic(output_path, diarization)
+    return diarization
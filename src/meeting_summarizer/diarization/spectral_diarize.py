@@ -0,0 +1,297 @@
+from __future__ import annotations
+
+import wave
+from collections import Counter
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from meeting_summarizer.audio.wav_reader import WavReader
+from meeting_summarizer.diarization.embeddings import normalize_embeddings, window_embeddings
+from meeting_summarizer.io.atomic import write_json_atomic
+from meeting_summarizer.vad.detect_speech import find_speech_regions
+
+if TYPE_CHECKING:
+    from meeting_summarizer.audio.load_audio import AudioBuffer
+
+DIARIZATION_METHOD = "logmel_ahc_v1"
+# Speech regions are embedded in pieces of at most this length, which bounds memory.
+MAX_PIECE_S = 60.0
+# Windows are first grouped into this many k-means micro-clusters; only those go through
+# agglomerative clustering, so memory stays O(n * k) rather than O(n^2).
+MICRO_CLUSTERS = 64
+KMEANS_ITERATIONS = 15
+# Average-linkage distance (RMS difference of the raw log-mel statistics, in nats) above
+# which two clusters are different speakers. Measured on raw features so that a recording
+# with a single voice is not stretched apart by per-recording standardization.
+SPEAKER_DISTANCE_THRESHOLD = 1.0
+MAX_SPEAKERS = 8
+# Clusters holding less than this share of the speech are folded into their nearest
+# neighbour: they are usually windows straddling a speaker change, not a voice.
+MIN_SPEAKER_SHARE = 0.05
+# Window labels are smoothed by a majority vote over this many neighbours on each side.
+SMOOTH_RADIUS = 1
+# Same-speaker turns separated by a shorter gap are merged.
+MERGE_GAP_S = 0.5
+_ASSIGN_BLOCK = 4096
+
+
+def _speech_pieces(regions: Sequence[Dict], max_piece_s: float = MAX_PIECE_S) -> List[Tuple[float, float]]:
+    """Speech regions as (start, end) pieces of at most `max_piece_s` seconds."""
+    pieces: List[Tuple[float, float]] = []
+    for region in regions:
+        start, end = float(region["start"]), float(region["end"])
+        count = max(1, int(np.ceil((end - start) / max_piece_s)))
+        step = (end - start) / count
+        for i in range(count):
+            pieces.append((start + i * step, end if i == count - 1 else start + (i + 1) * step))
+    return pieces
+
+
+def embed_speech(
+    source: "WavReader | AudioBuffer", pieces: Sequence[Tuple[float, float]]
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Window embeddings over all speech pieces: (embeddings, starts s, ends s, piece index)."""
+    blocks, starts, ends, owners = [], [], [], []
+    sample_rate = source.sample_rate
+    for index, (start, end) in enumerate(pieces):
+        left = int(round(start * sample_rate))
+        samples = source.read(left, int(round(end * sample_rate)))
+        embeddings, window_starts, window_ends = window_embeddings(samples, sample_rate)
+        if len(embeddings) == 0:
+            continue
+        offset = left / float(sample_rate)
+        blocks.append(embeddings)
+        starts.append(window_starts + offset)
+        ends.append(window_ends + offset)
+        owners.append(np.full(len(embeddings), index))
+    if not blocks:
+        return np.empty((0, 0), dtype=np.float32), np.empty(0), np.empty(0), np.empty(0, dtype=np.int64)
+    return np.concatenate(blocks), np.concatenate(starts), np.concatenate(ends), np.concatenate(owners)
+
+
+def assign_to_centroids(x: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    """Index of the most similar (unit-length) centroid for each row, in row blocks."""
+    labels = np.empty(len(x), dtype=np.int64)
+    for lo in range(0, len(x), _ASSIGN_BLOCK):
+        labels[lo : lo + _ASSIGN_BLOCK] = np.argmax(x[lo : lo + _ASSIGN_BLOCK] @ centroids.T, axis=1)
+    return labels
+
+
+def _unit_rows(x: np.ndarray) -> np.ndarray:
+    return x / np.maximum(np.linalg.norm(x, axis=1, keepdims=True), 1e-12)
+
+
+def spherical_kmeans(
+    x: np.ndarray, k: int, iterations: int = KMEANS_ITERATIONS, seed: int = 0
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Cosine k-means on unit vectors with k-means++ seeding; returns (centroids, labels)."""
+    rng = np.random.default_rng(seed)
+    k = max(1, min(int(k), len(x)))
+    centroids = [x[rng.integers(len(x))]]
+    closest = 1.0 - x @ centroids[0]
+    for _ in range(1, k):
+        weights = np.maximum(closest, 0.0)
+        total = float(weights.sum())
+        pick = rng.choice(len(x), p=weights / total) if total > 0 else rng.integers(len(x))
+        centroids.append(x[pick])
+        closest = np.minimum(closest, 1.0 - x @ x[pick])
+    centroids = np.array(centroids)
+
+    labels = assign_to_centroids(x, centroids)
+    for _ in range(iterations):
+        sums = np.zeros_like(centroids, dtype=np.float64)
+        np.add.at(sums, labels, x)
+        counts = np.bincount(labels, minlength=len(centroids))
+        updated = np.where(counts[:, None] > 0, _unit_rows(sums), centroids).astype(np.float32)
+        new_labels = assign_to_centroids(x, updated)
+        centroids = updated
+        if np.array_equal(new_labels, labels):
+            break
+        labels = new_labels
+    return centroids, labels
+
+
+def centroid_distances(embeddings: np.ndarray, labels: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    RMS distance between the raw mean embeddings of each of `k` clusters, plus cluster sizes.
+    """
+    sums = np.zeros((k, embeddings.shape[1]), dtype=np.float64)
+    np.add.at(sums, labels, embeddings)
+    counts = np.bincount(labels, minlength=k).astype(np.float64)
+    means = sums / np.maximum(counts, 1.0)[:, None]
+    squared = np.sum(np.square(means), axis=1)
+    gram = squared[:, None] + squared[None, :] - 2.0 * (means @ means.T)
+    return np.sqrt(np.maximum(gram, 0.0) / embeddings.shape[1]), counts
+
+
+def agglomerate(
+    dist: np.ndarray,
+    weights: np.ndarray,
+    num_speakers: Optional[int] = None,
+    threshold: float = SPEAKER_DISTANCE_THRESHOLD,
+    max_speakers: int = MAX_SPEAKERS,
+    min_share: float = MIN_SPEAKER_SHARE,
+) -> np.ndarray:
+    """
+    Weighted average-linkage clustering over a square distance matrix.
+
+    Merges until `num_speakers` clusters remain, or (when it is None) until the closest pair
+    is further apart than `threshold` and at most `max_speakers` remain; clusters weighing
+    less than `min_share` of the total are then merged into their nearest cluster. Returns
+    a cluster index per row.
+    """
+    m = len(dist)
+    members = [[i] for i in range(m)]
+    sizes = np.maximum(np.asarray(weights, dtype=np.float64), 1.0)
+    dist = np.array(dist, dtype=np.float64)
+    np.fill_diagonal(dist, np.inf)
+    alive = m
+    target = max(1, int(num_speakers)) if num_speakers else 1
+
+    def merge(i: int, j: int) -> None:
+        i, j = min(i, j), max(i, j)
+        # Lance-Williams update for size-weighted average linkage.
+        merged = (sizes[i] * dist[i] + sizes[j] * dist[j]) / (sizes[i] + sizes[j])
+        dist[i, :] = merged
+        dist[:, i] = merged
+        dist[i, i] = np.inf
+        dist[j, :] = np.inf
+        dist[:, j] = np.inf
+        sizes[i] += sizes[j]
+        sizes[j] = 0.0
+        members[i].extend(members[j])
+        members[j] = []
+
+    while alive > target:
+        i, j = np.unravel_index(np.argmin(dist), dist.shape)
+        if num_speakers is None and dist[i, j] > threshold and alive <= max_speakers:
+            break
+        merge(int(i), int(j))
+        alive -= 1
+
+    if num_speakers is None:
+        total = float(sizes.sum())
+        while alive > 1:
+            live = np.flatnonzero(sizes > 0)
+            smallest = int(live[np.argmin(sizes[live])])
+            if sizes[smallest] >= min_share * total:
+                break
+            merge(smallest, int(np.argmin(dist[smallest])))
+            alive -= 1
+
+    labels = np.empty(m, dtype=np.int64)
+    for cluster, group in enumerate(group for group in members if group):
+        labels[group] = cluster
+    return labels
+
+
+def _smooth_labels(labels: np.ndarray, owners: np.ndarray, radius: int = SMOOTH_RADIUS) -> np.ndarray:
+    """Majority vote over neighbouring windows of the same speech piece (ties keep the label)."""
+    if radius <= 0:
+        return labels
+    smoothed = labels.copy()
+    for i in range(len(labels)):
+        lo, hi = max(0, i - radius), min(len(labels), i + radius + 1)
+        votes = Counter(int(label) for label, owner in zip(labels[lo:hi], owners[lo:hi]) if owner == owners[i])
+        best, count = votes.most_common(1)[0]
+        if count > votes[int(labels[i])]:
+            smoothed[i] = best
+    return smoothed
+
+
+def _build_turns(
+    labels: np.ndarray,
+    starts: np.ndarray,
+    ends: np.ndarray,
+    owners: np.ndarray,
+    pieces: Sequence[Tuple[float, float]],
+) -> List[Dict]:
+    """
+    Turn list from per-window labels: within a piece, speaker changes fall midway between
+    the centres of the two windows; each piece's first and last turns reach its edges.
+    """
+    raw: List[List] = []
+    centers = 0.5 * (starts + ends)
+    for i in range(len(labels)):
+        piece_start, piece_end = pieces[int(owners[i])]
+        same_piece_prev = i > 0 and owners[i - 1] == owners[i]
+        same_piece_next = i + 1 < len(labels) and owners[i + 1] == owners[i]
+        start = 0.5 * (centers[i - 1] + centers[i]) if same_piece_prev else piece_start
+        end = 0.5 * (centers[i] + centers[i + 1]) if same_piece_next else piece_end
+        label = int(labels[i])
+        if raw and raw[-1][0] == label and start - raw[-1][2] <= MERGE_GAP_S:
+            raw[-1][2] = end
+        else:
+            raw.append([label, start, end])
+    return [{"label": label, "start": float(start), "end": float(end)} for label, start, end in raw]
+
+
+def diarize_audio(
+    audio_path: Path,
+    output_path: Path,
+    audio: Optional["AudioBuffer"] = None,
+    regions: Optional[List[Dict]] = None,
+    num_speakers: Optional[int] = None,
+    threshold: float = SPEAKER_DISTANCE_THRESHOLD,
+) -> Dict:
+    """
+    CPU-only speaker diarization from log-mel statistics, written as diarization.json.
+
+    Speech (VAD `regions`, detected here when not given) is cut into 1.5 s windows every
+    0.75 s and each window is embedded as per-band log-mel mean and std (standardized over
+    the recording, unit length). Windows are grouped into at most `MICRO_CLUSTERS` cosine
+    k-means clusters; only those are merged by average-linkage agglomerative clustering
+    over the distances between their raw mean embeddings, so memory is O(n) in windows.
+    Merging stops at `num_speakers` if known, else once clusters are further apart than
+    `threshold`. Labels are smoothed over neighbouring windows and turned into
+    non-overlapping turns that follow the speech regions.
+
+    Speakers are numbered by first appearance. When the audio is missing or unreadable,
+    `turns` is empty and `audio_read_error` explains why.
+    """
+    turns: List[Dict] = []
+    speakers: List[str] = []
+    audio_read_error: Optional[str] = None
+
+    if audio is not None or audio_path.exists():
+        try:
+            source = audio if audio is not None else WavReader(audio_path, engine="numpy")
+            try:
+                if regions is None:
+                    regions = find_speech_regions(source)
+                pieces = _speech_pieces(regions)
+                embeddings, starts, ends, owners = embed_speech(source, pieces)
+            finally:
+                source.close()
+        except (wave.Error, ValueError, OSError, EOFError) as exc:
+            audio_read_error = str(exc)
+            embeddings = np.empty((0, 0), dtype=np.float32)
+    else:
+        audio_read_error = f"Audio file not found: {audio_path}"
+        embeddings = np.empty((0, 0), dtype=np.float32)
+
+    if len(embeddings):
+        x = normalize_embeddings(embeddings, embeddings.mean(axis=0), embeddings.std(axis=0))
+        centroids, micro = spherical_kmeans(x, MICRO_CLUSTERS)
+        dist, weights = centroid_distances(embeddings, micro, len(centroids))
+        speaker_of_micro = agglomerate(dist, weights, num_speakers=num_speakers, threshold=threshold)
+        labels = _smooth_labels(speaker_of_micro[micro], owners)
+
+        names: Dict[int, str] = {}
+        for row in _build_turns(labels, starts, ends, owners, pieces):
+            if row["label"] not in names:
+                names[row["label"]] = f"SPEAKER_{len(names)}"
+            turns.append({"id": len(turns), "speaker": names[row["label"]], "start": row["start"], "end": row["end"]})
+        speakers = list(names.values())
+
+    diarization = {
+        "audio_path": str(audio_path),
+        "method": DIARIZATION_METHOD,
+        "audio_read_error": audio_read_error,
+        "speakers": speakers,
+        "turns": turns,
+    }
+    write_json_atomic(output_path, diarization)
+    return diarization
@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import Any
+
+
+def write_text_atomic(path: Path, text: str) -> None:
+    """
+    Write `text` to `path` so readers see either the old file or the complete new one:
+    the data goes to a temporary file in the same directory, is flushed to disk, and is
+    then renamed over `path` (a crash leaves at most a stray `.<name>.<pid>.tmp`).
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        with tmp_path.open("w", encoding="utf-8") as handle:
+            handle.write(text)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def write_json_atomic(path: Path, data: Any, indent: int = 2) -> None:
+    """`json.dumps(data, indent=indent)` written with `write_text_atomic`."""
+    write_text_atomic(path, json.dumps(data, indent=indent))
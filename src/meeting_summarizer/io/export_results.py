@@ -0,0 +1,305 @@
+from __future__ import annotations
+
+import json
+import os
+import shutil
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+COLUMNAR_FORMAT = "meeting_columns_v1"
+HEADER_FILENAME = "header.json"
+COLUMNAR_SUFFIX = ".cols"
+# Per-row list inside each artifact that becomes the columnar table; the rest of the
+# document (method, speaker stats, transitions, ...) is kept verbatim in the header.
+ARTIFACT_TABLES: Dict[str, Tuple[str, ...]] = {
+    "segments.json": ("segments",),
+    "prosody.json": ("features",),
+    "prosody_model.json": ("sequence", "observations"),
+    "prosody_hmm.json": ("sequence", "observations"),
+}
+# String columns with at most this share of distinct values are dictionary-encoded.
+CATEGORY_MAX_RATIO = 0.5
+
+# Column kinds: "int" (int64), "float" (float64), "bool", "category" (codes into a
+# header dictionary), "string" (UTF-8 bytes + offsets) and "json" (JSON text per row,
+# for nested values such as word lists). Nulls are kept in a separate boolean mask.
+
+
+def columnar_path(json_path: Path) -> Path:
+    """Where the columnar copy of an artifact lives: prosody.json -> prosody.cols/."""
+    return json_path.with_suffix(COLUMNAR_SUFFIX)
+
+
+def _column_kind(values: Sequence[Any]) -> str:
+    present = [value for value in values if value is not None]
+    if not present:
+        return "float"
+    if all(isinstance(value, bool) for value in present):
+        return "bool"
+    if all(isinstance(value, int) and not isinstance(value, bool) for value in present):
+        return "int"
+    if all(isinstance(value, (int, float)) and not isinstance(value, bool) for value in present):
+        return "float"
+    if all(isinstance(value, str) for value in present):
+        distinct = len(set(present))
+        return "category" if distinct <= max(1, CATEGORY_MAX_RATIO * len(values)) else "string"
+    return "json"
+
+
+def _codes_dtype(count: int) -> np.dtype:
+    if count < 2**8:
+        return np.dtype(np.uint8)
+    if count < 2**16:
+        return np.dtype(np.uint16)
+    return np.dtype(np.uint32)
+
+
+def _write_text_column(directory: Path, name: str, texts: Iterable[str]) -> None:
+    """Arrow-style variable-length strings: concatenated UTF-8 bytes plus n + 1 offsets."""
+    encoded = [text.encode("utf-8") for text in texts]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum(np.array([len(chunk) for chunk in encoded], dtype=np.int64), out=offsets[1:])
+    np.save(directory / f"{name}.offsets.npy", offsets)
+    np.save(directory / f"{name}.npy", np.frombuffer(b"".join(encoded), dtype=np.uint8))
+
+
+def write_columns(
+    rows: Sequence[Dict],
+    directory: Path,
+    meta: Optional[Dict] = None,
+    table: str = "rows",
+    source: Optional[Dict] = None,
+) -> Dict:
+    """
+    Write `rows` (a list of flat dicts, as in prosody.json's `features`) as one .npy file
+    per column in `directory`, plus header.json with the column kinds, row count, `meta`
+    (any other JSON content to keep next to the table) and `source` (what the table was
+    built from, if given). Returns the header.
+    """
+    names: List[str] = []
+    for row in rows:
+        for key in row:
+            if key not in names:
+                names.append(key)
+
+    # Built in a side directory and swapped in, so readers never see a half-written table.
+    staging = directory.with_name(f".{directory.name}.{os.getpid()}.tmp")
+    if staging.exists():
+        shutil.rmtree(staging)
+    staging.mkdir(parents=True)
+    columns = []
+    for index, name in enumerate(names):
+        values = [row.get(name) for row in rows]
+        kind = _column_kind(values)
+        stem = f"c{index}"
+        nulls = np.array([value is None for value in values], dtype=bool)
+        column: Dict[str, Any] = {"name": name, "kind": kind, "file": stem, "nulls": bool(nulls.any())}
+        # Rows missing the key entirely are told apart from explicit nulls when rebuilding.
+        missing = [row_index for row_index, row in enumerate(rows) if name not in row]
+        if missing:
+            column["missing_rows"] = missing
+
+        if kind == "int":
+            np.save(staging / f"{stem}.npy", np.array([value or 0 for value in values], dtype=np.int64))
+        elif kind == "float":
+            data = np.array([np.nan if value is None else value for value in values], dtype=np.float64)
+            np.save(staging / f"{stem}.npy", data)
+        elif kind == "bool":
+            np.save(staging / f"{stem}.npy", np.array([bool(value) for value in values], dtype=bool))
+        elif kind == "category":
+            categories = sorted({value for value in values if value is not None})
+            lookup = {value: code for code, value in enumerate(categories)}
+            codes = np.array([lookup.get(value, 0) for value in values], dtype=_codes_dtype(len(categories)))
+            np.save(staging / f"{stem}.npy", codes)
+            column["categories"] = categories
+        elif kind == "string":
+            _write_text_column(staging, stem, ("" if value is None else value for value in values))
+        else:
+            _write_text_column(staging, stem, ("" if value is None else json.dumps(value) for value in values))
+        if column["nulls"]:
+            np.save(staging / f"{stem}.nulls.npy", nulls)
+        columns.append(column)
+
+    header = {
+        "format": COLUMNAR_FORMAT,
+        "table": table,
+        "rows": len(rows),
+        "columns": columns,
+        "meta": meta or {},
+    }
+    if source is not None:
+        header["source"] = source
+    (staging / HEADER_FILENAME).write_text(json.dumps(header, indent=2), encoding="utf-8")
+    if directory.exists():
+        shutil.rmtree(directory)
+    os.replace(staging, directory)
+    return header
+
+
+class ColumnarTable:
+    """
+    Lazy reader for a `write_columns` directory.
+
+    Column files are memory-mapped on first use, so reading one column, or a row range of
+    a few columns, touches only those bytes of the table. Numeric columns come back as
+    numpy arrays (nulls as NaN in float columns, see `nulls`); string, category and JSON
+    columns come back as lists with None for nulls.
+    """
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = Path(directory)
+        self.header = json.loads((self.directory / HEADER_FILENAME).read_text(encoding="utf-8"))
+        if self.header.get("format") != COLUMNAR_FORMAT:
+            raise ValueError(f"{self.directory} is not a {COLUMNAR_FORMAT} table")
+        self._columns = {column["name"]: column for column in self.header["columns"]}
+        self._arrays: Dict[str, np.ndarray] = {}
+
+    @property
+    def num_rows(self) -> int:
+        return int(self.header["rows"])
+
+    @property
+    def column_names(self) -> List[str]:
+        return [column["name"] for column in self.header["columns"]]
+
+    @property
+    def meta(self) -> Dict:
+        return self.header["meta"]
+
+    def _array(self, filename: str) -> np.ndarray:
+        if filename not in self._arrays:
+            self._arrays[filename] = np.load(self.directory / filename, mmap_mode="r")
+        return self._arrays[filename]
+
+    def _spec(self, name: str) -> Dict:
+        if name not in self._columns:
+            raise KeyError(f"No column {name!r} in {self.directory}")
+        return self._columns[name]
+
+    def _bounds(self, start: int, stop: Optional[int]) -> Tuple[int, int]:
+        start, stop, _step = slice(start, stop).indices(self.num_rows)
+        return start, max(start, stop)
+
+    def nulls(self, name: str, start: int = 0, stop: Optional[int] = None) -> np.ndarray:
+        """Boolean mask of null values in rows [start, stop) of a column."""
+        spec = self._spec(name)
+        start, stop = self._bounds(start, stop)
+        if not spec["nulls"]:
+            return np.zeros(stop - start, dtype=bool)
+        return np.asarray(self._array(f"{spec['file']}.nulls.npy")[start:stop])
+
+    def column(self, name: str, start: int = 0, stop: Optional[int] = None):
+        """Rows [start, stop) of one column (a numpy array, or a list for text kinds)."""
+        spec = self._spec(name)
+        start, stop = self._bounds(start, stop)
+        kind = spec["kind"]
+        if kind in ("int", "float", "bool"):
+            return np.asarray(self._array(f"{spec['file']}.npy")[start:stop])
+
+        null_mask = self.nulls(name, start, stop)
+        if kind == "category":
+            categories = spec["categories"]
+            codes = self._array(f"{spec['file']}.npy")[start:stop]
+            return [None if is_null else categories[code] for code, is_null in zip(codes.tolist(), null_mask)]
+
+        offsets = np.asarray(self._array(f"{spec['file']}.offsets.npy")[start : stop + 1])
+        if len(offsets) == 0:
+            return []
+        blob = bytes(self._array(f"{spec['file']}.npy")[offsets[0] : offsets[-1]])
+        relative = (offsets - offsets[0]).tolist()
+        texts = [blob[begin:end].decode("utf-8") for begin, end in zip(relative, relative[1:])]
+        if kind == "json":
+            return [None if is_null else json.loads(text) for text, is_null in zip(texts, null_mask)]
+        return [None if is_null else text for text, is_null in zip(texts, null_mask)]
+
+    def rows(self, start: int = 0, stop: Optional[int] = None, columns: Optional[Sequence[str]] = None) -> List[Dict]:
+        """Rows [start, stop) as JSON-style dicts (None for nulls), limited to `columns` if given."""
+        start, stop = self._bounds(start, stop)
+        names = list(columns) if columns is not None else self.column_names
+        values: Dict[str, List] = {}
+        for name in names:
+            data = self.column(name, start, stop)
+            if isinstance(data, np.ndarray):
+                data = data.tolist()
+                null_mask = self.nulls(name, start, stop)
+                if null_mask.any():
+                    data = [None if is_null else value for value, is_null in zip(data, null_mask)]
+            values[name] = data
+
+        rows = [dict(zip(names, row_values)) for row_values in zip(*(values[name] for name in names))]
+        if not names:
+            rows = [{} for _ in range(stop - start)]
+        for name in names:
+            for row in self._spec(name).get("missing_rows", []):
+                if start <= row < stop:
+                    del rows[row - start][name]
+        return rows
+
+
+def export_artifact(json_path: Path, output_dir: Optional[Path] = None) -> Optional[Path]:
+    """
+    Write the columnar copy of one run artifact (see ARTIFACT_TABLES) next to it, or in
+    `output_dir`. The JSON file stays the source of truth; the header records its size
+    and mtime so readers can tell when the copy is stale. Returns None for unknown files.
+    """
+    table_path = ARTIFACT_TABLES.get(json_path.name)
+    if table_path is None or not json_path.exists():
+        return None
+    document = json.loads(json_path.read_text(encoding="utf-8"))
+
+    meta = json.loads(json.dumps(document))
+    parent = meta
+    for key in table_path[:-1]:
+        parent = parent.setdefault(key, {})
+    rows = parent.pop(table_path[-1], [])
+
+    directory = (output_dir or json_path.parent) / columnar_path(json_path).name
+    stat = json_path.stat()
+    source = {"name": json_path.name, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+    write_columns(rows, directory, meta=meta, table=".".join(table_path), source=source)
+    return directory
+
+
+def export_run(output_dir: Path) -> List[Path]:
+    """Columnar copies of every ARTIFACT_TABLES file present in a run directory."""
+    written = []
+    for name in ARTIFACT_TABLES:
+        directory = export_artifact(output_dir / name)
+        if directory is not None:
+            written.append(directory)
+    return written
+
+
+def open_artifact(json_path: Path) -> Optional[ColumnarTable]:
+    """The columnar copy of `json_path` if it exists and matches the JSON file, else None."""
+    directory = columnar_path(json_path)
+    if not (directory / HEADER_FILENAME).exists() or not json_path.exists():
+        return None
+    table = ColumnarTable(directory)
+    source = table.header.get("source", {})
+    stat = json_path.stat()
+    if source.get("size") != stat.st_size or source.get("mtime_ns") != stat.st_mtime_ns:
+        return None
+    return table
+
+
+def load_artifact(json_path: Path) -> Optional[Dict]:
+    """
+    The full artifact document, rebuilt from its columnar copy when that is current and
+    parsed from JSON otherwise (None if neither exists).
+    """
+    table = open_artifact(json_path)
+    if table is None:
+        if not json_path.exists():
+            return None
+        return json.loads(json_path.read_text(encoding="utf-8"))
+
+    document = json.loads(json.dumps(table.meta))
+    parent = document
+    keys = table.header["table"].split(".")
+    for key in keys[:-1]:
+        parent = parent.setdefault(key, {})
+    parent[keys[-1]] = table.rows()
+    return document
@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import hashlib
+import importlib
+import json
+from datetime import datetime, timezone
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Optional, Sequence
+
+from meeting_summarizer.io.atomic import write_json_atomic
+
+PIPELINE_VERSION = "0.1"
+MANIFEST_FILENAME = "metadata.json"
+_HASH_BLOCK_BYTES = 1 << 20
+
+
+def file_sha256(path: Path) -> Optional[str]:
+    """Hex SHA-256 of a file's bytes, or None if it does not exist."""
+    digest = hashlib.sha256()
+    try:
+        with path.open("rb") as handle:
+            for block in iter(lambda: handle.read(_HASH_BLOCK_BYTES), b""):
+                digest.update(block)
+    except FileNotFoundError:
+        return None
+    return digest.hexdigest()
+
+
+def json_sha256(data) -> str:
+    """Hex SHA-256 of a JSON value in canonical form (sorted keys, no whitespace)."""
+    return hashlib.sha256(json.dumps(data, sort_keys=True, separators=(",", ":")).encode("utf-8")).hexdigest()
+
+
+@lru_cache(maxsize=None)
+def _source_sha256(filename: str) -> str:
+    return file_sha256(Path(filename)) or ""
+
+
+def code_version(modules: Sequence[str]) -> str:
+    """
+    Version tag for the code behind a stage: PIPELINE_VERSION plus a hash of the source
+    files of the named `modules`, so editing a stage's implementation invalidates its
+    old outputs.
+    """
+    digest = hashlib.sha256(PIPELINE_VERSION.encode("utf-8"))
+    for name in modules:
+        filename = getattr(importlib.import_module(name), "__file__", None) or ""
+        digest.update(_source_sha256(filename).encode("utf-8"))
+    return f"{PIPELINE_VERSION}+{digest.hexdigest()[:16]}"
+
+
+def _utc_now() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+class StageManifest:
+    """
+    Per-run record of how each pipeline stage produced its outputs, kept in metadata.json.
+
+    Each stage entry stores the hashes of its inputs, its parameters, its code version
+    and the SHA-256 of every output file. `is_current` is true only when all of those
+    match and the outputs are still on disk unchanged, so the pipeline can reuse them
+    instead of recomputing; anything else (a changed upstream artifact, a new parameter,
+    edited code, a missing or modified output) re-runs the stage. The manifest is saved
+    atomically after every recorded stage, so a crash keeps the stages finished so far.
+    """
+
+    def __init__(self, output_dir: Path) -> None:
+        self.output_dir = output_dir
+        self.path = output_dir / MANIFEST_FILENAME
+        self.data: Dict = {}
+        try:
+            self.data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            self.data = {}
+        if not isinstance(self.data.get("stages"), dict):
+            self.data["stages"] = {}
+        self.data.setdefault("created_utc", _utc_now())
+        self.data["pipeline_version"] = PIPELINE_VERSION
+        self._hashes: Dict[str, Optional[str]] = {}
+
+    @property
+    def stages(self) -> Dict[str, Dict]:
+        return self.data["stages"]
+
+    def output_hash(self, path: Path) -> Optional[str]:
+        """SHA-256 of an output file, computed once per run (None if missing)."""
+        key = str(path)
+        if key not in self._hashes:
+            self._hashes[key] = file_sha256(path)
+        return self._hashes[key]
+
+    def _relative(self, path: Path) -> str:
+        try:
+            return str(path.relative_to(self.output_dir))
+        except ValueError:
+            return str(path)
+
+    def is_current(self, stage: str, inputs: Dict, params: Dict, code: str) -> bool:
+        entry = self.stages.get(stage)
+        if not entry:
+            return False
+        if entry.get("code_version") != code:
+            return False
+        if entry.get("inputs") != json.loads(json.dumps(inputs)) or entry.get("params") != json.loads(json.dumps(params)):
+            return False
+        for name, digest in entry.get("outputs", {}).items():
+            if digest is None or self.output_hash(self.output_dir / name) != digest:
+                return False
+        return True
+
+    def record(
+        self,
+        stage: str,
+        inputs: Dict,
+        params: Dict,
+        code: str,
+        outputs: Sequence[Path],
+        elapsed_s: float,
+    ) -> None:
+        """Store a finished stage that took `elapsed_s` seconds and save the manifest."""
+        hashes = {}
+        for path in outputs:
+            self._hashes.pop(str(path), None)
+            hashes[self._relative(path)] = self.output_hash(path)
+        self.stages[stage] = {
+            "inputs": json.loads(json.dumps(inputs)),
+            "params": json.loads(json.dumps(params)),
+            "code_version": code,
+            "outputs": hashes,
+            "elapsed_s": elapsed_s,
+            "completed_utc": _utc_now(),
+        }
+        self.save()
+
+    def update(self, **fields) -> None:
+        """Set top-level metadata fields (audio_path, asr, diarization, ...)."""
+        self.data.update(fields)
+
+    def save(self) -> None:
+        self.data["updated_utc"] = _utc_now()
+        write_json_atomic(self.path, self.data)
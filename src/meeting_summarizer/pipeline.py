@@ -1,79 +1,532 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Sequence, Tuple, TypeVar
 import json
+import time
 
-from meeting_summarizer.asr.transcribe import transcribe_audio
-from meeting_summarizer.diarization.diarize import baseline_diarize_from_transcript
-from meeting_summarizer.diarization.align import align_transcript_with_diarization
-from meeting_summarizer.prosody.extract_prosody import extract_prosody_features
+from meeting_summarizer.asr.cache import TranscriptCache, transcript_cache_key
+from meeting_summarizer.asr.parallel_transcribe import transcribe_parallel
+from meeting_summarizer.asr.transcribe import (
+    TRANSCRIPT_JSONL_FILENAME,
+    TranscriptStream,
+    transcribe_audio,
+    write_transcript_jsonl,
+)
+from meeting_summarizer.audio.load_audio import load_audio
+from meeting_summarizer.diarization.diarize import baseline_diarize_from_transcript, baseline_turn
+from meeting_summarizer.diarization.align import align_segment, align_transcript_with_diarization
+from meeting_summarizer.diarization.online_diarize import diarize_audio_online
+from meeting_summarizer.diarization.spectral_diarize import diarize_audio
+from meeting_summarizer.io.atomic import write_json_atomic, write_text_atomic
+from meeting_summarizer.io.export_results import ARTIFACT_TABLES, HEADER_FILENAME, columnar_path, export_run
+from meeting_summarizer.io.manifest import StageManifest, code_version, file_sha256, json_sha256
+from meeting_summarizer.prosody.corpus_stats import update_corpus_stats
+from meeting_summarizer.prosody.extract_prosody import _segment_sample_bounds, extract_prosody_features
+from meeting_summarizer.prosody.hmm import GaussianHMM, build_prosody_hmm
+from meeting_summarizer.prosody.streaming import StreamingProsodyExtractor
 from meeting_summarizer.prosody.model_sequence import build_prosody_sequence_model
+from meeting_summarizer.search.index import update_search_index
 from meeting_summarizer.summarization.summarize import summarize_segments
+from meeting_summarizer.topics.segment_topics import segment_topics
+from meeting_summarizer.vad.detect_speech import detect_speech_regions, speech_clip_timestamps
+
+if TYPE_CHECKING:
+    from meeting_summarizer.audio.load_audio import AudioBuffer
+
+# "baseline": one speaker per transcript; "spectral": log-mel embeddings + clustering;
+# "online": the same embeddings clustered incrementally, as for live audio.
+DIARIZERS = ("baseline", "spectral", "online")
+
+# Modules whose source makes up each stage's code version in metadata.json: editing one
+# re-runs that stage (and, through changed outputs, everything downstream of it).
+STAGE_MODULES: Dict[str, Tuple[str, ...]] = {
+    "vad": ("meeting_summarizer.vad.detect_speech",),
+    "asr": (
+        "meeting_summarizer.asr.transcribe",
+        "meeting_summarizer.asr.parallel_transcribe",
+        "meeting_summarizer.prosody.streaming",
+    ),
+    "diarization": (
+        "meeting_summarizer.diarization.diarize",
+        "meeting_summarizer.diarization.embeddings",
+        "meeting_summarizer.diarization.spectral_diarize",
+        "meeting_summarizer.diarization.online_diarize",
+    ),
+    "alignment": ("meeting_summarizer.diarization.align",),
+    "prosody": (
+        "meeting_summarizer.prosody.extract_prosody",
+        "meeting_summarizer.prosody.energy_envelope",
+        "meeting_summarizer.prosody.pitch",
+        "meeting_summarizer.prosody.parallel",
+        "meeting_summarizer.prosody.streaming",
+    ),
+    "prosody_model": ("meeting_summarizer.prosody.model_sequence",),
+    "prosody_hmm": ("meeting_summarizer.prosody.hmm",),
+    "topics": ("meeting_summarizer.topics.segment_topics",),
+    "summary": ("meeting_summarizer.summarization.summarize", "meeting_summarizer.topics.segment_topics"),
+    "columnar": ("meeting_summarizer.io.export_results",),
+}
+
+T = TypeVar("T")
+
 
 @dataclass
 class PipelineResult:
     output_dir: Path
     summary_text: str
+    asr_cache: Optional[str] = None  # "hit", "miss", or None when the cache was not consulted
+    reused_stages: List[str] = field(default_factory=list)  # stages whose previous outputs were kept
+    corpus_stats: Optional[str] = None  # "added", "skipped" (meeting already in it), or None when unused
+
+
+def _read_json(path: Path) -> Dict:
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+class _StageRunner:
+    """Runs stages through the run's StageManifest: reuse current outputs, else compute and record."""
 
-def run_pipeline(input_path: Path, output_dir: Path, enable_engagement: bool = False, run_asr: bool = True) -> PipelineResult:
+    def __init__(self, manifest: StageManifest, reuse: bool) -> None:
+        self.manifest = manifest
+        self.reuse = reuse
+        self.reused: List[str] = []
+
+    def digest(self, path: Path) -> Optional[str]:
+        return self.manifest.output_hash(path)
+
+    def run(
+        self,
+        name: str,
+        inputs: Dict,
+        params: Dict,
+        outputs: Sequence[Path],
+        compute: Callable[[], T],
+        load: Callable[[], T],
+    ) -> T:
+        code = code_version(STAGE_MODULES[name])
+        if self.reuse and self.manifest.is_current(name, inputs, params, code):
+            self.reused.append(name)
+            return load()
+        began = time.perf_counter()
+        value = compute()
+        self.manifest.record(name, inputs, params, code, outputs, time.perf_counter() - began)
+        return value
+
+    def record(self, name: str, inputs: Dict, params: Dict, outputs: Sequence[Path], elapsed_s: float) -> None:
+        """Record a stage whose outputs were produced elsewhere (e.g. prosody streamed during ASR)."""
+        self.manifest.record(name, inputs, params, code_version(STAGE_MODULES[name]), outputs, elapsed_s)
+
+
+def _stream_asr(
+    input_path: Path,
+    output_dir: Path,
+    asr_options: Dict,
+    audio: Optional["AudioBuffer"],
+    extract_pitch: bool,
+    vad: Optional[Dict],
+) -> Tuple[Dict, Optional[Dict]]:
+    """
+    Transcribe with `TranscriptStream`, appending segments to transcript.jsonl as they are
+    decoded and aligning + scoring each one for prosody right away.
+
+    Returns the transcript and the streamed prosody dict, or None for prosody when it has
+    to be computed in batch afterwards (no decoded audio, VAD pauses, or segments that
+    arrive out of order).
     """
-    Minimal scaffold for the meeting understanding pipeline.
-
-    Later, each stage will call into:
-      - diarization/
-      - asr/
-      - prosody/
-      - topics/
-      - summarization/
+    stream = TranscriptStream(input_path, jsonl_path=output_dir / TRANSCRIPT_JSONL_FILENAME, **asr_options)
+    extractor = None
+    if audio is not None and vad is None:
+        extractor = StreamingProsodyExtractor(audio.sample_rate, audio_path=str(input_path), extract_pitch=extract_pitch)
+
+    fed = 0
+    for index, segment in enumerate(stream):
+        if extractor is None:
+            continue
+        row = align_segment(index, segment, [baseline_turn(index, segment)])
+        # Feed audio through the end of the 20ms frame holding the segment's last sample,
+        # so every frame the extractor scores is complete, exactly as in batch.
+        _left, right = _segment_sample_bounds(row["start"], row["end"], audio.sample_rate, audio.num_frames)
+        target = min(audio.num_frames, -(-right // extractor.window_size) * extractor.window_size)
+        try:
+            if target > fed:
+                extractor.push_audio(audio.samples[fed:target])
+                fed = target
+            extractor.push_segment(row)
+        except ValueError:
+            extractor = None
+
+    transcript = stream.transcript()
+    if extractor is None:
+        return transcript, None
+    return transcript, extractor.finish(output_dir / "prosody.json")
+
+
+def _transcribe(
+    input_path: Path,
+    output_dir: Path,
+    audio: Optional["AudioBuffer"],
+    vad: Optional[Dict],
+    clip_timestamps: Optional[List[float]],
+    asr_model: str,
+    asr_workers: int,
+    stream_asr: bool,
+    asr_cache_dir: Optional[Path],
+    use_asr_cache: bool,
+    diarizer: str,
+    extract_pitch: bool,
+) -> Tuple[Dict, Optional[Dict], Optional[str]]:
+    """
+    Run ASR (through the transcript cache when possible) and write transcript.json.
+
+    Returns the transcript, the prosody dict when it was streamed alongside ASR (else
+    None), and the transcript cache status ("hit", "miss", or None when not consulted).
+    """
+    asr_options = {"model_size": asr_model}
+    if audio is not None:
+        asr_options["audio"] = audio
+    if clip_timestamps is not None:
+        asr_options["clip_timestamps"] = clip_timestamps
+    prosody = None
+    asr_cache_status = None
+    cache = None
+    cache_key = None
+    transcript = None
+    if use_asr_cache and audio is not None:
+        cache = TranscriptCache(asr_cache_dir or output_dir.parent / ".asr_cache")
+        cache_key = transcript_cache_key(
+            audio.content_hash,
+            asr_model,
+            clip_timestamps=clip_timestamps,
+            workers=max(1, asr_workers),
+        )
+        transcript = cache.get(cache_key)
+
+    if transcript is not None:
+        transcript["audio_path"] = str(input_path)
+        if stream_asr:
+            write_transcript_jsonl(transcript, output_dir / TRANSCRIPT_JSONL_FILENAME)
+    elif asr_workers > 1:
+        transcript = transcribe_parallel(
+            input_path,
+            model_size=asr_model,
+            workers=asr_workers,
+            regions=vad["regions"] if vad is not None and vad["audio_read_error"] is None else None,
+            audio=audio,
+        )
+    elif stream_asr:
+        # Streamed prosody assumes baseline speakers; other diarizers score it afterwards.
+        stream_audio = audio if diarizer == "baseline" else None
+        transcript, prosody = _stream_asr(input_path, output_dir, asr_options, stream_audio, extract_pitch, vad)
+    else:
+        transcript = transcribe_audio(input_path, **asr_options)
+
+    if cache is not None:
+        asr_cache_status = "hit" if cache.hits else "miss"
+        if cache.misses:
+            cache.put(cache_key, transcript)
+        transcript = {**transcript, "cache": {"status": asr_cache_status, "key": cache_key}}
+
+    write_json_atomic(output_dir / "transcript.json", transcript)
+    return transcript, prosody, asr_cache_status
+
+
+def run_pipeline(
+    input_path: Path,
+    output_dir: Path,
+    enable_engagement: bool = False,
+    run_asr: bool = True,
+    extract_pitch: bool = False,
+    workers: int = 1,
+    run_vad: bool = False,
+    vad_trim_asr: bool = False,
+    audio_cache_dir: Optional[Path] = None,
+    asr_model: str = "small",
+    asr_workers: int = 1,
+    stream_asr: bool = False,
+    asr_cache_dir: Optional[Path] = None,
+    use_asr_cache: bool = True,
+    diarizer: str = "baseline",
+    prosody_hmm: bool = False,
+    prosody_hmm_model: Optional[Path] = None,
+    corpus_stats_path: Optional[Path] = None,
+    search_index_path: Optional[Path] = None,
+    export_columns: bool = False,
+    reuse_outputs: bool = True,
+) -> PipelineResult:
+    """
+    Run the meeting understanding pipeline as manifest-tracked stages (VAD, ASR, diarization,
+    alignment, prosody, topics, summary), writing each stage's artifacts to `output_dir`.
+
+    `run_vad` writes vad.json and feeds VAD-based pauses into prosody;
+    `vad_trim_asr` (implies `run_vad`) also limits ASR to detected speech.
+
+    The input is decoded once to 16 kHz mono float32 and cached as a content-hashed
+    .npy in `audio_cache_dir` (default: `.audio_cache` next to `output_dir`); ASR,
+    VAD and prosody all read that same memory-mapped buffer.
+
+    The `asr_model` Whisper model is loaded through the process-wide model registry, so
+    repeated runs in one process (e.g. the web app) reuse it; transcript.json reports
+    load and transcription time separately. With `asr_workers` > 1, the recording is
+    split at silences and transcribed on that many worker processes. With `stream_asr`,
+    segments are appended to transcript.jsonl as they are decoded and prosody is computed
+    incrementally while ASR is still running.
+
+    Transcripts are cached under `asr_cache_dir` (default: `.asr_cache` next to
+    `output_dir`), keyed by the audio content hash, model and decoding options, so
+    re-running on the same recording skips ASR; `PipelineResult.asr_cache` and
+    transcript.json's `cache` report whether it was a hit.
+
+    `diarizer` picks the diarization.json backend: "baseline" labels the whole transcript
+    SPEAKER_0, "spectral" clusters log-mel speaker embeddings of the audio (reusing the
+    VAD regions when `run_vad` is on), "online" clusters them incrementally with a fixed
+    label latency, as it would for a live meeting.
+
+    `prosody_hmm` (implied by `prosody_hmm_model`) also writes prosody_hmm.json: segment
+    states decoded by a Gaussian HMM, fitted on this meeting or loaded from the
+    `prosody_hmm_model` JSON (e.g. trained across many meetings).
+
+    `corpus_stats_path` names a running corpus statistics JSON (prosody.corpus_stats); this
+    meeting's prosody is folded into it after the sequence model, once per recording (keyed
+    by the audio content hash); `PipelineResult.corpus_stats` says whether it was added or
+    skipped as already counted.
+
+    `search_index_path` names a cross-meeting SQLite search database (search.index); the
+    finished run's segments, prosody and summary are added to it (or refreshed) at the end.
+
+    `export_columns` also writes compact columnar copies of the per-row artifacts
+    (prosody.cols/, prosody_model.cols/, ... via io.export_results) for lazy loading.
+
+    Every stage records its input hashes, parameters, code version and output hashes in
+    metadata.json (io.manifest). On a re-run into the same `output_dir`, a stage whose
+    record still matches and whose outputs are untouched is skipped and its previous
+    output loaded instead (listed in `PipelineResult.reused_stages`), so e.g. toggling
+    `enable_engagement` only rebuilds summary.md. `reuse_outputs=False` recomputes all
+    stages. Artifacts are written atomically (temp file + rename), so a crashed run never
+    leaves a partial file that a later run would trust.
     """
+    if diarizer not in DIARIZERS:
+        raise ValueError(f"Unknown diarizer {diarizer!r}; expected one of {', '.join(DIARIZERS)}")
     output_dir.mkdir(parents=True, exist_ok=True)
     aligned = {"segments": []}
+    prosody = None
+    asr_cache_status: Optional[str] = None
+    manifest = StageManifest(output_dir)
+    manifest.update(
+        audio_path=str(input_path),
+        asr={"model": asr_model if run_asr else None},
+        diarization={"method": diarizer if run_asr else None},
+    )
+    stages_run = _StageRunner(manifest, reuse=reuse_outputs)
+
+    # Audio loading: decode once, shared by every stage below
+    audio = None
+    if input_path.exists():
+        try:
+            audio = load_audio(input_path, cache_dir=audio_cache_dir or output_dir.parent / ".audio_cache")
+        except (OSError, ValueError):
+            # Undecodable input: stages fall back to reading the path and report their own errors.
+            audio = None
+    audio_input = {
+        "audio_path": str(input_path),
+        "audio": audio.content_hash if audio is not None else file_sha256(input_path),
+    }
+
+    # Voice activity detection (optional)
+    vad = None
+    vad_path = output_dir / "vad.json"
+    if run_vad or vad_trim_asr:
+        vad = stages_run.run(
+            "vad", audio_input, {}, [vad_path],
+            lambda: detect_speech_regions(input_path, vad_path, audio=audio),
+            lambda: _read_json(vad_path),
+        )
+    vad_input = {"vad": stages_run.digest(vad_path) if vad is not None else None}
 
     # ASR stage
     if run_asr:
-        transcript = transcribe_audio(input_path)
-
-        # Write transcript.json
         transcript_path = output_dir / "transcript.json"
-        transcript_path.write_text(json.dumps(transcript, indent=2), encoding="utf-8")
+        clip_timestamps = speech_clip_timestamps(vad) if vad_trim_asr and vad is not None and vad["regions"] else None
+        asr_outputs = [transcript_path] + ([output_dir / TRANSCRIPT_JSONL_FILENAME] if stream_asr else [])
+
+        # Streamed prosody is computed while ASR runs, so it is charged the ASR wall time.
+        asr_elapsed = {"s": 0.0}
+
+        def transcribe() -> Tuple[Dict, Optional[Dict], Optional[str]]:
+            began = time.perf_counter()
+            result = _transcribe(
+                input_path, output_dir, audio, vad, clip_timestamps, asr_model, asr_workers, stream_asr,
+                asr_cache_dir, use_asr_cache, diarizer, extract_pitch,
+            )
+            asr_elapsed["s"] = time.perf_counter() - began
+            return result
+
+        transcript, prosody, asr_cache_status = stages_run.run(
+            "asr",
+            {**audio_input, "clip_timestamps": json_sha256(clip_timestamps)},
+            {"model": asr_model, "workers": max(1, asr_workers), "stream": stream_asr},
+            asr_outputs,
+            transcribe,
+            lambda: (_read_json(transcript_path), None, None),
+        )
+        transcript_input = {"transcript": stages_run.digest(transcript_path)}
 
-        # Diarization (baseline stub)
+        # Diarization
         diarization_path = output_dir / "diarization.json"
-        diarization = baseline_diarize_from_transcript(transcript, diarization_path)
+        diarization_regions = vad["regions"] if vad is not None and vad["audio_read_error"] is None else None
+
+        def diarize() -> Dict:
+            if diarizer == "spectral":
+                return diarize_audio(input_path, diarization_path, audio=audio, regions=diarization_regions)
+            if diarizer == "online":
+                return diarize_audio_online(input_path, diarization_path, audio=audio)
+            return baseline_diarize_from_transcript(transcript, diarization_path)
+
+        diarization = stages_run.run(
+            "diarization",
+            {**audio_input, **transcript_input, **vad_input},
+            {"diarizer": diarizer},
+            [diarization_path],
+            diarize,
+            lambda: _read_json(diarization_path),
+        )
 
         # Alignment: ASR segments + diarization turns -> segments.json
-        aligned = align_transcript_with_diarization(transcript, diarization)
-        (output_dir / "segments.json").write_text(
-            json.dumps(aligned, indent=2),
-            encoding="utf-8",
+        segments_path = output_dir / "segments.json"
+
+        def align() -> Dict:
+            result = align_transcript_with_diarization(transcript, diarization)
+            write_json_atomic(segments_path, result)
+            return result
+
+        aligned = stages_run.run(
+            "alignment",
+            {**transcript_input, "diarization": stages_run.digest(diarization_path)},
+            {},
+            [segments_path],
+            align,
+            lambda: _read_json(segments_path),
         )
+        segments_input = {"segments": stages_run.digest(segments_path)}
+    else:
+        segments_input = {"segments": json_sha256(aligned)}
 
     stages = [
         "1) Speaker diarization",
         "2) Speech-to-text transcription (ASR)",
         "3) Prosody analysis (pitch/pauses/energy)",
-        "3.5) Prosody sequence modeling (speaker stats + state transitions)",
+        "3.5) Prosody sequence modeling (speaker stats + state transitions)"
+        + (" + HMM states" if prosody_hmm or prosody_hmm_model else ""),
         "4) Engagement / emotion detection" + (" (enabled)" if enable_engagement else " (skipped)"),
         "5) Topic segmentation",
         "6) Speech-aware summarization",
     ]
 
-    prosody = extract_prosody_features(
-        audio_path=input_path,
-        aligned=aligned,
-        output_path=output_dir / "prosody.json",
+    prosody_path = output_dir / "prosody.json"
+    prosody_inputs = {**audio_input, **segments_input, **vad_input}
+    prosody_params = {"extract_pitch": extract_pitch}
+    if prosody is not None:
+        # Streamed alongside ASR: same output as the batch extractor, recorded as such.
+        stages_run.record("prosody", prosody_inputs, prosody_params, [prosody_path], asr_elapsed["s"])
+    else:
+        prosody = stages_run.run(
+            "prosody",
+            prosody_inputs,
+            prosody_params,
+            [prosody_path],
+            lambda: extract_prosody_features(
+                audio_path=input_path,
+                aligned=aligned,
+                output_path=prosody_path,
+                extract_pitch=extract_pitch,
+                workers=workers,
+                vad=vad,
+                audio=audio,
+            ),
+            lambda: _read_json(prosody_path),
+        )
+    prosody_input = {"prosody": stages_run.digest(prosody_path)}
+
+    prosody_model_path = output_dir / "prosody_model.json"
+    prosody_model = stages_run.run(
+        "prosody_model", prosody_input, {}, [prosody_model_path],
+        lambda: build_prosody_sequence_model(prosody=prosody, output_path=prosody_model_path),
+        lambda: _read_json(prosody_model_path),
+    )
+    prosody_model_input = {"prosody_model": stages_run.digest(prosody_model_path)}
+
+    if prosody_hmm or prosody_hmm_model:
+        prosody_hmm_path = output_dir / "prosody_hmm.json"
+        stages_run.run(
+            "prosody_hmm",
+            {**prosody_input, "hmm_model": file_sha256(prosody_hmm_model) if prosody_hmm_model else None},
+            {},
+            [prosody_hmm_path],
+            lambda: build_prosody_hmm(
+                prosody,
+                prosody_hmm_path,
+                model=GaussianHMM.load(prosody_hmm_model) if prosody_hmm_model else None,
+            ),
+            lambda: _read_json(prosody_hmm_path),
+        )
+    corpus_stats_status: Optional[str] = None
+    if corpus_stats_path is not None:
+        _corpus, added = update_corpus_stats(
+            corpus_stats_path, prosody, prosody_model=prosody_model, meeting_id=audio_input["audio"]
+        )
+        corpus_stats_status = "added" if added else "skipped"
+
+    topics_path = output_dir / "topics.json"
+    topics = stages_run.run(
+        "topics", {**segments_input, **prosody_model_input}, {}, [topics_path],
+        lambda: segment_topics(aligned, topics_path, prosody_model=prosody_model),
+        lambda: _read_json(topics_path),
     )
-    prosody_model = build_prosody_sequence_model(prosody=prosody, output_path=output_dir / "prosody_model.json")
 
-    summary_text = summarize_segments(
-        input_path=input_path,
-        aligned=aligned,
-        prosody_model=prosody_model,
-        enable_engagement=enable_engagement,
+    summary_path = output_dir / "summary.md"
+
+    def summarize() -> str:
+        text = summarize_segments(
+            input_path=input_path,
+            aligned=aligned,
+            prosody_model=prosody_model,
+            enable_engagement=enable_engagement,
+            topics=topics,
+        )
+        write_text_atomic(summary_path, text)
+        return text
+
+    summary_text = stages_run.run(
+        "summary",
+        {"audio_path": str(input_path), **segments_input, **prosody_model_input,
+         "topics": stages_run.digest(topics_path)},
+        {"enable_engagement": enable_engagement},
+        [summary_path],
+        summarize,
+        lambda: summary_path.read_text(encoding="utf-8"),
     )
 
-    (output_dir / "stages.txt").write_text("\n".join(stages) + "\n", encoding="utf-8")
-    (output_dir / "summary.md").write_text(summary_text, encoding="utf-8")
+    write_text_atomic(output_dir / "stages.txt", "\n".join(stages) + "\n")
+    if export_columns:
+        sources = [output_dir / name for name in ARTIFACT_TABLES if (output_dir / name).exists()]
+        stages_run.run(
+            "columnar",
+            # The copies are tied to their JSON's mtime too (see export_results.open_artifact).
+            {path.name: [stages_run.digest(path), path.stat().st_mtime_ns] for path in sources},
+            {},
+            [columnar_path(path) / HEADER_FILENAME for path in sources],
+            lambda: export_run(output_dir),
+            lambda: None,
+        )
+    manifest.save()
+    if search_index_path is not None:
+        update_search_index(search_index_path, output_dir)
 
-    return PipelineResult(output_dir=output_dir, summary_text=summary_text)
\ No newline at end of file
+    return PipelineResult(
+        output_dir=output_dir,
+        summary_text=summary_text,
+        asr_cache=asr_cache_status,
+        reused_stages=stages_run.reused,
+        corpus_stats=corpus_stats_status,
+    )
\ No newline at end of file
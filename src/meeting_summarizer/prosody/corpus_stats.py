@@ -0,0 +1,441 @@
+from __future__ import annotations
+
+import json
+import math
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from meeting_summarizer.io.atomic import write_json_atomic
+from meeting_summarizer.prosody.model_sequence import sequence_model
+
+CORPUS_STATS_METHOD = "prosody_corpus_v1"
+CORPUS_FEATURES = ("duration_s", "pause_before_s", "pause_after_s", "rms_mean")
+# Quantile sketch estimates are within this relative error of a true order statistic.
+SKETCH_RELATIVE_ACCURACY = 0.01
+# Values at or below this go to the sketch's zero bucket (pauses are often exactly 0).
+SKETCH_MIN_VALUE = 1e-9
+
+
+class RunningMoments:
+    """
+    Count / mean / sum of squared deviations, mergeable with Chan et al.'s parallel update.
+
+    A batch (one meeting's values) is reduced with Welford's update and then merged, so
+    adding a meeting is O(its size) and merging two corpora is O(1).
+    """
+
+    __slots__ = ("count", "mean", "m2", "minimum", "maximum")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        self.minimum = min(self.minimum, value)
+        self.maximum = max(self.maximum, value)
+
+    def add_many(self, values: Iterable[float]) -> None:
+        batch = RunningMoments()
+        for value in values:
+            batch.add(float(value))
+        self.merge(batch)
+
+    def merge(self, other: "RunningMoments") -> None:
+        if other.count == 0:
+            return
+        if self.count == 0:
+            self.count, self.mean, self.m2 = other.count, other.mean, other.m2
+            self.minimum, self.maximum = other.minimum, other.maximum
+            return
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+
+    @property
+    def variance(self) -> Optional[float]:
+        """Sample variance (n - 1), or None with fewer than two values."""
+        return self.m2 / (self.count - 1) if self.count > 1 else None
+
+    @property
+    def std(self) -> Optional[float]:
+        variance = self.variance
+        return math.sqrt(variance) if variance is not None else None
+
+    def to_dict(self) -> Dict:
+        return {
+            "count": self.count,
+            "mean": self.mean if self.count else None,
+            "m2": self.m2,
+            "std": self.std,
+            "min": self.minimum if self.count else None,
+            "max": self.maximum if self.count else None,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "RunningMoments":
+        moments = cls()
+        moments.count = int(data.get("count", 0))
+        if moments.count:
+            moments.mean = float(data["mean"])
+            moments.m2 = float(data["m2"])
+            moments.minimum = float(data["min"])
+            moments.maximum = float(data["max"])
+        return moments
+
+
+class QuantileSketch:
+    """
+    Mergeable quantile sketch over non-negative values with logarithmic buckets.
+
+    A positive value x goes to bucket ceil(log_gamma(x)) with gamma = (1 + a) / (1 - a),
+    and a bucket reports 2 gamma^i / (gamma + 1); that estimate is within relative error
+    `a` of every value in the bucket, so `value_at(i)` is within `a` of the exact i-th
+    smallest value. Buckets are plain counts, so sketches merge exactly by adding them, and
+    the number of buckets grows only with log(max / min), not with the number of values.
+    """
+
+    __slots__ = ("relative_accuracy", "_log_gamma", "zero_count", "bins")
+
+    def __init__(self, relative_accuracy: float = SKETCH_RELATIVE_ACCURACY) -> None:
+        if not 0.0 < relative_accuracy < 1.0:
+            raise ValueError("relative_accuracy must be between 0 and 1")
+        self.relative_accuracy = float(relative_accuracy)
+        self._log_gamma = math.log((1.0 + relative_accuracy) / (1.0 - relative_accuracy))
+        self.zero_count = 0
+        self.bins: Dict[int, int] = {}
+
+    @property
+    def count(self) -> int:
+        return self.zero_count + sum(self.bins.values())
+
+    def key(self, value: float) -> Optional[int]:
+        """Bucket index for `value`, or None for the zero bucket."""
+        if value <= SKETCH_MIN_VALUE:
+            return None
+        return math.ceil(math.log(value) / self._log_gamma)
+
+    def add(self, value: float, count: int = 1) -> Optional[int]:
+        """Count `value` and return its bucket key (see `key`)."""
+        index = self.key(value)
+        if index is None:
+            self.zero_count += count
+        else:
+            self.bins[index] = self.bins.get(index, 0) + count
+        return index
+
+    def add_many(self, values: Iterable[float]) -> None:
+        for value in values:
+            self.add(float(value))
+
+    def merge(self, other: "QuantileSketch") -> None:
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge quantile sketches with different relative accuracy")
+        self.zero_count += other.zero_count
+        for index, count in other.bins.items():
+            self.bins[index] = self.bins.get(index, 0) + count
+
+    def estimate(self, index: Optional[int]) -> float:
+        """The value reported for bucket `index` (0.0 for the zero bucket)."""
+        if index is None:
+            return 0.0
+        return 2.0 * math.exp(index * self._log_gamma) / (1.0 + math.exp(self._log_gamma))
+
+    def value_at(self, rank: int) -> Optional[float]:
+        """Estimate of the `rank`-th smallest value (0-based), or None when empty."""
+        total = self.count
+        if total == 0:
+            return None
+        rank = min(max(0, rank), total - 1)
+        if rank < self.zero_count:
+            return 0.0
+        seen = self.zero_count
+        for index in sorted(self.bins):
+            seen += self.bins[index]
+            if rank < seen:
+                return self.estimate(index)
+        return None  # pragma: no cover - unreachable, counts always add up
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate of the value at rank floor(q * count), the convention of `_energy_thresholds`."""
+        return self.value_at(int(q * self.count))
+
+    def rank(self, value: float) -> float:
+        """Approximate share of values <= `value` (0 for an empty sketch)."""
+        total = self.count
+        if total == 0:
+            return 0.0
+        if value <= SKETCH_MIN_VALUE:
+            return self.zero_count / total if value >= 0 else 0.0
+        limit = self.key(value)
+        below = self.zero_count + sum(count for index, count in self.bins.items() if index <= limit)
+        return below / total
+
+    def to_dict(self) -> Dict:
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "zero_count": self.zero_count,
+            "bins": [[index, self.bins[index]] for index in sorted(self.bins)],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "QuantileSketch":
+        sketch = cls(float(data.get("relative_accuracy", SKETCH_RELATIVE_ACCURACY)))
+        sketch.zero_count = int(data.get("zero_count", 0))
+        sketch.bins = {int(index): int(count) for index, count in data.get("bins", [])}
+        return sketch
+
+
+def _feature_values(features: List[Dict], name: str) -> List[float]:
+    return [float(item[name]) for item in features if item.get(name) is not None]
+
+
+class _SpeakerStats:
+    __slots__ = ("segment_count", "total_duration_s", "meetings", "moments", "rms_sketch")
+
+    def __init__(self, relative_accuracy: float) -> None:
+        self.segment_count = 0
+        self.total_duration_s = 0.0
+        self.meetings = 0
+        self.moments = {name: RunningMoments() for name in CORPUS_FEATURES}
+        self.rms_sketch = QuantileSketch(relative_accuracy)
+
+    def merge(self, other: "_SpeakerStats") -> None:
+        self.segment_count += other.segment_count
+        self.total_duration_s += other.total_duration_s
+        self.meetings += other.meetings
+        for name in CORPUS_FEATURES:
+            self.moments[name].merge(other.moments[name])
+        self.rms_sketch.merge(other.rms_sketch)
+
+
+class ProsodyCorpusStats:
+    """
+    Team-wide prosody baselines accumulated meeting by meeting.
+
+    Holds only sufficient statistics: per-feature moments and quantile sketches for the
+    whole corpus and per speaker label, plus state occupancy / transition counts from the
+    prosody sequence model. Adding a meeting touches only that meeting's rows; two corpora
+    (e.g. built on different machines) combine with `merge`; the whole state round-trips
+    through one JSON file, so nothing needs the original prosody.json files again.
+
+    Speakers are keyed by their prosody labels, so per-speaker baselines are meaningful
+    when labels are stable across meetings (e.g. after mapping SPEAKER_n to names).
+    """
+
+    def __init__(self, relative_accuracy: float = SKETCH_RELATIVE_ACCURACY) -> None:
+        self.relative_accuracy = float(relative_accuracy)
+        self.meetings = 0
+        self.meeting_ids: List[str] = []
+        self._seen = set()
+        self.moments = {name: RunningMoments() for name in CORPUS_FEATURES}
+        self.sketches = {name: QuantileSketch(relative_accuracy) for name in CORPUS_FEATURES}
+        self.speakers: Dict[str, _SpeakerStats] = {}
+        self.state_counts: Dict[str, int] = {}
+        self.transitions: Dict[Tuple[str, str], int] = {}
+
+    def add_meeting(self, prosody: Dict, prosody_model: Optional[Dict] = None, meeting_id: Optional[str] = None) -> bool:
+        """
+        Fold one meeting into the corpus; returns False (and changes nothing) when a meeting
+        with the same id was already added. `meeting_id` should identify the recording
+        itself (the pipeline passes the audio content hash, so a renamed or copied file is
+        still one meeting); without it the prosody audio_path is used. Pass the run's
+        prosody_model.json dict to reuse its states instead of recomputing them.
+        """
+        meeting_id = meeting_id if meeting_id is not None else prosody.get("audio_path")
+        if meeting_id is not None:
+            if meeting_id in self._seen:
+                return False
+            self._seen.add(meeting_id)
+            self.meeting_ids.append(meeting_id)
+        self.meetings += 1
+
+        features = prosody.get("features", [])
+        for name in CORPUS_FEATURES:
+            values = _feature_values(features, name)
+            self.moments[name].add_many(values)
+            self.sketches[name].add_many(values)
+
+        by_speaker: Dict[str, List[Dict]] = {}
+        for item in features:
+            by_speaker.setdefault(str(item.get("speaker", "UNKNOWN")), []).append(item)
+        for speaker, rows in by_speaker.items():
+            stats = self.speakers.get(speaker)
+            if stats is None:
+                stats = self.speakers[speaker] = _SpeakerStats(self.relative_accuracy)
+            stats.segment_count += len(rows)
+            stats.total_duration_s += sum(float(item.get("duration_s", 0.0)) for item in rows)
+            stats.meetings += 1
+            for name in CORPUS_FEATURES:
+                stats.moments[name].add_many(_feature_values(rows, name))
+            stats.rms_sketch.add_many(_feature_values(rows, "rms_mean"))
+
+        if features:
+            sequence = (prosody_model or sequence_model(prosody))["sequence"]
+            for row in sequence["observations"]:
+                self.state_counts[row["state_label"]] = self.state_counts.get(row["state_label"], 0) + 1
+            for row in sequence["state_transition_counts"]:
+                key = (row["from"], row["to"])
+                self.transitions[key] = self.transitions.get(key, 0) + int(row["count"])
+        return True
+
+    def merge(self, other: "ProsodyCorpusStats") -> None:
+        """Add another corpus' statistics; raises ValueError if both contain the same meeting id."""
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge corpus stats with different sketch accuracy")
+        overlap = self._seen & other._seen
+        if overlap:
+            raise ValueError(f"Corpora share {len(overlap)} meeting(s), e.g. {sorted(overlap)[0]!r}")
+        self.meetings += other.meetings
+        self.meeting_ids.extend(other.meeting_ids)
+        self._seen |= other._seen
+        for name in CORPUS_FEATURES:
+            self.moments[name].merge(other.moments[name])
+            self.sketches[name].merge(other.sketches[name])
+        for speaker, stats in other.speakers.items():
+            if speaker not in self.speakers:
+                self.speakers[speaker] = _SpeakerStats(self.relative_accuracy)
+            self.speakers[speaker].merge(stats)
+        for state, count in other.state_counts.items():
+            self.state_counts[state] = self.state_counts.get(state, 0) + count
+        for key, count in other.transitions.items():
+            self.transitions[key] = self.transitions.get(key, 0) + count
+
+    # -- queries -----------------------------------------------------------------------------
+
+    def energy_thresholds(self, speaker: Optional[str] = None) -> Tuple[float, float]:
+        """Corpus (or speaker) RMS terciles, at the ranks `_energy_thresholds` uses."""
+        sketch = self.sketches["rms_mean"] if speaker is None else self.speakers[speaker].rms_sketch
+        total = sketch.count
+        if total == 0:
+            return 0.0, 0.0
+        return sketch.value_at(total // 3), sketch.value_at((2 * total) // 3)
+
+    def zscore(self, value: float, feature: str = "rms_mean", speaker: Optional[str] = None) -> Optional[float]:
+        """How many corpus (or speaker) standard deviations `value` is from the mean."""
+        moments = self.moments[feature] if speaker is None else self.speakers[speaker].moments[feature]
+        std = moments.std
+        if not std:
+            return None
+        return (value - moments.mean) / std
+
+    def percentile(self, value: float, speaker: Optional[str] = None, feature: str = "rms_mean") -> float:
+        """Approximate share of corpus (or speaker) values <= `value`; speakers keep an RMS sketch only."""
+        if speaker is not None:
+            if feature != "rms_mean":
+                raise ValueError("Per-speaker percentiles are only tracked for rms_mean")
+            return self.speakers[speaker].rms_sketch.rank(value)
+        return self.sketches[feature].rank(value)
+
+    def compare_meeting(self, prosody: Dict) -> List[Dict]:
+        """
+        Per speaker in `prosody`: their mean RMS this meeting against their corpus baseline
+        (z-score and percentile), e.g. to flag someone unusually quiet today.
+        """
+        by_speaker: Dict[str, List[float]] = {}
+        for item in prosody.get("features", []):
+            if item.get("rms_mean") is not None:
+                by_speaker.setdefault(str(item.get("speaker", "UNKNOWN")), []).append(float(item["rms_mean"]))
+        rows: List[Dict] = []
+        for speaker in sorted(by_speaker):
+            values = by_speaker[speaker]
+            mean_rms = sum(values) / len(values)
+            known = speaker in self.speakers and self.speakers[speaker].moments["rms_mean"].count > 0
+            rows.append(
+                {
+                    "speaker": speaker,
+                    "segment_count": len(values),
+                    "avg_rms_mean": mean_rms,
+                    "baseline_rms_mean": self.speakers[speaker].moments["rms_mean"].mean if known else None,
+                    "rms_zscore": self.zscore(mean_rms, speaker=speaker) if known else None,
+                    "rms_percentile": self.percentile(mean_rms, speaker=speaker) if known else None,
+                }
+            )
+        return rows
+
+    # -- persistence -------------------------------------------------------------------------
+
+    def to_dict(self) -> Dict:
+        return {
+            "method": CORPUS_STATS_METHOD,
+            "relative_accuracy": self.relative_accuracy,
+            "meetings": self.meetings,
+            "meeting_ids": list(self.meeting_ids),
+            "features": {
+                name: {"moments": self.moments[name].to_dict(), "sketch": self.sketches[name].to_dict()}
+                for name in CORPUS_FEATURES
+            },
+            "speakers": {
+                speaker: {
+                    "segment_count": stats.segment_count,
+                    "total_duration_s": stats.total_duration_s,
+                    "meetings": stats.meetings,
+                    "moments": {name: stats.moments[name].to_dict() for name in CORPUS_FEATURES},
+                    "rms_sketch": stats.rms_sketch.to_dict(),
+                }
+                for speaker, stats in sorted(self.speakers.items())
+            },
+            "state_counts": dict(sorted(self.state_counts.items())),
+            "state_transition_counts": [
+                {"from": start, "to": end, "count": count}
+                for (start, end), count in sorted(self.transitions.items())
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "ProsodyCorpusStats":
+        corpus = cls(float(data.get("relative_accuracy", SKETCH_RELATIVE_ACCURACY)))
+        corpus.meetings = int(data.get("meetings", 0))
+        corpus.meeting_ids = list(data.get("meeting_ids", []))
+        corpus._seen = set(corpus.meeting_ids)
+        for name, entry in data.get("features", {}).items():
+            corpus.moments[name] = RunningMoments.from_dict(entry["moments"])
+            corpus.sketches[name] = QuantileSketch.from_dict(entry["sketch"])
+        for speaker, entry in data.get("speakers", {}).items():
+            stats = _SpeakerStats(corpus.relative_accuracy)
+            stats.segment_count = int(entry["segment_count"])
+            stats.total_duration_s = float(entry["total_duration_s"])
+            stats.meetings = int(entry["meetings"])
+            stats.moments = {name: RunningMoments.from_dict(value) for name, value in entry["moments"].items()}
+            stats.rms_sketch = QuantileSketch.from_dict(entry["rms_sketch"])
+            corpus.speakers[speaker] = stats
+        corpus.state_counts = {state: int(count) for state, count in data.get("state_counts", {}).items()}
+        corpus.transitions = {
+            (row["from"], row["to"]): int(row["count"]) for row in data.get("state_transition_counts", [])
+        }
+        return corpus
+
+    def save(self, path: Path) -> None:
+        write_json_atomic(path, self.to_dict())
+
+    @classmethod
+    def load(cls, path: Path) -> "ProsodyCorpusStats":
+        return cls.from_dict(json.loads(path.read_text(encoding="utf-8")))
+
+
+def update_corpus_stats(
+    path: Path,
+    prosody: Dict,
+    prosody_model: Optional[Dict] = None,
+    meeting_id: Optional[str] = None,
+) -> Tuple[ProsodyCorpusStats, bool]:
+    """
+    Load the corpus stats JSON at `path` (or start one), add this meeting and save it back.
+    Returns the corpus and whether the meeting was added (False: `meeting_id` was already in
+    it and the file is left untouched); see `ProsodyCorpusStats.add_meeting`.
+    """
+    corpus = ProsodyCorpusStats.load(path) if path.exists() else ProsodyCorpusStats()
+    added = corpus.add_meeting(prosody, prosody_model=prosody_model, meeting_id=meeting_id)
+    if added:
+        corpus.save(path)
+    return corpus, added
@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+import json
+import math
+import os
+from dataclasses import dataclass
+from itertools import accumulate
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple
+
+from meeting_summarizer.audio.wav_reader import DEFAULT_BLOCK_FRAMES, WavReader
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without numpy installed
+    np = None
+
+if TYPE_CHECKING:
+    from meeting_summarizer.audio.load_audio import AudioBuffer
+
+ENVELOPE_CACHE_FILENAME = "energy_envelope.npz"
+ENVELOPE_WINDOW_S = 0.02
+
+
+def _windowed_rms(samples: List[float], window_size: int) -> List[float]:
+    if not samples:
+        return []
+    size = max(1, int(window_size))
+    values: List[float] = []
+    for i in range(0, len(samples), size):
+        chunk = samples[i : i + size]
+        if not chunk:
+            continue
+        mean_sq = sum(value * value for value in chunk) / len(chunk)
+        values.append(math.sqrt(mean_sq))
+    return values
+
+
+def _windowed_rms_numpy(samples, window_size: int):
+    """Reshape-based `_windowed_rms`: one row per window, trailing partial window kept."""
+    if len(samples) == 0:
+        return np.empty(0, dtype=np.float64)
+    size = max(1, int(window_size))
+    full = len(samples) // size
+    squared = np.square(samples, dtype=np.float64)
+    values = np.sqrt(squared[: full * size].reshape(full, size).mean(axis=1))
+    if full * size < len(samples):
+        values = np.append(values, math.sqrt(float(squared[full * size :].mean())))
+    return values
+
+
+@dataclass
+class EnergyEnvelope:
+    """
+    Frame-level RMS envelope of one recording plus prefix sums of RMS and RMS^2.
+
+    Frame `i` covers samples [i * window_size, (i + 1) * window_size); the last frame may be
+    partial. `cumsum[i]` / `cumsum_sq[i]` hold the sums over frames [0, i), so any contiguous
+    frame range has its mean and standard deviation answered in O(1).
+    """
+
+    sample_rate: int
+    window_size: int
+    num_samples: int
+    frame_rms: Sequence[float]
+    cumsum: Sequence[float]
+    cumsum_sq: Sequence[float]
+
+    @property
+    def num_frames(self) -> int:
+        return len(self.frame_rms)
+
+    def frame_range(self, left_sample: int, right_sample: int) -> Tuple[int, int]:
+        """Frames touched by samples [left_sample, right_sample)."""
+        if right_sample <= left_sample:
+            return 0, 0
+        lo = max(0, min(self.num_frames, left_sample // self.window_size))
+        hi = max(lo, min(self.num_frames, -(-right_sample // self.window_size)))
+        return lo, hi
+
+    def stats(self, left_sample: int, right_sample: int) -> Tuple[Optional[float], Optional[float]]:
+        """Mean and population std of frame RMS over the frames touched by the sample range."""
+        lo, hi = self.frame_range(left_sample, right_sample)
+        if hi <= lo:
+            return None, None
+        return prefix_mean_std(
+            self.cumsum[lo], self.cumsum[hi], self.cumsum_sq[lo], self.cumsum_sq[hi], hi - lo
+        )
+
+
+def prefix_mean_std(
+    sum_lo: float, sum_hi: float, sum_sq_lo: float, sum_sq_hi: float, count: int
+) -> Tuple[float, float]:
+    """Mean and population std over `count` frames from prefix sums at the range bounds."""
+    mean = float(sum_hi - sum_lo) / count
+    mean_sq = float(sum_sq_hi - sum_sq_lo) / count
+    return mean, math.sqrt(max(0.0, mean_sq - mean * mean))
+
+
+def _build_envelope(sample_rate: int, window_size: int, num_samples: int, frame_rms) -> EnergyEnvelope:
+    if np is not None and not isinstance(frame_rms, list):
+        cumsum = np.concatenate(([0.0], np.cumsum(frame_rms)))
+        cumsum_sq = np.concatenate(([0.0], np.cumsum(np.square(frame_rms))))
+    else:
+        cumsum = list(accumulate(frame_rms, initial=0.0))
+        cumsum_sq = list(accumulate((value * value for value in frame_rms), initial=0.0))
+    return EnergyEnvelope(
+        sample_rate=int(sample_rate),
+        window_size=int(window_size),
+        num_samples=int(num_samples),
+        frame_rms=frame_rms,
+        cumsum=cumsum,
+        cumsum_sq=cumsum_sq,
+    )
+
+
+def compute_energy_envelope(
+    reader: "WavReader | AudioBuffer", block_frames: int = DEFAULT_BLOCK_FRAMES
+) -> EnergyEnvelope:
+    """Stream the whole recording once, in window-aligned blocks, into an `EnergyEnvelope`."""
+    window_size = max(1, int(reader.sample_rate * ENVELOPE_WINDOW_S))
+    step = max(window_size, (int(block_frames) // window_size) * window_size)
+
+    if reader.engine == "numpy":
+        blocks = [_windowed_rms_numpy(block, window_size) for block in reader.iter_blocks(0, reader.num_frames, step)]
+        frame_rms = np.concatenate(blocks) if blocks else np.empty(0, dtype=np.float64)
+    else:
+        frame_rms = []
+        for block in reader.iter_blocks(0, reader.num_frames, step):
+            frame_rms.extend(_windowed_rms(block, window_size))
+
+    return _build_envelope(reader.sample_rate, window_size, reader.num_frames, frame_rms)
+
+
+def _source_fingerprint(audio_path: Path) -> Dict:
+    stat = audio_path.stat()
+    return {
+        "audio_path": str(audio_path.resolve()),
+        "size_bytes": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "window_s": ENVELOPE_WINDOW_S,
+    }
+
+
+def _load_cached_envelope(cache_path: Path, fingerprint: Dict) -> Optional[EnergyEnvelope]:
+    if not cache_path.exists():
+        return None
+    try:
+        with np.load(cache_path, allow_pickle=False) as data:
+            header = json.loads(str(data["header"]))
+            if header.get("source") != fingerprint:
+                return None
+            return EnergyEnvelope(
+                sample_rate=int(header["sample_rate"]),
+                window_size=int(header["window_size"]),
+                num_samples=int(header["num_samples"]),
+                frame_rms=data["frame_rms"],
+                cumsum=data["cumsum"],
+                cumsum_sq=data["cumsum_sq"],
+            )
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def _save_envelope(cache_path: Path, envelope: EnergyEnvelope, fingerprint: Dict) -> None:
+    header = {
+        "source": fingerprint,
+        "sample_rate": envelope.sample_rate,
+        "window_size": envelope.window_size,
+        "num_samples": envelope.num_samples,
+    }
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    # Written aside and renamed, so a crash never leaves a truncated cache entry behind.
+    tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+    with tmp_path.open("wb") as handle:
+        np.savez(
+            handle,
+            header=np.array(json.dumps(header)),
+            frame_rms=np.asarray(envelope.frame_rms, dtype=np.float64),
+            cumsum=np.asarray(envelope.cumsum, dtype=np.float64),
+            cumsum_sq=np.asarray(envelope.cumsum_sq, dtype=np.float64),
+        )
+    os.replace(tmp_path, cache_path)
+
+
+def load_energy_envelope(
+    audio_path: Path,
+    engine: str,
+    cache_path: Optional[Path] = None,
+    block_frames: int = DEFAULT_BLOCK_FRAMES,
+    audio: Optional["AudioBuffer"] = None,
+) -> EnergyEnvelope:
+    """
+    Return the recording's envelope, reusing `cache_path` when it matches the audio file.
+
+    The cache is keyed by the file's resolved path, size and mtime (or by the decoded
+    buffer's content hash when `audio` is given), so a hit never opens the audio. Caching
+    needs numpy; the pure-Python engine always recomputes.
+    """
+    use_cache = cache_path is not None and (engine == "numpy" or audio is not None)
+    fingerprint: Dict = {}
+    if use_cache:
+        if audio is not None:
+            fingerprint = {
+                "content_sha256": audio.content_hash,
+                "sample_rate": audio.sample_rate,
+                "window_s": ENVELOPE_WINDOW_S,
+            }
+        else:
+            fingerprint = _source_fingerprint(audio_path)
+        cached = _load_cached_envelope(cache_path, fingerprint)
+        if cached is not None:
+            return cached
+
+    if audio is not None:
+        envelope = compute_energy_envelope(audio, block_frames=block_frames)
+    else:
+        with WavReader(audio_path, engine=engine) as reader:
+            envelope = compute_energy_envelope(reader, block_frames=block_frames)
+
+    if use_cache:
+        _save_envelope(cache_path, envelope, fingerprint)
+    return envelope
@@ -1,67 +1,41 @@
 from __future__ import annotations
 
-import json
 import math
-import struct
 import wave
+from bisect import bisect_left, bisect_right
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
-
-
-def _decode_pcm_mono(audio_path: Path) -> Tuple[List[float], int]:
-    """Read a WAV file and return mono samples normalized to [-1, 1] and sample rate."""
-    with wave.open(str(audio_path), "rb") as wav_file:
-        channels = wav_file.getnchannels()
-        sample_width = wav_file.getsampwidth()
-        sample_rate = wav_file.getframerate()
-        frames = wav_file.getnframes()
-        raw = wav_file.readframes(frames)
-
-    if sample_width == 1:
-        ints = [byte - 128 for byte in raw]
-        max_abs = 128.0
-    elif sample_width == 2:
-        count = len(raw) // 2
-        ints = list(struct.unpack(f"<{count}h", raw))
-        max_abs = 32768.0
-    elif sample_width == 4:
-        count = len(raw) // 4
-        ints = list(struct.unpack(f"<{count}i", raw))
-        max_abs = 2147483648.0
-    else:
-        raise ValueError(f"Unsupported WAV sample width: {sample_width} bytes")
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
 
-    if channels <= 1:
-        mono = [value / max_abs for value in ints]
-    else:
-        mono = []
-        for idx in range(0, len(ints), channels):
-            frame = ints[idx : idx + channels]
-            mono.append((sum(frame) / len(frame)) / max_abs)
-
-    return mono, int(sample_rate)
-
-
-def _windowed_rms(samples: List[float], window_size: int) -> List[float]:
-    if not samples:
-        return []
-    size = max(1, int(window_size))
-    values: List[float] = []
-    for i in range(0, len(samples), size):
-        chunk = samples[i : i + size]
-        if not chunk:
-            continue
-        mean_sq = sum(value * value for value in chunk) / len(chunk)
-        values.append(math.sqrt(mean_sq))
-    return values
+from meeting_summarizer.audio.wav_reader import DEFAULT_BLOCK_FRAMES, WavReader
+from meeting_summarizer.io.atomic import write_json_atomic
+from meeting_summarizer.prosody.energy_envelope import (
+    ENVELOPE_CACHE_FILENAME,
+    EnergyEnvelope,
+    load_energy_envelope,
+)
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without numpy installed
+    np = None
 
+if TYPE_CHECKING:
+    from meeting_summarizer.audio.load_audio import AudioBuffer
 
-def _mean_std(values: List[float]) -> Tuple[Optional[float], Optional[float]]:
-    if not values:
-        return None, None
-    mean = sum(values) / len(values)
-    variance = sum((value - mean) ** 2 for value in values) / len(values)
-    return mean, math.sqrt(variance)
+PROSODY_ENGINES = ("auto", "numpy", "python")
+# v2: RMS windows sit on the recording's 20ms grid (v1 started them at each segment start).
+PROSODY_METHOD = "rms_pause_v2"
+PROSODY_PITCH_METHOD = "rms_pause_f0_v3"
+
+
+def _resolve_engine(engine: str) -> str:
+    if engine not in PROSODY_ENGINES:
+        raise ValueError(f"Unknown prosody engine: {engine!r} (expected one of {', '.join(PROSODY_ENGINES)})")
+    if engine == "auto":
+        return "numpy" if np is not None else "python"
+    if engine == "numpy" and np is None:
+        raise ValueError("Prosody engine 'numpy' requested but numpy is not installed")
+    return engine
 
 
 def _segment_sample_bounds(start_s: float, end_s: float, sample_rate: int, total_samples: int) -> Tuple[int, int]:
@@ -70,7 +44,19 @@ def _segment_sample_bounds(start_s: float, end_s: float, sample_rate: int, total
     return start_idx, end_idx
 
 
-def extract_prosody_features(audio_path: Path, aligned: Dict, output_path: Path) -> Dict:
+def extract_prosody_features(
+    audio_path: Path,
+    aligned: Dict,
+    output_path: Path,
+    engine: str = "auto",
+    block_frames: int = DEFAULT_BLOCK_FRAMES,
+    envelope_cache_path: Optional[Path] = None,
+    use_envelope_cache: bool = True,
+    extract_pitch: bool = False,
+    workers: int = 1,
+    vad: Optional[Dict] = None,
+    audio: Optional["AudioBuffer"] = None,
+) -> Dict:
     """
     Compute segment-level prosody features and write prosody.json.
 
@@ -78,77 +64,213 @@ def extract_prosody_features(audio_path: Path, aligned: Dict, output_path: Path)
       - duration_s
       - pause_before_s / pause_after_s
       - rms_mean / rms_std (20ms windows)
+
+    `engine` selects the sample backend: "numpy" (vectorized decode and RMS),
+    "python" (pure-Python fallback), or "auto" (numpy when installed).
+    Both produce the same `rms_pause_v2` output up to float rounding.
+
+    RMS statistics come from a per-recording 20ms energy envelope with prefix
+    sums (see `energy_envelope.py`), so each segment costs O(1) regardless of
+    length or overlap. The envelope is built by streaming the WAV in blocks of at
+    most `block_frames` frames and cached at `envelope_cache_path` (default:
+    `energy_envelope.npz` next to `output_path`); re-running with a different
+    segmentation reuses the cache without reading audio. Windows sit on the
+    recording's 20ms grid, so segments starting off-grid include the partial
+    window they start in; that is what distinguishes `rms_pause_v2` from the
+    per-segment windows of `rms_pause_v1`.
+
+    With `extract_pitch=True` the output method becomes `rms_pause_f0_v3` and
+    each row also carries `f0_mean`, `f0_std` (Hz, voiced frames only) and
+    `voiced_ratio` from a batched YIN tracker (see `pitch.py`; needs numpy).
+    `workers > 1` fans pitch extraction out over a process pool sharing one
+    decoded copy of the audio (see `parallel.py`); rows and values are identical
+    to the serial path. RMS lookups stay serial since each is O(1).
+
+    When `vad` (a vad.json dict) is given, pauses are measured between speech
+    regions instead of ASR timestamps: `pause_before_s` / `pause_after_s` are the
+    silences adjacent to the segment's first and last speech frames, and an extra
+    `internal_pause_s` sums the silence inside the segment. Segments with no
+    detected speech keep the ASR-gap pauses and a null `internal_pause_s`. The
+    output then also carries `pause_source: "vad"`.
+
+    `audio` is an already decoded buffer from `audio.load_audio` (any format the
+    decoder supports); when given it is used instead of reading `audio_path`.
     """
+    engine = _resolve_engine(engine)
+    if extract_pitch and np is None:
+        raise ValueError("Pitch extraction requires numpy")
     segments = sorted(
         aligned.get("segments", []),
         key=lambda item: (float(item.get("start", 0.0)), float(item.get("end", 0.0))),
     )
 
-    samples: List[float] = []
+    envelope: Optional[EnergyEnvelope] = None
     sample_rate: Optional[int] = None
     audio_read_error: Optional[str] = None
 
-    if audio_path.exists():
+    if envelope_cache_path is None and use_envelope_cache:
+        envelope_cache_path = output_path.parent / ENVELOPE_CACHE_FILENAME
+
+    if audio is not None or audio_path.exists():
         try:
-            samples, sample_rate = _decode_pcm_mono(audio_path)
-        except (wave.Error, ValueError, OSError) as exc:
+            envelope = load_energy_envelope(
+                audio_path,
+                engine=engine,
+                cache_path=envelope_cache_path if use_envelope_cache else None,
+                block_frames=block_frames,
+                audio=audio,
+            )
+            sample_rate = envelope.sample_rate
+        except (wave.Error, ValueError, OSError, EOFError) as exc:
             audio_read_error = str(exc)
     else:
         audio_read_error = f"Audio file not found: {audio_path}"
 
-    features: List[Dict] = []
-    for idx, segment in enumerate(segments):
-        start = float(segment.get("start", 0.0))
-        end = float(segment.get("end", start))
-        if end < start:
-            end = start
-
-        segment_id = int(segment.get("id", idx))
-        speaker = str(segment.get("speaker", "UNKNOWN"))
-        duration_s = max(0.0, end - start)
-
-        if idx == 0:
-            pause_before_s = 0.0
-        else:
-            prev_end = float(segments[idx - 1].get("end", start))
-            pause_before_s = max(0.0, start - prev_end)
-
-        if idx == len(segments) - 1:
-            pause_after_s = 0.0
-        else:
-            next_start = float(segments[idx + 1].get("start", end))
-            pause_after_s = max(0.0, next_start - end)
-
-        rms_mean: Optional[float] = None
-        rms_std: Optional[float] = None
-        if sample_rate is not None and samples:
-            left, right = _segment_sample_bounds(start, end, sample_rate, len(samples))
-            segment_samples = samples[left:right]
-            rms_values = _windowed_rms(segment_samples, window_size=int(sample_rate * 0.02))
-            rms_mean, rms_std = _mean_std(rms_values)
-
-        features.append(
-            {
-                "segment_id": segment_id,
-                "start": start,
-                "end": end,
-                "speaker": speaker,
-                "duration_s": duration_s,
-                "pause_before_s": pause_before_s,
-                "pause_after_s": pause_after_s,
-                "rms_mean": rms_mean,
-                "rms_std": rms_std,
-            }
+    features = _segment_features(segments, envelope)
+    if vad is not None:
+        _apply_vad_pauses(features, vad.get("regions", []))
+    if extract_pitch:
+        _add_pitch_features(
+            features,
+            audio_path if envelope is not None else None,
+            workers=workers,
+            block_frames=block_frames,
+            audio=audio,
         )
 
     result = {
         "audio_path": str(audio_path),
-        "method": "rms_pause_v1",
+        "method": PROSODY_PITCH_METHOD if extract_pitch else PROSODY_METHOD,
         "sample_rate_hz": sample_rate,
         "audio_read_error": audio_read_error,
         "features": features,
     }
+    if vad is not None:
+        result["pause_source"] = "vad"
 
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    output_path.write_text(json.dumps(result, indent=2), encoding="utf-8")
+    write_json_atomic(output_path, result)
     return result
+
+
+def _feature_row(idx: int, segment: Dict, prev_segment: Optional[Dict], next_segment: Optional[Dict]) -> Dict:
+    """Timing/pause fields for one segment given its sorted neighbours (RMS left null)."""
+    start = float(segment.get("start", 0.0))
+    end = float(segment.get("end", start))
+    if end < start:
+        end = start
+
+    segment_id = int(segment.get("id", idx))
+    speaker = str(segment.get("speaker", "UNKNOWN"))
+    duration_s = max(0.0, end - start)
+
+    if prev_segment is None:
+        pause_before_s = 0.0
+    else:
+        prev_end = float(prev_segment.get("end", start))
+        pause_before_s = max(0.0, start - prev_end)
+
+    if next_segment is None:
+        pause_after_s = 0.0
+    else:
+        next_start = float(next_segment.get("start", end))
+        pause_after_s = max(0.0, next_start - end)
+
+    return {
+        "segment_id": segment_id,
+        "start": start,
+        "end": end,
+        "speaker": speaker,
+        "duration_s": duration_s,
+        "pause_before_s": pause_before_s,
+        "pause_after_s": pause_after_s,
+        "rms_mean": None,
+        "rms_std": None,
+    }
+
+
+def _segment_features(segments: List[Dict], envelope: Optional[EnergyEnvelope]) -> List[Dict]:
+    features: List[Dict] = []
+    for idx, segment in enumerate(segments):
+        prev_segment = segments[idx - 1] if idx > 0 else None
+        next_segment = segments[idx + 1] if idx < len(segments) - 1 else None
+        row = _feature_row(idx, segment, prev_segment, next_segment)
+
+        if envelope is not None and envelope.num_samples > 0:
+            left, right = _segment_sample_bounds(row["start"], row["end"], envelope.sample_rate, envelope.num_samples)
+            row["rms_mean"], row["rms_std"] = envelope.stats(left, right)
+
+        features.append(row)
+
+    return features
+
+
+def _add_pitch_features(
+    features: List[Dict],
+    audio_path: Optional[Path],
+    workers: int,
+    block_frames: int,
+    audio: Optional["AudioBuffer"] = None,
+) -> None:
+    """Fill f0_mean / f0_std / voiced_ratio in place; nulls when audio is unavailable."""
+    from meeting_summarizer.prosody.pitch import pitch_stats
+
+    if audio_path is None:
+        for row in features:
+            row.update({"f0_mean": None, "f0_std": None, "voiced_ratio": None})
+        return
+
+    source = audio if audio is not None else WavReader(audio_path, engine="numpy")
+    try:
+        bounds = [
+            _segment_sample_bounds(row["start"], row["end"], source.sample_rate, source.num_frames)
+            for row in features
+        ]
+        if workers > 1 and len(features) >= 2:
+            from meeting_summarizer.prosody.parallel import parallel_pitch_stats
+
+            pitch_rows = parallel_pitch_stats(source, bounds, workers=workers, block_frames=block_frames)
+        else:
+            pitch_rows = [pitch_stats(source.read(left, right), source.sample_rate) for left, right in bounds]
+    finally:
+        source.close()
+
+    for row, (f0_mean, f0_std, voiced_ratio) in zip(features, pitch_rows):
+        row.update({"f0_mean": f0_mean, "f0_std": f0_std, "voiced_ratio": voiced_ratio})
+
+
+def _apply_vad_pauses(features: List[Dict], regions: List[Dict]) -> None:
+    """
+    Replace ASR-gap pauses with VAD silences in place (regions sorted and non-overlapping).
+
+    Region ends are taken from `speech_end` when present, so the VAD hangover tail does not
+    count as speech. A pause is always the silence between two regions, so the segments on
+    either side of a gap report the same value even when ASR timestamps cut into the speech.
+    """
+    starts = [float(region["start"]) for region in regions]
+    ends = [float(region.get("speech_end", region["end"])) for region in regions]
+
+    for idx, row in enumerate(features):
+        start, end = row["start"], row["end"]
+        lo = bisect_right(ends, start)
+        hi = bisect_left(starts, end)
+        if lo >= hi:
+            row["internal_pause_s"] = None
+            continue
+
+        onset = max(start, starts[lo])
+        offset = min(end, ends[hi - 1])
+        speech_s = sum(min(end, ends[i]) - max(start, starts[i]) for i in range(lo, hi))
+
+        # Silence before the first / after the last region is not a pause (matching the ASR-gap
+        # rules), and neither is speech that runs on into the neighbouring segment.
+        prev_end = features[idx - 1]["end"] if idx > 0 else None
+        next_start = features[idx + 1]["start"] if idx + 1 < len(features) else None
+        if lo == 0 or (starts[lo] < start and prev_end is not None and prev_end > starts[lo]):
+            row["pause_before_s"] = 0.0
+        else:
+            row["pause_before_s"] = starts[lo] - ends[lo - 1]
+        if hi == len(regions) or (ends[hi - 1] > end and next_start is not None and next_start < ends[hi - 1]):
+            row["pause_after_s"] = 0.0
+        else:
+            row["pause_after_s"] = starts[hi] - ends[hi - 1]
+        row["internal_pause_s"] = max(0.0, (offset - onset) - speech_s)
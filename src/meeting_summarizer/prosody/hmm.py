@@ -0,0 +1,469 @@
+from __future__ import annotations
+
+import json
+import math
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from meeting_summarizer.io.atomic import write_json_atomic
+from meeting_summarizer.prosody.model_sequence import (
+    _energy_bucket,
+    _pause_bucket,
+    _state_label,
+    sequence_columns,
+    sequence_states,
+)
+
+HMM_METHOD = "prosody_hmm_v1"
+# Observation vector per segment (standardized with the training data's mean / std).
+HMM_FEATURES = ("log_rms", "log1p_pause_before_s", "log1p_pause_after_s", "log_duration_s")
+DEFAULT_STATES = 4
+DEFAULT_ITERATIONS = 30
+DEFAULT_TOLERANCE = 1e-4  # stop when the mean per-observation log-likelihood gains less
+MIN_VARIANCE = 1e-3
+# Step kinds in the concatenated training chain (index into the step matrices).
+_STEP_TRANSITION, _STEP_RESTART, _STEP_PADDING = 0, 1, 2
+_RMS_FLOOR = 1e-5
+_DURATION_FLOOR = 1e-2
+
+
+def _logsumexp(x: np.ndarray, axis: int) -> np.ndarray:
+    peak = np.max(x, axis=axis, keepdims=True)
+    peak = np.where(np.isfinite(peak), peak, 0.0)
+    return np.squeeze(peak, axis=axis) + np.log(np.sum(np.exp(x - peak), axis=axis))
+
+
+def _log_matmul(log_x: np.ndarray, matrix: np.ndarray) -> np.ndarray:
+    """log(exp(log_x) @ matrix) for a probability matrix, shifted by each row's max."""
+    peak = np.max(log_x, axis=-1, keepdims=True)
+    peak = np.where(np.isfinite(peak), peak, 0.0)
+    return np.log(np.exp(log_x - peak) @ matrix) + peak
+
+
+def observation_matrix(columns: Dict) -> np.ndarray:
+    """
+    (n, len(HMM_FEATURES)) raw observation vectors from `sequence_columns` output (in the
+    columns' row order). Missing RMS values take the median of the present ones.
+    """
+    rms = columns["rms_mean"].copy()
+    has_rms = columns["has_rms"]
+    rms[~has_rms] = np.median(rms[has_rms]) if np.any(has_rms) else _RMS_FLOOR
+    return np.column_stack(
+        (
+            np.log(np.maximum(rms, _RMS_FLOOR)),
+            np.log1p(np.maximum(columns["pause_before_s"], 0.0)),
+            np.log1p(np.maximum(columns["pause_after_s"], 0.0)),
+            np.log(np.maximum(columns["duration_s"], _DURATION_FLOOR)),
+        )
+    )
+
+
+class GaussianHMM:
+    """
+    Hidden Markov model with diagonal-covariance Gaussian emissions.
+
+    Training (`fit`) is Baum-Welch over any number of sequences at once. They are joined
+    into one chain in which each new sequence restarts from the initial distribution, so
+    the chain's likelihood is exactly the product of the sequences' likelihoods. The
+    forward / backward recursions run in log space as a chunked scan: the chain is cut
+    into ~sqrt(N) chunks, each chunk's transfer matrix is computed for all chunks at
+    once, the chunks are stitched in order, then replayed together. That is ~3 sqrt(N)
+    vectorized steps instead of N Python-level ones, with O(N K) memory. Expected
+    transition counts are summed with one weighted matrix product. `decode` is batched
+    Viterbi over padded sequences.
+
+    Observations are standardized with the training data's per-feature mean and std,
+    which are stored with the model so a corpus-trained model can decode new meetings.
+    """
+
+    def __init__(
+        self,
+        n_states: int = DEFAULT_STATES,
+        n_iter: int = DEFAULT_ITERATIONS,
+        tol: float = DEFAULT_TOLERANCE,
+        min_variance: float = MIN_VARIANCE,
+    ) -> None:
+        self.n_states = int(n_states)
+        self.n_iter = int(n_iter)
+        self.tol = float(tol)
+        self.min_variance = float(min_variance)
+        self.start_prob: Optional[np.ndarray] = None
+        self.transitions: Optional[np.ndarray] = None
+        self.means: Optional[np.ndarray] = None
+        self.variances: Optional[np.ndarray] = None
+        self.feature_mean: Optional[np.ndarray] = None
+        self.feature_std: Optional[np.ndarray] = None
+        self.log_likelihood: Optional[float] = None
+        self.iterations = 0
+        self.converged = False
+
+    # -- batching ----------------------------------------------------------------------------
+
+    def _batch(self, sequences: Sequence[np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+        """Standardized observations padded to (B, T, D), plus lengths (B,)."""
+        lengths = np.array([len(seq) for seq in sequences], dtype=np.int64)
+        dims = sequences[0].shape[1]
+        batch = np.zeros((len(sequences), int(lengths.max()), dims))
+        for row, seq in enumerate(sequences):
+            batch[row, : len(seq)] = (np.asarray(seq, dtype=np.float64) - self.feature_mean) / self.feature_std
+        return batch, lengths
+
+    def _log_emissions(self, batch: np.ndarray) -> np.ndarray:
+        """log N(x | mean_k, var_k) for every observation and state: (..., K)."""
+        inv_var = 1.0 / self.variances
+        log_norm = -0.5 * (np.sum(np.log(2.0 * np.pi * self.variances), axis=1))
+        # Expanded quadratic form keeps memory at O(N * K) instead of O(N * K * D).
+        quad = (
+            np.square(batch) @ inv_var.T
+            - 2.0 * batch @ (self.means * inv_var).T
+            + np.sum(np.square(self.means) * inv_var, axis=1)
+        )
+        return log_norm - 0.5 * quad
+
+    # -- inference ---------------------------------------------------------------------------
+
+    def _chain(self, sequences: Sequence[np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        All sequences concatenated into one (N, D) standardized chain, plus the step kind
+        per step: _STEP_TRANSITION, or _STEP_RESTART where a new sequence begins.
+        """
+        chain = (np.concatenate(sequences) - self.feature_mean) / self.feature_std
+        kinds = np.full(len(chain), _STEP_TRANSITION, dtype=np.int8)
+        kinds[np.cumsum([0] + [len(seq) for seq in sequences[:-1]])] = _STEP_RESTART
+        return chain, kinds
+
+    def _chunked(self, log_b: np.ndarray, kinds: np.ndarray):
+        """
+        Split the chain into ~sqrt(N) chunks of ~sqrt(N) steps: (C, L, K) emissions, (C, L)
+        step kinds (the tail is padded with identity steps that leave alpha / beta unchanged)
+        and the (3, K, K) step matrices indexed by kind.
+        """
+        n, k = log_b.shape
+        length = max(1, int(math.ceil(math.sqrt(n))))
+        count = -(-n // length)
+        padded_b = np.zeros((count * length, k))
+        padded_b[:n] = log_b
+        padded_kinds = np.full(count * length, _STEP_PADDING, dtype=np.int8)
+        padded_kinds[:n] = kinds
+        matrices = np.stack((self.transitions, np.tile(self.start_prob, (k, 1)), np.eye(k)))
+        return padded_b.reshape(count, length, k), padded_kinds.reshape(count, length), matrices
+
+    def _forward(self, log_b: np.ndarray, kinds: np.ndarray, matrices: np.ndarray) -> np.ndarray:
+        """Log forward variables over the chunked chain, (C, L, K)."""
+        count, length, k = log_b.shape
+        with np.errstate(divide="ignore"):
+            # Pass 1, all chunks at once: log transfer matrix from the state before each
+            # chunk to its last step.
+            transfer = np.log(matrices[kinds[:, 0]]) + log_b[:, 0, None, :]
+            for t in range(1, length):
+                transfer = _log_matmul(transfer, matrices[kinds[:, t]]) + log_b[:, t, None, :]
+            # Stitch in order: the forward vector entering each chunk. The uniform vector in
+            # front of the chain has log-sum 0, so it does not change the likelihood.
+            entering = np.empty((count, k))
+            current = np.full(k, -math.log(k))
+            for chunk in range(count):
+                entering[chunk] = current
+                current = _logsumexp(current[:, None] + transfer[chunk], axis=0)
+            # Pass 2: replay every chunk from its true entering vector.
+            alpha = np.empty_like(log_b)
+            current = entering
+            for t in range(length):
+                current = _log_matmul(current[:, None, :], matrices[kinds[:, t]])[:, 0] + log_b[:, t]
+                alpha[:, t] = current
+        return alpha
+
+    def _backward(self, log_b: np.ndarray, kinds: np.ndarray, matrices: np.ndarray) -> np.ndarray:
+        """Log backward variables over the chunked chain, (C, L, K)."""
+        count, length, k = log_b.shape
+        reverse = matrices.transpose(0, 2, 1)
+        with np.errstate(divide="ignore"):
+            # Pass 1: log map from the backward vector at each chunk's last step to its first.
+            transfer = np.broadcast_to(np.log(np.eye(k)), (count, k, k)).copy()
+            for t in range(length - 2, -1, -1):
+                transfer = _log_matmul(transfer + log_b[:, t + 1, None, :], reverse[kinds[:, t + 1]])
+            # Stitch from the end: the backward vector at each chunk's last step.
+            leaving = np.empty((count, k))
+            current = np.zeros(k)
+            for chunk in range(count - 1, -1, -1):
+                leaving[chunk] = current
+                first = _logsumexp(current[:, None] + transfer[chunk], axis=0)
+                current = _log_matmul((first + log_b[chunk, 0])[None, :], reverse[kinds[chunk, 0]])[0]
+            # Pass 2: replay every chunk backwards from its true leaving vector.
+            beta = np.empty_like(log_b)
+            current = leaving
+            beta[:, -1] = current
+            for t in range(length - 2, -1, -1):
+                current = _log_matmul((current + log_b[:, t + 1])[:, None, :], reverse[kinds[:, t + 1]])[:, 0]
+                beta[:, t] = current
+        return beta
+
+    def _expectations(self, chain: np.ndarray, kinds: np.ndarray):
+        """E-step over the chain: state posteriors (N, K), summed transition posteriors (K, K)
+        and the total log-likelihood."""
+        n = len(chain)
+        log_b, chunk_kinds, matrices = self._chunked(self._log_emissions(chain), kinds)
+        alpha = self._forward(log_b, chunk_kinds, matrices).reshape(-1, self.n_states)
+        beta = self._backward(log_b, chunk_kinds, matrices).reshape(-1, self.n_states)
+        log_lik = float(_logsumexp(alpha[-1], axis=0))
+        gamma = np.exp(alpha[:n] + beta[:n] - log_lik)
+
+        # xi summed over t: A_ij * sum_t exp(alpha_t-1(i)) exp(b_t(j) + beta_t(j)) / P over
+        # steps that are real transitions, as one matrix product of max-shifted factors.
+        xi = np.zeros((self.n_states, self.n_states))
+        moves = np.flatnonzero(kinds[1:] == _STEP_TRANSITION) + 1
+        if len(moves):
+            left = alpha[moves - 1]
+            right = log_b.reshape(-1, self.n_states)[moves] + beta[moves]
+            left_peak = left.max(axis=1, keepdims=True)
+            right_peak = right.max(axis=1, keepdims=True)
+            weight = np.exp(left_peak + right_peak - log_lik)
+            xi = self.transitions * ((np.exp(left - left_peak) * weight).T @ np.exp(right - right_peak))
+        return gamma, xi, log_lik
+
+    # -- public API --------------------------------------------------------------------------
+
+    def _initialize(self, sequences: Sequence[np.ndarray]) -> None:
+        pooled = np.concatenate(sequences)
+        self.feature_mean = pooled.mean(axis=0)
+        self.feature_std = np.maximum(pooled.std(axis=0), 1e-6)
+        standardized = (pooled - self.feature_mean) / self.feature_std
+        # Deterministic start: states own equal-count slices of the first feature (energy).
+        order = np.argsort(standardized[:, 0], kind="stable")
+        groups = np.array_split(order, self.n_states)
+        self.means = np.array([standardized[group].mean(axis=0) for group in groups])
+        self.variances = np.maximum(
+            np.array([standardized[group].var(axis=0) for group in groups]), self.min_variance
+        )
+        self.start_prob = np.full(self.n_states, 1.0 / self.n_states)
+        stay = 0.6 if self.n_states > 1 else 1.0
+        self.transitions = np.full((self.n_states, self.n_states), (1.0 - stay) / max(1, self.n_states - 1))
+        np.fill_diagonal(self.transitions, stay)
+
+    def fit(self, sequences: Sequence[np.ndarray]) -> "GaussianHMM":
+        """Baum-Welch on raw observation matrices (one per meeting); empty ones are ignored."""
+        sequences = [np.asarray(seq, dtype=np.float64) for seq in sequences if len(seq)]
+        if not sequences:
+            raise ValueError("GaussianHMM.fit needs at least one non-empty sequence")
+        total = sum(len(seq) for seq in sequences)
+        self.n_states = max(1, min(self.n_states, total))
+        self._initialize(sequences)
+        chain, kinds = self._chain(sequences)
+        restarts = kinds == _STEP_RESTART
+
+        previous = -np.inf
+        self.converged = False
+        for iteration in range(1, self.n_iter + 1):
+            gamma, xi, self.log_likelihood = self._expectations(chain, kinds)
+            self.iterations = iteration
+
+            occupancy = np.maximum(gamma.sum(axis=0), 1e-12)
+            self.start_prob = np.maximum(gamma[restarts].sum(axis=0), 1e-12)
+            self.start_prob /= self.start_prob.sum()
+            rows = np.maximum(xi.sum(axis=1, keepdims=True), 1e-12)
+            self.transitions = np.maximum(xi / rows, 1e-12)
+            self.transitions /= self.transitions.sum(axis=1, keepdims=True)
+            self.means = (gamma.T @ chain) / occupancy[:, None]
+            second = (gamma.T @ np.square(chain)) / occupancy[:, None]
+            self.variances = np.maximum(second - np.square(self.means), self.min_variance)
+
+            per_observation = self.log_likelihood / total
+            if per_observation - previous < self.tol:
+                self.converged = True
+                break
+            previous = per_observation
+
+        self._sort_states()
+        self.log_likelihood = self.score(sequences)
+        return self
+
+    def _sort_states(self) -> None:
+        """Renumber states by ascending mean energy so the output is stable across runs."""
+        order = np.argsort(self.means[:, 0], kind="stable")
+        self.means = self.means[order]
+        self.variances = self.variances[order]
+        self.start_prob = self.start_prob[order]
+        self.transitions = self.transitions[np.ix_(order, order)]
+
+    def score(self, sequences: Sequence[np.ndarray]) -> float:
+        """Total log-likelihood of the sequences under the model."""
+        sequences = [np.asarray(seq, dtype=np.float64) for seq in sequences if len(seq)]
+        if not sequences:
+            return 0.0
+        chain, kinds = self._chain(sequences)
+        alpha = self._forward(*self._chunked(self._log_emissions(chain), kinds))
+        return float(_logsumexp(alpha[-1, -1], axis=0))
+
+    def decode(self, sequences: Sequence[np.ndarray]) -> List[np.ndarray]:
+        """Most likely state path per sequence (batched Viterbi)."""
+        keep = [index for index, seq in enumerate(sequences) if len(seq)]
+        paths: List[np.ndarray] = [np.empty(0, dtype=np.int64) for _ in sequences]
+        if not keep:
+            return paths
+        batch, lengths = self._batch([np.asarray(sequences[index], dtype=np.float64) for index in keep])
+        log_b = self._log_emissions(batch)
+        log_a = np.log(self.transitions)
+        n_seq, steps, k = log_b.shape
+
+        score = np.log(self.start_prob) + log_b[:, 0]
+        back = np.zeros((n_seq, steps, k), dtype=np.int32)
+        best_end = score.copy()
+        for t in range(1, steps):
+            candidates = score[:, :, None] + log_a
+            back[:, t] = np.argmax(candidates, axis=1)
+            score = np.max(candidates, axis=1) + log_b[:, t]
+            ending = lengths == t + 1
+            best_end[ending] = score[ending]
+
+        for row, index in enumerate(keep):
+            length = int(lengths[row])
+            path = np.empty(length, dtype=np.int64)
+            path[-1] = int(np.argmax(best_end[row]))
+            for t in range(length - 1, 0, -1):
+                path[t - 1] = back[row, t, path[t]]
+            paths[index] = path
+        return paths
+
+    # -- persistence -------------------------------------------------------------------------
+
+    def to_dict(self) -> Dict:
+        return {
+            "n_states": self.n_states,
+            "features": list(HMM_FEATURES),
+            "feature_mean": self.feature_mean.tolist(),
+            "feature_std": self.feature_std.tolist(),
+            "start_prob": self.start_prob.tolist(),
+            "transition_matrix": self.transitions.tolist(),
+            "means": self.means.tolist(),
+            "variances": self.variances.tolist(),
+            "log_likelihood": self.log_likelihood,
+            "iterations": self.iterations,
+            "converged": self.converged,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "GaussianHMM":
+        model = cls(n_states=int(data["n_states"]))
+        model.feature_mean = np.asarray(data["feature_mean"], dtype=np.float64)
+        model.feature_std = np.asarray(data["feature_std"], dtype=np.float64)
+        model.start_prob = np.asarray(data["start_prob"], dtype=np.float64)
+        model.transitions = np.asarray(data["transition_matrix"], dtype=np.float64)
+        model.means = np.asarray(data["means"], dtype=np.float64)
+        model.variances = np.asarray(data["variances"], dtype=np.float64)
+        model.log_likelihood = data.get("log_likelihood")
+        model.iterations = int(data.get("iterations", 0))
+        model.converged = bool(data.get("converged", False))
+        return model
+
+    def save(self, path: Path) -> None:
+        write_json_atomic(path, self.to_dict())
+
+    @classmethod
+    def load(cls, path: Path) -> "GaussianHMM":
+        return cls.from_dict(json.loads(path.read_text(encoding="utf-8")))
+
+
+def prosody_observations(prosody: Dict) -> Tuple[Dict, np.ndarray]:
+    """(ordered columns, raw observation matrix) for one prosody.json dict."""
+    columns = sequence_states(sequence_columns(prosody.get("features", [])))["columns"]
+    return columns, observation_matrix(columns)
+
+
+def fit_prosody_hmm(
+    prosodies: Sequence[Dict],
+    n_states: int = DEFAULT_STATES,
+    n_iter: int = DEFAULT_ITERATIONS,
+) -> GaussianHMM:
+    """Fit one HMM across several meetings' prosody dicts (each meeting is one sequence)."""
+    sequences = [prosody_observations(prosody)[1] for prosody in prosodies]
+    return GaussianHMM(n_states=n_states, n_iter=n_iter).fit(sequences)
+
+
+def _describe_states(model: GaussianHMM, columns: Dict, path: np.ndarray) -> List[Dict]:
+    """Per-state summary in original units, labelled with the heuristic vocabulary."""
+    raw_means = model.means * model.feature_std + model.feature_mean
+    present = np.sort(columns["rms_mean"][columns["has_rms"]])
+    low_cut = float(present[len(present) // 3]) if len(present) else 0.0
+    high_cut = float(present[min((2 * len(present)) // 3, len(present) - 1)]) if len(present) else 0.0
+    counts = np.bincount(path, minlength=model.n_states) if len(path) else np.zeros(model.n_states, dtype=np.int64)
+
+    states: List[Dict] = []
+    for state in range(model.n_states):
+        rms = float(np.exp(raw_means[state, 0]))
+        pause_before = float(np.expm1(raw_means[state, 1]))
+        pause_after = float(np.expm1(raw_means[state, 2]))
+        label = _state_label(_energy_bucket(rms, low_cut, high_cut), _pause_bucket(pause_before + pause_after))
+        states.append(
+            {
+                "state": state,
+                "label": label,
+                "typical_rms": rms,
+                "typical_pause_before_s": pause_before,
+                "typical_pause_after_s": pause_after,
+                "typical_duration_s": float(np.exp(raw_means[state, 3])),
+                "share": float(counts[state] / len(path)) if len(path) else 0.0,
+            }
+        )
+    return states
+
+
+def build_prosody_hmm(
+    prosody: Dict,
+    output_path: Path,
+    model: Optional[GaussianHMM] = None,
+    n_states: int = DEFAULT_STATES,
+) -> Dict:
+    """
+    Decode the meeting's prosody observations with a Gaussian HMM and write prosody_hmm.json.
+
+    The trained counterpart of the threshold states in prosody_model.json: segments are
+    described by log RMS, log pauses and log duration; `model` (e.g. fitted across many
+    meetings with `fit_prosody_hmm`) is used as given, otherwise one is fitted on this
+    meeting alone. States are numbered by rising typical energy and carry the nearest
+    heuristic label for readability.
+    """
+    columns, observations = prosody_observations(prosody)
+    speakers = columns["speakers"]
+
+    fitted: Optional[GaussianHMM] = model
+    if fitted is None and len(observations):
+        fitted = GaussianHMM(n_states=n_states).fit([observations])
+
+    rows: List[Dict] = []
+    states: List[Dict] = []
+    log_likelihood: Optional[float] = None
+    if fitted is not None and len(observations):
+        path = fitted.decode([observations])[0]
+        log_likelihood = fitted.score([observations])
+        states = _describe_states(fitted, columns, path)
+        for segment_id, speaker, start, end, state in zip(
+            columns["segment_id"].tolist(),
+            columns["speaker"].tolist(),
+            columns["start"].tolist(),
+            columns["end"].tolist(),
+            path.tolist(),
+        ):
+            rows.append(
+                {
+                    "segment_id": segment_id,
+                    "speaker": speakers[speaker],
+                    "start": start,
+                    "end": end,
+                    "state": state,
+                    "state_label": states[state]["label"],
+                }
+            )
+
+    result = {
+        "audio_path": prosody.get("audio_path"),
+        "method": HMM_METHOD,
+        "source_prosody_method": prosody.get("method"),
+        "model": fitted.to_dict() if fitted is not None else None,
+        "pretrained": model is not None,
+        "log_likelihood": log_likelihood,
+        "states": states,
+        "sequence": {"length": len(rows), "observations": rows},
+    }
+    write_json_atomic(output_path, result)
+    return result
@@ -1,9 +1,23 @@
 from __future__ import annotations
 
-import json
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
+from meeting_summarizer.io.atomic import write_json_atomic
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without numpy installed
+    np = None
+
+SEQUENCE_ENGINES = ("auto", "numpy", "python")
+SEQUENCE_METHOD = "prosody_sequence_v1"
+SEQUENCE_NOTES = "Prototype HMM-style discretization over prosody observations (not a trained HMM)."
+
+# Integer codes used by the columnar engine; "unknown" energy is last.
+ENERGY_BUCKETS = ("low", "medium", "high", "unknown")
+PAUSE_BUCKETS = ("short", "medium", "long")
+
 
 def _mean(values: List[float]) -> Optional[float]:
     if not values:
@@ -51,14 +65,20 @@ def _state_label(energy_bucket: str, pause_bucket: str) -> str:
     return "TRANSITIONAL"
 
 
-def build_prosody_sequence_model(prosody: Dict, output_path: Path) -> Dict:
-    """
-    Build speaker-level summaries and a prototype state sequence from prosody features.
+def _resolve_engine(engine: str) -> str:
+    if engine not in SEQUENCE_ENGINES:
+        raise ValueError(f"Unknown sequence engine: {engine!r} (expected one of {', '.join(SEQUENCE_ENGINES)})")
+    if engine == "auto":
+        return "numpy" if np is not None else "python"
+    if engine == "numpy" and np is None:
+        raise ValueError("Sequence engine 'numpy' requested but numpy is not installed")
+    return engine
 
-    This is an HMM-inspired prototype using discretized observations and transition stats.
-    """
+
+def _sequence_python(features_in: List[Dict]) -> Tuple[List[Dict], List[Dict], List[Dict], List[Dict]]:
+    """Row-at-a-time engine: (speaker_stats, observations, transition counts, probabilities)."""
     features: List[Dict] = sorted(
-        prosody.get("features", []),
+        features_in,
         key=lambda item: (float(item.get("start", 0.0)), float(item.get("end", 0.0))),
     )
 
@@ -156,20 +176,209 @@ def build_prosody_sequence_model(prosody: Dict, output_path: Path) -> Dict:
         for row in transition_count_rows
     ]
 
-    model = {
+    return speaker_stats, observations, transition_count_rows, transition_probability_rows
+
+
+def _state_table() -> List[List[str]]:
+    """State label for every (energy code, pause code) pair."""
+    return [[_state_label(energy, pause) for pause in PAUSE_BUCKETS] for energy in ENERGY_BUCKETS]
+
+
+def sequence_columns(features: List[Dict]) -> Dict:
+    """
+    Columns of the prosody feature rows, as read by the row engine: float arrays for
+    start / end / duration / pauses / rms (NaN where `rms_mean` is missing, see `has_rms`),
+    int64 segment ids, int64 speaker codes indexing the sorted `speakers` list.
+    """
+    n = len(features)
+    start = np.fromiter((float(item.get("start", 0.0)) for item in features), dtype=np.float64, count=n)
+    end = np.fromiter((float(item.get("end", 0.0)) for item in features), dtype=np.float64, count=n)
+    duration = np.fromiter((float(item.get("duration_s", 0.0)) for item in features), dtype=np.float64, count=n)
+    pause_before = np.fromiter((float(item.get("pause_before_s", 0.0)) for item in features), dtype=np.float64, count=n)
+    pause_after = np.fromiter((float(item.get("pause_after_s", 0.0)) for item in features), dtype=np.float64, count=n)
+    raw_rms = [item.get("rms_mean") for item in features]
+    has_rms = np.fromiter((value is not None for value in raw_rms), dtype=bool, count=n)
+    rms = np.fromiter((float(value) if value is not None else np.nan for value in raw_rms), dtype=np.float64, count=n)
+    segment_id = np.fromiter((int(item.get("segment_id", 0)) for item in features), dtype=np.int64, count=n)
+
+    names = [str(item.get("speaker", "UNKNOWN")) for item in features]
+    speakers = sorted(set(names))
+    lookup = {name: code for code, name in enumerate(speakers)}
+    speaker = np.fromiter((lookup[name] for name in names), dtype=np.int64, count=n)
+    return {
+        "start": start,
+        "end": end,
+        "duration_s": duration,
+        "pause_before_s": pause_before,
+        "pause_after_s": pause_after,
+        "rms_mean": rms,
+        "has_rms": has_rms,
+        "segment_id": segment_id,
+        "speaker": speaker,
+        "speakers": speakers,
+    }
+
+
+def sequence_states(columns: Dict) -> Dict:
+    """
+    The numeric core of the columnar engine, on columns from `sequence_columns`.
+
+    Rows are put in (start, end) order with a stable lexsort (skipped when they already
+    are); energy terciles come from
+    `np.partition` (the same order statistics `_energy_thresholds` picks); buckets and
+    states are integer codes; per-speaker sums use `np.bincount` (which adds in row order,
+    like the row engine); transitions are a dense states x states count matrix.
+    """
+    start, end = columns["start"], columns["end"]
+    step_start, step_end = np.diff(start), np.diff(end)
+    if np.all((step_start > 0) | ((step_start == 0) & (step_end >= 0))):
+        cols = dict(columns)  # already in order (the usual case for prosody.json)
+    else:
+        order = np.lexsort((end, start))
+        cols = {key: (value[order] if key != "speakers" else value) for key, value in columns.items()}
+    n = len(start)
+    n_speakers = len(cols["speakers"])
+
+    rms = cols["rms_mean"]
+    has_rms = cols["has_rms"]
+    low_cut, high_cut = 0.0, 0.0
+    present = rms[has_rms]
+    if len(present):
+        low_idx = len(present) // 3
+        high_idx = min((2 * len(present)) // 3, len(present) - 1)
+        cuts = np.partition(present, (low_idx, high_idx))
+        low_cut, high_cut = float(cuts[low_idx]), float(cuts[high_idx])
+
+    energy = np.where(rms <= low_cut, 0, np.where(rms <= high_cut, 1, 2))
+    energy[~has_rms] = len(ENERGY_BUCKETS) - 1
+    pause_total = cols["pause_before_s"] + cols["pause_after_s"]
+    pause = np.where(pause_total < 0.15, 0, np.where(pause_total < 0.5, 1, 2))
+
+    table = _state_table()
+    state_names = sorted({label for row in table for label in row})
+    state_codes = np.array([[state_names.index(label) for label in row] for row in table], dtype=np.int64)
+    state = state_codes[energy, pause]
+
+    speaker = cols["speaker"]
+    segment_count = np.bincount(speaker, minlength=n_speakers)
+    rms_count = np.bincount(speaker[has_rms], minlength=n_speakers)
+    transitions = np.zeros((len(state_names), len(state_names)), dtype=np.int64)
+    if n > 1:
+        pairs = state[:-1] * len(state_names) + state[1:]
+        transitions = np.bincount(pairs, minlength=len(state_names) ** 2).reshape(len(state_names), len(state_names))
+
+    return {
+        "columns": cols,
+        "energy": energy,
+        "pause": pause,
+        "state": state,
+        "state_names": state_names,
+        "segment_count": segment_count,
+        "total_duration_s": np.bincount(speaker, weights=cols["duration_s"], minlength=n_speakers),
+        "rms_count": rms_count,
+        "rms_sum": np.bincount(speaker[has_rms], weights=rms[has_rms], minlength=n_speakers),
+        "pause_before_sum": np.bincount(speaker, weights=cols["pause_before_s"], minlength=n_speakers),
+        "pause_after_sum": np.bincount(speaker, weights=cols["pause_after_s"], minlength=n_speakers),
+        "transitions": transitions,
+    }
+
+
+def _sequence_numpy(features: List[Dict]) -> Tuple[List[Dict], List[Dict], List[Dict], List[Dict]]:
+    """Columnar engine; output is identical to `_sequence_python`."""
+    core = sequence_states(sequence_columns(features))
+    cols = core["columns"]
+    speakers = cols["speakers"]
+
+    speaker_stats: List[Dict] = []
+    for code, speaker in enumerate(speakers):
+        count = int(core["segment_count"][code])
+        rms_count = int(core["rms_count"][code])
+        speaker_stats.append(
+            {
+                "speaker": speaker,
+                "segment_count": count,
+                "total_duration_s": float(core["total_duration_s"][code]),
+                "avg_rms_mean": float(core["rms_sum"][code]) / rms_count if rms_count else None,
+                "avg_pause_before_s": float(core["pause_before_sum"][code]) / count if count else None,
+                "avg_pause_after_s": float(core["pause_after_sum"][code]) / count if count else None,
+            }
+        )
+
+    state_names = core["state_names"]
+    rms_values = [value if present else None for value, present in zip(cols["rms_mean"].tolist(), cols["has_rms"].tolist())]
+    observations = [
+        {
+            "segment_id": segment_id,
+            "speaker": speakers[speaker],
+            "start": start,
+            "end": end,
+            "rms_mean": rms_value,
+            "pause_before_s": pause_before,
+            "pause_after_s": pause_after,
+            "energy_bucket": ENERGY_BUCKETS[energy],
+            "pause_bucket": PAUSE_BUCKETS[pause],
+            "state_label": state_names[state],
+        }
+        for segment_id, speaker, start, end, rms_value, pause_before, pause_after, energy, pause, state in zip(
+            cols["segment_id"].tolist(),
+            cols["speaker"].tolist(),
+            cols["start"].tolist(),
+            cols["end"].tolist(),
+            rms_values,
+            cols["pause_before_s"].tolist(),
+            cols["pause_after_s"].tolist(),
+            core["energy"].tolist(),
+            core["pause"].tolist(),
+            core["state"].tolist(),
+        )
+    ]
+
+    transitions = core["transitions"].tolist()
+    transition_count_rows: List[Dict] = []
+    transition_probability_rows: List[Dict] = []
+    for i, start_state in enumerate(state_names):
+        outgoing = sum(transitions[i])
+        for j, end_state in enumerate(state_names):
+            if transitions[i][j]:
+                transition_count_rows.append({"from": start_state, "to": end_state, "count": transitions[i][j]})
+                transition_probability_rows.append(
+                    {"from": start_state, "to": end_state, "probability": transitions[i][j] / max(1, outgoing)}
+                )
+    return speaker_stats, observations, transition_count_rows, transition_probability_rows
+
+
+def sequence_model(prosody: Dict, engine: str = "auto") -> Dict:
+    """The prosody_model.json dict for `prosody`, without writing it (see `build_prosody_sequence_model`)."""
+    features = prosody.get("features", [])
+    if _resolve_engine(engine) == "numpy":
+        speaker_stats, observations, count_rows, probability_rows = _sequence_numpy(features)
+    else:
+        speaker_stats, observations, count_rows, probability_rows = _sequence_python(features)
+    return {
         "audio_path": prosody.get("audio_path"),
-        "method": "prosody_sequence_v1",
+        "method": SEQUENCE_METHOD,
         "source_prosody_method": prosody.get("method"),
         "speaker_stats": speaker_stats,
         "sequence": {
             "length": len(observations),
             "observations": observations,
-            "state_transition_counts": transition_count_rows,
-            "state_transition_probabilities": transition_probability_rows,
+            "state_transition_counts": count_rows,
+            "state_transition_probabilities": probability_rows,
         },
-        "notes": "Prototype HMM-style discretization over prosody observations (not a trained HMM).",
+        "notes": SEQUENCE_NOTES,
     }
 
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    output_path.write_text(json.dumps(model, indent=2), encoding="utf-8")
+
+def build_prosody_sequence_model(prosody: Dict, output_path: Path, engine: str = "auto") -> Dict:
+    """
+    Build speaker-level summaries and a prototype state sequence from prosody features.
+
+    This is an HMM-inspired prototype using discretized observations and transition stats.
+
+    `engine` picks the implementation: "numpy" (columnar: integer-coded speakers and
+    states, `np.bincount` aggregates, dense transition matrix), "python" (row at a time)
+    or "auto" (numpy when installed). Both produce the same JSON.
+    """
+    model = sequence_model(prosody, engine=engine)
+    write_json_atomic(output_path, model)
     return model
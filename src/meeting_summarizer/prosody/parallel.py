@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import TYPE_CHECKING, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from meeting_summarizer.audio.shared_audio import SharedAudio, open_shared_audio, shared_audio
+from meeting_summarizer.audio.wav_reader import DEFAULT_BLOCK_FRAMES, WavReader
+from meeting_summarizer.prosody.pitch import pitch_stats
+
+if TYPE_CHECKING:
+    from meeting_summarizer.audio.load_audio import AudioBuffer
+
+PitchRow = Tuple[Optional[float], Optional[float], Optional[float]]
+
+# Segments sent to a worker per task; large enough to amortize pickling, small enough to balance.
+DEFAULT_CHUNK_SEGMENTS = 32
+
+# Per-process view of the shared recording, set by `_attach_shared_audio`.
+_WORKER_AUDIO = None
+_WORKER_SHM: Optional[shared_memory.SharedMemory] = None
+_WORKER_SAMPLE_RATE = 0
+
+
+def _attach_shared_audio(spec: SharedAudio, sample_rate: int) -> None:
+    global _WORKER_AUDIO, _WORKER_SHM, _WORKER_SAMPLE_RATE
+    _WORKER_AUDIO, _WORKER_SHM = open_shared_audio(spec)
+    _WORKER_SAMPLE_RATE = int(sample_rate)
+
+
+def _pitch_chunk(bounds: Sequence[Tuple[int, int]]) -> List[PitchRow]:
+    return [pitch_stats(_WORKER_AUDIO[left:right], _WORKER_SAMPLE_RATE) for left, right in bounds]
+
+
+def parallel_pitch_stats(
+    source: "WavReader | AudioBuffer",
+    bounds: Sequence[Tuple[int, int]],
+    workers: int,
+    chunk_segments: int = DEFAULT_CHUNK_SEGMENTS,
+    block_frames: int = DEFAULT_BLOCK_FRAMES,
+) -> List[PitchRow]:
+    """
+    Compute `pitch_stats` for each (left, right) sample range on a process pool.
+
+    `source` (an open `WavReader` or an `AudioBuffer`) is shared with the workers without
+    per-worker copies: a memory-mapped cache buffer by its `.npy` path, anything else
+    decoded once into float32 shared memory (see `audio.shared_audio`). Rows come back in
+    `bounds` order and equal the serial path exactly, since `pitch_stats` works on the
+    float32 signal in both cases.
+    """
+    step = max(1, int(chunk_segments))
+    chunks = [list(bounds[i : i + step]) for i in range(0, len(bounds), step)]
+    with shared_audio(source, block_frames) as spec, ProcessPoolExecutor(
+        max_workers=max(1, int(workers)),
+        initializer=_attach_shared_audio,
+        initargs=(spec, source.sample_rate),
+    ) as pool:
+        rows: List[PitchRow] = []
+        for chunk_rows in pool.map(_pitch_chunk, chunks):
+            rows.extend(chunk_rows)
+    return rows
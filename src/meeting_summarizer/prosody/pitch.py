@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import math
+from typing import Optional, Tuple
+
+import numpy as np
+
+# YIN defaults tuned for conversational speech at 16 kHz.
+PITCH_FMIN_HZ = 60.0
+PITCH_FMAX_HZ = 400.0
+PITCH_HOP_S = 0.01
+PITCH_WINDOW_S = 0.025
+YIN_THRESHOLD = 0.15
+# Frames quieter than this RMS (full scale = 1.0) are treated as unvoiced without running YIN.
+PITCH_MIN_RMS = 0.005
+
+
+def frame_signal(samples, frame_length: int, hop_length: int):
+    """Return a read-only (n_frames, frame_length) strided view over `samples` (no copy)."""
+    samples = np.asarray(samples)
+    if len(samples) < frame_length:
+        return np.empty((0, frame_length), dtype=samples.dtype)
+    windows = np.lib.stride_tricks.sliding_window_view(samples, frame_length)
+    return windows[::hop_length]
+
+
+def _yin_difference(frames, window: int, max_lag: int):
+    """
+    Batched YIN difference function d(tau) for tau in [0, max_lag].
+
+    Each frame holds `window + max_lag` samples. The cross term sum_j x_j x_{j+tau} comes from
+    one real FFT per frame; the energy terms come from a cumulative sum of squares.
+    """
+    frames = np.asarray(frames, dtype=np.float64)
+    n_fft = 1 << int(math.ceil(math.log2(frames.shape[1] + window)))
+    head = np.fft.rfft(frames[:, :window], n=n_fft, axis=1)
+    full = np.fft.rfft(frames, n=n_fft, axis=1)
+    cross = np.fft.irfft(np.conj(head) * full, n=n_fft, axis=1)[:, : max_lag + 1]
+
+    energy = np.concatenate(
+        (np.zeros((frames.shape[0], 1)), np.cumsum(np.square(frames), axis=1)), axis=1
+    )
+    lags = np.arange(max_lag + 1)
+    energy_lagged = energy[:, lags + window] - energy[:, lags]
+    energy_head = energy[:, window : window + 1]
+    return np.maximum(0.0, energy_head + energy_lagged - 2.0 * cross)
+
+
+def _cumulative_mean_normalized(diff):
+    cmnd = np.ones_like(diff)
+    running = np.cumsum(diff[:, 1:], axis=1)
+    lags = np.arange(1, diff.shape[1])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cmnd[:, 1:] = np.where(running > 0.0, diff[:, 1:] * lags / running, 1.0)
+    return cmnd
+
+
+def estimate_f0(
+    samples,
+    sample_rate: int,
+    fmin_hz: float = PITCH_FMIN_HZ,
+    fmax_hz: float = PITCH_FMAX_HZ,
+    hop_s: float = PITCH_HOP_S,
+    window_s: float = PITCH_WINDOW_S,
+    threshold: float = YIN_THRESHOLD,
+    min_rms: float = PITCH_MIN_RMS,
+):
+    """
+    Frame-level F0 track (Hz) using YIN, with NaN for unvoiced frames.
+
+    All frames of `samples` are processed as one batch. Samples are cast to float32 first so
+    results depend only on the float32 signal, whichever buffer they were read from.
+    """
+    samples = np.asarray(samples, dtype=np.float32)
+    min_lag = max(2, int(sample_rate / fmax_hz))
+    max_lag = max(min_lag + 1, int(math.ceil(sample_rate / fmin_hz)))
+    window = max(max_lag, int(round(sample_rate * window_s)))
+    hop = max(1, int(round(sample_rate * hop_s)))
+
+    frames = frame_signal(samples, window + max_lag, hop)
+    if frames.shape[0] == 0:
+        return np.empty(0, dtype=np.float64)
+
+    f0 = np.full(frames.shape[0], np.nan)
+    rms = np.sqrt(np.mean(np.square(frames[:, :window], dtype=np.float64), axis=1))
+    loud = rms >= min_rms
+    if not np.any(loud):
+        return f0
+
+    cmnd = _cumulative_mean_normalized(_yin_difference(frames[loud], window, max_lag))
+
+    # First dip below the threshold, then walk to its local minimum: the first lag that is
+    # below threshold and not followed by a smaller value.
+    search = cmnd[:, min_lag:max_lag]
+    following = cmnd[:, min_lag + 1 : max_lag + 1]
+    candidates = (search < threshold) & (search <= following)
+    voiced = candidates.any(axis=1)
+    tau = np.argmax(candidates, axis=1) + min_lag
+
+    # Parabolic interpolation around the chosen lag for sub-sample precision.
+    rows = np.arange(cmnd.shape[0])
+    left = cmnd[rows, tau - 1]
+    centre = cmnd[rows, tau]
+    right = cmnd[rows, np.minimum(tau + 1, max_lag)]
+    denom = left - 2.0 * centre + right
+    with np.errstate(divide="ignore", invalid="ignore"):
+        shift = np.where(np.abs(denom) > 1e-12, 0.5 * (left - right) / denom, 0.0)
+    refined = tau + np.clip(shift, -1.0, 1.0)
+
+    loud_f0 = np.where(voiced, sample_rate / refined, np.nan)
+    f0[loud] = loud_f0
+    return f0
+
+
+def pitch_stats(samples, sample_rate: int) -> Tuple[Optional[float], Optional[float], Optional[float]]:
+    """Return (f0_mean, f0_std, voiced_ratio) for a segment; all None when it is shorter than one frame."""
+    f0 = estimate_f0(samples, sample_rate)
+    if len(f0) == 0:
+        return None, None, None
+    voiced = f0[~np.isnan(f0)]
+    voiced_ratio = float(len(voiced)) / len(f0)
+    if len(voiced) == 0:
+        return None, None, voiced_ratio
+    return float(voiced.mean()), float(voiced.std()), voiced_ratio
@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+import math
+from collections import deque
+from pathlib import Path
+from typing import Deque, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from meeting_summarizer.io.atomic import write_json_atomic
+from meeting_summarizer.prosody.energy_envelope import ENVELOPE_WINDOW_S, _windowed_rms_numpy, prefix_mean_std
+from meeting_summarizer.prosody.extract_prosody import (
+    PROSODY_METHOD,
+    PROSODY_PITCH_METHOD,
+    _feature_row,
+    _segment_sample_bounds,
+)
+
+# Audio history kept for segments that have not been emitted yet. A segment reaching further
+# back than this (from the newest sample) cannot be scored and raises ValueError.
+DEFAULT_RING_BUFFER_S = 120.0
+
+
+class StreamingProsodyExtractor:
+    """
+    Incremental counterpart of `extract_prosody_features` for live or near-live input.
+
+    Feed mono audio with `push_audio` (float samples in [-1, 1] at `sample_rate`) and closed
+    aligned segments with `push_segment`, in any interleaving but with segments in
+    (start, end) order. Each call returns the feature rows that became final: a row needs the
+    next segment (for `pause_after_s`) and the audio up to its end. `finish()` flushes the
+    rest and returns a dict equal to the batch `prosody.json` for the same audio and
+    segments (ASR-gap pauses; VAD pauses are batch-only).
+
+    Only the 20ms energy prefix sums and, with `extract_pitch`, raw samples from the oldest
+    pending segment onward are kept, capped at `ring_buffer_s` seconds.
+    """
+
+    def __init__(
+        self,
+        sample_rate: int,
+        audio_path: str = "",
+        extract_pitch: bool = False,
+        ring_buffer_s: float = DEFAULT_RING_BUFFER_S,
+    ) -> None:
+        self.sample_rate = int(sample_rate)
+        self.audio_path = str(audio_path)
+        self.extract_pitch = extract_pitch
+        self.window_size = max(1, int(self.sample_rate * ENVELOPE_WINDOW_S))
+        self.ring_frames = max(1, int(math.ceil(ring_buffer_s * self.sample_rate / self.window_size)))
+
+        # cumsum[i - cum_offset] = sum of frame RMS over frames [0, i)
+        self._cumsum: List[float] = [0.0]
+        self._cumsum_sq: List[float] = [0.0]
+        self._cum_offset = 0
+        self._frames_done = 0
+        self._partial = np.empty(0, dtype=np.float64)
+        self._samples_received = 0
+
+        self._audio = np.empty(0, dtype=np.float64)
+        self._audio_offset = 0
+
+        self._pending: Deque[Dict] = deque()
+        self._prev_segment: Optional[Dict] = None
+        self._last_key: Optional[Tuple[float, float]] = None
+        self._emitted = 0
+        self._features: List[Dict] = []
+        self._finished = False
+
+    @property
+    def received_s(self) -> float:
+        """Seconds of audio pushed so far."""
+        return self._samples_received / float(self.sample_rate)
+
+    # -- input -------------------------------------------------------------------------------
+
+    def push_audio(self, samples) -> List[Dict]:
+        self._check_open()
+        chunk = np.asarray(samples)
+        if len(chunk) == 0:
+            return []
+        if self.extract_pitch:
+            self._audio = np.concatenate((self._audio, chunk))
+
+        data = np.concatenate((self._partial, chunk))
+        full = len(data) // self.window_size
+        if full:
+            self._append_frames(_windowed_rms_numpy(data[: full * self.window_size], self.window_size))
+        self._partial = data[full * self.window_size :]
+        self._samples_received += len(chunk)
+
+        rows = self._drain(final=False)
+        self._trim()
+        return rows
+
+    def push_segment(self, segment: Dict) -> List[Dict]:
+        self._check_open()
+        start = float(segment.get("start", 0.0))
+        key = (start, float(segment.get("end", 0.0)))
+        if self._last_key is not None and key < self._last_key:
+            raise ValueError("Segments must be pushed in (start, end) order")
+        self._last_key = key
+        self._pending.append(segment)
+
+        rows = self._drain(final=False)
+        self._trim()
+        return rows
+
+    def finish(self, output_path: Optional[Path] = None) -> Dict:
+        """Flush remaining rows and return (and optionally write) the full prosody dict."""
+        if not self._finished:
+            if len(self._partial):
+                self._append_frames(_windowed_rms_numpy(self._partial, self.window_size))
+                self._partial = self._partial[:0]
+            self._drain(final=True)
+            self._finished = True
+
+        result = {
+            "audio_path": self.audio_path,
+            "method": PROSODY_PITCH_METHOD if self.extract_pitch else PROSODY_METHOD,
+            "sample_rate_hz": self.sample_rate,
+            "audio_read_error": None,
+            "features": self._features,
+        }
+        if output_path is not None:
+            write_json_atomic(output_path, result)
+        return result
+
+    # -- internals ---------------------------------------------------------------------------
+
+    def _check_open(self) -> None:
+        if self._finished:
+            raise ValueError("StreamingProsodyExtractor is already finished")
+
+    def _append_frames(self, frame_rms) -> None:
+        # Seeding np.cumsum with the running total repeats the batch path's sequential sums.
+        sums = np.cumsum(np.concatenate(([self._cumsum[-1]], frame_rms)))[1:]
+        sums_sq = np.cumsum(np.concatenate(([self._cumsum_sq[-1]], np.square(frame_rms))))[1:]
+        self._cumsum.extend(sums.tolist())
+        self._cumsum_sq.extend(sums_sq.tolist())
+        self._frames_done += len(frame_rms)
+
+    def _prefix(self, frame: int) -> Tuple[float, float]:
+        idx = frame - self._cum_offset
+        if idx < 0:
+            raise ValueError("Segment reaches audio older than the ring buffer; increase ring_buffer_s")
+        return self._cumsum[idx], self._cumsum_sq[idx]
+
+    def _segment_bounds(self, row: Dict, final: bool) -> Optional[Tuple[int, int]]:
+        """Sample bounds for the row, or None while its audio is still incomplete."""
+        if final:
+            return _segment_sample_bounds(row["start"], row["end"], self.sample_rate, self._samples_received)
+        left, right = _segment_sample_bounds(row["start"], row["end"], self.sample_rate, 1 << 62)
+        needed_frames = -(-right // self.window_size) if right > left else 0
+        if self._frames_done < needed_frames:
+            return None
+        return left, right
+
+    def _drain(self, final: bool) -> List[Dict]:
+        emitted: List[Dict] = []
+        while self._pending:
+            segment = self._pending[0]
+            next_segment = self._pending[1] if len(self._pending) > 1 else None
+            if next_segment is None and not final:
+                break
+
+            row = _feature_row(self._emitted, segment, self._prev_segment, next_segment)
+            bounds = self._segment_bounds(row, final)
+            if bounds is None:
+                break
+            left, right = bounds
+
+            if self._samples_received > 0:
+                lo = max(0, min(self._frames_done, left // self.window_size))
+                hi = max(lo, min(self._frames_done, -(-right // self.window_size))) if right > left else lo
+                if hi > lo:
+                    sum_lo, sum_sq_lo = self._prefix(lo)
+                    sum_hi, sum_sq_hi = self._prefix(hi)
+                    row["rms_mean"], row["rms_std"] = prefix_mean_std(sum_lo, sum_hi, sum_sq_lo, sum_sq_hi, hi - lo)
+
+            if self.extract_pitch:
+                from meeting_summarizer.prosody.pitch import pitch_stats
+
+                if left < self._audio_offset:
+                    raise ValueError("Segment reaches audio older than the ring buffer; increase ring_buffer_s")
+                samples = self._audio[left - self._audio_offset : right - self._audio_offset]
+                f0_mean, f0_std, voiced_ratio = pitch_stats(samples, self.sample_rate)
+                row.update({"f0_mean": f0_mean, "f0_std": f0_std, "voiced_ratio": voiced_ratio})
+
+            self._features.append(row)
+            emitted.append(row)
+            self._prev_segment = segment
+            self._pending.popleft()
+            self._emitted += 1
+        return emitted
+
+    def _trim(self) -> None:
+        """Drop prefix sums and samples that no pending or future segment can reach."""
+        if self._pending:
+            keep_start = float(self._pending[0].get("start", 0.0))
+        elif self._last_key is not None:
+            keep_start = self._last_key[0]
+        else:
+            keep_start = 0.0
+        keep_frame = max(0, int(math.floor(keep_start * self.sample_rate)) // self.window_size)
+        keep_frame = max(keep_frame, self._frames_done - self.ring_frames)
+
+        drop = min(keep_frame - self._cum_offset, len(self._cumsum) - 1)
+        if drop > 0 and drop * 2 >= len(self._cumsum):
+            del self._cumsum[:drop]
+            del self._cumsum_sq[:drop]
+            self._cum_offset += drop
+
+        if self.extract_pitch:
+            drop_samples = min(keep_frame * self.window_size - self._audio_offset, len(self._audio))
+            if drop_samples > 0 and drop_samples * 2 >= len(self._audio):
+                self._audio = self._audio[drop_samples:].copy()
+                self._audio_offset += drop_samples
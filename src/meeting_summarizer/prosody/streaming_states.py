@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+import bisect
+from fractions import Fraction
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from meeting_summarizer.io.atomic import write_json_atomic
+from meeting_summarizer.prosody.corpus_stats import SKETCH_RELATIVE_ACCURACY, QuantileSketch
+from meeting_summarizer.prosody.model_sequence import (
+    SEQUENCE_NOTES,
+    _energy_bucket,
+    _pause_bucket,
+    _state_label,
+)
+
+STREAMING_SEQUENCE_METHOD = "prosody_sequence_stream_v1"
+# Energy cut points: the values at ranks n // 3 and 2n // 3, as in `_energy_thresholds`.
+ENERGY_TERCILES = (Fraction(1, 3), Fraction(2, 3))
+# Sorts before every real bucket key; stands for the sketch's zero bucket.
+_ZERO_KEY = float("-inf")
+
+
+class StreamingQuantiles:
+    """
+    Running quantiles of a value stream with a relative-error guarantee.
+
+    Values go into a `QuantileSketch`; each tracked quantile q keeps a pointer to the
+    bucket holding rank floor(q * n) plus the count below that bucket. A new value shifts
+    both the target rank and the count below by at most one, so the pointer moves at most
+    a bucket or two per value (amortized O(1)); a bucket seen for the first time costs one
+    insertion into the sorted bucket list, and there are only O(log(max / min)) of those.
+
+    `values()` are within `relative_accuracy` of the exact order statistics of everything
+    added so far (values at or below SKETCH_MIN_VALUE read as 0.0).
+    """
+
+    def __init__(self, quantiles: Sequence[float], relative_accuracy: float = SKETCH_RELATIVE_ACCURACY) -> None:
+        self.quantiles = tuple(Fraction(q).limit_denominator(1000) for q in quantiles)
+        if any(not 0 <= q <= 1 for q in self.quantiles):
+            raise ValueError("quantiles must be between 0 and 1")
+        self.sketch = QuantileSketch(relative_accuracy)
+        self.count = 0
+        self._keys: List[float] = []
+        self._position = [0] * len(self.quantiles)
+        self._below = [0] * len(self.quantiles)
+
+    def _bucket_count(self, key: float) -> int:
+        return self.sketch.zero_count if key == _ZERO_KEY else self.sketch.bins[int(key)]
+
+    def add(self, value: float) -> None:
+        index = self.sketch.add(float(value))
+        key = _ZERO_KEY if index is None else index
+        self.count += 1
+
+        slot = bisect.bisect_left(self._keys, key)
+        if slot == len(self._keys) or self._keys[slot] != key:
+            self._keys.insert(slot, key)
+            if len(self._keys) > 1:
+                self._position = [position + (slot <= position) for position in self._position]
+
+        for tracker, q in enumerate(self.quantiles):
+            position, below = self._position[tracker], self._below[tracker]
+            if key < self._keys[position]:
+                below += 1
+            target = min((self.count * q.numerator) // q.denominator, self.count - 1)
+            while target < below:
+                position -= 1
+                below -= self._bucket_count(self._keys[position])
+            while target >= below + self._bucket_count(self._keys[position]):
+                below += self._bucket_count(self._keys[position])
+                position += 1
+            self._position[tracker], self._below[tracker] = position, below
+
+    def values(self) -> List[Optional[float]]:
+        if self.count == 0:
+            return [None] * len(self.quantiles)
+        return [
+            0.0 if self._keys[position] == _ZERO_KEY else self.sketch.estimate(int(self._keys[position]))
+            for position in self._position
+        ]
+
+
+class StreamingStateLabeler:
+    """
+    Incremental counterpart of `build_prosody_sequence_model`: labels prosody feature rows
+    with energy / pause buckets and states as they arrive (e.g. from
+    `StreamingProsodyExtractor`), instead of waiting for every RMS value to sort them.
+
+    Energy cut points are the running terciles of the RMS values seen so far, including the
+    current row, from `StreamingQuantiles`, so each is within `relative_accuracy` of the
+    exact tercile `_energy_thresholds` would compute over the same prefix. Emitted labels
+    are final; early rows are judged against the terciles known at the time, so they can
+    differ from a batch run over the whole meeting.
+
+    Rows are expected in (start, end) order; speaker stats and transitions are running sums.
+    """
+
+    def __init__(
+        self,
+        audio_path: Optional[str] = None,
+        source_method: Optional[str] = None,
+        relative_accuracy: float = SKETCH_RELATIVE_ACCURACY,
+    ) -> None:
+        self.audio_path = audio_path
+        self.source_method = source_method
+        self._terciles = StreamingQuantiles(ENERGY_TERCILES, relative_accuracy)
+        self._speakers: Dict[str, Dict[str, float]] = {}
+        self._transitions: Dict[Tuple[str, str], int] = {}
+        self._previous_state: Optional[str] = None
+        self.observations: List[Dict] = []
+
+    @property
+    def energy_thresholds(self) -> Tuple[float, float]:
+        low, high = self._terciles.values()
+        return (low or 0.0, high or 0.0)
+
+    def push(self, feature: Dict) -> Dict:
+        """Label one prosody feature row; returns its prosody_model.json observation row."""
+        speaker = str(feature.get("speaker", "UNKNOWN"))
+        duration = float(feature.get("duration_s", 0.0))
+        pause_before = float(feature.get("pause_before_s", 0.0))
+        pause_after = float(feature.get("pause_after_s", 0.0))
+        rms_mean = feature.get("rms_mean")
+        rms_value: Optional[float] = float(rms_mean) if rms_mean is not None else None
+
+        if rms_value is not None:
+            self._terciles.add(rms_value)
+        low_cut, high_cut = self.energy_thresholds
+        energy = _energy_bucket(rms_value, low_cut, high_cut)
+        pause = _pause_bucket(pause_before + pause_after)
+        state = _state_label(energy, pause)
+
+        acc = self._speakers.setdefault(
+            speaker,
+            {"segment_count": 0, "total_duration_s": 0.0, "rms_count": 0, "rms_sum": 0.0,
+             "pause_before_sum": 0.0, "pause_after_sum": 0.0},
+        )
+        acc["segment_count"] += 1
+        acc["total_duration_s"] += duration
+        acc["pause_before_sum"] += pause_before
+        acc["pause_after_sum"] += pause_after
+        if rms_value is not None:
+            acc["rms_count"] += 1
+            acc["rms_sum"] += rms_value
+
+        if self._previous_state is not None:
+            key = (self._previous_state, state)
+            self._transitions[key] = self._transitions.get(key, 0) + 1
+        self._previous_state = state
+
+        row = {
+            "segment_id": int(feature.get("segment_id", 0)),
+            "speaker": speaker,
+            "start": float(feature.get("start", 0.0)),
+            "end": float(feature.get("end", 0.0)),
+            "rms_mean": rms_value,
+            "pause_before_s": pause_before,
+            "pause_after_s": pause_after,
+            "energy_bucket": energy,
+            "pause_bucket": pause,
+            "state_label": state,
+        }
+        self.observations.append(row)
+        return row
+
+    def finish(self, output_path: Optional[Path] = None) -> Dict:
+        """prosody_model.json-shaped dict of everything pushed (written to `output_path` if given)."""
+        speaker_stats = [
+            {
+                "speaker": speaker,
+                "segment_count": int(acc["segment_count"]),
+                "total_duration_s": acc["total_duration_s"],
+                "avg_rms_mean": acc["rms_sum"] / acc["rms_count"] if acc["rms_count"] else None,
+                "avg_pause_before_s": acc["pause_before_sum"] / acc["segment_count"],
+                "avg_pause_after_s": acc["pause_after_sum"] / acc["segment_count"],
+            }
+            for speaker, acc in sorted(self._speakers.items())
+        ]
+        outgoing: Dict[str, int] = {}
+        for (start_state, _end_state), count in self._transitions.items():
+            outgoing[start_state] = outgoing.get(start_state, 0) + count
+        ordered = sorted(self._transitions.items())
+        result = {
+            "audio_path": self.audio_path,
+            "method": STREAMING_SEQUENCE_METHOD,
+            "source_prosody_method": self.source_method,
+            "speaker_stats": speaker_stats,
+            "energy_thresholds": list(self.energy_thresholds),
+            "sequence": {
+                "length": len(self.observations),
+                "observations": self.observations,
+                "state_transition_counts": [
+                    {"from": start, "to": end, "count": count} for (start, end), count in ordered
+                ],
+                "state_transition_probabilities": [
+                    {"from": start, "to": end, "probability": count / outgoing[start]}
+                    for (start, end), count in ordered
+                ],
+            },
+            "notes": SEQUENCE_NOTES,
+        }
+        if output_path is not None:
+            write_json_atomic(output_path, result)
+        return result
@@ -0,0 +1,314 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+SEARCH_SCHEMA_VERSION = 1
+# Run outputs read by the index; a run is re-ingested when any of them changes.
+INDEXED_FILES = ("segments.json", "prosody.json", "summary.md")
+DEFAULT_LIMIT = 20
+# "relevance": best BM25 match first; "time": meeting (ingest) then time order, which FTS5
+# streams in rowid order and stops at `limit`, so it stays fast for very common words.
+SEARCH_ORDERS = ("relevance", "time")
+SNIPPET_TOKENS = 12
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meetings (
+    meeting_id INTEGER PRIMARY KEY,
+    run_dir TEXT NOT NULL UNIQUE,
+    audio_path TEXT,
+    fingerprint TEXT NOT NULL,
+    segment_count INTEGER NOT NULL,
+    summary TEXT NOT NULL DEFAULT '',
+    indexed_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS segments (
+    rowid INTEGER PRIMARY KEY,
+    meeting_id INTEGER NOT NULL REFERENCES meetings(meeting_id) ON DELETE CASCADE,
+    segment_id INTEGER NOT NULL,
+    speaker TEXT NOT NULL,
+    start REAL NOT NULL,
+    end REAL NOT NULL,
+    text TEXT NOT NULL,
+    rms_mean REAL,
+    pause_before_s REAL,
+    pause_after_s REAL
+);
+CREATE INDEX IF NOT EXISTS segments_by_speaker ON segments(speaker, meeting_id, start);
+CREATE INDEX IF NOT EXISTS segments_by_time ON segments(meeting_id, start);
+CREATE VIRTUAL TABLE IF NOT EXISTS segments_fts USING fts5(
+    text, content='segments', content_rowid='rowid', tokenize='porter unicode61'
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS summaries_fts USING fts5(
+    summary, content='meetings', content_rowid='meeting_id', tokenize='porter unicode61'
+);
+CREATE TRIGGER IF NOT EXISTS segments_fts_insert AFTER INSERT ON segments BEGIN
+    INSERT INTO segments_fts(rowid, text) VALUES (new.rowid, new.text);
+END;
+CREATE TRIGGER IF NOT EXISTS segments_fts_delete AFTER DELETE ON segments BEGIN
+    INSERT INTO segments_fts(segments_fts, rowid, text) VALUES ('delete', old.rowid, old.text);
+END;
+CREATE TRIGGER IF NOT EXISTS summaries_fts_insert AFTER INSERT ON meetings BEGIN
+    INSERT INTO summaries_fts(rowid, summary) VALUES (new.meeting_id, new.summary);
+END;
+CREATE TRIGGER IF NOT EXISTS summaries_fts_delete AFTER DELETE ON meetings BEGIN
+    INSERT INTO summaries_fts(summaries_fts, rowid, summary) VALUES ('delete', old.meeting_id, old.summary);
+END;
+"""
+
+
+def _match_expression(query: str) -> str:
+    """
+    Free text -> FTS5 query: every whitespace-separated word must appear (implicit AND),
+    each quoted so punctuation and FTS operators in user input are taken literally.
+    A trailing `*` keeps its prefix-match meaning.
+    """
+    terms = []
+    for word in query.split():
+        prefix = word.endswith("*") and len(word) > 1
+        word = word.rstrip("*") if prefix else word
+        terms.append('"' + word.replace('"', '""') + '"' + ("*" if prefix else ""))
+    return " ".join(terms)
+
+
+def _fingerprint(run_dir: Path) -> str:
+    """Size and mtime of each indexed file, so unchanged runs are skipped without reading them."""
+    parts = []
+    for name in INDEXED_FILES:
+        path = run_dir / name
+        if path.exists():
+            stat = path.stat()
+            parts.append(f"{name}:{stat.st_size}:{stat.st_mtime_ns}")
+        else:
+            parts.append(f"{name}:-")
+    return "|".join(parts)
+
+
+def _read_json(path: Path) -> Optional[Dict]:
+    if not path.exists():
+        return None
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+class MeetingIndex:
+    """
+    Cross-meeting search over pipeline run directories, in one SQLite database.
+
+    Segment text (from segments.json, with RMS and pauses joined in from prosody.json)
+    and summary.md go into FTS5 tables kept in sync by triggers; B-tree indexes on
+    (speaker, meeting, start) and (meeting, start) serve speaker and time filters.
+    Ingestion is incremental: a run is identified by its directory and re-read only when
+    the size or mtime of one of its INDEXED_FILES changed.
+
+        with MeetingIndex(Path("outputs/search.db")) as index:
+            index.ingest_tree(Path("outputs"))
+            index.search("budget", speaker="SPEAKER_2")
+    """
+
+    def __init__(self, db_path: Path) -> None:
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(str(self.db_path))
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        self.connection.execute("PRAGMA journal_mode = WAL")
+        self.connection.execute("PRAGMA synchronous = NORMAL")
+        version = self.connection.execute("PRAGMA user_version").fetchone()[0]
+        if version not in (0, SEARCH_SCHEMA_VERSION):
+            raise ValueError(f"{self.db_path} has search schema v{version}, expected v{SEARCH_SCHEMA_VERSION}")
+        self.connection.executescript(_SCHEMA)
+        self.connection.execute(f"PRAGMA user_version = {SEARCH_SCHEMA_VERSION}")
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def __enter__(self) -> "MeetingIndex":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    # Ingestion
+
+    def add_meeting(
+        self,
+        run_dir: str,
+        aligned: Dict,
+        prosody: Optional[Dict] = None,
+        summary: str = "",
+        fingerprint: str = "",
+    ) -> int:
+        """Index (or re-index) one meeting from its parsed outputs; returns its meeting_id."""
+        features = {
+            int(row.get("segment_id", -1)): row for row in (prosody or {}).get("features", [])
+        }
+        audio_path = aligned.get("audio_path") or (prosody or {}).get("audio_path")
+        segments = aligned.get("segments", [])
+        with self.connection:
+            self.connection.execute("DELETE FROM meetings WHERE run_dir = ?", (run_dir,))
+            cursor = self.connection.execute(
+                "INSERT INTO meetings (run_dir, audio_path, fingerprint, segment_count, summary, indexed_at)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (run_dir, audio_path, fingerprint, len(segments), summary, time.time()),
+            )
+            meeting_id = int(cursor.lastrowid)
+            rows = []
+            for index, segment in enumerate(segments):
+                segment_id = int(segment.get("id", index))
+                feature = features.get(segment_id, {})
+                rows.append(
+                    (
+                        meeting_id,
+                        segment_id,
+                        str(segment.get("speaker", "UNKNOWN")),
+                        float(segment.get("start", 0.0)),
+                        float(segment.get("end", segment.get("start", 0.0))),
+                        str(segment.get("text") or "").strip(),
+                        feature.get("rms_mean"),
+                        feature.get("pause_before_s"),
+                        feature.get("pause_after_s"),
+                    )
+                )
+            self.connection.executemany(
+                "INSERT INTO segments (meeting_id, segment_id, speaker, start, end, text,"
+                " rms_mean, pause_before_s, pause_after_s) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+        return meeting_id
+
+    def ingest_run(self, run_dir: Path) -> bool:
+        """Index a run directory if it is new or changed; False when it was already current."""
+        run_dir = Path(run_dir)
+        key = str(run_dir.resolve())
+        fingerprint = _fingerprint(run_dir)
+        current = self.connection.execute(
+            "SELECT fingerprint FROM meetings WHERE run_dir = ?", (key,)
+        ).fetchone()
+        if current is not None and current["fingerprint"] == fingerprint:
+            return False
+        aligned = _read_json(run_dir / "segments.json") or {"segments": []}
+        summary_path = run_dir / "summary.md"
+        summary = summary_path.read_text(encoding="utf-8") if summary_path.exists() else ""
+        self.add_meeting(key, aligned, _read_json(run_dir / "prosody.json"), summary, fingerprint)
+        return True
+
+    def ingest_tree(self, root: Path) -> Dict[str, int]:
+        """Ingest every run directory (one holding segments.json) under `root`."""
+        counts = {"indexed": 0, "unchanged": 0}
+        for segments_path in sorted(Path(root).rglob("segments.json")):
+            counts["indexed" if self.ingest_run(segments_path.parent) else "unchanged"] += 1
+        return counts
+
+    def remove_missing(self) -> int:
+        """Drop meetings whose run directory no longer has a segments.json."""
+        gone = [
+            row["run_dir"]
+            for row in self.connection.execute("SELECT run_dir FROM meetings")
+            if not (Path(row["run_dir"]) / "segments.json").exists()
+        ]
+        with self.connection:
+            self.connection.executemany("DELETE FROM meetings WHERE run_dir = ?", [(run_dir,) for run_dir in gone])
+        return len(gone)
+
+    # Queries
+
+    def search(
+        self,
+        query: Optional[str] = None,
+        speaker: Optional[str] = None,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        run_dir: Optional[str] = None,
+        limit: int = DEFAULT_LIMIT,
+        order: str = "relevance",
+    ) -> List[Dict]:
+        """
+        Segments matching all given filters: `query` words (FTS5, stemmed), `speaker`
+        label, overlap with the [`start`, `end`] window in seconds, and one `run_dir` (as
+        stored: `ingest_run` keys runs by their resolved directory path).
+
+        With `query` and `order="relevance"`, the best BM25 matches come first; ranking
+        has to score every match, so a word said in most meetings costs far more than a
+        rare one. `order="time"` (and any search without `query`) returns matches in
+        meeting and time order instead, reading only as many rows as it needs.
+        """
+        if order not in SEARCH_ORDERS:
+            raise ValueError(f"Unknown order {order!r}; expected one of {', '.join(SEARCH_ORDERS)}")
+        conditions: List[str] = []
+        parameters: List = []
+        if speaker is not None:
+            conditions.append("s.speaker = ?")
+            parameters.append(speaker)
+        if start is not None:
+            conditions.append("s.end >= ?")
+            parameters.append(float(start))
+        if end is not None:
+            conditions.append("s.start <= ?")
+            parameters.append(float(end))
+        if run_dir is not None:
+            conditions.append("m.run_dir = ?")
+            parameters.append(run_dir)
+
+        columns = (
+            "m.run_dir, m.audio_path, s.segment_id, s.speaker, s.start, s.end, s.text,"
+            " s.rms_mean, s.pause_before_s, s.pause_after_s"
+        )
+        if query and query.strip():
+            sql = (
+                f"SELECT {columns}, bm25(segments_fts) AS score,"
+                f" snippet(segments_fts, 0, '[', ']', '...', {SNIPPET_TOKENS}) AS snippet"
+                " FROM segments_fts JOIN segments s ON s.rowid = segments_fts.rowid"
+                " JOIN meetings m ON m.meeting_id = s.meeting_id"
+                " WHERE segments_fts MATCH ?"
+            )
+            parameters.insert(0, _match_expression(query))
+            # Segment rowids follow ingest order: meetings one after another, each in time order.
+            order_by = "score, s.meeting_id, s.start" if order == "relevance" else "segments_fts.rowid"
+        else:
+            sql = (
+                f"SELECT {columns}, NULL AS score, NULL AS snippet"
+                " FROM segments s JOIN meetings m ON m.meeting_id = s.meeting_id WHERE 1"
+            )
+            order_by = "s.meeting_id, s.start"
+        for condition in conditions:
+            sql += " AND " + condition
+        sql += f" ORDER BY {order_by} LIMIT ?"
+        parameters.append(int(limit))
+        return [dict(row) for row in self.connection.execute(sql, parameters)]
+
+    def search_summaries(self, query: str, limit: int = DEFAULT_LIMIT) -> List[Dict]:
+        """Meetings whose summary.md matches `query`, best BM25 match first."""
+        sql = (
+            "SELECT m.run_dir, m.audio_path, m.segment_count, bm25(summaries_fts) AS score,"
+            f" snippet(summaries_fts, 0, '[', ']', '...', {SNIPPET_TOKENS}) AS snippet"
+            " FROM summaries_fts JOIN meetings m ON m.meeting_id = summaries_fts.rowid"
+            " WHERE summaries_fts MATCH ? ORDER BY score LIMIT ?"
+        )
+        return [dict(row) for row in self.connection.execute(sql, (_match_expression(query), int(limit)))]
+
+    def speakers(self, run_dir: Optional[str] = None) -> List[Dict]:
+        """Speaker labels with segment counts and talk time, overall or for one run."""
+        sql = "SELECT s.speaker, COUNT(*) AS segments, SUM(s.end - s.start) AS talk_time_s FROM segments s"
+        parameters: Iterable = ()
+        if run_dir is not None:
+            sql += " JOIN meetings m ON m.meeting_id = s.meeting_id WHERE m.run_dir = ?"
+            parameters = (run_dir,)
+        sql += " GROUP BY s.speaker ORDER BY s.speaker"
+        return [dict(row) for row in self.connection.execute(sql, parameters)]
+
+    def stats(self) -> Dict[str, int]:
+        meetings = self.connection.execute("SELECT COUNT(*) FROM meetings").fetchone()[0]
+        segments = self.connection.execute("SELECT COUNT(*) FROM segments").fetchone()[0]
+        return {"meetings": int(meetings), "segments": int(segments)}
+
+
+def update_search_index(db_path: Path, run_dir: Path) -> bool:
+    """Add or refresh one finished run in the search database at `db_path`."""
+    with MeetingIndex(db_path) as index:
+        return index.ingest_run(run_dir)
@@ -1,19 +1,122 @@
 from __future__ import annotations
 
+import heapq
+import math
 from pathlib import Path
 from typing import Dict, List, Optional
 
+from meeting_summarizer.topics.segment_topics import idf_weights, tokenize
+
+# TextRank (PageRank over segment similarity) settings for transcript highlights.
+HIGHLIGHT_DAMPING = 0.85
+HIGHLIGHT_ITERATIONS = 100
+HIGHLIGHT_TOLERANCE = 1e-9
+# Segments with fewer content words than this are skipped unless nothing else qualifies.
+MIN_HIGHLIGHT_TERMS = 3
+# Centrality multipliers for prosodically emphasized segments (from prosody_model.json).
+ACTIVE_SPEECH_BOOST = 0.5
+HIGH_ENERGY_BOOST = 0.25
+
+
+def _tfidf_rows(token_lists: List[List[str]], idf: Dict[str, float]) -> List[Dict[str, float]]:
+    """Sparse L2-normalized TF-IDF vector (term -> weight) per segment; {} for no content words."""
+    rows: List[Dict[str, float]] = []
+    for tokens in token_lists:
+        row: Dict[str, float] = {}
+        for token in tokens:
+            row[token] = row.get(token, 0.0) + idf[token]
+        norm = math.sqrt(sum(value * value for value in row.values()))
+        rows.append({token: value / norm for token, value in row.items()} if norm else {})
+    return rows
+
+
+def _similarity_times(rows: List[Dict[str, float]], vector: List[float]) -> List[float]:
+    """
+    (X X^T - I) v for the row-normalized TF-IDF matrix X, i.e. cosine-similarity weighted sums
+    over the other segments, computed as X (X^T v) in O(non-zeros) without forming X X^T.
+    """
+    totals: Dict[str, float] = {}
+    for row, weight in zip(rows, vector):
+        if weight:
+            for token, value in row.items():
+                totals[token] = totals.get(token, 0.0) + weight * value
+    return [
+        sum(value * totals.get(token, 0.0) for token, value in row.items()) - weight if row else 0.0
+        for row, weight in zip(rows, vector)
+    ]
+
+
+def _centrality(
+    rows: List[Dict[str, float]],
+    damping: float = HIGHLIGHT_DAMPING,
+    iterations: int = HIGHLIGHT_ITERATIONS,
+    tolerance: float = HIGHLIGHT_TOLERANCE,
+) -> List[float]:
+    """
+    TextRank / LexRank scores: PageRank over the cosine-similarity graph of the segments, by
+    power iteration. Each step is one sparse X (X^T v) product, so a pass is linear in the
+    number of non-zero TF-IDF entries rather than quadratic in the number of segments.
+    Segments similar to nothing else spread their rank uniformly (dangling nodes).
+    """
+    n = len(rows)
+    if n == 0:
+        return []
+    degree = _similarity_times(rows, [1.0] * n)
+    rank = [1.0 / n] * n
+    for _ in range(iterations):
+        share = [value / weight if weight > 1e-12 else 0.0 for value, weight in zip(rank, degree)]
+        dangling = sum(value for value, weight in zip(rank, degree) if weight <= 1e-12)
+        spread = _similarity_times(rows, share)
+        updated = [(1.0 - damping) / n + damping * (value + dangling / n) for value in spread]
+        change = sum(abs(new - old) for new, old in zip(updated, rank))
+        rank = updated
+        if change < tolerance:
+            break
+    return rank
+
+
+def _emphasis_boosts(prosody_model: Optional[Dict]) -> Dict[int, float]:
+    """Score multiplier per segment id from prosody: ACTIVE_SPEECH, or at least high energy."""
+    boosts: Dict[int, float] = {}
+    if not prosody_model:
+        return boosts
+    for row in prosody_model.get("sequence", {}).get("observations", []):
+        if row.get("state_label") == "ACTIVE_SPEECH":
+            boosts[int(row.get("segment_id", -1))] = 1.0 + ACTIVE_SPEECH_BOOST
+        elif row.get("energy_bucket") == "high":
+            boosts[int(row.get("segment_id", -1))] = 1.0 + HIGH_ENERGY_BOOST
+    return boosts
+
+
+def _collect_highlights(segments: List[Dict], max_items: int = 3, prosody_model: Optional[Dict] = None) -> List[str]:
+    """
+    The `max_items` most central transcript segments, best first.
+
+    Segments are ranked by TextRank centrality over sparse TF-IDF vectors, scaled by
+    prosodic emphasis from `prosody_model`, and the top ones are picked with a heap.
+    Segments with fewer than MIN_HIGHLIGHT_TERMS content words (greetings, mic checks,
+    "okay") are only used when nothing longer was said.
+    """
+    spoken = [segment for segment in segments if (segment.get("text") or "").strip()]
+    token_lists = [tokenize(str(segment["text"])) for segment in spoken]
+    candidates = [index for index, tokens in enumerate(token_lists) if len(tokens) >= MIN_HIGHLIGHT_TERMS]
+    if not candidates:
+        candidates = list(range(len(spoken)))
+
+    rows = _tfidf_rows(token_lists, idf_weights(token_lists))
+    rank = _centrality(rows)
+    boosts = _emphasis_boosts(prosody_model)
+    scores = {
+        index: rank[index] * boosts.get(int(spoken[index].get("id", -1)), 1.0) for index in candidates
+    }
+    # Ties (e.g. no shared vocabulary at all) go to the earlier segment.
+    best = heapq.nlargest(max_items, candidates, key=lambda index: (scores[index], -index))
 
-def _collect_highlights(segments: List[Dict], max_items: int = 3) -> List[str]:
     highlights: List[str] = []
-    for segment in segments:
-        text = (segment.get("text") or "").strip()
-        if not text:
-            continue
+    for index in best:
+        segment = spoken[index]
         speaker = str(segment.get("speaker", "UNKNOWN"))
-        highlights.append(f"- {speaker}: {text}")
-        if len(highlights) >= max_items:
-            break
+        highlights.append(f"- {speaker}: {str(segment['text']).strip()}")
     return highlights
 
 
@@ -41,6 +144,16 @@ def _format_speaker_stats(prosody_model: Dict) -> List[str]:
     return lines
 
 
+def _format_topics(topics: Optional[Dict]) -> List[str]:
+    rows = topics.get("topics", []) if isinstance(topics, dict) else []
+    lines: List[str] = []
+    for row in rows:
+        start, end = float(row.get("start", 0.0)), float(row.get("end", 0.0))
+        count = len(row.get("segment_ids", []))
+        lines.append(f"- [{start:.1f}s - {end:.1f}s] {row.get('label', '')} ({count} segments)")
+    return lines
+
+
 def _compute_sequence_signals(prosody_model: Optional[Dict]) -> Dict[str, float | int]:
     if not prosody_model:
         return {
@@ -109,6 +222,7 @@ def summarize_segments(
     aligned: Dict,
     prosody_model: Optional[Dict] = None,
     enable_engagement: bool = False,
+    topics: Optional[Dict] = None,
 ) -> str:
     segments: List[Dict] = aligned.get("segments", [])
 
@@ -127,7 +241,7 @@ def summarize_segments(
     duration_seconds = max(0.0, end - start)
 
     speakers = sorted({str(segment.get("speaker", "UNKNOWN")) for segment in segments})
-    highlights = _collect_highlights(segments)
+    highlights = _collect_highlights(segments, prosody_model=prosody_model)
     if not highlights:
         highlights = ["- (No spoken text captured in transcript segments.)"]
 
@@ -142,6 +256,10 @@ def summarize_segments(
         *highlights,
     ]
 
+    topic_lines = _format_topics(topics)
+    if topic_lines:
+        lines.extend(["", "Topics:", *topic_lines])
+
     lines.extend(["", "Speaker prosody profile:"])
     lines.extend(_format_speaker_stats(prosody_model or {}))
 
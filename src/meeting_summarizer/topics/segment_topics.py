@@ -0,0 +1,280 @@
+from __future__ import annotations
+
+import heapq
+import math
+import re
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+from meeting_summarizer.io.atomic import write_json_atomic
+
+TOPIC_METHOD = "texttiling_prosody_v1"
+# Segments on each side of a gap whose TF-IDF vectors are compared (TextTiling's block size).
+WINDOW_SEGMENTS = 10
+# Moving-average radius applied to the gap similarities before depth scoring.
+SMOOTH_RADIUS = 2
+# Pauses up to PAUSE_FLOOR_S (ordinary turn-taking) add nothing; the bonus then grows
+# linearly to PAUSE_WEIGHT at LONG_PAUSE_S.
+PAUSE_FLOOR_S = 1.0
+LONG_PAUSE_S = 3.0
+PAUSE_WEIGHT = 0.3
+# Bonus when the prosody state changes into or out of REFLECTIVE_PAUSE across the gap.
+STATE_CHANGE_WEIGHT = 0.1
+# Topics shorter than this many segments are not split off.
+MIN_TOPIC_SEGMENTS = 10
+# A boundary candidate must score this many standard deviations above the candidates' mean.
+BOUNDARY_CUTOFF_STD = 1.25
+LABEL_TERMS = 3
+
+_TOKEN = re.compile(r"[a-z0-9']+")
+STOPWORDS = frozenset(
+    """
+    a about above after again against all also am an and any are as at be because been before
+    being below between both but by can could did do does doing down during each few for from
+    further get got had has have having he her here hers herself him himself his how i if in
+    into is it it's its itself just let let's like me more most my myself no nor not now of off
+    oh ok okay on once only or other our ours ourselves out over own really right same she
+    should so some such than that that's the their theirs them themselves then there these they
+    thing things think this those through to too um uh under until up very was we we're well
+    were what when where which while who whom why will with would yeah yes you your yours
+    yourself yourselves going gonna know mean one two see say said want
+    """.split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-cased content words (stopwords and 1-2 character tokens dropped)."""
+    return [token for token in _TOKEN.findall(text.lower()) if len(token) > 2 and token not in STOPWORDS]
+
+
+def idf_weights(documents: Sequence[Sequence[str]]) -> Dict[str, float]:
+    """Smoothed inverse document frequency, log((1 + n) / (1 + df)) + 1, per term."""
+    document_frequency: Dict[str, int] = {}
+    for tokens in documents:
+        for token in set(tokens):
+            document_frequency[token] = document_frequency.get(token, 0) + 1
+    n = len(documents)
+    return {token: math.log((1 + n) / (1 + df)) + 1.0 for token, df in document_frequency.items()}
+
+
+class _SlidingCosine:
+    """
+    Cosine similarity between two adjacent TF-IDF windows that slide one segment at a time.
+
+    Term counts, squared norms and the dot product are updated only for the terms of the
+    segments entering or leaving a window, so a full pass costs O(total tokens).
+    """
+
+    def __init__(self, idf: Dict[str, float]) -> None:
+        self.idf_sq = {token: weight * weight for token, weight in idf.items()}
+        self.left: Dict[str, int] = {}
+        self.right: Dict[str, int] = {}
+        self.left_norm = 0.0
+        self.right_norm = 0.0
+        self.dot = 0.0
+
+    def _change(self, side: Dict[str, int], other: Dict[str, int], tokens: Sequence[str], delta: int) -> float:
+        norm_change = 0.0
+        for token in tokens:
+            weight = self.idf_sq[token]
+            count = side.get(token, 0)
+            norm_change += ((count + delta) ** 2 - count * count) * weight
+            self.dot += delta * other.get(token, 0) * weight
+            if count + delta:
+                side[token] = count + delta
+            else:
+                del side[token]
+        return norm_change
+
+    def add_left(self, tokens: Sequence[str], delta: int = 1) -> None:
+        self.left_norm += self._change(self.left, self.right, tokens, delta)
+
+    def add_right(self, tokens: Sequence[str], delta: int = 1) -> None:
+        self.right_norm += self._change(self.right, self.left, tokens, delta)
+
+    def similarity(self) -> float:
+        if self.left_norm <= 1e-12 or self.right_norm <= 1e-12:
+            return 0.0
+        return self.dot / math.sqrt(self.left_norm * self.right_norm)
+
+
+def gap_similarities(tokens: Sequence[Sequence[str]], idf: Dict[str, float], window: int = WINDOW_SEGMENTS) -> List[float]:
+    """Lexical cohesion at each gap i (between segment i and i + 1) across `window` segments per side."""
+    n = len(tokens)
+    if n < 2:
+        return []
+    cosine = _SlidingCosine(idf)
+    cosine.add_left(tokens[0])
+    for index in range(1, min(n, 1 + window)):
+        cosine.add_right(tokens[index])
+
+    similarities: List[float] = []
+    for gap in range(n - 1):
+        if gap > 0:
+            # Segment `gap` crosses from the right window to the left one; both windows slide.
+            cosine.add_right(tokens[gap], -1)
+            cosine.add_left(tokens[gap])
+            if gap - window >= 0:
+                cosine.add_left(tokens[gap - window], -1)
+            if gap + window < n:
+                cosine.add_right(tokens[gap + window])
+        similarities.append(cosine.similarity())
+    return similarities
+
+
+def _smooth(values: List[float], radius: int) -> List[float]:
+    """Centered moving average via a running sum (windows shrink at the edges)."""
+    if radius <= 0 or not values:
+        return list(values)
+    prefix = [0.0]
+    for value in values:
+        prefix.append(prefix[-1] + value)
+    n = len(values)
+    return [
+        (prefix[min(n, i + radius + 1)] - prefix[max(0, i - radius)]) / (min(n, i + radius + 1) - max(0, i - radius))
+        for i in range(n)
+    ]
+
+
+def depth_scores(similarities: List[float]) -> List[float]:
+    """
+    TextTiling depth: how far each gap sits below the peaks reached by climbing uphill to
+    its left and to its right. The peaks are carried along in one pass per direction, so
+    this is O(n) even on long monotone stretches.
+    """
+    n = len(similarities)
+    left_peak = list(similarities)
+    for i in range(1, n):
+        if similarities[i - 1] >= similarities[i]:
+            left_peak[i] = left_peak[i - 1]
+    right_peak = list(similarities)
+    for i in range(n - 2, -1, -1):
+        if similarities[i + 1] >= similarities[i]:
+            right_peak[i] = right_peak[i + 1]
+    return [(left_peak[i] - value) + (right_peak[i] - value) for i, value in enumerate(similarities)]
+
+
+def _prosody_bonus(segments: List[Dict], prosody_model: Optional[Dict]) -> List[float]:
+    """Per-gap boundary evidence from pauses and REFLECTIVE_PAUSE state changes."""
+    states: Dict[int, str] = {}
+    pause_after: Dict[int, float] = {}
+    if prosody_model:
+        for row in prosody_model.get("sequence", {}).get("observations", []):
+            segment_id = int(row.get("segment_id", -1))
+            states[segment_id] = str(row.get("state_label", "UNKNOWN"))
+            if row.get("pause_after_s") is not None:
+                pause_after[segment_id] = float(row["pause_after_s"])
+
+    bonus: List[float] = []
+    for current, following in zip(segments, segments[1:]):
+        current_id, following_id = int(current.get("id", -1)), int(following.get("id", -1))
+        gap_s = float(following.get("start", 0.0)) - float(current.get("end", 0.0))
+        pause = max(gap_s, pause_after.get(current_id, 0.0))
+        score = PAUSE_WEIGHT * min(1.0, max(0.0, pause - PAUSE_FLOOR_S) / (LONG_PAUSE_S - PAUSE_FLOOR_S))
+        before, after = states.get(current_id), states.get(following_id)
+        if before is not None and after is not None and before != after and "REFLECTIVE_PAUSE" in (before, after):
+            score += STATE_CHANGE_WEIGHT
+        bonus.append(score)
+    return bonus
+
+
+def _pick_boundaries(scores: List[float], min_segments: int, cutoff_std: float) -> List[int]:
+    """
+    Gaps that are local maxima scoring above mean + `cutoff_std` * std of all local maxima,
+    thinned so no topic has fewer than `min_segments` segments: one left-to-right pass that
+    keeps the stronger of two boundaries that are too close.
+
+    TextTiling's own cutoff (mean - std / 2 over every gap) is tuned for paragraphs; over
+    short ASR segments most gaps are low-depth noise, so the statistics are taken over the
+    candidates instead.
+    """
+    n = len(scores)
+    candidates = [
+        gap
+        for gap, score in enumerate(scores)
+        if score > 0.0
+        and (gap == 0 or scores[gap - 1] <= score)
+        and (gap + 1 == n or scores[gap + 1] <= score)
+        # Gap g splits after segment g, so the topics on each side must keep min_segments.
+        and gap + 1 >= min_segments
+        and n - gap >= min_segments
+    ]
+    if not candidates:
+        return []
+    values = [scores[gap] for gap in candidates]
+    mean = sum(values) / len(values)
+    std = math.sqrt(sum((value - mean) ** 2 for value in values) / len(values))
+    cutoff = mean + cutoff_std * std
+
+    chosen: List[int] = []
+    for gap in candidates:
+        if scores[gap] <= cutoff:
+            continue
+        if chosen and gap - chosen[-1] < min_segments:
+            if scores[gap] > scores[chosen[-1]]:
+                chosen[-1] = gap
+            continue
+        chosen.append(gap)
+    return chosen
+
+
+def _label(tokens: Sequence[Sequence[str]], idf: Dict[str, float], count: int = LABEL_TERMS) -> List[str]:
+    weights: Dict[str, float] = {}
+    for segment_tokens in tokens:
+        for token in segment_tokens:
+            weights[token] = weights.get(token, 0.0) + idf[token]
+    return [token for token, _weight in heapq.nlargest(count, weights.items(), key=lambda item: (item[1], item[0]))]
+
+
+def segment_topics(
+    aligned: Dict,
+    output_path: Path,
+    prosody_model: Optional[Dict] = None,
+    window: int = WINDOW_SEGMENTS,
+    min_segments: int = MIN_TOPIC_SEGMENTS,
+    cutoff_std: float = BOUNDARY_CUTOFF_STD,
+) -> Dict:
+    """
+    Split segments.json into topics and write topics.json.
+
+    TextTiling over ASR segments: each gap between consecutive segments is scored by the
+    cosine similarity of the TF-IDF vectors of the `window` segments on either side
+    (slid incrementally, so the pass is linear in the number of tokens), smoothed, and
+    turned into depth scores. Pauses and changes into or out of REFLECTIVE_PAUSE from
+    prosody_model.json add boundary evidence. Each topic is labelled with its top TF-IDF
+    terms. Segments are taken in the order given (segments.json is time ordered).
+    """
+    segments: List[Dict] = aligned.get("segments", [])
+    tokens = [tokenize(str(segment.get("text") or "")) for segment in segments]
+    idf = idf_weights(tokens)
+
+    similarities = _smooth(gap_similarities(tokens, idf, window=window), SMOOTH_RADIUS)
+    scores = [depth + bonus for depth, bonus in zip(depth_scores(similarities), _prosody_bonus(segments, prosody_model))]
+    boundaries = _pick_boundaries(scores, min_segments, cutoff_std)
+
+    topics: List[Dict] = []
+    edges = [-1] + boundaries + [len(segments) - 1]
+    for topic_id, (first_gap, last) in enumerate(zip(edges, edges[1:])):
+        members = segments[first_gap + 1 : last + 1]
+        if not members:
+            continue
+        keywords = _label(tokens[first_gap + 1 : last + 1], idf)
+        topics.append(
+            {
+                "topic_id": topic_id,
+                "start": float(members[0].get("start", 0.0)),
+                "end": float(members[-1].get("end", members[-1].get("start", 0.0))),
+                "label": " / ".join(keywords) if keywords else "(no content words)",
+                "keywords": keywords,
+                "segment_ids": [int(segment.get("id", first_gap + 1 + offset)) for offset, segment in enumerate(members)],
+                "boundary_score": scores[first_gap] if first_gap >= 0 else None,
+            }
+        )
+
+    result = {
+        "method": TOPIC_METHOD,
+        "parameters": {"window_segments": window, "min_topic_segments": min_segments, "cutoff_std": cutoff_std},
+        "topics": topics,
+    }
+    write_json_atomic(output_path, result)
+    return result
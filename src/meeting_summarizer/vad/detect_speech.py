@@ -0,0 +1,251 @@
+from __future__ import annotations
+
+import math
+import wave
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from meeting_summarizer.audio.wav_reader import DEFAULT_BLOCK_FRAMES, WavReader
+from meeting_summarizer.io.atomic import write_json_atomic
+
+if TYPE_CHECKING:
+    from meeting_summarizer.audio.load_audio import AudioBuffer
+
+VAD_METHOD = "energy_zcr_v1"
+VAD_FRAME_S = 0.02
+
+# Frame energy must exceed max(VAD_MIN_RMS, noise floor * VAD_NOISE_FACTOR) to count as speech.
+VAD_MIN_RMS = 0.003
+VAD_NOISE_FACTOR = 3.0
+VAD_NOISE_PERCENTILE = 10.0
+# Quieter frames (down to half the threshold) still count when their zero-crossing rate looks
+# like a fricative ("s", "f", "sh"), which carry little energy but are speech.
+VAD_FRICATIVE_ZCR = 0.25
+# Smoothing, in seconds: keep speech on for the hangover after each speech frame, then close
+# shorter gaps and drop shorter speech bursts.
+VAD_HANGOVER_S = 0.2
+VAD_MIN_SILENCE_S = 0.25
+VAD_MIN_SPEECH_S = 0.1
+
+
+def frame_rms_zcr(block, frame_size: int) -> Tuple[np.ndarray, np.ndarray]:
+    """RMS and zero-crossing rate of each whole `frame_size` frame of `block` (partial tail dropped)."""
+    block = np.asarray(block, dtype=np.float64)
+    full = len(block) // frame_size
+    frames = block[: full * frame_size].reshape(full, frame_size)
+    rms = np.sqrt(np.mean(np.square(frames), axis=1))
+    signs = np.signbit(frames)
+    zcr = np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1) / float(frame_size)
+    return rms, zcr
+
+
+def _frame_features(
+    reader: "WavReader | AudioBuffer", frame_size: int, block_frames: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Per-frame RMS and zero-crossing rate, streamed in frame-aligned blocks (partial tail dropped)."""
+    step = max(frame_size, (int(block_frames) // frame_size) * frame_size)
+    rms_blocks: List[np.ndarray] = []
+    zcr_blocks: List[np.ndarray] = []
+    for block in reader.iter_blocks(0, reader.num_frames, step):
+        rms, zcr = frame_rms_zcr(block, frame_size)
+        rms_blocks.append(rms)
+        zcr_blocks.append(zcr)
+    if not rms_blocks:
+        return np.empty(0), np.empty(0)
+    return np.concatenate(rms_blocks), np.concatenate(zcr_blocks)
+
+
+def _runs(mask: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Start (inclusive) and end (exclusive) indices of each run of True in `mask`."""
+    padded = np.concatenate(([False], mask, [False])).astype(np.int8)
+    edges = np.diff(padded)
+    return np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+
+
+def _fill_short_runs(mask: np.ndarray, value: bool, max_len: int) -> np.ndarray:
+    """Flip interior runs equal to `value` that are shorter than `max_len` frames."""
+    if max_len <= 0 or len(mask) == 0:
+        return mask
+    starts, ends = _runs(mask == value)
+    out = mask.copy()
+    for start, end in zip(starts, ends):
+        interior = start > 0 and end < len(mask)
+        if end - start < max_len and (interior or value):
+            out[start:end] = not value
+    return out
+
+
+def _raw_speech_frames(rms: np.ndarray, zcr: np.ndarray) -> np.ndarray:
+    """Frames that pass the energy / zero-crossing thresholds, before any smoothing."""
+    if len(rms) == 0:
+        return np.zeros(0, dtype=bool)
+    noise_floor = float(np.percentile(rms, VAD_NOISE_PERCENTILE))
+    threshold = max(VAD_MIN_RMS, noise_floor * VAD_NOISE_FACTOR)
+    return (rms >= threshold) | ((rms >= 0.5 * threshold) & (zcr >= VAD_FRICATIVE_ZCR))
+
+
+def classify_speech_frames(
+    rms: np.ndarray,
+    zcr: np.ndarray,
+    frame_s: float = VAD_FRAME_S,
+    hangover_s: float = VAD_HANGOVER_S,
+    min_silence_s: float = VAD_MIN_SILENCE_S,
+    min_speech_s: float = VAD_MIN_SPEECH_S,
+) -> np.ndarray:
+    """Boolean speech mask per frame from energy / zero-crossing thresholds plus hangover smoothing."""
+    if len(rms) == 0:
+        return np.zeros(0, dtype=bool)
+
+    speech = _raw_speech_frames(rms, zcr)
+
+    # Hangover: a speech frame keeps the following frames on (running max over a trailing window).
+    hangover = int(round(hangover_s / frame_s))
+    if hangover > 0:
+        onsets = np.concatenate(([0], np.cumsum(speech.astype(np.int64))))
+        idx = np.arange(len(speech))
+        recent = onsets[idx + 1] - onsets[np.maximum(0, idx - hangover)]
+        speech = recent > 0
+
+    speech = _fill_short_runs(speech, value=False, max_len=int(round(min_silence_s / frame_s)))
+    speech = _fill_short_runs(speech, value=True, max_len=int(round(min_speech_s / frame_s)))
+    return speech
+
+
+def find_speech_regions(
+    reader: "WavReader | AudioBuffer", block_frames: int = DEFAULT_BLOCK_FRAMES
+) -> List[Dict]:
+    """
+    Speech regions ({id, start, end, speech_end} in seconds) of an open reader or decoded buffer.
+
+    `end` includes the hangover tail; `speech_end` is the end of the region's last frame that
+    passed the thresholds, i.e. where the silence after the region really begins.
+    """
+    frame_size = max(1, int(reader.sample_rate * VAD_FRAME_S))
+    frame_s = frame_size / float(reader.sample_rate)
+    duration_s = reader.num_frames / float(reader.sample_rate)
+    rms, zcr = _frame_features(reader, frame_size, block_frames)
+
+    regions: List[Dict] = []
+    raw = _raw_speech_frames(rms, zcr)
+    starts, ends = _runs(classify_speech_frames(rms, zcr, frame_s=frame_s))
+    for start, end in zip(starts, ends):
+        voiced = np.flatnonzero(raw[start:end])
+        speech_end = start + int(voiced[-1]) + 1 if len(voiced) else end
+        regions.append(
+            {
+                "id": len(regions),
+                "start": float(start * frame_s),
+                "end": float(min(duration_s, end * frame_s)),
+                "speech_end": float(min(duration_s, speech_end * frame_s)),
+            }
+        )
+    return regions
+
+
+def detect_speech_regions(
+    audio_path: Path,
+    output_path: Path,
+    block_frames: int = DEFAULT_BLOCK_FRAMES,
+    audio: Optional["AudioBuffer"] = None,
+) -> Dict:
+    """
+    Run frame-level energy/zero-crossing VAD over a recording and write vad.json.
+
+    Regions are merged speech spans in seconds, sorted by `start`. When the audio is missing
+    or unreadable, `regions` is empty and `audio_read_error` explains why. A decoded `audio`
+    buffer, when given, is used instead of reading `audio_path`.
+    """
+    regions: List[Dict] = []
+    sample_rate: Optional[int] = None
+    audio_read_error: Optional[str] = None
+    duration_s = 0.0
+
+    if audio is not None or audio_path.exists():
+        try:
+            reader = audio if audio is not None else WavReader(audio_path, engine="numpy")
+            try:
+                sample_rate = reader.sample_rate
+                duration_s = reader.num_frames / float(reader.sample_rate)
+                regions = find_speech_regions(reader, block_frames)
+            finally:
+                reader.close()
+        except (wave.Error, ValueError, OSError, EOFError) as exc:
+            audio_read_error = str(exc)
+            sample_rate = None
+            duration_s = 0.0
+    else:
+        audio_read_error = f"Audio file not found: {audio_path}"
+
+    speech_s = sum(region["end"] - region["start"] for region in regions)
+    result = {
+        "audio_path": str(audio_path),
+        "method": VAD_METHOD,
+        "sample_rate_hz": sample_rate,
+        "frame_s": VAD_FRAME_S,
+        "audio_read_error": audio_read_error,
+        "duration_s": duration_s,
+        "speech_ratio": speech_s / duration_s if duration_s > 0 else 0.0,
+        "regions": regions,
+    }
+
+    write_json_atomic(output_path, result)
+    return result
+
+
+def speech_clip_timestamps(vad: Dict, pad_s: float = 0.2) -> List[float]:
+    """
+    Flatten VAD regions into faster-whisper `clip_timestamps` ([start0, end0, start1, ...]).
+
+    Regions are padded by `pad_s` on both sides so word edges are not clipped, and merged
+    when the padding makes them touch.
+    """
+    clips: List[List[float]] = []
+    duration = float(vad.get("duration_s") or 0.0)
+    for region in vad.get("regions", []):
+        start = max(0.0, float(region["start"]) - pad_s)
+        end = float(region["end"]) + pad_s
+        if duration > 0:
+            end = min(duration, end)
+        if clips and start <= clips[-1][1]:
+            clips[-1][1] = max(clips[-1][1], end)
+        else:
+            clips.append([start, end])
+    return [value for clip in clips for value in clip]
+
+
+def speech_chunks(
+    regions: List[Dict], duration_s: float, max_chunk_s: float = 30.0, pad_s: float = 0.2
+) -> List[Tuple[float, float]]:
+    """
+    Group speech regions into (start, end) chunks of at most `max_chunk_s` seconds.
+
+    Consecutive regions share a chunk while the chunk still fits, so chunk edges fall in
+    silence; a single region longer than `max_chunk_s` is cut into equal pieces. Regions
+    are padded by `pad_s`, clamped to the recording, and chunks never overlap.
+    """
+    chunks: List[Tuple[float, float]] = []
+    for i, region in enumerate(regions):
+        start = float(region["start"]) - pad_s
+        end = float(region["end"]) + pad_s
+        # Padding never crosses the middle of the gap to a neighbouring region.
+        if i > 0:
+            start = max(start, 0.5 * (regions[i - 1]["end"] + region["start"]))
+        if i + 1 < len(regions):
+            end = min(end, 0.5 * (region["end"] + regions[i + 1]["start"]))
+        start = max(0.0, start)
+        if duration_s > 0:
+            end = min(duration_s, end)
+        if end <= start:
+            continue
+
+        if chunks and end - chunks[-1][0] <= max_chunk_s:
+            chunks[-1] = (chunks[-1][0], end)
+            continue
+
+        pieces = max(1, int(math.ceil((end - start) / max_chunk_s)))
+        step = (end - start) / pieces
+        for piece in range(pieces):
+            chunks.append((start + piece * step, end if piece == pieces - 1 else start + (piece + 1) * step))
+    return chunks
@@ -1,13 +1,18 @@
 from __future__ import annotations
 
+import argparse
 import json
 import mimetypes
+import os
 from pathlib import Path
 from typing import Any, Dict
 from urllib.parse import quote
 
 from flask import Flask, jsonify, render_template, request, send_file
 
+from meeting_summarizer.asr.model_registry import warm_up
+from meeting_summarizer.asr.transcribe import TRANSCRIPT_JSONL_FILENAME, load_partial_transcript
+from meeting_summarizer.io.export_results import ARTIFACT_TABLES, columnar_path, load_artifact, open_artifact
 from meeting_summarizer.pipeline import run_pipeline
 
 BASE_DIR = Path(__file__).resolve().parent
@@ -23,6 +28,10 @@ app = Flask(
 )
 
 
+# Transcript cache hits/misses across /api/run calls since the server started.
+_ASR_CACHE_STATS = {"hits": 0, "misses": 0}
+
+
 def _as_bool(value: Any, default: bool) -> bool:
     if isinstance(value, bool):
         return value
@@ -62,6 +71,35 @@ def audio_file():
     return send_file(str(audio_path), mimetype=guessed_type, conditional=True)
 
 
+@app.get("/api/transcript/partial")
+def partial_transcript():
+    output_dir = Path(request.args.get("output_dir") or "outputs/web_run")
+    jsonl_path = output_dir / TRANSCRIPT_JSONL_FILENAME
+    if not jsonl_path.exists():
+        return jsonify({"ok": False, "error": f"No streamed transcript in {output_dir}"}), 404
+    return jsonify({"ok": True, "transcript": load_partial_transcript(jsonl_path)})
+
+
+@app.get("/api/rows")
+def artifact_rows():
+    """A page of rows from a run artifact's columnar copy, e.g. ?artifact=prosody.json&start=0&stop=500&columns=start,rms_mean."""
+    output_dir = Path(request.args.get("output_dir") or "outputs/web_run")
+    artifact = request.args.get("artifact") or "prosody.json"
+    if artifact not in ARTIFACT_TABLES:
+        return jsonify({"ok": False, "error": f"Unknown artifact {artifact!r}"}), 400
+    table = open_artifact(output_dir / artifact)
+    if table is None:
+        return jsonify({"ok": False, "error": f"No current columnar copy of {artifact} in {output_dir}"}), 404
+    columns = [name for name in (request.args.get("columns") or "").split(",") if name] or None
+    try:
+        start = int(request.args.get("start", 0))
+        stop = int(request.args["stop"]) if "stop" in request.args else None
+        rows = table.rows(start, stop, columns=columns)
+    except (KeyError, ValueError) as exc:
+        return jsonify({"ok": False, "error": str(exc)}), 400
+    return jsonify({"ok": True, "artifact": artifact, "total_rows": table.num_rows, "start": start, "rows": rows})
+
+
 @app.post("/api/run")
 def run_pipeline_api():
     payload = request.get_json(silent=True) or {}
@@ -70,6 +108,15 @@ def run_pipeline_api():
     output_dir = Path(payload.get("output_dir") or "outputs/web_run")
     run_asr = _as_bool(payload.get("run_asr"), default=False)
     enable_engagement = _as_bool(payload.get("enable_engagement"), default=False)
+    extract_pitch = _as_bool(payload.get("extract_pitch"), default=False)
+    run_vad = _as_bool(payload.get("run_vad"), default=False)
+    asr_model = str(payload.get("asr_model") or "small")
+    stream_asr = _as_bool(payload.get("stream_asr"), default=False)
+    use_asr_cache = _as_bool(payload.get("use_asr_cache"), default=True)
+    diarizer = str(payload.get("diarizer") or "baseline")
+    prosody_hmm = _as_bool(payload.get("prosody_hmm"), default=False)
+    columnar = _as_bool(payload.get("columnar"), default=False)
+    force = _as_bool(payload.get("force"), default=False)
 
     try:
         result = run_pipeline(
@@ -77,24 +124,37 @@ def run_pipeline_api():
             output_dir=output_dir,
             run_asr=run_asr,
             enable_engagement=enable_engagement,
+            extract_pitch=extract_pitch,
+            run_vad=run_vad,
+            asr_model=asr_model,
+            stream_asr=stream_asr,
+            use_asr_cache=use_asr_cache,
+            diarizer=diarizer,
+            prosody_hmm=prosody_hmm,
+            export_columns=columnar,
+            reuse_outputs=not force,
         )
     except Exception as exc:  # pragma: no cover - API error formatting
         return jsonify({"ok": False, "error": str(exc)}), 400
 
+    if result.asr_cache is not None:
+        _ASR_CACHE_STATS["hits" if result.asr_cache == "hit" else "misses"] += 1
+
     summary_path = output_dir / "summary.md"
     prosody_path = output_dir / "prosody.json"
     prosody_model_path = output_dir / "prosody_model.json"
     segments_path = output_dir / "segments.json"
+    transcript_path = output_dir / "transcript.json"
 
     summary_text = summary_path.read_text(encoding="utf-8") if summary_path.exists() else result.summary_text
 
-    prosody: Dict[str, Any] | None = None
-    if prosody_path.exists():
-        prosody = json.loads(prosody_path.read_text(encoding="utf-8"))
+    # Rebuilt from the columnar copies when they were written, instead of re-parsing JSON.
+    prosody: Dict[str, Any] | None = load_artifact(prosody_path)
+    prosody_model: Dict[str, Any] | None = load_artifact(prosody_model_path)
 
-    prosody_model: Dict[str, Any] | None = None
-    if prosody_model_path.exists():
-        prosody_model = json.loads(prosody_model_path.read_text(encoding="utf-8"))
+    asr_timing: Dict[str, Any] | None = None
+    if run_asr and transcript_path.exists():
+        asr_timing = json.loads(transcript_path.read_text(encoding="utf-8")).get("timing")
 
     resolved_input_path = _resolve_audio_path(str(input_path))
     audio_exists = resolved_input_path.exists() and resolved_input_path.is_file()
@@ -106,13 +166,29 @@ def run_pipeline_api():
         "summary_text": summary_text,
         "run_asr": run_asr,
         "enable_engagement": enable_engagement,
+        "extract_pitch": extract_pitch,
+        "run_vad": run_vad,
+        "asr_model": asr_model,
+        "stream_asr": stream_asr,
+        "diarizer": diarizer,
+        "prosody_hmm": prosody_hmm,
+        "columnar": columnar,
+        "force": force,
+        "reused_stages": result.reused_stages,
+        "asr_cache": result.asr_cache,
+        "asr_cache_stats": dict(_ASR_CACHE_STATS),
+        "asr_timing": asr_timing,
         "audio_file_exists": audio_exists,
         "audio_preview_url": f"/api/audio?path={quote(str(input_path))}" if audio_exists else None,
         "files": {
             "summary_md": summary_path.exists(),
             "prosody_json": prosody_path.exists(),
             "prosody_model_json": prosody_model_path.exists(),
+            "prosody_hmm_json": (output_dir / "prosody_hmm.json").exists(),
+            "topics_json": (output_dir / "topics.json").exists(),
             "segments_json": segments_path.exists(),
+            "prosody_cols": columnar_path(prosody_path).exists(),
+            "metadata_json": (output_dir / "metadata.json").exists(),
         },
         "prosody": prosody,
         "prosody_model": prosody_model,
@@ -121,6 +197,17 @@ def run_pipeline_api():
 
 
 def main() -> None:
+    parser = argparse.ArgumentParser(description="Local web UI for the meeting summarizer.")
+    parser.add_argument("--warm-up", action="store_true",
+                        help="Load the ASR model at startup so the first /api/run does not pay for it.")
+    parser.add_argument("--asr-model", type=str, default="small", help="Model to warm up (default: small).")
+    args = parser.parse_args()
+
+    # With the debug reloader, only the serving child process (not the watcher) needs the model.
+    if args.warm_up and os.environ.get("WERKZEUG_RUN_MAIN") == "true":
+        timing = warm_up(args.asr_model)
+        app.logger.info("ASR model %s loaded in %.2fs", args.asr_model, timing["model_load_s"])
+
     app.run(host="127.0.0.1", port=8000, debug=True)
 
 
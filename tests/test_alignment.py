@@ -21,4 +21,70 @@ def test_alignment_assigns_speaker_by_overlap():
     assert segs[0]["speaker"] == "SPEAKER_0"
     assert segs[0]["turn_id"] == 10
     assert segs[1]["speaker"] == "SPEAKER_0"  # overlaps 2-3 (1s) vs 3-4 (1s) -> tie goes to first max found
-    assert segs[1]["turn_id"] == 10
\ No newline at end of file
+    assert segs[1]["turn_id"] == 10
+
+
+def _align_by_scan(transcript, diarization):
+    """Reference: compare every segment with every turn, first max overlap wins."""
+    out = []
+    for idx, seg in enumerate(transcript["segments"]):
+        start, end = float(seg["start"]), float(seg["end"])
+        speaker, best_turn_id, best_overlap = "UNKNOWN", None, 0.0
+        for turn in diarization["turns"]:
+            ov = max(0.0, min(end, turn["end"]) - max(start, turn["start"]))
+            if ov > best_overlap:
+                speaker, best_turn_id, best_overlap = turn["speaker"], turn["id"], ov
+        out.append((seg.get("id", idx), speaker, best_turn_id))
+    return out
+
+
+def test_sweep_alignment_matches_full_scan_including_ties():
+    import random
+
+    rng = random.Random(7)
+    for _ in range(50):
+        # Coarse half-second grid so equal overlaps (ties) are common.
+        segments = []
+        for i in range(rng.randint(0, 40)):
+            start = rng.randint(0, 120) / 2.0
+            segments.append({"id": i, "start": start, "end": start + rng.randint(0, 12) / 2.0, "text": "x"})
+        turns = []
+        for j in range(rng.randint(0, 40)):
+            start = rng.randint(0, 120) / 2.0
+            turns.append({"id": 100 + j, "speaker": f"S{j % 4}", "start": start, "end": start + rng.randint(0, 16) / 2.0})
+        transcript, diarization = {"segments": segments}, {"turns": turns}
+
+        aligned = align_transcript_with_diarization(transcript, diarization)["segments"]
+
+        expected = {seg_id: (speaker, turn_id) for seg_id, speaker, turn_id in _align_by_scan(transcript, diarization)}
+        assert len(aligned) == len(segments)
+        for row in aligned:
+            assert (row["speaker"], row.get("turn_id")) == expected[row["id"]]
+        assert [(row["start"], row["end"]) for row in aligned] == sorted((row["start"], row["end"]) for row in aligned)
+
+
+def test_alignment_without_diarization_is_unknown():
+    aligned = align_transcript_with_diarization({"segments": [{"start": 1.0, "end": 2.0, "text": " a "}]}, None)
+
+    assert aligned["segments"] == [
+        {"id": 0, "start": 1.0, "end": 2.0, "speaker": "UNKNOWN", "text": "a", "asr_segment_id": 0}
+    ]
+
+
+def test_long_segment_does_not_widen_the_sweep(monkeypatch):
+    import meeting_summarizer.diarization.align as align
+
+    calls = []
+    real_overlap = align._overlap
+    monkeypatch.setattr(align, "_overlap", lambda *args: calls.append(args) or real_overlap(*args))
+
+    count = 2000
+    segments = [{"id": 0, "start": 0.0, "end": float(count), "text": "long"}]
+    segments += [{"id": i + 1, "start": i + 0.25, "end": i + 0.75, "text": "x"} for i in range(count)]
+    turns = [{"id": j, "speaker": f"S{j % 2}", "start": float(j), "end": j + 1.0} for j in range(count)]
+
+    aligned = align_transcript_with_diarization({"segments": segments}, {"turns": turns})["segments"]
+
+    assert [row["turn_id"] for row in aligned if row["id"] > 0] == list(range(count))
+    # The long segment meets every turn once; each short one only the turn it sits in.
+    assert len(calls) == 2 * count
@@ -0,0 +1,87 @@
+import json
+import os
+import struct
+import wave
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("numpy")
+pytest.importorskip("faster_whisper")
+
+from meeting_summarizer.asr.cache import TranscriptCache, transcript_cache_key  # noqa: E402
+from meeting_summarizer.pipeline import run_pipeline  # noqa: E402
+
+
+def _transcript(text: str) -> dict:
+    return {"audio_path": "a.wav", "model": "small", "language": "en", "segments": [{"id": 0, "text": text}]}
+
+
+def test_cache_key_changes_with_model_and_options() -> None:
+    base = transcript_cache_key("abc", "small")
+
+    assert transcript_cache_key("abc", "small") == base
+    assert transcript_cache_key("abd", "small") != base
+    assert transcript_cache_key("abc", "base") != base
+    assert transcript_cache_key("abc", "small", language="de") != base
+    assert transcript_cache_key("abc", "small", clip_timestamps=[0.0, 1.0]) != base
+
+
+def test_cache_round_trip_and_counts(tmp_path: Path) -> None:
+    cache = TranscriptCache(tmp_path / "cache")
+
+    assert cache.get("k1") is None
+    cache.put("k1", _transcript("hello"))
+    assert cache.get("k1") == _transcript("hello")
+    assert cache.stats() == {"hits": 1, "misses": 1}
+    assert not list((tmp_path / "cache").glob("*.tmp"))
+
+
+def test_cache_evicts_least_recently_used_past_size_cap(tmp_path: Path) -> None:
+    cache = TranscriptCache(tmp_path / "cache", max_bytes=10**9)
+    for i, key in enumerate(("old", "used", "new")):
+        cache.put(key, _transcript("x" * 200))
+        os.utime(tmp_path / "cache" / f"{key}.json", ns=(i * 10**9, i * 10**9))
+    cache.get("used")  # refreshes "used", leaving "old" as least recently used
+
+    entry_size = (tmp_path / "cache" / "old.json").stat().st_size
+    cache.max_bytes = 2 * entry_size
+    assert cache.evict() == 1
+
+    assert sorted(path.stem for path in (tmp_path / "cache").glob("*.json")) == ["new", "used"]
+
+
+def test_pipeline_reuses_cached_transcript(tmp_path: Path, monkeypatch) -> None:
+    audio_path = tmp_path / "speech.wav"
+    with wave.open(str(audio_path), "wb") as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(16000)
+        wav_file.writeframes(struct.pack("<16000h", *([3000] * 16000)))
+
+    calls = []
+
+    def _fake_transcribe(_audio_path: Path, **_kwargs):
+        calls.append(_audio_path)
+        return {
+            "audio_path": str(_audio_path),
+            "model": "small",
+            "language": "en",
+            "segments": [{"id": 0, "start": 0.1, "end": 0.9, "text": "hello"}],
+        }
+
+    monkeypatch.setattr("meeting_summarizer.pipeline.transcribe_audio", _fake_transcribe)
+
+    first = run_pipeline(audio_path, tmp_path / "run1")
+    second = run_pipeline(audio_path, tmp_path / "run2", enable_engagement=True)
+
+    assert len(calls) == 1
+    assert (first.asr_cache, second.asr_cache) == ("miss", "hit")
+    transcript = json.loads((tmp_path / "run2" / "transcript.json").read_text(encoding="utf-8"))
+    assert transcript["segments"][0]["text"] == "hello"
+    assert transcript["cache"]["status"] == "hit"
+
+    # Different decoding options are a different cache entry.
+    third = run_pipeline(audio_path, tmp_path / "run3", asr_model="base")
+    assert third.asr_cache == "miss"
+    assert len(calls) == 2
@@ -0,0 +1,82 @@
+import json
+import math
+import struct
+import wave
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from meeting_summarizer.asr.batch_transcribe import transcribe_batch  # noqa: E402
+from meeting_summarizer.asr.model_registry import ModelRegistry  # noqa: E402
+
+
+def _write_bursts_wav(path: Path, layout, sample_rate: int = 16000) -> None:
+    pieces = []
+    for seconds, amplitude in layout:
+        t = np.arange(int(seconds * sample_rate)) / sample_rate
+        pieces.append(amplitude * np.sin(2.0 * math.pi * 180.0 * t))
+    pcm = np.concatenate(pieces)
+    with wave.open(str(path), "wb") as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes(struct.pack(f"<{len(pcm)}h", *(int(v * 32767) for v in pcm)))
+
+
+class _FakeModel:
+    def detect_language(self, audio=None, **_kwargs):
+        return "en", 1.0, [("en", 1.0)]
+
+
+class _FakeBatchedPipeline:
+    calls = []
+
+    def __init__(self, model):
+        self.model = model
+
+    def transcribe(self, audio, language=None, clip_timestamps=None, batch_size=8):
+        self.calls.append({"samples": len(audio), "clips": list(clip_timestamps), "language": language})
+        segments = [
+            SimpleNamespace(start=round(clip["start"], 3), end=round(clip["end"], 3), text=f" clip {i} ")
+            for i, clip in enumerate(clip_timestamps)
+        ]
+        return iter(segments), SimpleNamespace(language=language)
+
+
+def test_transcribe_batch_shares_one_batched_call_and_restores_file_times(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setattr("meeting_summarizer.asr.batch_transcribe._batched_pipeline", _FakeBatchedPipeline)
+    _FakeBatchedPipeline.calls = []
+
+    first = tmp_path / "in" / "standup.wav"
+    second = tmp_path / "in2" / "standup.wav"
+    first.parent.mkdir()
+    second.parent.mkdir()
+    _write_bursts_wav(first, [(0.5, 0.0), (1.0, 0.2), (0.5, 0.0)])
+    _write_bursts_wav(second, [(1.0, 0.0), (0.5, 0.2), (1.0, 0.0)])
+    missing = tmp_path / "missing.wav"
+
+    registry = ModelRegistry(loader=lambda *_key: _FakeModel())
+    report = transcribe_batch([first, second, missing], tmp_path / "runs", model_size="tiny", registry=registry)
+
+    # Both recordings went through a single batched call over their concatenated audio.
+    assert len(_FakeBatchedPipeline.calls) == 1
+    assert _FakeBatchedPipeline.calls[0]["samples"] == int(2.0 * 16000) + int(2.5 * 16000)
+
+    first_transcript = json.loads((tmp_path / "runs" / "standup" / "transcript.json").read_text(encoding="utf-8"))
+    second_transcript = json.loads((tmp_path / "runs" / "standup_1" / "transcript.json").read_text(encoding="utf-8"))
+    assert first_transcript["language"] == "en"
+    assert [segment["id"] for segment in second_transcript["segments"]] == [0]
+    assert first_transcript["segments"][0]["start"] == pytest.approx(0.3, abs=0.05)
+    # Times in the second file are relative to that file, not to the concatenated buffer.
+    assert second_transcript["segments"][0]["start"] == pytest.approx(0.8, abs=0.05)
+    assert second_transcript["segments"][0]["end"] <= 2.5
+    assert second_transcript["segments"][0]["text"] == "clip 1"
+
+    assert [entry["segments"] for entry in report["files"]] == [1, 1, 0]
+    assert report["files"][2]["error"] is not None
+    assert report["audio_s"] == pytest.approx(4.5)
+    assert report["throughput_x"] > 0
+    assert (tmp_path / "runs" / "batch_report.json").exists()
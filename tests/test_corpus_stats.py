@@ -0,0 +1,127 @@
+import json
+import random
+import statistics
+from pathlib import Path
+
+import pytest
+
+from meeting_summarizer.prosody.corpus_stats import (
+    ProsodyCorpusStats,
+    QuantileSketch,
+    RunningMoments,
+    update_corpus_stats,
+)
+from meeting_summarizer.prosody.model_sequence import sequence_model
+
+
+def _prosody(name: str, rows: int, seed: int, quiet_speaker: str = "") -> dict:
+    rng = random.Random(seed)
+    features, position = [], 0.0
+    for index in range(rows):
+        speaker = f"SPEAKER_{index % 3}"
+        duration = rng.uniform(0.5, 4.0)
+        pause = rng.choice([0.0, rng.uniform(0.05, 1.0)])
+        rms = rng.uniform(0.05, 0.2) * (0.2 if speaker == quiet_speaker else 1.0)
+        features.append(
+            {
+                "segment_id": index,
+                "start": position + pause,
+                "end": position + pause + duration,
+                "speaker": speaker,
+                "duration_s": duration,
+                "pause_before_s": pause,
+                "pause_after_s": rng.uniform(0.0, 0.5),
+                "rms_mean": None if index % 17 == 5 else rms,
+            }
+        )
+        position += pause + duration
+    return {"audio_path": name, "method": "rms_pause_v1", "features": features}
+
+
+def test_running_moments_merge_matches_one_pass() -> None:
+    rng = random.Random(0)
+    values = [rng.gauss(3.0, 2.0) for _ in range(1000)]
+
+    merged = RunningMoments()
+    for left in range(0, len(values), 137):
+        part = RunningMoments()
+        part.add_many(values[left : left + 137])
+        merged.merge(part)
+
+    assert merged.count == len(values)
+    assert merged.mean == pytest.approx(statistics.fmean(values), rel=1e-12)
+    assert merged.variance == pytest.approx(statistics.variance(values), rel=1e-10)
+    assert (merged.minimum, merged.maximum) == (min(values), max(values))
+    assert RunningMoments.from_dict(merged.to_dict()).to_dict() == merged.to_dict()
+
+
+def test_quantile_sketch_is_within_relative_accuracy_and_merges_exactly() -> None:
+    rng = random.Random(1)
+    values = [rng.lognormvariate(-3.0, 1.0) for _ in range(5000)] + [0.0] * 50
+    whole = QuantileSketch(0.01)
+    whole.add_many(values)
+    halves = QuantileSketch(0.01), QuantileSketch(0.01)
+    halves[0].add_many(values[::2])
+    halves[1].add_many(values[1::2])
+    halves[0].merge(halves[1])
+
+    assert halves[0].to_dict() == whole.to_dict()
+    ordered = sorted(values)
+    for rank in range(0, len(ordered), 97):
+        assert whole.value_at(rank) == pytest.approx(ordered[rank], rel=0.01, abs=1e-12)
+    assert len(whole.bins) < 1000
+    with pytest.raises(ValueError):
+        whole.merge(QuantileSketch(0.02))
+
+
+def test_corpus_merge_and_persistence_match_a_single_pass(tmp_path: Path) -> None:
+    meetings = [_prosody(f"m{index}.wav", 40 + index * 7, seed=index) for index in range(6)]
+
+    single = ProsodyCorpusStats()
+    for prosody in meetings:
+        assert single.add_meeting(prosody)
+    assert not single.add_meeting(meetings[0])
+    assert single.meetings == 6
+
+    first, second = ProsodyCorpusStats(), ProsodyCorpusStats()
+    for prosody in meetings[:3]:
+        first.add_meeting(prosody, prosody_model=sequence_model(prosody))
+    for prosody in meetings[3:]:
+        second.add_meeting(prosody)
+    second.save(tmp_path / "second.json")
+    first.merge(ProsodyCorpusStats.load(tmp_path / "second.json"))
+
+    merged, expected = first.to_dict(), single.to_dict()
+    assert merged["state_transition_counts"] == expected["state_transition_counts"]
+    assert merged["state_counts"] == expected["state_counts"]
+    assert sum(merged["state_counts"].values()) == sum(len(p["features"]) for p in meetings)
+    assert merged["features"]["rms_mean"]["sketch"] == expected["features"]["rms_mean"]["sketch"]
+    assert merged["features"]["rms_mean"]["moments"]["mean"] == pytest.approx(
+        expected["features"]["rms_mean"]["moments"]["mean"], rel=1e-12
+    )
+    assert merged["speakers"].keys() == expected["speakers"].keys()
+    with pytest.raises(ValueError):
+        first.merge(single)
+
+    rms = [item["rms_mean"] for p in meetings for item in p["features"] if item["rms_mean"] is not None]
+    ordered = sorted(rms)
+    low, high = single.energy_thresholds()
+    assert low == pytest.approx(ordered[len(ordered) // 3], rel=0.01)
+    assert high == pytest.approx(ordered[(2 * len(ordered)) // 3], rel=0.01)
+
+
+def test_compare_meeting_flags_an_unusually_quiet_speaker(tmp_path: Path) -> None:
+    path = tmp_path / "corpus.json"
+    for index in range(5):
+        update_corpus_stats(path, _prosody(f"m{index}.wav", 60, seed=index))
+    corpus, added = update_corpus_stats(path, _prosody("m0.wav", 60, seed=0))
+    assert not added
+    assert corpus.meetings == 5
+    _corpus, added = update_corpus_stats(path, _prosody("copy.wav", 60, seed=0), meeting_id="m0.wav")
+    assert not added
+    assert json.loads(path.read_text(encoding="utf-8"))["meetings"] == 5
+
+    rows = {row["speaker"]: row for row in corpus.compare_meeting(_prosody("today.wav", 60, 9, "SPEAKER_1"))}
+    assert rows["SPEAKER_1"]["rms_zscore"] < -1.5
+    assert rows["SPEAKER_1"]["rms_percentile"] < 0.05
+    assert abs(rows["SPEAKER_0"]["rms_zscore"]) < 1.0
@@ -0,0 +1,127 @@
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from meeting_summarizer.io.export_results import (  # noqa: E402
+    ColumnarTable,
+    columnar_path,
+    export_artifact,
+    export_run,
+    load_artifact,
+    open_artifact,
+    write_columns,
+)
+
+
+def _prosody(rows: int) -> dict:
+    features = []
+    for index in range(rows):
+        features.append(
+            {
+                "segment_id": index,
+                "start": index * 2.5,
+                "end": index * 2.5 + 2.0,
+                "speaker": f"SPEAKER_{index % 3}",
+                "duration_s": 2.0,
+                "pause_before_s": 0.5 if index else 0.0,
+                "pause_after_s": 0.5,
+                "rms_mean": None if index % 7 == 3 else 0.05 + index / 1000,
+                "rms_std": 0.01,
+            }
+        )
+    return {
+        "audio_path": "meeting.wav",
+        "method": "rms_pause_v1",
+        "sample_rate_hz": 16000,
+        "audio_read_error": None,
+        "pause_source": "asr_gaps",
+        "features": features,
+    }
+
+
+def _write_json(path: Path, document: dict) -> None:
+    path.write_text(json.dumps(document, indent=2), encoding="utf-8")
+
+
+def test_prosody_round_trip_and_lazy_reads(tmp_path: Path) -> None:
+    prosody = _prosody(50)
+    json_path = tmp_path / "prosody.json"
+    _write_json(json_path, prosody)
+
+    assert export_artifact(json_path) == tmp_path / "prosody.cols"
+    assert load_artifact(json_path) == prosody
+
+    table = open_artifact(json_path)
+    assert table.num_rows == 50
+    assert table.meta["method"] == "rms_pause_v1" and "features" not in table.meta
+    kinds = {column["name"]: column["kind"] for column in table.header["columns"]}
+    assert kinds["segment_id"] == "int" and kinds["rms_mean"] == "float" and kinds["speaker"] == "category"
+
+    rms = table.column("rms_mean", 2, 5)
+    assert isinstance(rms, np.ndarray) and rms[0] == pytest.approx(0.052) and np.isnan(rms[1])
+    assert table.nulls("rms_mean", 2, 5).tolist() == [False, True, False]
+    assert table.column("speaker", 48) == ["SPEAKER_0", "SPEAKER_1"]
+    assert table.rows(9, 11, columns=["segment_id", "rms_mean"]) == [
+        {"segment_id": 9, "rms_mean": 0.05 + 9 / 1000},
+        {"segment_id": 10, "rms_mean": None},
+    ]
+    with pytest.raises(KeyError):
+        table.column("f0_mean")
+
+
+def test_text_json_and_missing_keys(tmp_path: Path) -> None:
+    rows = [
+        {"id": 0, "text": "Déjà vu, budget review.", "words": [{"word": "Déjà", "p": 0.9}], "kept": True},
+        {"id": 1, "text": "", "kept": False},
+        {"id": 2, "text": None, "words": None, "kept": True},
+    ]
+    write_columns(rows, tmp_path / "t.cols", meta={"note": "x"}, table="segments")
+    table = ColumnarTable(tmp_path / "t.cols")
+
+    assert table.column("text") == ["Déjà vu, budget review.", "", None]
+    assert table.column("words", 0, 1) == [[{"word": "Déjà", "p": 0.9}]]
+    assert table.column("kept").tolist() == [True, False, True]
+    # Row 1 has no "words" key at all; row 2 has an explicit null.
+    assert table.rows() == rows
+    assert table.rows(5, 9) == []
+
+
+def test_stale_copy_falls_back_to_json(tmp_path: Path) -> None:
+    json_path = tmp_path / "prosody_model.json"
+    document = {
+        "method": "prosody_sequence_v1",
+        "speaker_stats": [{"speaker": "SPEAKER_0", "segment_count": 2}],
+        "sequence": {
+            "length": 2,
+            "observations": [
+                {"segment_id": 0, "state_label": "ACTIVE_SPEECH", "energy_bucket": "high"},
+                {"segment_id": 1, "state_label": "ACTIVE_SPEECH", "energy_bucket": "mid"},
+            ],
+            "state_transition_counts": [{"from": "ACTIVE_SPEECH", "to": "ACTIVE_SPEECH", "count": 1}],
+        },
+    }
+    _write_json(json_path, document)
+    export_artifact(json_path)
+    assert open_artifact(json_path).header["table"] == "sequence.observations"
+    assert load_artifact(json_path) == document
+
+    document["sequence"]["length"] = 3
+    _write_json(json_path, document)
+    stat = json_path.stat()
+    os.utime(json_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert open_artifact(json_path) is None
+    assert load_artifact(json_path)["sequence"]["length"] == 3
+    assert load_artifact(tmp_path / "missing.json") is None
+
+
+def test_export_run_is_smaller_than_indented_json(tmp_path: Path) -> None:
+    _write_json(tmp_path / "prosody.json", _prosody(2000))
+    (tmp_path / "summary.md").write_text("# Summary\n", encoding="utf-8")
+
+    assert export_run(tmp_path) == [tmp_path / "prosody.cols"]
+    columnar_bytes = sum(path.stat().st_size for path in columnar_path(tmp_path / "prosody.json").iterdir())
+    assert columnar_bytes < (tmp_path / "prosody.json").stat().st_size / 3
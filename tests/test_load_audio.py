@@ -0,0 +1,70 @@
+import shutil
+import struct
+import wave
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("faster_whisper")
+
+from meeting_summarizer.audio.load_audio import AudioBuffer, load_audio  # noqa: E402
+from meeting_summarizer.prosody.extract_prosody import extract_prosody_features  # noqa: E402
+
+
+def _write_wav(path: Path, sample_rate: int = 16000) -> None:
+    samples = [int(0.25 * 32767) * (1 if (i // 20) % 2 else -1) for i in range(sample_rate)]
+    with wave.open(str(path), "wb") as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes(struct.pack(f"<{len(samples)}h", *samples))
+
+
+def test_load_audio_decodes_once_and_memory_maps_cache(tmp_path: Path, monkeypatch) -> None:
+    audio_path = tmp_path / "meeting.wav"
+    _write_wav(audio_path)
+    cache_dir = tmp_path / "cache"
+
+    first = load_audio(audio_path, cache_dir=cache_dir)
+    assert first.sample_rate == 16000
+    assert first.samples.dtype == np.float32
+    assert first.num_frames == 16000
+    assert first.cache_path is not None and first.cache_path.exists()
+    assert float(np.abs(first.samples).max()) == pytest.approx(0.25, abs=1e-3)
+
+    def _no_decode(*_args, **_kwargs):
+        raise AssertionError("cached audio should not be decoded again")
+
+    monkeypatch.setattr("meeting_summarizer.audio.load_audio._decode_to_array", _no_decode)
+
+    # Same bytes under another name hit the same content-addressed entry.
+    copy_path = tmp_path / "copy.wav"
+    shutil.copy(audio_path, copy_path)
+    second = load_audio(copy_path, cache_dir=cache_dir)
+
+    assert second.cache_path == first.cache_path
+    assert isinstance(second.samples, np.memmap)
+    assert np.array_equal(second.samples, first.samples)
+
+
+def test_load_audio_missing_file(tmp_path: Path) -> None:
+    with pytest.raises(FileNotFoundError):
+        load_audio(tmp_path / "missing.wav", cache_dir=tmp_path / "cache")
+
+
+def test_prosody_reads_decoded_buffer_for_non_wav_input(tmp_path: Path) -> None:
+    t = np.arange(16000, dtype=np.float32) / 16000.0
+    buffer = AudioBuffer(
+        samples=(0.2 * np.sin(2.0 * np.pi * 200.0 * t)).astype(np.float32),
+        sample_rate=16000,
+        source_path=tmp_path / "meeting.m4a",
+        content_hash="deadbeef",
+    )
+    aligned = {"segments": [{"id": 0, "start": 0.0, "end": 1.0, "speaker": "SPEAKER_0", "text": "hi"}]}
+
+    result = extract_prosody_features(tmp_path / "meeting.m4a", aligned, tmp_path / "p.json", audio=buffer)
+
+    assert result["audio_read_error"] is None
+    assert result["sample_rate_hz"] == 16000
+    assert result["features"][0]["rms_mean"] == pytest.approx(0.2 / np.sqrt(2.0), rel=1e-3)
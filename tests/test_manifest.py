@@ -0,0 +1,159 @@
+import json
+import struct
+import time
+import wave
+from pathlib import Path
+
+import pytest
+
+from meeting_summarizer.io.atomic import write_json_atomic, write_text_atomic
+from meeting_summarizer.io.manifest import StageManifest, code_version, json_sha256
+from meeting_summarizer.pipeline import run_pipeline
+
+ALL_STAGES = ["asr", "diarization", "alignment", "prosody", "prosody_model", "topics", "summary"]
+
+
+def _write_wav(path: Path, seconds: float = 2.0) -> None:
+    sample_rate = 16000
+    samples = [int(0.15 * 32767)] * int(sample_rate * seconds)
+    with wave.open(str(path), "wb") as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes(struct.pack(f"<{len(samples)}h", *samples))
+
+
+@pytest.fixture
+def stubbed_asr(tmp_path: Path, monkeypatch):
+    audio_path = tmp_path / "speech.wav"
+    _write_wav(audio_path)
+    calls = []
+
+    def _fake_transcribe(_audio_path: Path, **_kwargs):
+        calls.append(_audio_path)
+        return {
+            "audio_path": str(audio_path),
+            "model": "fake",
+            "language": "en",
+            "segments": [
+                {"id": 0, "start": 0.0, "end": 1.0, "text": "budget review for the quarter"},
+                {"id": 1, "start": 1.2, "end": 2.0, "text": "marketing costs went up"},
+            ],
+        }
+
+    monkeypatch.setattr("meeting_summarizer.pipeline.transcribe_audio", _fake_transcribe)
+    return audio_path, calls
+
+
+def _run(audio_path: Path, output_dir: Path, **options):
+    return run_pipeline(input_path=audio_path, output_dir=output_dir, run_asr=True, use_asr_cache=False, **options)
+
+
+def test_rerun_reuses_unchanged_stages(tmp_path: Path, stubbed_asr) -> None:
+    audio_path, calls = stubbed_asr
+    output_dir = tmp_path / "out"
+
+    first = _run(audio_path, output_dir)
+    assert first.reused_stages == []
+    metadata = json.loads((output_dir / "metadata.json").read_text(encoding="utf-8"))
+    assert metadata["audio_path"] == str(audio_path)
+    assert metadata["pipeline_version"] == "0.1"
+    assert metadata["asr"] == {"model": "small"} and metadata["diarization"] == {"method": "baseline"}
+    assert sorted(metadata["stages"]) == sorted(ALL_STAGES)
+    prosody_entry = metadata["stages"]["prosody"]
+    assert prosody_entry["params"] == {"extract_pitch": False}
+    assert set(prosody_entry["inputs"]) == {"audio_path", "audio", "segments", "vad"}
+    assert list(prosody_entry["outputs"]) == ["prosody.json"]
+    assert prosody_entry["code_version"].startswith("0.1+")
+
+    second = _run(audio_path, output_dir)
+    assert second.reused_stages == ALL_STAGES
+    assert second.summary_text == first.summary_text
+    assert len(calls) == 1
+
+    # Only the summary depends on the engagement flag.
+    third = _run(audio_path, output_dir, enable_engagement=True)
+    assert third.reused_stages == ALL_STAGES[:-1]
+    assert "Engagement heuristic" in (output_dir / "summary.md").read_text(encoding="utf-8")
+
+    forced = _run(audio_path, output_dir, enable_engagement=True, reuse_outputs=False)
+    assert forced.reused_stages == []
+    assert len(calls) == 2
+
+
+def test_changed_or_missing_outputs_are_recomputed(tmp_path: Path, stubbed_asr) -> None:
+    audio_path, calls = stubbed_asr
+    output_dir = tmp_path / "out"
+    _run(audio_path, output_dir)
+
+    # A hand-edited (or half-written) artifact no longer matches its recorded hash.
+    (output_dir / "topics.json").write_text("{", encoding="utf-8")
+    result = _run(audio_path, output_dir)
+    assert "topics" not in result.reused_stages and "prosody" in result.reused_stages
+    assert json.loads((output_dir / "topics.json").read_text(encoding="utf-8"))["method"]
+
+    (output_dir / "segments.json").unlink()
+    result = _run(audio_path, output_dir, extract_pitch=True)
+    assert result.reused_stages == ["asr", "diarization"]
+    assert len(calls) == 1
+
+
+def test_streamed_prosody_records_its_streaming_time(tmp_path: Path, monkeypatch) -> None:
+    audio_path = tmp_path / "speech.wav"
+    _write_wav(audio_path)
+    rows = [
+        {"id": 0, "start": 0.0, "end": 1.0, "text": "budget review for the quarter"},
+        {"id": 1, "start": 1.2, "end": 2.0, "text": "marketing costs went up"},
+    ]
+
+    class _SlowStream:
+        def __init__(self, path: Path, **_options) -> None:
+            self.path = path
+
+        def __iter__(self):
+            for row in rows:
+                time.sleep(0.05)
+                yield dict(row)
+
+        def transcript(self):
+            return {"audio_path": str(self.path), "model": "fake", "language": "en", "segments": rows}
+
+    monkeypatch.setattr("meeting_summarizer.pipeline.TranscriptStream", _SlowStream)
+    output_dir = tmp_path / "out"
+    run_pipeline(input_path=audio_path, output_dir=output_dir, run_asr=True, use_asr_cache=False, stream_asr=True)
+
+    stages = json.loads((output_dir / "metadata.json").read_text(encoding="utf-8"))["stages"]
+    assert stages["prosody"]["elapsed_s"] >= 0.1
+    assert stages["prosody"]["elapsed_s"] <= stages["asr"]["elapsed_s"]
+
+
+def test_manifest_compares_inputs_params_and_code(tmp_path: Path) -> None:
+    output = tmp_path / "out.json"
+    write_json_atomic(output, {"value": 1})
+    code = code_version(["meeting_summarizer.io.manifest"])
+    manifest = StageManifest(tmp_path)
+    manifest.record("stage", {"input": json_sha256([1, 2])}, {"k": (1, 2)}, code, [output], 0.25)
+
+    reloaded = StageManifest(tmp_path)
+    assert reloaded.stages["stage"]["elapsed_s"] == 0.25
+    assert reloaded.is_current("stage", {"input": json_sha256([1, 2])}, {"k": [1, 2]}, code)
+    assert not reloaded.is_current("stage", {"input": json_sha256([1, 3])}, {"k": [1, 2]}, code)
+    assert not reloaded.is_current("stage", {"input": json_sha256([1, 2])}, {"k": [1]}, code)
+    assert not reloaded.is_current("stage", {"input": json_sha256([1, 2])}, {"k": [1, 2]}, code + "x")
+    assert not reloaded.is_current("other", {}, {}, code)
+    assert code != code_version(["meeting_summarizer.io.atomic"])
+
+
+def test_atomic_write_keeps_old_file_on_failure(tmp_path: Path, monkeypatch) -> None:
+    path = tmp_path / "summary.md"
+    write_text_atomic(path, "old")
+
+    def _crash(_src, _dst):
+        raise OSError("disk full")
+
+    monkeypatch.setattr("meeting_summarizer.io.atomic.os.replace", _crash)
+    with pytest.raises(OSError):
+        write_text_atomic(path, "new")
+
+    assert path.read_text(encoding="utf-8") == "old"
+    assert [child.name for child in tmp_path.iterdir()] == ["summary.md"]
@@ -0,0 +1,165 @@
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from meeting_summarizer.asr.model_registry import ModelRegistry, estimate_model_memory_mb  # noqa: E402
+from meeting_summarizer.asr.transcribe import transcribe_audio  # noqa: E402
+
+
+class _FakeModel:
+    def __init__(self, key):
+        self.key = key
+
+    def transcribe(self, _source, **_options):
+        segment = SimpleNamespace(start=0.0, end=1.0, text=" hello ")
+        return iter([segment]), SimpleNamespace(language="en")
+
+
+def _counting_loader(loads):
+    def _load(*key):
+        loads.append(key)
+        return _FakeModel(key)
+
+    return _load
+
+
+def test_registry_reuses_loaded_model() -> None:
+    loads = []
+    registry = ModelRegistry(loader=_counting_loader(loads))
+
+    first, first_load_s = registry.get("tiny")
+    second, second_load_s = registry.get("tiny")
+
+    assert first is second
+    assert len(loads) == 1
+    assert first_load_s >= 0.0 and second_load_s == 0.0
+    assert (registry.hits, registry.misses) == (1, 1)
+
+    # A different key (here: thread count) is a different model.
+    registry.get("tiny", cpu_threads=4)
+    assert len(loads) == 2
+
+
+def test_registry_evicts_least_recently_used() -> None:
+    loads = []
+    registry = ModelRegistry(max_models=2, max_memory_mb=None, loader=_counting_loader(loads))
+
+    registry.get("tiny")
+    registry.get("base")
+    registry.get("tiny")  # base is now least recently used
+    registry.get("small")
+
+    assert [key[0] for key in registry.loaded()] == ["tiny", "small"]
+
+
+def test_registry_memory_cap_evicts_but_keeps_requested_model() -> None:
+    registry = ModelRegistry(max_models=4, max_memory_mb=300, loader=_counting_loader([]))
+
+    registry.get("tiny")  # ~37 MB at int8
+    registry.get("small")  # ~233 MB, fits alongside tiny
+    assert len(registry.loaded()) == 2
+
+    registry.get("medium")  # alone over the cap: everything else goes, medium stays
+    assert [key[0] for key in registry.loaded()] == ["medium"]
+    assert registry.memory_mb() == pytest.approx(estimate_model_memory_mb("medium", "int8"))
+
+
+def test_registry_loads_outside_the_lock() -> None:
+    import threading
+
+    loads = []
+    release = threading.Event()
+    load_started = threading.Event()
+
+    def _slow_loader(*key):
+        loads.append(key)
+        if key[0] == "base":
+            load_started.set()
+            assert release.wait(5.0)
+        return _FakeModel(key)
+
+    registry = ModelRegistry(max_models=4, max_memory_mb=None, loader=_slow_loader)
+    tiny, _ = registry.get("tiny")
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(registry.get("base")[0])) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    assert load_started.wait(5.0)
+
+    # A cached model is served while "base" is still loading.
+    assert registry.get("tiny")[0] is tiny
+    release.set()
+    for thread in threads:
+        thread.join(5.0)
+
+    assert len(results) == 2 and results[0] is results[1]
+    assert [key[0] for key in loads] == ["tiny", "base"]
+
+
+def test_registry_reserves_memory_for_loads_in_progress() -> None:
+    import threading
+
+    release = threading.Event()
+    load_started = threading.Event()
+
+    def _slow_loader(*key):
+        if key[0] == "small":
+            load_started.set()
+            assert release.wait(5.0)
+        return _FakeModel(key)
+
+    registry = ModelRegistry(max_models=4, max_memory_mb=310, loader=_slow_loader)
+    registry.get("tiny")  # ~37 MB
+    thread = threading.Thread(target=lambda: registry.get("small"))  # ~233 MB
+    thread.start()
+    assert load_started.wait(5.0)
+
+    # "small" already holds its share, so "base" (~71 MB) makes room by evicting "tiny" now.
+    registry.get("base")
+    assert [key[0] for key in registry.loaded()] == ["base"]
+    release.set()
+    thread.join(5.0)
+
+    # Finishing "small" does not evict "base", which was inserted while it loaded.
+    assert [key[0] for key in registry.loaded()] == ["base", "small"]
+    assert registry.memory_mb() <= 310
+
+
+def test_estimate_model_memory_scales_with_compute_type() -> None:
+    assert estimate_model_memory_mb("small", "float32") == pytest.approx(4 * estimate_model_memory_mb("small", "int8"))
+    assert estimate_model_memory_mb("large-v3", "int8") == estimate_model_memory_mb("large", "int8")
+    assert estimate_model_memory_mb("base.en", "int8") == estimate_model_memory_mb("base", "int8")
+
+
+def test_transcribe_reports_load_and_transcription_time(tmp_path: Path) -> None:
+    audio_path = tmp_path / "speech.wav"
+    audio_path.write_bytes(b"")
+    registry = ModelRegistry(loader=_counting_loader([]))
+
+    first = transcribe_audio(audio_path, model_size="tiny", registry=registry)
+    second = transcribe_audio(audio_path, model_size="tiny", registry=registry)
+
+    assert first["segments"] == [{"id": 0, "start": 0.0, "end": 1.0, "text": "hello"}]
+    assert set(first["timing"]) == {"model_load_s", "transcription_s", "first_segment_s"}
+    assert second["timing"]["model_load_s"] == 0.0
+    assert second["timing"]["transcription_s"] >= 0.0
+
+
+def test_transcribe_passes_language_to_the_model(tmp_path: Path) -> None:
+    audio_path = tmp_path / "speech.wav"
+    audio_path.write_bytes(b"")
+    calls = []
+
+    class _RecordingModel(_FakeModel):
+        def transcribe(self, source, **options):
+            calls.append(options)
+            return super().transcribe(source, **options)
+
+    registry = ModelRegistry(loader=lambda *key: _RecordingModel(key))
+    transcribe_audio(audio_path, model_size="tiny", registry=registry, language="de")
+    transcribe_audio(audio_path, model_size="tiny", registry=registry)
+
+    assert calls == [{"language": "de"}, {}]
@@ -0,0 +1,134 @@
+import json
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from meeting_summarizer.audio.load_audio import AudioBuffer  # noqa: E402
+from meeting_summarizer.diarization.online_diarize import (  # noqa: E402
+    ONLINE_DIARIZATION_METHOD,
+    OnlineDiarizer,
+    diarize_audio_online,
+)
+from voices import SAMPLE_RATE, meeting, speaker_at, voice  # noqa: E402
+
+# Seconds of near-silence before each turn of `meeting`.
+GAP_S = 0.6
+TURNS = [(0, 5.0), (1, 4.0), (0, 6.0), (1, 5.0), (0, 4.0), (1, 6.0), (0, 5.0), (1, 4.0)]
+
+
+def test_online_diarizer_separates_two_voices() -> None:
+    samples, truth = meeting(TURNS, GAP_S)
+    diarizer = OnlineDiarizer(SAMPLE_RATE, audio_path="live.wav")
+
+    closed = []
+    for left in range(0, len(samples), 4000):
+        for turn in diarizer.push_audio(samples[left : left + 4000]):
+            # Closed turns come out while audio is still arriving, never past it.
+            assert turn["end"] <= diarizer.received_s
+            closed.append(turn)
+    diarization = diarizer.finish()
+
+    assert diarization["method"] == ONLINE_DIARIZATION_METHOD
+    assert diarization["speakers"] == ["SPEAKER_0", "SPEAKER_1"]
+    assert diarization["turns"][: len(closed)] == closed
+    turns = diarization["turns"]
+    assert [turn["id"] for turn in turns] == list(range(len(turns)))
+    assert all(a["end"] <= b["start"] for a, b in zip(turns, turns[1:]))
+
+    names = {}
+    for speaker, start, end in truth:
+        found = speaker_at(diarization, 0.5 * (start + end))
+        assert names.setdefault(speaker, found) == found
+    assert len(set(names.values())) == 2
+
+
+def test_online_diarizer_does_not_depend_on_chunk_size() -> None:
+    samples, _truth = meeting(TURNS[:4], GAP_S)
+
+    whole = OnlineDiarizer(SAMPLE_RATE)
+    whole.push_audio(samples)
+    chunked = OnlineDiarizer(SAMPLE_RATE)
+    for left in range(0, len(samples), 1234):
+        chunked.push_audio(samples[left : left + 1234])
+
+    assert chunked.finish() == whole.finish()
+
+
+def test_online_diarizer_state_stays_bounded() -> None:
+    samples, _truth = meeting([(index % 2, 4.0) for index in range(16)], GAP_S)
+    diarizer = OnlineDiarizer(SAMPLE_RATE)
+
+    for left in range(0, len(samples), SAMPLE_RATE):
+        diarizer.push_audio(samples[left : left + SAMPLE_RATE])
+        assert len(diarizer._pending) <= diarizer.lookahead
+        assert len(diarizer._audio) < diarizer.window_size + SAMPLE_RATE
+
+    assert len(diarizer._clusters) <= 4
+    assert diarizer.finish()["speakers"] == ["SPEAKER_0", "SPEAKER_1"]
+    with pytest.raises(ValueError):
+        diarizer.push_audio(samples[:100])
+
+
+def _run(samples) -> dict:
+    diarizer = OnlineDiarizer(SAMPLE_RATE)
+    for left in range(0, len(samples), 4000):
+        diarizer.push_audio(samples[left : left + 4000])
+    return diarizer.finish()
+
+
+def test_online_diarizer_labels_speech_from_the_first_window() -> None:
+    samples, truth = meeting(TURNS[:4], GAP_S)
+    # No leading silence: the noise history starts out holding only speech.
+    diarization = _run(samples[int(GAP_S * SAMPLE_RATE) :])
+
+    assert diarization["speakers"] == ["SPEAKER_0", "SPEAKER_1"]
+    assert diarization["turns"][0]["start"] == 0.0
+    assert speaker_at(diarization, 0.5) == "SPEAKER_0"
+    assert speaker_at(diarization, truth[1][1] + 1.5 - GAP_S) == "SPEAKER_1"
+
+
+def test_online_diarizer_change_windows_do_not_start_speakers() -> None:
+    rng = np.random.default_rng(0)
+    lengths = [5.3, 3.1, 6.2, 4.4, 5.1, 3.7, 4.9, 4.2]
+    samples = np.concatenate([voice(seconds, index % 2, rng, steady=True) for index, seconds in enumerate(lengths)])
+
+    diarization = _run(samples.astype(np.float32))
+
+    assert diarization["speakers"] == ["SPEAKER_0", "SPEAKER_1"]
+    assert diarization["turns"][0]["start"] == 0.0
+    bounds = np.concatenate(([0.0], np.cumsum(lengths)))
+    for index, (start, end) in enumerate(zip(bounds, bounds[1:])):
+        assert speaker_at(diarization, 0.5 * (start + end)) == f"SPEAKER_{index % 2}"
+
+
+def test_online_diarizer_survives_a_dropped_candidate_cluster() -> None:
+    rng = np.random.default_rng(0)
+
+    def silence(seconds: float) -> np.ndarray:
+        return 0.001 * rng.standard_normal(int(seconds * SAMPLE_RATE))
+
+    # The second voice's windows are still pending when the stale first cluster is dropped.
+    samples = np.concatenate(
+        [silence(6.0), voice(1.0, 0, rng), silence(23.375), voice(0.6, 1, rng), silence(6.0)]
+    ).astype(np.float32)
+
+    diarization = _run(samples)
+
+    assert diarization["speakers"] == ["SPEAKER_0"]
+    assert speaker_at(diarization, 6.5) == "SPEAKER_0"
+
+
+def test_diarize_audio_online_writes_json_and_reports_missing_audio(tmp_path: Path) -> None:
+    samples, _truth = meeting(TURNS[:2], GAP_S)
+    audio = AudioBuffer(samples, SAMPLE_RATE, Path("meeting.wav"), "test")
+
+    diarization = diarize_audio_online(Path("meeting.wav"), tmp_path / "diarization.json", audio=audio)
+    assert json.loads((tmp_path / "diarization.json").read_text(encoding="utf-8")) == diarization
+    assert diarization["audio_read_error"] is None
+    assert len(diarization["speakers"]) == 2
+
+    missing = diarize_audio_online(tmp_path / "missing.wav", tmp_path / "missing.json")
+    assert missing["turns"] == []
+    assert "not found" in missing["audio_read_error"]
@@ -0,0 +1,96 @@
+import math
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("faster_whisper")
+
+from meeting_summarizer.asr.model_registry import ModelRegistry  # noqa: E402
+from meeting_summarizer.asr.parallel_transcribe import transcribe_parallel  # noqa: E402
+from meeting_summarizer.asr.transcribe import transcribe_audio  # noqa: E402
+from meeting_summarizer.audio.load_audio import AudioBuffer  # noqa: E402
+
+SAMPLE_RATE = 16000
+
+
+class _ToneModel:
+    """Stand-in for WhisperModel: one segment per loud burst, named after its loudness."""
+
+    def transcribe(self, audio, language=None, **_options):
+        frame = SAMPLE_RATE // 10
+        audio = np.asarray(audio)
+        loud = [float(np.abs(audio[i : i + frame]).max()) > 0.05 for i in range(0, len(audio) - frame + 1, frame)]
+        segments = []
+        i = 0
+        while i < len(loud):
+            if not loud[i]:
+                i += 1
+                continue
+            j = i
+            while j < len(loud) and loud[j]:
+                j += 1
+            peak = float(np.abs(audio[i * frame : j * frame]).max())
+            segments.append(SimpleNamespace(start=i * 0.1, end=j * 0.1, text=f" burst {peak:.1f} "))
+            i = j
+        return iter(segments), SimpleNamespace(language=language or "en")
+
+
+def _load_tone_model(*_key):
+    return _ToneModel()
+
+
+def _bursts(seconds: float, amplitudes):
+    """Two-second bursts separated by three seconds of silence."""
+    samples = np.zeros(int(seconds * SAMPLE_RATE), dtype=np.float32)
+    t = np.arange(2 * SAMPLE_RATE) / SAMPLE_RATE
+    for k, amplitude in enumerate(amplitudes):
+        start = int((1.0 + 5.0 * k) * SAMPLE_RATE)
+        samples[start : start + len(t)] = amplitude * np.sin(2.0 * math.pi * 180.0 * t)
+    return samples
+
+
+def test_parallel_transcribe_matches_single_pass(tmp_path: Path) -> None:
+    amplitudes = [0.1 + 0.05 * (k % 8) for k in range(30)]
+    samples = _bursts(151.0, amplitudes)
+    audio = AudioBuffer(samples, SAMPLE_RATE, tmp_path / "long.wav", content_hash="test")
+
+    single = transcribe_audio(audio.source_path, audio=audio, registry=ModelRegistry(loader=_load_tone_model))
+    parallel = transcribe_parallel(audio.source_path, workers=2, audio=audio, loader=_load_tone_model)
+
+    assert parallel["timing"]["chunks"] >= 2
+    assert [segment["id"] for segment in parallel["segments"]] == list(range(len(amplitudes)))
+    assert [segment["text"] for segment in parallel["segments"]] == [segment["text"] for segment in single["segments"]]
+    for got, expected in zip(parallel["segments"], single["segments"]):
+        assert got["start"] == pytest.approx(expected["start"], abs=0.1)
+        assert got["end"] == pytest.approx(expected["end"], abs=0.1)
+    assert parallel["language"] == "en"
+
+
+def test_parallel_transcribe_without_speech_returns_no_segments(tmp_path: Path) -> None:
+    audio = AudioBuffer(np.zeros(5 * SAMPLE_RATE, dtype=np.float32), SAMPLE_RATE, tmp_path / "quiet.wav", "quiet")
+
+    result = transcribe_parallel(audio.source_path, workers=2, audio=audio, loader=_load_tone_model)
+
+    assert result["segments"] == []
+    assert result["timing"]["chunks"] == 0
+
+
+def test_single_worker_honours_language_and_regions(tmp_path: Path) -> None:
+    calls = []
+
+    class _RecordingModel(_ToneModel):
+        def transcribe(self, audio, language=None, **options):
+            calls.append((language, options.get("clip_timestamps")))
+            return super().transcribe(audio, language=language, **options)
+
+    audio = AudioBuffer(_bursts(11.0, [0.2, 0.3]), SAMPLE_RATE, tmp_path / "short.wav", content_hash="short")
+    regions = [{"id": 0, "start": 1.0, "end": 3.0}, {"id": 1, "start": 6.0, "end": 8.0}]
+
+    result = transcribe_parallel(
+        audio.source_path, workers=1, audio=audio, language="de", regions=regions, loader=lambda *_key: _RecordingModel()
+    )
+
+    assert result["language"] == "de"
+    assert calls == [("de", pytest.approx([0.8, 3.2, 5.8, 8.2]))]
@@ -0,0 +1,112 @@
+import math
+import struct
+import wave
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from meeting_summarizer.prosody.extract_prosody import extract_prosody_features  # noqa: E402
+from meeting_summarizer.prosody.pitch import estimate_f0, pitch_stats  # noqa: E402
+
+
+def _harmonic_tone(f0_hz: float, seconds: float, sample_rate: int = 16000):
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    return sum((0.3 / k) * np.sin(2.0 * math.pi * k * f0_hz * t) for k in (1, 2, 3))
+
+
+@pytest.mark.parametrize("f0_hz", [85.0, 140.0, 230.0, 330.0])
+def test_pitch_stats_recovers_tone_frequency(f0_hz: float) -> None:
+    f0_mean, f0_std, voiced_ratio = pitch_stats(_harmonic_tone(f0_hz, 1.0), 16000)
+
+    assert f0_mean == pytest.approx(f0_hz, rel=0.01)
+    assert f0_std < 1.0
+    assert voiced_ratio == pytest.approx(1.0)
+
+
+def test_pitch_stats_silence_and_short_input() -> None:
+    assert pitch_stats(np.zeros(16000), 16000) == (None, None, 0.0)
+    assert pitch_stats(np.zeros(100), 16000) == (None, None, None)
+
+
+def test_estimate_f0_marks_quiet_frames_unvoiced() -> None:
+    signal = np.concatenate([_harmonic_tone(150.0, 0.5), np.zeros(8000)])
+    f0 = estimate_f0(signal, 16000)
+
+    assert np.all(np.isfinite(f0[:10]))
+    assert np.all(np.isnan(f0[-10:]))
+
+
+def test_extract_prosody_features_with_pitch(tmp_path: Path) -> None:
+    audio_path = tmp_path / "voice.wav"
+    pcm = np.concatenate([_harmonic_tone(120.0, 1.0), np.zeros(8000), _harmonic_tone(200.0, 1.0)])
+    with wave.open(str(audio_path), "wb") as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(16000)
+        wav_file.writeframes(struct.pack(f"<{len(pcm)}h", *(int(v * 32767) for v in pcm)))
+
+    aligned = {
+        "segments": [
+            {"id": 0, "start": 0.0, "end": 1.0, "speaker": "SPEAKER_0", "text": "low"},
+            {"id": 1, "start": 1.5, "end": 2.5, "speaker": "SPEAKER_1", "text": "high"},
+        ]
+    }
+    result = extract_prosody_features(audio_path, aligned, tmp_path / "prosody.json", extract_pitch=True)
+
+    assert result["method"] == "rms_pause_f0_v3"
+    low, high = result["features"]
+    assert low["f0_mean"] == pytest.approx(120.0, rel=0.02)
+    assert high["f0_mean"] == pytest.approx(200.0, rel=0.02)
+    assert low["voiced_ratio"] > 0.9
+    assert low["rms_mean"] is not None
+
+
+def test_extract_prosody_features_with_pitch_missing_audio(tmp_path: Path) -> None:
+    aligned = {"segments": [{"id": 0, "start": 0.0, "end": 1.0, "speaker": "SPEAKER_0", "text": "a"}]}
+    result = extract_prosody_features(tmp_path / "missing.wav", aligned, tmp_path / "p.json", extract_pitch=True)
+
+    assert result["method"] == "rms_pause_f0_v3"
+    assert result["features"][0]["f0_mean"] is None
+    assert result["features"][0]["voiced_ratio"] is None
+
+
+def test_parallel_pitch_matches_serial(tmp_path: Path) -> None:
+    audio_path = tmp_path / "voice.wav"
+    pcm = np.concatenate([_harmonic_tone(110.0 + 15.0 * i, 0.4) for i in range(8)])
+    with wave.open(str(audio_path), "wb") as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(16000)
+        wav_file.writeframes(struct.pack(f"<{len(pcm)}h", *(int(v * 32767) for v in pcm)))
+
+    aligned = {
+        "segments": [
+            {"id": i, "start": 0.4 * i, "end": 0.4 * i + 0.35, "speaker": f"SPEAKER_{i % 2}", "text": str(i)}
+            for i in range(8)
+        ]
+    }
+    serial = extract_prosody_features(audio_path, aligned, tmp_path / "serial" / "p.json", extract_pitch=True)
+    parallel = extract_prosody_features(
+        audio_path, aligned, tmp_path / "parallel" / "p.json", extract_pitch=True, workers=2
+    )
+
+    assert parallel["features"] == serial["features"]
+
+
+def test_parallel_pitch_maps_cached_audio_by_path(tmp_path: Path, monkeypatch) -> None:
+    from meeting_summarizer.audio.load_audio import AudioBuffer
+    from meeting_summarizer.prosody.parallel import parallel_pitch_stats
+
+    cache_path = tmp_path / "cache.npy"
+    np.save(cache_path, np.concatenate([_harmonic_tone(110.0 + 20.0 * i, 0.4) for i in range(6)]).astype(np.float32))
+    audio = AudioBuffer(np.load(cache_path, mmap_mode="r"), 16000, tmp_path / "voice.wav", "hash", cache_path=cache_path)
+    bounds = [(6400 * i, 6400 * i + 5600) for i in range(6)]
+    serial = [pitch_stats(audio.read(left, right), audio.sample_rate) for left, right in bounds]
+
+    def _no_copy(*_args):
+        raise AssertionError("memory-mapped audio should not be copied into shared memory")
+
+    monkeypatch.setattr("meeting_summarizer.audio.shared_audio._copy_to_shared_memory", _no_copy)
+    assert parallel_pitch_stats(audio, bounds, workers=2, chunk_segments=2) == serial
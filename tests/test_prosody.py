@@ -4,6 +4,8 @@ import struct
 import wave
 from pathlib import Path
 
+import pytest
+
 from meeting_summarizer.prosody.extract_prosody import extract_prosody_features
 
 
@@ -47,9 +49,10 @@ def test_extract_prosody_features_rms_and_pauses(tmp_path: Path) -> None:
     result = extract_prosody_features(audio_path=audio_path, aligned=aligned, output_path=output_path)
 
     assert output_path.exists()
-    assert result["method"] == "rms_pause_v1"
+    assert result["method"] == "rms_pause_v2"
     assert result["audio_read_error"] is None
     assert result["sample_rate_hz"] == 16000
+    assert "pause_source" not in result
 
     features = result["features"]
     assert len(features) == 2
@@ -88,3 +91,147 @@ def test_extract_prosody_features_missing_audio(tmp_path: Path) -> None:
     assert len(result["features"]) == 1
     assert result["features"][0]["rms_mean"] is None
     assert result["features"][0]["rms_std"] is None
+
+
+def _write_multiformat_wav(path: Path, sample_width: int, channels: int, sample_rate: int = 8000) -> None:
+    full_scale = {1: 127, 2: 32767, 4: 2147483647}[sample_width]
+    values = []
+    for i in range(sample_rate):
+        t = i / sample_rate
+        for channel in range(channels):
+            amp = (0.05 + 0.1 * channel + 0.2 * t) * math.sin(2.0 * math.pi * 180.0 * t)
+            values.append(int(amp * full_scale))
+
+    if sample_width == 1:
+        frames = bytes(value + 128 for value in values)
+    else:
+        frames = struct.pack(f"<{len(values)}{'h' if sample_width == 2 else 'i'}", *values)
+
+    with wave.open(str(path), "wb") as wav_file:
+        wav_file.setnchannels(channels)
+        wav_file.setsampwidth(sample_width)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes(frames)
+
+
+@pytest.mark.parametrize("sample_width", [1, 2, 4])
+@pytest.mark.parametrize("channels", [1, 2])
+def test_numpy_engine_matches_python_engine(tmp_path: Path, sample_width: int, channels: int) -> None:
+    pytest.importorskip("numpy")
+    audio_path = tmp_path / "multi.wav"
+    _write_multiformat_wav(audio_path, sample_width=sample_width, channels=channels)
+
+    aligned = {
+        "segments": [
+            {"id": 0, "start": 0.0, "end": 0.37, "speaker": "SPEAKER_0", "text": "a"},
+            {"id": 1, "start": 0.41, "end": 0.9, "speaker": "SPEAKER_1", "text": "b"},
+            {"id": 2, "start": 0.95, "end": 1.4, "speaker": "SPEAKER_0", "text": "past the end"},
+        ]
+    }
+
+    python_result = extract_prosody_features(audio_path, aligned, tmp_path / "py.json", engine="python")
+    numpy_result = extract_prosody_features(audio_path, aligned, tmp_path / "np.json", engine="numpy")
+
+    assert numpy_result["method"] == python_result["method"] == "rms_pause_v2"
+    assert numpy_result["sample_rate_hz"] == python_result["sample_rate_hz"]
+    for py_row, np_row in zip(python_result["features"], numpy_result["features"]):
+        assert np_row.keys() == py_row.keys()
+        for key, value in py_row.items():
+            if isinstance(value, float):
+                assert np_row[key] == pytest.approx(value, rel=1e-9, abs=1e-12)
+            else:
+                assert np_row[key] == value
+
+
+def test_extract_prosody_features_rejects_unknown_engine(tmp_path: Path) -> None:
+    with pytest.raises(ValueError):
+        extract_prosody_features(tmp_path / "missing.wav", {"segments": []}, tmp_path / "p.json", engine="gpu")
+
+
+def test_extract_prosody_features_small_blocks_match_single_pass(tmp_path: Path) -> None:
+    audio_path = tmp_path / "speech_like.wav"
+    _write_test_wav(audio_path)
+    aligned = {
+        "segments": [
+            {"id": 0, "start": 0.013, "end": 1.2, "speaker": "SPEAKER_0", "text": "a"},
+            {"id": 1, "start": 1.31, "end": 2.5, "speaker": "SPEAKER_1", "text": "b"},
+        ]
+    }
+
+    single = extract_prosody_features(audio_path, aligned, tmp_path / "single" / "prosody.json")
+    blocked = extract_prosody_features(
+        audio_path, aligned, tmp_path / "blocked" / "prosody.json", block_frames=1000
+    )
+
+    for full_row, block_row in zip(single["features"], blocked["features"]):
+        assert block_row["rms_mean"] == pytest.approx(full_row["rms_mean"], rel=1e-12)
+        assert block_row["rms_std"] == pytest.approx(full_row["rms_std"], rel=1e-12)
+
+
+def test_extract_prosody_features_reuses_envelope_cache(tmp_path: Path, monkeypatch) -> None:
+    pytest.importorskip("numpy")
+    audio_path = tmp_path / "speech_like.wav"
+    _write_test_wav(audio_path)
+    output_path = tmp_path / "run" / "prosody.json"
+
+    first = extract_prosody_features(
+        audio_path,
+        {"segments": [{"id": 0, "start": 0.0, "end": 2.5, "speaker": "SPEAKER_0", "text": "all"}]},
+        output_path,
+    )
+    assert (tmp_path / "run" / "energy_envelope.npz").exists()
+    assert first["features"][0]["rms_mean"] is not None
+
+    aligned = {
+        "segments": [
+            {"id": 0, "start": 0.0, "end": 1.0, "speaker": "SPEAKER_0", "text": "part one"},
+            {"id": 1, "start": 1.5, "end": 2.5, "speaker": "SPEAKER_1", "text": "part two"},
+        ]
+    }
+    uncached = extract_prosody_features(audio_path, aligned, tmp_path / "other" / "prosody.json", engine="python")
+
+    def _no_audio_access(*_args, **_kwargs):
+        raise AssertionError("audio should not be re-read when the envelope cache is valid")
+
+    monkeypatch.setattr("meeting_summarizer.prosody.energy_envelope.WavReader", _no_audio_access)
+    cached = extract_prosody_features(audio_path, aligned, output_path)
+
+    assert cached["sample_rate_hz"] == 16000
+    for cached_row, direct_row in zip(cached["features"], uncached["features"]):
+        assert cached_row["rms_mean"] == pytest.approx(direct_row["rms_mean"], rel=1e-9)
+        assert cached_row["rms_std"] == pytest.approx(direct_row["rms_std"], rel=1e-6, abs=1e-9)
+
+
+def test_envelope_cache_invalidated_when_audio_changes(tmp_path: Path) -> None:
+    pytest.importorskip("numpy")
+    audio_path = tmp_path / "speech_like.wav"
+    output_path = tmp_path / "run" / "prosody.json"
+    aligned = {"segments": [{"id": 0, "start": 0.0, "end": 1.0, "speaker": "SPEAKER_0", "text": "a"}]}
+
+    _write_test_wav(audio_path, sample_rate=16000)
+    first = extract_prosody_features(audio_path, aligned, output_path)
+    _write_test_wav(audio_path, sample_rate=8000)
+    second = extract_prosody_features(audio_path, aligned, output_path)
+
+    assert first["sample_rate_hz"] == 16000
+    assert second["sample_rate_hz"] == 8000
+
+
+def test_envelope_prefix_std_stays_close_to_direct_computation() -> None:
+    np = pytest.importorskip("numpy")
+    from meeting_summarizer.prosody.energy_envelope import _build_envelope
+
+    # An hour of 20ms frames; the second half is nearly constant, where mean_sq - mean^2
+    # cancels hardest.
+    rng = np.random.default_rng(0)
+    frames = 180000
+    frame_rms = 0.05 + 0.02 * rng.random(frames)
+    frame_rms[frames // 2 :] = 0.1 + 1e-5 * rng.standard_normal(frames - frames // 2)
+    envelope = _build_envelope(16000, 320, frames * 320, frame_rms)
+
+    for _ in range(500):
+        lo = int(rng.integers(0, frames - 2))
+        hi = int(min(frames, lo + rng.integers(2, 3000)))
+        mean, std = envelope.stats(lo * 320, hi * 320)
+        assert mean == pytest.approx(float(np.mean(frame_rms[lo:hi])), abs=1e-12)
+        assert std == pytest.approx(float(np.std(frame_rms[lo:hi])), abs=1e-7)
@@ -0,0 +1,108 @@
+import json
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from meeting_summarizer.prosody.hmm import HMM_METHOD, GaussianHMM, build_prosody_hmm, fit_prosody_hmm  # noqa: E402
+
+MEANS = np.array([[-1.0, 0.0, 0.0, 0.0], [2.0, 1.0, 1.0, 0.5]])
+TRANSITIONS = np.array([[0.9, 0.1], [0.2, 0.8]])
+
+
+def _sample(length: int, rng):
+    states = np.empty(length, dtype=np.int64)
+    states[0] = 0
+    for t in range(1, length):
+        states[t] = int(rng.random() < TRANSITIONS[states[t - 1], 1])
+    return MEANS[states] + 0.3 * rng.standard_normal((length, MEANS.shape[1])), states
+
+
+def _naive_log_likelihood(model: GaussianHMM, sequence) -> float:
+    """Step-by-step log-space forward pass for one sequence."""
+    log_b = model._log_emissions((sequence - model.feature_mean) / model.feature_std)
+    alpha = np.log(model.start_prob) + log_b[0]
+    for t in range(1, len(sequence)):
+        scores = alpha[:, None] + np.log(model.transitions)
+        peak = scores.max(axis=0)
+        alpha = peak + np.log(np.exp(scores - peak).sum(axis=0)) + log_b[t]
+    peak = alpha.max()
+    return float(peak + np.log(np.exp(alpha - peak).sum()))
+
+
+def _features(count: int, rng):
+    rows, position = [], 0.0
+    for index in range(count):
+        loud = (index // 5) % 2 == 1
+        duration = float(rng.uniform(1.0, 3.0))
+        pause = float(rng.uniform(0.05, 0.2) if loud else rng.uniform(0.8, 1.5))
+        rows.append(
+            {
+                "segment_id": index,
+                "start": position + pause,
+                "end": position + pause + duration,
+                "speaker": f"SPEAKER_{index % 2}",
+                "duration_s": duration,
+                "pause_before_s": pause,
+                "pause_after_s": pause,
+                "rms_mean": float(rng.uniform(0.2, 0.3) if loud else rng.uniform(0.01, 0.02)),
+            }
+        )
+        position += pause + duration
+    return rows
+
+
+def test_baum_welch_recovers_a_two_state_chain_across_sequences() -> None:
+    rng = np.random.default_rng(0)
+    data = [_sample(length, rng) for length in (300, 40, 500, 1)]
+
+    model = GaussianHMM(n_states=2).fit([observations for observations, _ in data])
+
+    assert model.converged
+    assert model.transitions == pytest.approx(TRANSITIONS, abs=0.05)
+    for path, (_observations, states) in zip(model.decode([observations for observations, _ in data]), data):
+        assert np.mean(path == states) > 0.98
+
+
+def test_chunked_forward_matches_step_by_step_likelihood() -> None:
+    rng = np.random.default_rng(1)
+    sequences = [_sample(length, rng)[0] for length in (7, 1, 130, 64)]
+    model = GaussianHMM(n_states=3, n_iter=2).fit(sequences)
+
+    expected = sum(_naive_log_likelihood(model, sequence) for sequence in sequences)
+    assert model.score(sequences) == pytest.approx(expected, rel=1e-9)
+    assert model.log_likelihood == pytest.approx(expected, rel=1e-9)
+
+
+def test_build_prosody_hmm_writes_states_and_accepts_a_pretrained_model(tmp_path: Path) -> None:
+    rng = np.random.default_rng(2)
+    prosody = {"audio_path": "a.wav", "method": "rms_pause_v1", "features": _features(60, rng)}
+
+    result = build_prosody_hmm(prosody, tmp_path / "prosody_hmm.json", n_states=2)
+
+    assert json.loads((tmp_path / "prosody_hmm.json").read_text(encoding="utf-8")) == result
+    assert result["method"] == HMM_METHOD
+    assert result["pretrained"] is False
+    assert result["sequence"]["length"] == 60
+    # States are numbered by typical energy, and the decoded path follows the loud blocks.
+    assert result["states"][0]["typical_rms"] < result["states"][1]["typical_rms"]
+    decoded = [row["state"] for row in result["sequence"]["observations"]]
+    assert decoded == [(index // 5) % 2 for index in range(60)]
+
+    model = fit_prosody_hmm([prosody, {"features": _features(30, rng)}], n_states=2)
+    model.save(tmp_path / "model.json")
+    loaded = GaussianHMM.load(tmp_path / "model.json")
+    pretrained = build_prosody_hmm(prosody, tmp_path / "decoded.json", model=loaded)
+    assert pretrained["pretrained"] is True
+    assert [row["state"] for row in pretrained["sequence"]["observations"]] == decoded
+
+
+def test_build_prosody_hmm_handles_empty_prosody(tmp_path: Path) -> None:
+    result = build_prosody_hmm({"audio_path": None, "method": "rms_pause_v1", "features": []}, tmp_path / "h.json")
+
+    assert result["model"] is None
+    assert result["states"] == []
+    assert result["sequence"] == {"length": 0, "observations": []}
+    with pytest.raises(ValueError):
+        GaussianHMM().fit([])
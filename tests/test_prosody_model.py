@@ -1,6 +1,9 @@
 import json
+import random
 from pathlib import Path
 
+import pytest
+
 from meeting_summarizer.prosody.model_sequence import build_prosody_sequence_model
 
 
@@ -96,3 +99,50 @@ def test_build_prosody_sequence_model_empty_features(tmp_path: Path) -> None:
     assert model["sequence"]["length"] == 0
     assert model["sequence"]["state_transition_counts"] == []
     assert model["sequence"]["state_transition_probabilities"] == []
+
+
+def _assert_same_model(actual, expected) -> None:
+    # Averages may differ in the last bit where Python's sum() compensates rounding.
+    assert actual["sequence"] == expected["sequence"]
+    assert [row["speaker"] for row in actual["speaker_stats"]] == [row["speaker"] for row in expected["speaker_stats"]]
+    for got, want in zip(actual["speaker_stats"], expected["speaker_stats"]):
+        assert got == pytest.approx(want, rel=1e-12)
+    assert {key: value for key, value in actual.items() if key not in {"sequence", "speaker_stats"}} == {
+        key: value for key, value in expected.items() if key not in {"sequence", "speaker_stats"}
+    }
+
+
+@pytest.mark.parametrize("shuffle", [False, True])
+def test_numpy_engine_matches_python_engine(tmp_path: Path, shuffle: bool) -> None:
+    pytest.importorskip("numpy")
+    rng = random.Random(3)
+    features = []
+    for index in range(500):
+        start = float(index // 2)  # pairs of rows share a start, so ties are exercised
+        features.append(
+            {
+                "segment_id": index,
+                "start": start,
+                "end": start + rng.choice([0.5, 1.0]),
+                "speaker": rng.choice(["SPEAKER_0", "SPEAKER_1", "SPEAKER_2"]),
+                "duration_s": rng.uniform(0.2, 3.0),
+                "pause_before_s": rng.choice([0.0, 0.05, 0.2, 0.6]),
+                "pause_after_s": rng.choice([0.0, 0.1, 0.3]),
+                "rms_mean": None if index % 17 == 0 else rng.choice([0.01, 0.05, 0.1, rng.uniform(0.0, 0.3)]),
+            }
+        )
+    if shuffle:
+        rng.shuffle(features)
+    features.append({"start": 600.0})  # only defaults
+    prosody = {"audio_path": "a.wav", "method": "rms_pause_v1", "features": features}
+
+    columnar = build_prosody_sequence_model(prosody, tmp_path / "numpy.json", engine="numpy")
+    rows = build_prosody_sequence_model(prosody, tmp_path / "python.json", engine="python")
+
+    _assert_same_model(columnar, rows)
+    assert columnar["sequence"]["length"] == len(features)
+
+
+def test_unknown_sequence_engine_is_rejected(tmp_path: Path) -> None:
+    with pytest.raises(ValueError, match="engine"):
+        build_prosody_sequence_model({"features": []}, tmp_path / "m.json", engine="fortran")
@@ -0,0 +1,83 @@
+import math
+import struct
+import wave
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from meeting_summarizer.audio.wav_reader import WavReader  # noqa: E402
+from meeting_summarizer.prosody.extract_prosody import extract_prosody_features  # noqa: E402
+from meeting_summarizer.prosody.streaming import StreamingProsodyExtractor  # noqa: E402
+
+
+def _write_meeting_wav(path: Path, seconds: float = 6.0, sample_rate: int = 16000) -> None:
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    envelope = 0.05 + 0.2 * (0.5 + 0.5 * np.sin(2.0 * math.pi * 0.3 * t))
+    voice = envelope * np.sin(2.0 * math.pi * (140.0 + 30.0 * np.sin(2.0 * math.pi * 0.5 * t)) * t)
+    voice[(t % 2.0) > 1.6] = 0.0
+    with wave.open(str(path), "wb") as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes(struct.pack(f"<{len(voice)}h", *(int(v * 32767) for v in voice)))
+
+
+SEGMENTS = [
+    {"id": 0, "start": 0.013, "end": 1.6, "speaker": "SPEAKER_0", "text": "a"},
+    {"id": 1, "start": 2.0, "end": 3.55, "speaker": "SPEAKER_1", "text": "b"},
+    {"id": 2, "start": 3.5, "end": 3.9, "speaker": "SPEAKER_0", "text": "overlap"},
+    {"id": 3, "start": 4.05, "end": 5.61, "speaker": "SPEAKER_1", "text": "c"},
+    {"id": 4, "start": 5.8, "end": 6.4, "speaker": "SPEAKER_0", "text": "past end"},
+]
+
+
+@pytest.mark.parametrize("extract_pitch", [False, True])
+@pytest.mark.parametrize("chunk_frames", [1000, 4410, 16000])
+def test_streaming_matches_batch(tmp_path: Path, extract_pitch: bool, chunk_frames: int) -> None:
+    audio_path = tmp_path / "meeting.wav"
+    _write_meeting_wav(audio_path)
+    batch = extract_prosody_features(
+        audio_path, {"segments": SEGMENTS}, tmp_path / "batch" / "prosody.json", extract_pitch=extract_pitch
+    )
+
+    extractor = StreamingProsodyExtractor(16000, audio_path=str(audio_path), extract_pitch=extract_pitch)
+    emitted = []
+    pending_segments = list(SEGMENTS)
+    with WavReader(audio_path) as reader:
+        for block in reader.iter_blocks(0, reader.num_frames, chunk_frames):
+            emitted.extend(extractor.push_audio(block))
+            while pending_segments and pending_segments[0]["end"] <= extractor.received_s:
+                emitted.extend(extractor.push_segment(pending_segments.pop(0)))
+    for segment in pending_segments:
+        emitted.extend(extractor.push_segment(segment))
+
+    # Rows are emitted before the stream ends, once their right-hand context exists.
+    assert len(emitted) >= 3
+    streamed = extractor.finish(tmp_path / "stream" / "prosody.json")
+
+    assert streamed == batch
+    assert (tmp_path / "stream" / "prosody.json").exists()
+
+
+def test_streaming_keeps_bounded_history(tmp_path: Path) -> None:
+    extractor = StreamingProsodyExtractor(16000, extract_pitch=True, ring_buffer_s=1.0)
+    for second in range(30):
+        extractor.push_segment({"id": second, "start": float(second), "end": second + 0.5, "text": ""})
+        extractor.push_audio(np.full(16000, 0.1))
+
+    assert len(extractor._cumsum) <= 2 * extractor.ring_frames + 1
+    assert len(extractor._audio) <= 2 * 16000 + 1
+
+    result = extractor.finish()
+    assert len(result["features"]) == 30
+    assert result["features"][10]["rms_mean"] == pytest.approx(0.1)
+
+
+def test_streaming_rejects_out_of_order_segments() -> None:
+    extractor = StreamingProsodyExtractor(16000)
+    extractor.push_segment({"id": 0, "start": 2.0, "end": 3.0})
+
+    with pytest.raises(ValueError):
+        extractor.push_segment({"id": 1, "start": 1.0, "end": 1.5})
@@ -0,0 +1,136 @@
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from cli import main as cli_main
+from meeting_summarizer.pipeline import run_pipeline
+from meeting_summarizer.search.index import MeetingIndex, _match_expression, update_search_index
+
+
+def _write_run(run_dir: Path, lines: list, summary: str = "") -> None:
+    run_dir.mkdir(parents=True, exist_ok=True)
+    segments = [
+        {"id": index, "start": index * 10.0, "end": index * 10.0 + 8.0, "speaker": speaker, "text": text}
+        for index, (speaker, text) in enumerate(lines)
+    ]
+    features = [
+        {"segment_id": index, "speaker": speaker, "rms_mean": 0.1 + index / 100, "pause_before_s": 2.0,
+         "pause_after_s": 0.5}
+        for index, (speaker, _text) in enumerate(lines)
+    ]
+    (run_dir / "segments.json").write_text(json.dumps({"audio_path": f"{run_dir.name}.wav", "segments": segments}))
+    (run_dir / "prosody.json").write_text(json.dumps({"audio_path": f"{run_dir.name}.wav", "features": features}))
+    (run_dir / "summary.md").write_text(summary)
+
+
+def _runs(root: Path) -> None:
+    _write_run(
+        root / "standup",
+        [
+            ("SPEAKER_0", "Good morning, quick standup today."),
+            ("SPEAKER_2", "The budget for the cloud migration is over by ten percent."),
+            ("SPEAKER_1", "Budgeting aside, the release is on track."),
+        ],
+        summary="# Meeting Summary\nRelease on track; migration budget overrun.",
+    )
+    _write_run(
+        root / "planning",
+        [
+            ("SPEAKER_2", "Hiring plan for next quarter."),
+            ("SPEAKER_0", "We need the marketing budget before Friday."),
+        ],
+        summary="# Meeting Summary\nHiring plan and marketing spend.",
+    )
+
+
+def test_search_by_text_speaker_and_time(tmp_path: Path) -> None:
+    _runs(tmp_path / "outputs")
+    with MeetingIndex(tmp_path / "search.db") as index:
+        assert index.ingest_tree(tmp_path / "outputs") == {"indexed": 2, "unchanged": 0}
+        assert index.stats() == {"meetings": 2, "segments": 5}
+
+        # Stemmed: "budget" also matches "Budgeting".
+        assert len(index.search("budget")) == 3
+        rows = index.search("budget", speaker="SPEAKER_2")
+        assert [row["text"] for row in rows] == ["The budget for the cloud migration is over by ten percent."]
+        assert rows[0]["run_dir"] == str((tmp_path / "outputs" / "standup").resolve())
+        assert rows[0]["rms_mean"] == 0.11 and rows[0]["pause_before_s"] == 2.0
+        assert "[budget]" in rows[0]["snippet"]
+
+        in_window = index.search("budget", start=19.0, end=25.0)
+        assert [row["segment_id"] for row in in_window] == [2]
+        # Without a query: meeting (ingest) order, then time.
+        assert [row["text"] for row in index.search(speaker="SPEAKER_2")] == [
+            "Hiring plan for next quarter.",
+            "The budget for the cloud migration is over by ten percent.",
+        ]
+        assert index.search("migr*", run_dir=str(tmp_path / "outputs" / "planning")) == []
+        assert len(index.search("migr*")) == 1
+        assert [(Path(row["run_dir"]).name, row["segment_id"]) for row in index.search("budget", order="time")] == [
+            ("planning", 1), ("standup", 1), ("standup", 2),
+        ]
+        with pytest.raises(ValueError):
+            index.search("budget", order="alphabetical")
+        # FTS operators in user input are literal words, not syntax.
+        assert index.search('budget" OR "hiring') == []
+
+        summaries = index.search_summaries("hiring")
+        assert [Path(row["run_dir"]).name for row in summaries] == ["planning"]
+        assert {row["speaker"]: row["segments"] for row in index.speakers()} == {
+            "SPEAKER_0": 2, "SPEAKER_1": 1, "SPEAKER_2": 2,
+        }
+
+
+def test_ingest_is_incremental(tmp_path: Path) -> None:
+    outputs = tmp_path / "outputs"
+    _runs(outputs)
+    db_path = tmp_path / "search.db"
+    with MeetingIndex(db_path) as index:
+        index.ingest_tree(outputs)
+        assert index.ingest_tree(outputs) == {"indexed": 0, "unchanged": 2}
+
+    # Re-running a meeting replaces its rows instead of duplicating them.
+    _write_run(outputs / "planning", [("SPEAKER_3", "Budget approved for the offsite.")])
+    stat = (outputs / "planning" / "segments.json").stat()
+    os.utime(outputs / "planning" / "segments.json", ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert update_search_index(db_path, outputs / "planning") is True
+    assert update_search_index(db_path, outputs / "planning") is False
+    with MeetingIndex(db_path) as index:
+        assert index.stats() == {"meetings": 2, "segments": 4}
+        assert index.search("hiring") == []
+        assert [row["speaker"] for row in index.search("offsite")] == ["SPEAKER_3"]
+
+        for path in (outputs / "planning").iterdir():
+            path.unlink()
+        assert index.remove_missing() == 1
+        assert index.stats() == {"meetings": 1, "segments": 3}
+        assert index.search("offsite") == []
+
+
+def test_match_expression_quotes_terms() -> None:
+    assert _match_expression("budget review") == '"budget" "review"'
+    assert _match_expression('say "hi" migr*') == '"say" """hi""" "migr"*'
+
+
+def test_cli_index_and_search(tmp_path: Path, capsys) -> None:
+    _runs(tmp_path / "outputs")
+    db_path = str(tmp_path / "search.db")
+
+    cli_main(["index", str(tmp_path / "outputs"), "--db", db_path])
+    cli_main(["search", "budget", "--speaker", "SPEAKER_0", "--db", db_path])
+    output = capsys.readouterr().out
+
+    assert "2 indexed, 0 unchanged" in output
+    assert "SPEAKER_0: We need the marketing [budget] before Friday." in output
+
+
+def test_pipeline_adds_run_to_search_index(tmp_path: Path) -> None:
+    db_path = tmp_path / "search.db"
+    run_pipeline(input_path=Path("data/raw/example.wav"), output_dir=tmp_path / "out", run_asr=False,
+                 search_index_path=db_path)
+
+    with MeetingIndex(db_path) as index:
+        assert index.stats() == {"meetings": 1, "segments": 0}
+        assert [Path(row["run_dir"]).name for row in index.search_summaries("summary")] == ["out"]
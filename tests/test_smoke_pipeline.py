@@ -3,6 +3,9 @@ import struct
 import wave
 from pathlib import Path
 
+import pytest
+
+from meeting_summarizer.audio.load_audio import hash_file
 from meeting_summarizer.pipeline import run_pipeline
 
 
@@ -17,9 +20,10 @@ def test_smoke_pipeline(tmp_path: Path) -> None:
     assert (output_dir / "summary.md").exists()
     assert (output_dir / "prosody.json").exists()
     assert (output_dir / "prosody_model.json").exists()
+    assert json.loads((output_dir / "topics.json").read_text(encoding="utf-8"))["topics"] == []
 
     prosody = json.loads((output_dir / "prosody.json").read_text(encoding="utf-8"))
-    assert prosody["method"] == "rms_pause_v1"
+    assert prosody["method"] == "rms_pause_v2"
     assert prosody["features"] == []
 
     prosody_model = json.loads((output_dir / "prosody_model.json").read_text(encoding="utf-8"))
@@ -55,7 +59,7 @@ def test_pipeline_writes_prosody_with_asr_enabled_using_stubbed_transcript(tmp_p
         wav_file.setframerate(sample_rate)
         wav_file.writeframes(frames)
 
-    def _fake_transcribe(_audio_path: Path):
+    def _fake_transcribe(_audio_path: Path, **_kwargs):
         return {
             "audio_path": str(audio_path),
             "model": "fake",
@@ -78,4 +82,96 @@ def test_pipeline_writes_prosody_with_asr_enabled_using_stubbed_transcript(tmp_p
     assert model["method"] == "prosody_sequence_v1"
     assert len(model["speaker_stats"]) == 1
     assert model["speaker_stats"][0]["speaker"] == "SPEAKER_0"
-    assert model["sequence"]["length"] == 1
\ No newline at end of file
+    assert model["sequence"]["length"] == 1
+
+
+def test_pipeline_vad_trims_asr_and_sets_pause_source(tmp_path: Path, monkeypatch) -> None:
+    audio_path = tmp_path / "speech.wav"
+    output_dir = tmp_path / "out"
+
+    sample_rate = 16000
+    samples = [0] * (sample_rate // 2) + [int(0.15 * 32767) * (1 if i % 40 < 20 else -1) for i in range(sample_rate)]
+    samples += [0] * (sample_rate // 2)
+    with wave.open(str(audio_path), "wb") as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes(struct.pack(f"<{len(samples)}h", *samples))
+
+    calls = {}
+
+    def _fake_transcribe(_audio_path: Path, clip_timestamps=None, audio=None, **_kwargs):
+        calls["clip_timestamps"] = clip_timestamps
+        calls["audio"] = audio
+        return {
+            "audio_path": str(audio_path),
+            "model": "fake",
+            "language": "en",
+            "segments": [{"id": 0, "start": 0.5, "end": 1.5, "text": "hello team"}],
+        }
+
+    monkeypatch.setattr("meeting_summarizer.pipeline.transcribe_audio", _fake_transcribe)
+
+    run_pipeline(input_path=audio_path, output_dir=output_dir, run_asr=True, vad_trim_asr=True)
+
+    assert (output_dir / "vad.json").exists()
+    clips = calls["clip_timestamps"]
+    assert len(clips) == 2
+    assert clips[0] > 0.0 and clips[1] < 2.0
+    # ASR receives the shared decoded buffer rather than decoding the file itself.
+    assert calls["audio"] is not None
+    assert calls["audio"].sample_rate == 16000
+
+    prosody = json.loads((output_dir / "prosody.json").read_text(encoding="utf-8"))
+    assert prosody["pause_source"] == "vad"
+
+
+def test_smoke_pipeline_rejects_unknown_diarizer(tmp_path: Path) -> None:
+    with pytest.raises(ValueError, match="diarizer"):
+        run_pipeline(input_path=Path("data/raw/example.wav"), output_dir=tmp_path / "out", run_asr=False, diarizer="magic")
+
+
+def test_smoke_pipeline_writes_prosody_hmm_when_requested(tmp_path: Path) -> None:
+    output_dir = tmp_path / "out"
+
+    run_pipeline(input_path=Path("data/raw/example.wav"), output_dir=output_dir, run_asr=False, prosody_hmm=True)
+
+    prosody_hmm = json.loads((output_dir / "prosody_hmm.json").read_text(encoding="utf-8"))
+    assert prosody_hmm["method"] == "prosody_hmm_v1"
+    assert prosody_hmm["sequence"]["length"] == 0
+
+
+def test_smoke_pipeline_updates_corpus_stats(tmp_path: Path) -> None:
+    corpus_path = tmp_path / "corpus.json"
+
+    audio_path = tmp_path / "meeting.wav"
+    with wave.open(str(audio_path), "wb") as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(16000)
+        wav_file.writeframes(struct.pack("<16000h", *([int(0.15 * 32767)] * 16000)))
+
+    first = run_pipeline(input_path=audio_path, output_dir=tmp_path / "out", run_asr=False,
+                         corpus_stats_path=corpus_path)
+    # The same recording under another name is still the same meeting.
+    copy_path = tmp_path / "renamed.wav"
+    copy_path.write_bytes(audio_path.read_bytes())
+    again = run_pipeline(input_path=copy_path, output_dir=tmp_path / "again", run_asr=False,
+                         corpus_stats_path=corpus_path)
+
+    assert (first.corpus_stats, again.corpus_stats) == ("added", "skipped")
+    corpus = json.loads(corpus_path.read_text(encoding="utf-8"))
+    assert corpus["method"] == "prosody_corpus_v1"
+    assert corpus["meetings"] == 1
+    assert corpus["meeting_ids"] == [hash_file(copy_path)]
+
+
+def test_smoke_pipeline_writes_columnar_copies_when_requested(tmp_path: Path) -> None:
+    output_dir = tmp_path / "out"
+
+    run_pipeline(input_path=Path("data/raw/example.wav"), output_dir=output_dir, run_asr=False, export_columns=True)
+
+    header = json.loads((output_dir / "prosody.cols" / "header.json").read_text(encoding="utf-8"))
+    assert header["format"] == "meeting_columns_v1"
+    assert header["table"] == "features" and header["rows"] == 0
+    assert (output_dir / "prosody_model.cols" / "header.json").exists()
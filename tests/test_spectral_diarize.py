@@ -0,0 +1,78 @@
+import json
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from meeting_summarizer.audio.load_audio import AudioBuffer  # noqa: E402
+from meeting_summarizer.diarization.spectral_diarize import (  # noqa: E402
+    DIARIZATION_METHOD,
+    agglomerate,
+    diarize_audio,
+)
+from voices import SAMPLE_RATE, meeting, speaker_at  # noqa: E402
+
+
+def _meeting(turns):
+    samples, truth = meeting(turns)
+    return AudioBuffer(samples, SAMPLE_RATE, Path("meeting.wav"), "test"), truth
+
+
+def test_diarize_audio_separates_two_voices(tmp_path: Path) -> None:
+    audio, truth = _meeting([(0, 5.0), (1, 4.0), (0, 6.0), (1, 5.0), (0, 4.0), (1, 6.0)])
+
+    diarization = diarize_audio(Path("meeting.wav"), tmp_path / "diarization.json", audio=audio)
+
+    assert diarization["method"] == DIARIZATION_METHOD
+    assert diarization["audio_read_error"] is None
+    assert diarization["speakers"] == ["SPEAKER_0", "SPEAKER_1"]
+    assert json.loads((tmp_path / "diarization.json").read_text(encoding="utf-8")) == diarization
+
+    turns = diarization["turns"]
+    assert [turn["id"] for turn in turns] == list(range(len(turns)))
+    assert all(a["end"] <= b["start"] for a, b in zip(turns, turns[1:]))
+    # The middle of every reference turn carries that turn's speaker, consistently.
+    names = {}
+    for speaker, start, end in truth:
+        found = speaker_at(diarization, 0.5 * (start + end))
+        assert names.setdefault(speaker, found) == found
+    assert len(set(names.values())) == 2
+
+
+def test_diarize_audio_keeps_one_voice_as_one_speaker(tmp_path: Path) -> None:
+    audio, _truth = _meeting([(1, 5.0), (1, 4.0), (1, 6.0), (1, 5.0)])
+
+    diarization = diarize_audio(Path("meeting.wav"), tmp_path / "diarization.json", audio=audio)
+
+    assert diarization["speakers"] == ["SPEAKER_0"]
+
+
+def test_diarize_audio_honours_known_speaker_count(tmp_path: Path) -> None:
+    audio, _truth = _meeting([(0, 5.0), (1, 5.0), (0, 5.0), (1, 5.0)])
+
+    diarization = diarize_audio(Path("meeting.wav"), tmp_path / "diarization.json", audio=audio, num_speakers=1)
+
+    assert diarization["speakers"] == ["SPEAKER_0"]
+
+
+def test_diarize_audio_reports_missing_audio(tmp_path: Path) -> None:
+    diarization = diarize_audio(tmp_path / "missing.wav", tmp_path / "diarization.json")
+
+    assert diarization["turns"] == []
+    assert diarization["speakers"] == []
+    assert "not found" in diarization["audio_read_error"]
+
+
+def test_agglomerate_stops_at_threshold_and_absorbs_small_clusters() -> None:
+    # Two tight groups far apart, plus a tiny cluster between them.
+    points = np.array([[0.0], [0.1], [0.2], [5.0], [5.1], [2.4]])
+    weights = np.array([30.0, 30.0, 30.0, 30.0, 30.0, 1.0])
+    dist = np.abs(points - points.T)
+
+    labels = agglomerate(dist, weights, threshold=1.0)
+
+    assert len(set(labels[:3])) == 1 and len(set(labels[3:5])) == 1
+    assert labels[0] != labels[3]
+    assert labels[5] in (labels[0], labels[3])
+    assert len(set(agglomerate(dist, weights, threshold=1.0, min_share=0.0))) == 3
@@ -0,0 +1,86 @@
+import random
+
+import pytest
+
+from meeting_summarizer.prosody.model_sequence import _energy_bucket, _energy_thresholds, sequence_model
+from meeting_summarizer.prosody.streaming_states import (
+    STREAMING_SEQUENCE_METHOD,
+    StreamingQuantiles,
+    StreamingStateLabeler,
+)
+
+
+def _features(rows: int, seed: int):
+    rng = random.Random(seed)
+    features, position = [], 0.0
+    for index in range(rows):
+        duration, pause = rng.uniform(0.5, 4.0), rng.expovariate(4.0)
+        features.append(
+            {
+                "segment_id": index,
+                "start": position + pause,
+                "end": position + pause + duration,
+                "speaker": f"SPEAKER_{rng.randrange(3)}",
+                "duration_s": duration,
+                "pause_before_s": pause,
+                "pause_after_s": rng.expovariate(4.0),
+                "rms_mean": None if rng.random() < 0.05 else rng.lognormvariate(-3.0, 0.8),
+            }
+        )
+        position += pause + duration
+    return features
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_streaming_terciles_stay_within_relative_error_of_exact_terciles(seed: int) -> None:
+    rng = random.Random(seed)
+    # Drifting stream with repeats and exact zeros, the hard cases for a pointer-based tracker.
+    values = [max(0.0, rng.gauss(0.05 + index * 1e-4, 0.03)) for index in range(1500)]
+    values += [values[7]] * 40 + [0.0] * 20
+    quantiles = StreamingQuantiles((1 / 3, 2 / 3), relative_accuracy=0.01)
+
+    for count, value in enumerate(values, start=1):
+        quantiles.add(value)
+        low, high = quantiles.values()
+        exact_low, exact_high = _energy_thresholds(values[:count])
+        assert low == pytest.approx(exact_low, rel=0.01, abs=1e-9)
+        assert high == pytest.approx(exact_high, rel=0.01, abs=1e-9)
+
+
+def test_streaming_labels_match_exact_prefix_thresholds_except_near_cut_points() -> None:
+    features = _features(800, seed=3)
+    labeler = StreamingStateLabeler(audio_path="live.wav", source_method="rms_pause_v1")
+    seen = []
+
+    for feature in features:
+        row = labeler.push(feature)
+        if feature["rms_mean"] is not None:
+            seen.append(feature["rms_mean"])
+        low, high = _energy_thresholds(seen)
+        exact = _energy_bucket(feature["rms_mean"], low, high)
+        if row["energy_bucket"] != exact:
+            # Only a value within the sketch's error of a cut point can land on the other side.
+            assert min(abs(feature["rms_mean"] - low) / low, abs(feature["rms_mean"] - high) / high) <= 0.01
+
+
+def test_streaming_labeler_finish_matches_batch_model_shape(tmp_path) -> None:
+    features = _features(300, seed=4)
+    prosody = {"audio_path": "live.wav", "method": "rms_pause_v1", "features": features}
+    labeler = StreamingStateLabeler(audio_path="live.wav", source_method="rms_pause_v1")
+    for feature in features:
+        labeler.push(feature)
+
+    streamed = labeler.finish(tmp_path / "prosody_model_stream.json")
+    batch = sequence_model(prosody)
+
+    assert (tmp_path / "prosody_model_stream.json").exists()
+    assert streamed["method"] == STREAMING_SEQUENCE_METHOD
+    assert streamed["sequence"]["length"] == batch["sequence"]["length"]
+    assert streamed["speaker_stats"] == pytest.approx(batch["speaker_stats"])
+    assert sum(row["count"] for row in streamed["sequence"]["state_transition_counts"]) == len(features) - 1
+    assert streamed["sequence"]["observations"][0].keys() == batch["sequence"]["observations"][0].keys()
+    agree = sum(
+        a["state_label"] == b["state_label"]
+        for a, b in zip(streamed["sequence"]["observations"], batch["sequence"]["observations"])
+    )
+    assert agree / len(features) > 0.8
@@ -1,5 +1,7 @@
 from pathlib import Path
 
+import pytest
+
 from meeting_summarizer.summarization.summarize import summarize_segments
 
 
@@ -77,3 +79,87 @@ def test_summarize_segments_with_sequence_and_engagement() -> None:
     assert "Longest ACTIVE_SPEECH run: 3" in summary
     assert "Engagement heuristic (prototype):" in summary
     assert "Estimated engagement level: moderate-to-high" in summary
+
+
+def test_summarize_segments_lists_topics() -> None:
+    aligned = {"segments": [{"id": 0, "start": 0.0, "end": 1.0, "speaker": "SPEAKER_0", "text": "Budget first."}]}
+    topics = {"topics": [{"topic_id": 0, "start": 0.0, "end": 1.0, "label": "budget", "segment_ids": [0]}]}
+
+    summary = summarize_segments(input_path=Path("data/raw/example.wav"), aligned=aligned, topics=topics)
+
+    assert "Topics:" in summary
+    assert "- [0.0s - 1.0s] budget (1 segments)" in summary
+
+
+def _segment(index: int, text: str, speaker: str = "SPEAKER_0") -> dict:
+    return {"id": index, "start": float(index), "end": index + 1.0, "speaker": speaker, "text": text}
+
+
+def test_highlights_skip_greetings_and_prefer_central_segments() -> None:
+    from meeting_summarizer.summarization.summarize import _collect_highlights
+
+    segments = [
+        _segment(0, "Hi everyone."),
+        _segment(1, "Can you hear me?"),
+        _segment(2, "The budget review shows marketing costs doubled this quarter."),
+        _segment(3, "Marketing costs need a budget cap before the review.", "SPEAKER_1"),
+        _segment(4, "Lunch options downstairs are limited today."),
+        _segment(5, "A budget cap on marketing costs sounds reasonable.", "SPEAKER_1"),
+    ]
+
+    highlights = _collect_highlights(segments, max_items=2)
+
+    assert len(highlights) == 2
+    assert all("budget" in line for line in highlights)
+    assert not any("everyone" in line or "hear me" in line or "Lunch" in line for line in highlights)
+
+
+def test_highlight_centrality_matches_dense_pagerank() -> None:
+    np = pytest.importorskip("numpy")
+    from meeting_summarizer.summarization.summarize import _centrality, _tfidf_rows
+    from meeting_summarizer.topics.segment_topics import idf_weights
+
+    token_lists = [
+        ["budget", "costs", "marketing"],
+        ["budget", "cap", "costs"],
+        ["lunch", "downstairs"],
+        ["marketing", "cap", "review"],
+        ["hiring", "plan"],
+    ]
+    rows = _tfidf_rows(token_lists, idf_weights(token_lists))
+    vocabulary = sorted({token for tokens in token_lists for token in tokens})
+    matrix = np.array([[row.get(token, 0.0) for token in vocabulary] for row in rows])
+    similarity = matrix @ matrix.T
+    np.fill_diagonal(similarity, 0.0)
+    degree = similarity.sum(axis=1)
+    n = len(rows)
+    rank = np.full(n, 1.0 / n)
+    for _ in range(200):
+        share = np.where(degree > 1e-12, rank / np.where(degree > 1e-12, degree, 1.0), 0.0)
+        dangling = rank[degree <= 1e-12].sum()
+        rank = (1 - 0.85) / n + 0.85 * (similarity @ share + dangling / n)
+
+    assert np.allclose(_centrality(rows), rank, atol=1e-8)
+    assert abs(sum(_centrality(rows)) - 1.0) < 1e-9
+
+
+def test_highlights_boost_prosodic_emphasis() -> None:
+    from meeting_summarizer.summarization.summarize import _collect_highlights
+
+    segments = [
+        _segment(0, "Quarterly revenue forecast looks strong."),
+        _segment(1, "Server migration finishes next week."),
+    ]
+    plain = _collect_highlights(segments, max_items=1)
+    prosody_model = {
+        "sequence": {
+            "observations": [
+                {"segment_id": 0, "state_label": "NEUTRAL_SPEECH", "energy_bucket": "low"},
+                {"segment_id": 1, "state_label": "ACTIVE_SPEECH", "energy_bucket": "high"},
+            ]
+        }
+    }
+    emphasized = _collect_highlights(segments, max_items=1, prosody_model=prosody_model)
+
+    assert plain == ["- SPEAKER_0: Quarterly revenue forecast looks strong."]
+    assert emphasized == ["- SPEAKER_0: Server migration finishes next week."]
@@ -0,0 +1,110 @@
+import json
+import math
+import random
+from pathlib import Path
+
+from meeting_summarizer.topics.segment_topics import (
+    TOPIC_METHOD,
+    depth_scores,
+    gap_similarities,
+    idf_weights,
+    segment_topics,
+    tokenize,
+)
+
+VOCABULARIES = [
+    "budget invoice spending forecast quarter revenue costs finance".split(),
+    "hiring candidate interview recruiter onboarding salary offer resume".split(),
+    "database migration schema index query latency replica backup".split(),
+]
+FILLER = "so we should look at this and then maybe talk about it".split()
+
+
+def _segments(blocks, seed: int = 0, gap_s: float = 0.3):
+    """`blocks` is a list of (vocabulary index, segment count)."""
+    rng = random.Random(seed)
+    segments, position = [], 0.0
+    for vocabulary, count in blocks:
+        for _ in range(count):
+            words = [rng.choice(VOCABULARIES[vocabulary]) if rng.random() < 0.5 else rng.choice(FILLER) for _ in range(10)]
+            segments.append(
+                {"id": len(segments), "start": position, "end": position + 3.0, "speaker": "SPEAKER_0", "text": " ".join(words)}
+            )
+            position += 3.0 + gap_s
+    return segments
+
+
+def _cosine(left, right, idf) -> float:
+    a, b = {}, {}
+    for tokens, vector in ((left, a), (right, b)):
+        for token in tokens:
+            vector[token] = vector.get(token, 0.0) + idf[token]
+    dot = sum(value * b.get(token, 0.0) for token, value in a.items())
+    norms = math.sqrt(sum(v * v for v in a.values())) * math.sqrt(sum(v * v for v in b.values()))
+    return dot / norms if norms else 0.0
+
+
+def test_sliding_similarities_match_direct_cosine() -> None:
+    tokens = [tokenize(segment["text"]) for segment in _segments([(0, 12), (1, 9)], seed=1)]
+    tokens[4] = []  # a segment with no content words
+    idf = idf_weights(tokens)
+
+    similarities = gap_similarities(tokens, idf, window=4)
+
+    assert len(similarities) == len(tokens) - 1
+    for gap, value in enumerate(similarities):
+        left = [token for segment in tokens[max(0, gap - 3) : gap + 1] for token in segment]
+        right = [token for segment in tokens[gap + 1 : gap + 5] for token in segment]
+        assert math.isclose(value, _cosine(left, right, idf), rel_tol=1e-9, abs_tol=1e-12)
+
+
+def test_depth_scores_climb_to_the_nearest_peaks() -> None:
+    depths = depth_scores([0.9, 0.5, 0.2, 0.6, 0.8, 0.7])
+
+    assert all(math.isclose(a, b, abs_tol=1e-12) for a, b in zip(depths, [0.0, 0.4, 1.3, 0.2, 0.0, 0.1]))
+
+
+def test_segment_topics_finds_vocabulary_shifts(tmp_path: Path) -> None:
+    segments = _segments([(0, 40), (1, 35), (2, 45)])
+
+    result = segment_topics({"segments": segments}, tmp_path / "topics.json")
+
+    assert json.loads((tmp_path / "topics.json").read_text(encoding="utf-8")) == result
+    assert result["method"] == TOPIC_METHOD
+    topics = result["topics"]
+    assert len(topics) == 3
+    assert [topic["topic_id"] for topic in topics] == [0, 1, 2]
+    assert [sid for topic in topics for sid in topic["segment_ids"]] == list(range(len(segments)))
+    starts = [topic["segment_ids"][0] for topic in topics[1:]]
+    assert abs(starts[0] - 40) <= 2 and abs(starts[1] - 75) <= 2
+    for topic, vocabulary in zip(topics, VOCABULARIES):
+        assert set(topic["keywords"]) <= set(vocabulary)
+        assert topic["start"] == segments[topic["segment_ids"][0]]["start"]
+
+
+def test_long_pause_and_state_change_break_lexically_uniform_speech(tmp_path: Path) -> None:
+    plain = _segments([(0, 60)], seed=2)
+    paused = [dict(segment) for segment in plain]
+    for segment in paused[30:]:
+        segment["start"] += 20.0
+        segment["end"] += 20.0
+    prosody_model = {
+        "sequence": {
+            "observations": [
+                {"segment_id": index, "state_label": "REFLECTIVE_PAUSE" if index == 30 else "STEADY_FLOW"}
+                for index in range(60)
+            ]
+        }
+    }
+
+    without = segment_topics({"segments": plain}, tmp_path / "a.json")
+    fused = segment_topics({"segments": paused}, tmp_path / "b.json", prosody_model=prosody_model)
+
+    assert 29 not in [topic["segment_ids"][-1] for topic in without["topics"]]
+    assert 29 in [topic["segment_ids"][-1] for topic in fused["topics"]]
+
+
+def test_segment_topics_handles_empty_and_tiny_meetings(tmp_path: Path) -> None:
+    assert segment_topics({"segments": []}, tmp_path / "t.json")["topics"] == []
+    single = segment_topics({"segments": _segments([(0, 1)])}, tmp_path / "t.json")["topics"]
+    assert len(single) == 1 and single[0]["segment_ids"] == [0]
@@ -0,0 +1,99 @@
+import json
+import math
+import struct
+import wave
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("faster_whisper")
+
+from meeting_summarizer.asr.model_registry import ModelRegistry  # noqa: E402
+from meeting_summarizer.asr.transcribe import TranscriptStream, load_partial_transcript  # noqa: E402
+from meeting_summarizer.pipeline import run_pipeline  # noqa: E402
+
+SEGMENTS = [(0.3, 1.1, " good morning "), (1.4, 2.05, " status update "), (2.5, 3.6, " any blockers ")]
+
+
+class _ScriptedModel:
+    def transcribe(self, _source, **_options):
+        segments = (SimpleNamespace(start=start, end=end, text=text) for start, end, text in SEGMENTS)
+        return segments, SimpleNamespace(language="en")
+
+
+def _registry() -> ModelRegistry:
+    return ModelRegistry(loader=lambda *_key: _ScriptedModel())
+
+
+def _write_speech_wav(path: Path, seconds: float = 4.0, sample_rate: int = 16000) -> None:
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    pcm = 0.2 * np.sin(2.0 * math.pi * 150.0 * t) * (0.5 + 0.5 * np.sin(2.0 * math.pi * 0.7 * t))
+    with wave.open(str(path), "wb") as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes(struct.pack(f"<{len(pcm)}h", *(int(v * 32767) for v in pcm)))
+
+
+def test_transcript_stream_appends_jsonl_while_decoding(tmp_path: Path) -> None:
+    audio_path = tmp_path / "meeting.wav"
+    audio_path.write_bytes(b"")
+    jsonl_path = tmp_path / "out" / "transcript.jsonl"
+
+    stream = TranscriptStream(audio_path, registry=_registry(), jsonl_path=jsonl_path)
+    # The header (with the detected language) is on disk before any segment is decoded.
+    assert load_partial_transcript(jsonl_path)["language"] == "en"
+
+    seen = []
+    for segment in stream:
+        seen.append(segment)
+        partial = load_partial_transcript(jsonl_path)
+        assert len(partial["segments"]) == len(seen)
+        assert partial["complete"] is False
+
+    final = load_partial_transcript(jsonl_path)
+    transcript = stream.transcript()
+    assert final["complete"] is True
+    assert final["segments"] == transcript["segments"]
+    assert [segment["text"] for segment in transcript["segments"]] == ["good morning", "status update", "any blockers"]
+    assert transcript["timing"]["first_segment_s"] <= transcript["timing"]["transcription_s"]
+
+
+def test_load_partial_transcript_ignores_torn_last_line(tmp_path: Path) -> None:
+    jsonl_path = tmp_path / "transcript.jsonl"
+    jsonl_path.write_text(
+        '{"audio_path": "a.wav", "model": "small", "language": "en"}\n'
+        '{"id": 0, "start": 0.0, "end": 1.0, "text": "hi"}\n'
+        '{"id": 1, "start": 1.',
+        encoding="utf-8",
+    )
+
+    partial = load_partial_transcript(jsonl_path)
+
+    assert partial["audio_path"] == "a.wav"
+    assert [segment["id"] for segment in partial["segments"]] == [0]
+    assert partial["complete"] is False
+
+
+@pytest.mark.parametrize("extract_pitch", [False, True])
+def test_streamed_pipeline_matches_batch_outputs(tmp_path: Path, monkeypatch, extract_pitch: bool) -> None:
+    registry = _registry()
+    monkeypatch.setattr("meeting_summarizer.asr.transcribe.default_registry", lambda: registry)
+    audio_path = tmp_path / "meeting.wav"
+    _write_speech_wav(audio_path)
+
+    run_pipeline(audio_path, tmp_path / "batch", extract_pitch=extract_pitch, use_asr_cache=False)
+    run_pipeline(audio_path, tmp_path / "stream", extract_pitch=extract_pitch, stream_asr=True, use_asr_cache=False)
+
+    for name in ("prosody.json", "segments.json", "diarization.json"):
+        batch = json.loads((tmp_path / "batch" / name).read_text(encoding="utf-8"))
+        streamed = json.loads((tmp_path / "stream" / name).read_text(encoding="utf-8"))
+        assert streamed == batch, name
+    # Prosody came from the streaming extractor, not a batch pass after ASR.
+    assert not (tmp_path / "stream" / "energy_envelope.npz").exists()
+
+    partial = load_partial_transcript(tmp_path / "stream" / "transcript.jsonl")
+    assert partial["complete"] is True
+    assert len(partial["segments"]) == len(SEGMENTS)
@@ -0,0 +1,156 @@
+import json
+import math
+import struct
+import wave
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from meeting_summarizer.prosody.extract_prosody import extract_prosody_features  # noqa: E402
+from meeting_summarizer.vad.detect_speech import (  # noqa: E402
+    detect_speech_regions,
+    speech_chunks,
+    speech_clip_timestamps,
+)
+
+
+def _write_bursts_wav(path: Path, layout, sample_rate: int = 16000) -> None:
+    """`layout` is a list of (seconds, amplitude) pieces; amplitude 0 is silence with faint noise."""
+    rng = np.random.default_rng(0)
+    pieces = []
+    for seconds, amplitude in layout:
+        t = np.arange(int(seconds * sample_rate)) / sample_rate
+        tone = amplitude * np.sin(2.0 * math.pi * 180.0 * t)
+        pieces.append(tone + 0.0005 * rng.standard_normal(len(t)))
+    pcm = np.clip(np.concatenate(pieces), -1.0, 1.0)
+    with wave.open(str(path), "wb") as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes(struct.pack(f"<{len(pcm)}h", *(int(v * 32767) for v in pcm)))
+
+
+def test_detect_speech_regions_finds_bursts(tmp_path: Path) -> None:
+    audio_path = tmp_path / "bursts.wav"
+    _write_bursts_wav(audio_path, [(0.5, 0.0), (1.0, 0.2), (1.0, 0.0), (1.0, 0.1), (0.5, 0.0)])
+
+    vad = detect_speech_regions(audio_path, tmp_path / "vad.json")
+
+    assert vad["audio_read_error"] is None
+    assert (tmp_path / "vad.json").exists()
+    assert len(vad["regions"]) == 2
+    first, second = vad["regions"]
+    assert first["start"] == pytest.approx(0.5, abs=0.03)
+    # Hangover keeps speech on briefly after each burst ends.
+    assert 1.5 <= first["end"] <= 1.75
+    assert second["start"] == pytest.approx(2.5, abs=0.03)
+    assert 0.4 < vad["speech_ratio"] < 0.7
+
+
+def test_detect_speech_regions_bridges_short_gaps(tmp_path: Path) -> None:
+    audio_path = tmp_path / "gappy.wav"
+    _write_bursts_wav(audio_path, [(0.3, 0.0), (0.5, 0.2), (0.35, 0.0), (0.5, 0.2), (0.3, 0.0)])
+
+    vad = detect_speech_regions(audio_path, tmp_path / "vad.json")
+
+    assert len(vad["regions"]) == 1
+
+
+def test_detect_speech_regions_missing_audio(tmp_path: Path) -> None:
+    vad = detect_speech_regions(tmp_path / "missing.wav", tmp_path / "vad.json")
+
+    assert vad["regions"] == []
+    assert "Audio file not found" in vad["audio_read_error"]
+
+
+def test_speech_clip_timestamps_pads_and_merges() -> None:
+    vad = {
+        "duration_s": 10.0,
+        "regions": [
+            {"id": 0, "start": 0.1, "end": 2.0},
+            {"id": 1, "start": 2.3, "end": 4.0},
+            {"id": 2, "start": 6.0, "end": 9.9},
+        ],
+    }
+
+    assert speech_clip_timestamps(vad, pad_s=0.2) == pytest.approx([0.0, 4.2, 5.8, 10.0])
+
+
+def test_prosody_uses_vad_pauses(tmp_path: Path) -> None:
+    vad = {
+        "regions": [
+            {"id": 0, "start": 0.2, "end": 1.0},
+            {"id": 1, "start": 1.4, "end": 2.0},
+            {"id": 2, "start": 2.8, "end": 3.5},
+        ]
+    }
+    aligned = {
+        "segments": [
+            # ASR glues the first two speech regions into one segment with no gaps around it.
+            {"id": 0, "start": 0.0, "end": 2.2, "speaker": "SPEAKER_0", "text": "a"},
+            {"id": 1, "start": 2.2, "end": 3.6, "speaker": "SPEAKER_1", "text": "b"},
+        ]
+    }
+
+    result = extract_prosody_features(tmp_path / "missing.wav", aligned, tmp_path / "p.json", vad=vad)
+    first, second = result["features"]
+
+    assert result["pause_source"] == "vad"
+    assert first["pause_before_s"] == 0.0
+    assert first["pause_after_s"] == pytest.approx(0.8)
+    assert first["internal_pause_s"] == pytest.approx(0.4)
+    assert second["pause_before_s"] == pytest.approx(0.8)
+    assert second["pause_after_s"] == 0.0
+    assert second["internal_pause_s"] == pytest.approx(0.0)
+
+    persisted = json.loads((tmp_path / "p.json").read_text(encoding="utf-8"))
+    assert persisted["features"][0]["internal_pause_s"] == pytest.approx(0.4)
+
+
+def test_vad_pauses_exclude_hangover_and_agree_across_a_gap(tmp_path: Path) -> None:
+    audio_path = tmp_path / "two_turns.wav"
+    _write_bursts_wav(audio_path, [(2.5, 0.2), (0.6, 0.0), (2.5, 0.2), (0.5, 0.0)])
+    vad = detect_speech_regions(audio_path, tmp_path / "vad.json")
+    first_region, second_region = vad["regions"]
+    # The hangover tail runs past the first turn, but `speech_end` does not.
+    assert first_region["end"] > 2.6
+    assert first_region["speech_end"] == pytest.approx(2.5, abs=0.03)
+
+    aligned = {
+        "segments": [
+            {"id": 0, "start": 0.0, "end": 2.5, "speaker": "SPEAKER_0", "text": "a"},
+            {"id": 1, "start": 3.1, "end": 5.6, "speaker": "SPEAKER_1", "text": "b"},
+        ]
+    }
+    result = extract_prosody_features(audio_path, aligned, tmp_path / "p.json", vad=vad)
+    first, second = result["features"]
+
+    assert first["pause_after_s"] == pytest.approx(0.6, abs=0.03)
+    assert second["pause_before_s"] == pytest.approx(first["pause_after_s"])
+
+
+def test_speech_chunks_group_regions_and_split_long_speech() -> None:
+    regions = [
+        {"id": 0, "start": 1.0, "end": 5.0},
+        {"id": 1, "start": 6.0, "end": 20.0},
+        {"id": 2, "start": 40.0, "end": 110.0},
+    ]
+
+    chunks = speech_chunks(regions, duration_s=120.0, max_chunk_s=30.0, pad_s=0.2)
+
+    # The first two regions fit one chunk; the 70 s region is cut into three equal pieces.
+    assert chunks[0] == pytest.approx((0.8, 20.2))
+    assert len(chunks) == 4
+    assert all(end - start <= 30.0 + 1e-9 for start, end in chunks)
+    assert chunks[1][0] == pytest.approx(39.8) and chunks[-1][1] == pytest.approx(110.2)
+    assert all(prev[1] <= nxt[0] for prev, nxt in zip(chunks, chunks[1:]))
+
+
+def test_speech_chunks_padding_stops_midway_between_regions() -> None:
+    regions = [{"id": 0, "start": 0.0, "end": 29.9}, {"id": 1, "start": 30.1, "end": 45.0}]
+
+    chunks = speech_chunks(regions, duration_s=45.0, max_chunk_s=30.0, pad_s=0.5)
+
+    assert chunks == [pytest.approx((0.0, 30.0)), pytest.approx((30.0, 45.0))]
@@ -0,0 +1,50 @@
+import struct
+import wave
+from pathlib import Path
+
+import pytest
+
+from meeting_summarizer.audio.wav_reader import WavReader
+
+
+def _write_ramp_wav(path: Path, frames: int, channels: int = 2) -> None:
+    values = []
+    for i in range(frames):
+        values.extend([i, -i] if channels == 2 else [i])
+    with wave.open(str(path), "wb") as wav_file:
+        wav_file.setnchannels(channels)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(8000)
+        wav_file.writeframes(struct.pack(f"<{len(values)}h", *values))
+
+
+@pytest.mark.parametrize("engine", ["python", "numpy"])
+def test_wav_reader_reads_only_requested_range(tmp_path: Path, engine: str) -> None:
+    if engine == "numpy":
+        pytest.importorskip("numpy")
+    audio_path = tmp_path / "ramp.wav"
+    _write_ramp_wav(audio_path, frames=1000, channels=1)
+
+    with WavReader(audio_path, engine=engine) as reader:
+        assert reader.num_frames == 1000
+        assert reader.sample_rate == 8000
+        samples = list(reader.read(100, 105))
+        past_end = list(reader.read(995, 2000))
+
+    assert samples == pytest.approx([i / 32768.0 for i in range(100, 105)])
+    assert len(past_end) == 5
+
+
+@pytest.mark.parametrize("engine", ["python", "numpy"])
+def test_wav_reader_blocks_cover_range_and_downmix(tmp_path: Path, engine: str) -> None:
+    if engine == "numpy":
+        pytest.importorskip("numpy")
+    audio_path = tmp_path / "stereo.wav"
+    _write_ramp_wav(audio_path, frames=1000, channels=2)
+
+    with WavReader(audio_path, engine=engine) as reader:
+        blocks = [list(block) for block in reader.iter_blocks(10, 710, block_frames=256)]
+
+    assert [len(block) for block in blocks] == [256, 256, 188]
+    # Left and right channels cancel out when downmixed.
+    assert all(value == 0.0 for block in blocks for value in block)
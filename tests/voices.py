@@ -0,0 +1,49 @@
+"""Synthetic two-speaker audio shared by the diarization tests."""
+
+import math
+
+import numpy as np
+
+SAMPLE_RATE = 16000
+VOICES = {
+    0: (110.0, [(500.0, 200.0), (1500.0, 300.0), (2500.0, 400.0)]),
+    1: (210.0, [(800.0, 250.0), (1200.0, 200.0), (2900.0, 500.0)]),
+}
+
+
+def voice(seconds: float, speaker: int, rng, steady: bool = False) -> np.ndarray:
+    """Formant-shaped harmonic tone with vibrato and a syllable-rate envelope (neither if `steady`)."""
+    f0, formants = VOICES[speaker]
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    vibrato = 0.0 if steady else 0.05
+    phase = 2.0 * math.pi * np.cumsum(f0 * (1.0 + vibrato * np.sin(2.0 * math.pi * 3.0 * t))) / SAMPLE_RATE
+    signal = np.zeros_like(t)
+    for k in range(1, int(7000.0 // f0) + 1):
+        gain = sum(math.exp(-(((k * f0) - centre) / width) ** 2) for centre, width in formants) + 0.05
+        signal += gain / math.sqrt(k) * np.sin(k * phase)
+    if not steady:
+        signal *= 0.5 + 0.5 * np.sin(2.0 * math.pi * 4.0 * t + rng.uniform(0, 6)) ** 2
+    return 0.15 * signal / np.max(np.abs(signal)) + 0.001 * rng.standard_normal(len(t))
+
+
+def meeting(turns, gap_s: float = 1.0):
+    """
+    `turns` is a list of (speaker, seconds), each preceded by `gap_s` of near-silence.
+    Returns float32 samples and the (speaker, start, end) of every turn.
+    """
+    rng = np.random.default_rng(0)
+    parts, truth, position = [], [], 0.0
+    for speaker, seconds in turns:
+        parts.append(0.001 * rng.standard_normal(int(gap_s * SAMPLE_RATE)))
+        position += gap_s
+        parts.append(voice(seconds, speaker, rng))
+        truth.append((speaker, position, position + seconds))
+        position += seconds
+    return np.concatenate(parts).astype(np.float32), truth
+
+
+def speaker_at(diarization, t: float):
+    for turn in diarization["turns"]:
+        if turn["start"] <= t < turn["end"]:
+            return turn["speaker"]
+    return None